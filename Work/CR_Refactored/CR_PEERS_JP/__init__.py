@@ -12,6 +12,7 @@ Quick start::
 
     mdd = MasterDataDictionary()
     print(mdd.lookup_metric("RCON2170"))
+    names = mdd.lookup_metrics(["RCON2170", "ASSET", "TTM_NCO_Rate"])
     report_df = mdd.export_dictionary_report()
 """
 
@@ -7,11 +7,19 @@ Runs the full MSPBNA Credit Risk pipeline sequentially:
   Step 1: MSPBNA_CR_Normalized.py  (data fetch + processing → Excel dashboard)
   Step 2: report_generator.py      (charts, scatters, HTML tables)
 
+Inside each step the stages run as a dependency DAG (pipeline_dag.py):
+independent stages run concurrently and Step 1 transforms are memoized
+under data/dag_cache by input hash.
+
 Usage:
     python run_pipeline.py                    # Both steps, full_local mode
     python run_pipeline.py --mode corp_safe   # Both steps, corp_safe mode
     python run_pipeline.py --step 2           # Step 2 only (assumes Step 1 already ran)
     python run_pipeline.py --force            # Continue Step 2 even if Step 1 fails
+    python run_pipeline.py --workers 1        # Run DAG stages one at a time
+    python run_pipeline.py --no-memo          # Recompute every Step 1 stage
+    python run_pipeline.py --overlap-io       # Launch all fetches up front on one event loop
+    python run_pipeline.py --memory-budget 500  # Warn when a stage output exceeds 500 MB
 """
 
 import argparse
@@ -55,6 +63,14 @@ def main():
                         default="both", help="Which step(s) to run")
     parser.add_argument("--force", action="store_true",
                         help="Continue to Step 2 even if Step 1 fails")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Concurrent DAG stages per step (default 4; 1 = sequential)")
+    parser.add_argument("--no-memo", action="store_true",
+                        help="Ignore memoized Step 1 stage outputs")
+    parser.add_argument("--overlap-io", action="store_true",
+                        help="Run network fetches on a shared event loop, overlapped with compute")
+    parser.add_argument("--memory-budget", type=float, default=None, metavar="MB",
+                        help="Warn when any DAG stage output exceeds this many MB")
     args = parser.parse_args()
 
     _load_env()
@@ -80,6 +96,14 @@ def main():
     python = sys.executable
     env = os.environ.copy()
     env["REPORT_MODE"] = args.mode
+    if args.workers is not None:
+        env["PIPELINE_WORKERS"] = str(max(1, args.workers))
+    if args.no_memo:
+        env["PIPELINE_MEMO"] = "0"
+    if args.overlap_io:
+        env["PIPELINE_OVERLAP"] = "1"
+    if args.memory_budget is not None:
+        env["PIPELINE_MEMORY_BUDGET_MB"] = str(args.memory_budget)
 
     # Force UTF-8 on Windows to prevent emoji/Unicode encoding errors in log output
     env["PYTHONUTF8"] = "1"
@@ -43,6 +43,8 @@ for _sub in ("src/reporting", "src/local_macro", "src/data_processing"):
 from master_data_dictionary import MasterDataDictionary, LOCAL_DERIVED_METRICS
 from case_shiller_zip_mapper import build_case_shiller_zip_sheets, resolve_hud_token
 from metric_registry import run_upstream_validation_suite
+from pipeline_dag import PipelineDAG, source_version
+from dtype_policy import apply_panel_dtypes
 
 
 # script_dir points at the project root (not this file's directory) so that
@@ -1804,7 +1806,12 @@ class FDICDataFetcher:
 
         return pd.DataFrame()
 
-    def fetch_all_banks(self) -> Tuple[pd.DataFrame, List[int]]:
+    def fetch_all_banks(self, heal: bool = True) -> Tuple[pd.DataFrame, List[int]]:
+        """Fetch FDIC financials (+ LNCI) for subject and peers.
+
+        With ``heal=False`` the FFIEC bulk recovery is left to a separate
+        ``heal_with_ffiec()`` call (the Step 1 DAG runs it as its own node).
+        """
         certs_to_fetch = [self.config.subject_bank_cert] + self.config.peer_bank_certs
         all_bank_data, failed_certs = [], []
 
@@ -1910,6 +1917,16 @@ class FDICDataFetcher:
         # =========================================================
         # [STEP 2] DUAL-TRACK DATA RECOVERY (FFIEC BULK HEALER)
         # =========================================================
+        if heal:
+            combined_df = self.heal_with_ffiec(combined_df, certs_to_fetch)
+
+        return self._finalize_fdic_frame(combined_df), failed_certs
+
+    def heal_with_ffiec(self, combined_df: pd.DataFrame,
+                        certs_to_fetch: Optional[List[int]] = None) -> pd.DataFrame:
+        """Patch missing RI-C fields from FFIEC bulk call files (non-fatal)."""
+        if certs_to_fetch is None:
+            certs_to_fetch = [self.config.subject_bank_cert] + self.config.peer_bank_certs
         try:
             print("\n[Dual-Track] Initiating FFIEC Bulk Data Recovery...")
             ffiec_loader = FFIECBulkLoader(output_dir="data/ffiec_cache")
@@ -1978,7 +1995,11 @@ class FDICDataFetcher:
         # =========================================================
 
 
-        # Step 4: Continue with existing processing
+        return combined_df
+
+    @staticmethod
+    def _finalize_fdic_frame(combined_df: pd.DataFrame) -> pd.DataFrame:
+        """Ensure every requested field exists, coerce numerics, sort."""
         for field in FDIC_FIELDS_TO_FETCH:
             if field not in combined_df.columns:
                 combined_df[field] = np.nan
@@ -1987,7 +2008,7 @@ class FDICDataFetcher:
         num_cols = [c for c in combined_df.columns if c not in ['CERT', 'NAME', 'REPDTE']]
         combined_df[num_cols] = combined_df[num_cols].apply(pd.to_numeric, errors='coerce')
 
-        return combined_df.sort_values(['CERT', 'REPDTE']), failed_certs
+        return combined_df.sort_values(['CERT', 'REPDTE'])
 
 
 
@@ -5028,8 +5049,8 @@ class ExcelOutputGenerator:
             frontier = next_frontier
 
         # Annotate terminal regulatory codes with dictionary definitions
-        for tc in sorted(terminal_codes):
-            info = self._mdd.lookup_metric(tc)
+        terminals = sorted(terminal_codes)
+        for tc, info in zip(terminals, self._mdd.lookup_metrics(terminals)):
             name = info.get("Metric_Name", "")
             if name and name != tc and info.get("Source_of_Truth", "") != "Not Found":
                 steps.append(f"[Regulatory Definition] {tc}: {name}")
@@ -5357,8 +5378,7 @@ class ExcelOutputGenerator:
         used_codes: set[str] = set()
 
         # --- 1. FDIC fields used by the dashboard ---
-        for code in FDIC_FIELDS_TO_FETCH:
-            info = self._mdd.lookup_metric(code)
+        for code, info in zip(FDIC_FIELDS_TO_FETCH, self._mdd.lookup_metrics(FDIC_FIELDS_TO_FETCH)):
             rows.append({
                 "Metric_Code": code,
                 "Metric_Name": info["Metric_Name"],
@@ -5841,18 +5861,11 @@ class BankPerformanceDashboard:
         return analysis_report
     def _optimize_df_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Reduces DataFrame memory usage and file size by downcasting numeric types
-        and converting object columns with low cardinality to 'category'.
+        Applies the panel dtype policy (float32 ratios, float64 dollar levels,
+        int32 CERT) and converts low-cardinality object columns to 'category'.
+        Dollar levels are no longer downcast — float32 rounds large balances.
         """
-        for col in df.columns:
-            if df[col].dtype == 'float64':
-                df[col] = pd.to_numeric(df[col], downcast='float')
-            elif df[col].dtype == 'int64':
-                df[col] = pd.to_numeric(df[col], downcast='integer')
-            elif df[col].dtype == 'object':
-                if len(df[col].unique()) / len(df[col]) < 0.5:
-                    df[col] = df[col].astype('category')
-        return df
+        return apply_panel_dtypes(df, categorize_objects=True)
     # Rate-like column name patterns (weighted average when method="weighted")
     _RATE_PATTERNS = re.compile(
         r"(?i)(_Rate$|_Ratio$|_Coverage$|_Pct$|_Share$|_Composition$|_Yield|"
@@ -6020,64 +6033,73 @@ class BankPerformanceDashboard:
 
         return df
 
-    def run(self) -> Dict[str, Any]:
-        logging.info("Starting dashboard generation...")
-        if csv_log:
-            csv_log.info("Dashboard generation started",
-                         event_type="CONFIG", phase="startup", component="run",
-                         context={"subject_cert": self.config.subject_bank_cert,
-                                  "peer_certs": self.config.peer_bank_certs})
+    # ------------------------------------------------------------------
+    #  Step 1 stages — wired together by build_dag(), executed by run()
+    # ------------------------------------------------------------------
+    # FRED series derived locally from other series (never fetched)
+    CALCULATED_SERIES = ['SOFR3MTB3M']
 
-        fdic_df, _ = self.fdic_fetcher.fetch_all_banks()
+    # Config fields kept out of the DAG version hash
+    _DAG_SECRET_FIELDS = ("fred_api_key", "hud_user_token", "bea_api_key", "census_api_key")
+
+    def _stage_fdic_fetch(self) -> pd.DataFrame:
+        fdic_df, _ = self.fdic_fetcher.fetch_all_banks(heal=False)
         if fdic_df.empty: raise ValueError("No FDIC data retrieved.")
+        return fdic_df
+
+    def _stage_ffiec_heal(self, fdic_df: pd.DataFrame) -> pd.DataFrame:
+        fdic_df = self.fdic_fetcher._finalize_fdic_frame(self.fdic_fetcher.heal_with_ffiec(fdic_df))
         if csv_log:
             csv_log.log_df_shape("fdic_df", len(fdic_df), len(fdic_df.columns),
                                  phase="data_fetch", component="fdic")
+        return fdic_df
 
-        all_certs = fdic_df['CERT'].unique().tolist()
+    def _stage_bank_locations(self) -> pd.DataFrame:
+        # Configured certs rather than the fetched ones so this can run
+        # alongside the FDIC fetch; the merge is a left join on CERT.
+        all_certs = list(dict.fromkeys([self.config.subject_bank_cert] + list(self.config.peer_bank_certs)))
         locations_df = get_bank_locations(all_certs)
         if 'NAME' in locations_df.columns:
             locations_df.drop(columns=['NAME'], inplace=True)
+        return locations_df
+
+    def _stage_merge_locations(self, fdic_df: pd.DataFrame, locations_df: pd.DataFrame) -> pd.DataFrame:
         if not locations_df.empty:
             fdic_df = pd.merge(fdic_df, locations_df, on='CERT', how='left')
             logging.info("Location data merged successfully.")
         else:
             logging.warning("Location DataFrame is empty — skipping location merge")
+        return fdic_df
 
-        fdic_analysis = self._analyze_fdic_data_availability(fdic_df)
-
-        proc_df = self.processor.create_derived_metrics(fdic_df)
-        proc_df_with_ttm = self.processor.calculate_ttm_metrics(proc_df)
+    def _stage_composites(self, proc_df_with_ttm: pd.DataFrame) -> pd.DataFrame:
         proc_df_with_peers = self._create_peer_composite(proc_df_with_ttm)
         if csv_log:
             csv_log.log_df_shape("proc_df_with_peers", len(proc_df_with_peers),
                                  len(proc_df_with_peers.columns),
                                  phase="processing", component="peer_composite")
+        return proc_df_with_peers
 
-        peer_comp_df = self.analyzer.create_peer_comparison(proc_df_with_peers)
-        norm_comp_df = self.analyzer.create_normalized_comparison(proc_df_with_peers)
-        snapshot_df = self.processor.create_latest_snapshot(proc_df_with_peers)
+    def _stage_averages_8q(self, proc_df_with_peers: pd.DataFrame) -> pd.DataFrame:
         avg_8q_all_metrics_df = self.processor.calculate_8q_averages(proc_df_with_peers)
         if csv_log:
             csv_log.log_df_shape("avg_8q_all_metrics_df", len(avg_8q_all_metrics_df),
                                  len(avg_8q_all_metrics_df.columns),
                                  phase="processing", component="8q_averages")
+        return self._optimize_df_dtypes(avg_8q_all_metrics_df)
 
+    async def _stage_fred_fetch(self) -> Dict[str, Any]:
         # === FRED DATA FETCHING - NO DUPLICATES ===
         logging.info("Fetching FRED macroeconomic data asynchronously...")
         start_time = time.perf_counter()
 
-        # Define calculated series that should NOT be fetched
-        CALCULATED_SERIES = ['SOFR3MTB3M']
-
         # Build list - EXCLUDING calculated series AND DEDUPLICATING
         series_ids_to_fetch = []
         for category_dict in FRED_SERIES_TO_FETCH.values():
             for sid in category_dict.keys():
-                if sid not in CALCULATED_SERIES and sid not in series_ids_to_fetch:
+                if sid not in self.CALCULATED_SERIES and sid not in series_ids_to_fetch:
                     series_ids_to_fetch.append(sid)
 
-        logger.info(f"Fetching {len(series_ids_to_fetch)} series (excluding {CALCULATED_SERIES})")
+        logger.info(f"Fetching {len(series_ids_to_fetch)} series (excluding {self.CALCULATED_SERIES})")
 
         # Build descriptions DataFrame for ALL series (including calculated)
         # Use a completely unique variable name to avoid any collisions
@@ -6107,35 +6129,36 @@ class BankPerformanceDashboard:
         series_descriptions_df = pd.DataFrame.from_dict(_temp_series_metadata_dict, orient='index')
         logger.info(f"Created descriptions dataframe with {len(series_descriptions_df)} rows")
 
-        # Handle event loop properly for Spyder/Jupyter
-        try:
-            loop = asyncio.get_running_loop()
-            import nest_asyncio
-            nest_asyncio.apply()
-            fred_df, fred_desc_df, failed_fred_series, fred_metadata_df = asyncio.run(
-                self.fred_fetcher.fetch_all_series_async(
-                    series_ids=series_ids_to_fetch,
-                    series_descriptions=series_descriptions_df
-                )
+        # Awaited on the pipeline's I/O loop in overlapped mode; otherwise the
+        # DAG runs this coroutine with asyncio.run on a worker thread (which
+        # never has a running loop, so nest_asyncio is no longer needed).
+        fred_df, fred_desc_df, failed_fred_series, fred_metadata_df = \
+            await self.fred_fetcher.fetch_all_series_async(
+                series_ids=series_ids_to_fetch,
+                series_descriptions=series_descriptions_df
             )
-            # === PATCH S-RAW3a: pull stashed raw observations DF ===
-            fred_obs_df = getattr(self.fred_fetcher, 'last_fred_obs_df', pd.DataFrame())
-            # === END PATCH S-RAW3a ===
-
-        except RuntimeError:
-            fred_df, fred_desc_df, failed_fred_series, fred_metadata_df = asyncio.run(
-                self.fred_fetcher.fetch_all_series_async(
-                    series_ids=series_ids_to_fetch,
-                    series_descriptions=series_descriptions_df
-                )
-            )
-            # === PATCH S-RAW3a: pull stashed raw observations DF ===
-            fred_obs_df = getattr(self.fred_fetcher, 'last_fred_obs_df', pd.DataFrame())
-            # === END PATCH S-RAW3a ===
+        # === PATCH S-RAW3a: pull stashed raw observations DF ===
+        fred_obs_df = getattr(self.fred_fetcher, 'last_fred_obs_df', pd.DataFrame())
+        # === END PATCH S-RAW3a ===
 
         end_time = time.perf_counter()
         logging.info(f"Asynchronous FRED data fetching completed in {end_time - start_time:.2f} seconds.")
 
+        # Post-processing is CPU work: it runs in the fred_data node so it
+        # does not hold the shared I/O loop while other fetches are in flight.
+        return {
+            "fred_df": fred_df,
+            "fred_desc_df": fred_desc_df,
+            "failed_fred_series": failed_fred_series,
+            "fred_metadata_df": fred_metadata_df,
+            "fred_obs_df": fred_obs_df,
+        }
+
+    def _stage_fred_data(self, fetched: Dict[str, Any]) -> Dict[str, Any]:
+        fred_df, fred_desc_df = fetched["fred_df"], fetched["fred_desc_df"]
+        failed_fred_series = fetched["failed_fred_series"]
+        fred_metadata_df, fred_obs_df = fetched["fred_metadata_df"], fetched["fred_obs_df"]
+
         # --- FALLBACK: ensure FRED DataFrames have correct schemas even on total failure ---
         # This guarantees downstream Excel sheets (FRED_Data, FRED_Descriptions, FRED_Metadata)
         # are always created, preventing report_generator.py from skipping macro charts.
@@ -6216,6 +6239,16 @@ class BankPerformanceDashboard:
                 new_row = pd.DataFrame([new_row_data])
                 fred_desc_df = pd.concat([fred_desc_df, new_row], ignore_index=True)
 
+        return {
+            "fred_df": fred_df,
+            "fred_desc_df": fred_desc_df,
+            "failed_fred_series": failed_fred_series,
+            "fred_metadata_df": fred_metadata_df,
+            "fred_obs_df": fred_obs_df,
+        }
+
+    def _stage_macro_analysis(self, fred: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+        fred_df = fred["fred_df"]
         # Process technical indicators
         enhanced_analyzer = MacroTrendAnalyzer(self.config)
         processed_data = {}
@@ -6223,7 +6256,7 @@ class BankPerformanceDashboard:
 
         for category, series_in_category in FRED_SERIES_TO_FETCH.items():
             for series_id in series_in_category.keys():
-                if series_id in CALCULATED_SERIES:
+                if series_id in self.CALCULATED_SERIES:
                     continue
                 if series_id in fred_df.columns:
                     validation_reports[series_id] = enhanced_analyzer.validate_series_data(
@@ -6237,7 +6270,7 @@ class BankPerformanceDashboard:
                             processed_data[series_id] = result
 
         # Process calculated series
-        for series_id in CALCULATED_SERIES:
+        for series_id in self.CALCULATED_SERIES:
             if series_id in fred_df.columns:
                 validation_reports[series_id] = enhanced_analyzer.validate_series_data(
                     series_id, fred_df[series_id]
@@ -6251,22 +6284,14 @@ class BankPerformanceDashboard:
 
         validation_df = pd.DataFrame.from_dict(validation_reports, orient='index')
         powerbi_macro_df = enhanced_analyzer.generate_powerbi_output(processed_data)
-
-
-        from logging_utils import get_run_date_str, build_artifact_filename
-        fname = build_artifact_filename(
-            "Bank_Performance_Dashboard", "", ext=".xlsx",
-            output_dir=self.config.output_dir,
-        )
-        peer_comp_df = self._optimize_df_dtypes(peer_comp_df)
-        norm_comp_df = self._optimize_df_dtypes(norm_comp_df)  # NEW: Optimize normalized view
-        snapshot_df = self._optimize_df_dtypes(snapshot_df)
-        proc_df_with_peers = self._optimize_df_dtypes(proc_df_with_peers)
-        avg_8q_all_metrics_df = self._optimize_df_dtypes(avg_8q_all_metrics_df)
         powerbi_macro_df = self._optimize_df_dtypes(powerbi_macro_df)
+        return {"validation_df": validation_df, "powerbi_macro_df": powerbi_macro_df}
+
+    @staticmethod
+    def _fdic_metric_meta() -> pd.DataFrame:
         # === FDIC-META: units & scaling for email tables ===
         # === FDIC-META (with Basis): tells consumer how to scale/format ===
-        fdic_meta_df = pd.DataFrame([
+        return pd.DataFrame([
             # Dollars in $000 → display $M (scale 1e-3)
             # --- Normalized ACL Metrics ---
             {"MetricCode":"Norm_ACL_Balance",                 "Display":"Normalized ACL Balance",       "DisplayUnit":"$M", "Scale":1e-3, "Fmt":"currency_m", "Decimals":2, "Basis":"level"},
@@ -6355,6 +6380,10 @@ class BankPerformanceDashboard:
         ])
         # === END FDIC-META ===
 
+    def _stage_audit_sheets(self, proc_df_with_peers: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        # Private copy: the coverage audit below NaN-s composite metrics in
+        # place, and sibling stages are still reading the composites output.
+        proc_df_with_peers = self._optimize_df_dtypes(proc_df_with_peers.copy())
 
         # --- Normalization Diagnostics Sheet ---
         norm_diag_cols = [
@@ -6474,6 +6503,16 @@ class BankPerformanceDashboard:
 
         composite_coverage_df = pd.DataFrame(coverage_audit_rows) if coverage_audit_rows else pd.DataFrame()
 
+        return {
+            "FDIC_Data": proc_df_with_peers,
+            "Normalization_Diagnostics": norm_diagnostics_df,
+            "Peer_Group_Definitions": peer_defs_df,
+            "Exclusion_Component_Audit": excl_audit_df,
+            "Composite_Coverage_Audit": composite_coverage_df,
+        }
+
+    def _stage_validation(self, audit: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        proc_df_with_peers = audit["FDIC_Data"]
         # --- Metric Validation Audit (run_upstream_validation_suite) ---
         # Validates registered derived metrics against their declared formulas/bounds.
         try:
@@ -6527,6 +6566,10 @@ class BankPerformanceDashboard:
         else:
             recon_df = pd.DataFrame()
 
+        return {"Metric_Validation_Audit": metric_validation_df,
+                "Normalization_Reconciliation_Sample": recon_df}
+
+    def _stage_case_shiller(self) -> Dict[str, pd.DataFrame]:
         # --- Case-Shiller ZIP Enrichment (standalone sheets) ---
         # Produces up to 3+2 keys: 3 DataFrames + enrichment_status + token_diagnostics.
         # Wrapped in try/except so HUD API failures do not crash the pipeline.
@@ -6550,7 +6593,9 @@ class BankPerformanceDashboard:
                 logging.warning(f"Case-Shiller ZIP enrichment produced no non-empty sheets (status={enrich_status})")
         except Exception as e:
             logging.warning(f"Case-Shiller ZIP enrichment failed (non-fatal): {e}")
+        return cs_kwargs
 
+    def _stage_local_macro(self) -> Dict[str, pd.DataFrame]:
         # --- Local Macro Pipeline (geography spine + BEA/BLS/Census) ---
         # Produces up to 6 sheets: Local_Macro_Raw, Local_Macro_Derived,
         # Local_Macro_Mapped, Local_Macro_Latest, MSA_Board_Panel, MSA_Crosswalk_Audit.
@@ -6601,6 +6646,26 @@ class BankPerformanceDashboard:
                 )
             except Exception:
                 pass  # Don't let skip-audit creation crash the pipeline
+        return local_macro_kwargs
+
+    def _stage_excel_write(self, peer_comp_df, norm_comp_df, snapshot_df, avg_8q_all_metrics_df,
+                           macro, fred, audit, validation, cs_kwargs, local_macro_kwargs) -> str:
+        fred_df, fred_metadata_df, fred_desc_df = fred["fred_df"], fred["fred_metadata_df"], fred["fred_desc_df"]
+        powerbi_macro_df, validation_df = macro["powerbi_macro_df"], macro["validation_df"]
+        proc_df_with_peers = audit["FDIC_Data"]
+        norm_diagnostics_df = audit["Normalization_Diagnostics"]
+        peer_defs_df = audit["Peer_Group_Definitions"]
+        excl_audit_df = audit["Exclusion_Component_Audit"]
+        composite_coverage_df = audit["Composite_Coverage_Audit"]
+        metric_validation_df = validation["Metric_Validation_Audit"]
+        recon_df = validation["Normalization_Reconciliation_Sample"]
+        fdic_meta_df = self._fdic_metric_meta()
+
+        from logging_utils import get_run_date_str, build_artifact_filename
+        fname = build_artifact_filename(
+            "Bank_Performance_Dashboard", "", ext=".xlsx",
+            output_dir=self.config.output_dir,
+        )
 
         # --- Diagnostic logging: prove curated tabs match allowlists ---
         if not peer_comp_df.empty and "Metric Code" in peer_comp_df.columns:
@@ -6650,7 +6715,81 @@ class BankPerformanceDashboard:
             **cs_kwargs,
             **local_macro_kwargs,
         )
+        return fname
+
+    def build_dag(self) -> PipelineDAG:
+        """Declare the Step 1 stages and their data dependencies.
+
+        Network fetches (FDIC, locations, FRED, Case-Shiller, local macro)
+        have no inputs and start immediately; with PIPELINE_OVERLAP=1 they
+        all launch up front on one event loop and leave the compute workers
+        to the CPU stages.  Deterministic transforms are memoized under
+        data/dag_cache keyed on their inputs and the source of the
+        processing modules.  Every node output passes through the panel
+        dtype policy, and its size is reported in the summary table.
+        """
+        src_dir = Path(__file__).resolve().parent
+        settings = {k: v for k, v in vars(self.config).items() if k not in self._DAG_SECRET_FIELDS}
+        dag = PipelineDAG(
+            "step1",
+            cache_dir=os.path.join(script_dir, "data", "dag_cache"),
+            version=source_version(src_dir.glob("*.py"), COMPOSITE_METHOD,
+                                   os.getenv("MSPBNA_CERT"), sorted(settings.items())),
+            boundary=apply_panel_dtypes,
+        )
+        opt = self._optimize_df_dtypes
+
+        # --- fetch (never memoized; io=True → shared event loop when overlapped) ---
+        dag.add("fdic_fetch", self._stage_fdic_fetch, io=True)
+        dag.add("bank_locations", self._stage_bank_locations, io=True)
+        dag.add("fred_fetch", self._stage_fred_fetch, io=True)
+        dag.add("case_shiller", self._stage_case_shiller, io=True)
+        dag.add("local_macro", self._stage_local_macro, io=True)
+        dag.add("ffiec_heal", self._stage_ffiec_heal, ["fdic_fetch"], io=True)
+        dag.add("merge_locations", self._stage_merge_locations, ["ffiec_heal", "bank_locations"])
+
+        # --- FDIC processing ---
+        dag.add("fdic_analysis", self._analyze_fdic_data_availability, ["merge_locations"])
+        dag.add("derived_metrics", self.processor.create_derived_metrics, ["merge_locations"], memoize=True)
+        dag.add("ttm_metrics", self.processor.calculate_ttm_metrics, ["derived_metrics"], memoize=True)
+        dag.add("composites", self._stage_composites, ["ttm_metrics"], memoize=True)
+        dag.add("peer_comparison", lambda df: opt(self.analyzer.create_peer_comparison(df)),
+                ["composites"], memoize=True)
+        dag.add("normalized_comparison", lambda df: opt(self.analyzer.create_normalized_comparison(df)),
+                ["composites"], memoize=True)
+        dag.add("snapshot", lambda df: opt(self.processor.create_latest_snapshot(df)),
+                ["composites"], memoize=True)
+        dag.add("averages_8q", self._stage_averages_8q, ["composites"], memoize=True)
+        dag.add("audit_sheets", self._stage_audit_sheets, ["composites"], memoize=True)
+        dag.add("validation", self._stage_validation, ["audit_sheets"], memoize=True)
+
+        # --- macro ---
+        dag.add("fred_data", self._stage_fred_data, ["fred_fetch"])
+        dag.add("macro_analysis", self._stage_macro_analysis, ["fred_data"], memoize=True)
+
+        # --- output ---
+        dag.add("excel_write", self._stage_excel_write,
+                ["peer_comparison", "normalized_comparison", "snapshot", "averages_8q",
+                 "macro_analysis", "fred_data", "audit_sheets", "validation",
+                 "case_shiller", "local_macro"])
+        return dag
 
+    def run(self) -> Dict[str, Any]:
+        logging.info("Starting dashboard generation...")
+        if csv_log:
+            csv_log.info("Dashboard generation started",
+                         event_type="CONFIG", phase="startup", component="run",
+                         context={"subject_cert": self.config.subject_bank_cert,
+                                  "peer_certs": self.config.peer_bank_certs})
+
+        dag = self.build_dag()
+        try:
+            out = dag.run()
+        finally:
+            logging.info("Step 1 stage timings:\n%s", dag.summary_table())
+        fname = out["excel_write"]
+        proc_df_with_peers = out["audit_sheets"]["FDIC_Data"]
+        fred = out["fred_data"]
 
         # === ENHANCED DIAGNOSTIC: Inspect Critical FDIC Data for Subject Bank ===
         print("\n" + "="*80)
@@ -6809,14 +6948,13 @@ class BankPerformanceDashboard:
                          context={"output_file": fname})
         return {
             "output_file": fname,
-            "powerbi_macro_df": powerbi_macro_df,
-            "fred_desc_df": fred_desc_df,
-            "failed_fred_series": failed_fred_series,
-            "fdic_analysis": fdic_analysis,
+            "powerbi_macro_df": out["macro_analysis"]["powerbi_macro_df"],
+            "fred_desc_df": fred["fred_desc_df"],
+            "failed_fred_series": fred["failed_fred_series"],
+            "fdic_analysis": out["fdic_analysis"],
         }
 
 
-
 def load_config() -> DashboardConfig:
     """
     Loads configuration from environment variables with fallback to defaults.
@@ -0,0 +1,106 @@
+"""
+Panel Dtype Policy
+==================
+
+One storage dtype per bank-panel column, applied at every Step 1 stage
+boundary (``PipelineDAG(boundary=apply_panel_dtypes)``) so the wide
+intermediate frames do not accumulate float64 / object columns.
+
+  * **ratios, percentages, multiples** — float32.  Taken from the
+    ``metric_semantics`` display format when the metric is registered,
+    otherwise from the rate-like column-name patterns below.
+  * **dollar levels, counts, everything unclassified** — float64.  FDIC
+    dollars are in $000 and a large bank's balances exceed float32's
+    7 significant digits.
+  * **CERT** — int32 (when it holds no missing values).
+  * **NAME / state strings** — category.
+  * **REPDTE** — left as datetime64.  A Period dtype costs the same
+    8 bytes per row, and the pipeline relies on ``.dt`` accessors and
+    Timestamp comparisons throughout.
+
+Stage output sizes are reported by ``PipelineDAG`` (``summary_table()``
+memory column, ``PIPELINE_MEMORY_BUDGET_MB`` warning).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict
+
+import pandas as pd
+
+from metric_semantics import METRIC_SEMANTICS, DisplayFormat
+
+RATIO_DTYPE = "float32"
+LEVEL_DTYPE = "float64"
+CERT_DTYPE = "int32"
+
+# Display formats whose values are ratios of two levels
+_RATIO_FORMATS = {DisplayFormat.PERCENT, DisplayFormat.BASIS_POINTS,
+                  DisplayFormat.MULTIPLE, DisplayFormat.RATIO}
+
+# Derived-metric naming conventions for rates / shares / multiples
+_RATIO_NAME = re.compile(
+    r"(?i)(_Rate$|_Ratio$|_Coverage$|_Pct$|_Share$|_Composition$|_Yield$|"
+    r"_Growth$|_YoY$|_Capital_Risk$|_to_Capital|_Rate_|_Severity$)"
+)
+
+# FDIC API fields that are already percentages
+_FDIC_RATIO_FIELDS = {"ROA", "ROE", "NIMY", "EEFFR", "RBCT1CER", "RBCRWAJ",
+                      "ELNATRY", "NONIIAY"}
+
+_CATEGORY_COLUMNS = {"NAME", "HQ_STATE", "ALL_OPERATING_STATES"}
+
+
+def column_storage_dtype(col: str) -> str:
+    """Storage dtype for a numeric panel column: float32 for ratios, float64 otherwise."""
+    sem = METRIC_SEMANTICS.get(col)
+    if sem is not None:
+        return RATIO_DTYPE if sem.display_format in _RATIO_FORMATS else LEVEL_DTYPE
+    if col in _FDIC_RATIO_FIELDS or _RATIO_NAME.search(col):
+        return RATIO_DTYPE
+    return LEVEL_DTYPE
+
+
+def apply_panel_dtypes(obj: Any, categorize_objects: bool = False) -> Any:
+    """Apply the panel dtype policy.
+
+    Accepts a DataFrame or a dict / list / tuple of them (other values pass
+    through).  Returns new frames; inputs are not modified.  With
+    ``categorize_objects`` any low-cardinality object column also becomes
+    category (used for workbook output, not between stages).
+    """
+    if isinstance(obj, pd.DataFrame):
+        return _apply_frame(obj, categorize_objects)
+    if isinstance(obj, dict):
+        return {k: apply_panel_dtypes(v, categorize_objects) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(apply_panel_dtypes(v, categorize_objects) for v in obj)
+    return obj
+
+
+def _apply_frame(df: pd.DataFrame, categorize_objects: bool) -> pd.DataFrame:
+    if df.empty or not df.columns.is_unique:
+        return df
+    casts: Dict[str, Any] = {}
+    for col, dtype in df.dtypes.items():
+        if not isinstance(col, str):
+            continue
+        if col == "CERT":
+            if pd.api.types.is_numeric_dtype(dtype) and dtype != CERT_DTYPE and df[col].notna().all():
+                casts[col] = CERT_DTYPE
+        elif pd.api.types.is_float_dtype(dtype):
+            target = column_storage_dtype(col)
+            if dtype != target:
+                casts[col] = target
+        elif dtype == object or pd.api.types.is_string_dtype(dtype):
+            if isinstance(dtype, pd.CategoricalDtype):
+                continue
+            if col in _CATEGORY_COLUMNS:
+                casts[col] = "category"
+            elif categorize_objects and len(df) and df[col].nunique(dropna=False) / len(df) < 0.5:
+                casts[col] = "category"
+    if not casts:
+        return df
+    return df.astype(casts)
+
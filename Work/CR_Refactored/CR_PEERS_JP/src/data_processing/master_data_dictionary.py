@@ -9,19 +9,32 @@ and the hardcoded FDIC_FFIEC_Series_Key.py with a unified three-tier waterfall:
     Tier 3 (Local / Derived)  : Locally-defined calculated fields (e.g. TTM_NCO_Rate)
 
 No BeautifulSoup scraping.  No XBRL XML parsing.  Just Pandas + requests.
+
+The Tier 1 / Tier 2 indexes are compiled into one SQLite file next to the
+cached CSVs (``dictionary_index.sqlite``: code primary key, code-prefix
+scans and a full-text index over names/descriptions).  It is rebuilt only
+when the cached CSV it was compiled from changes, so later runs resolve
+codes without re-parsing the MDRM CSV; ``lookup_metrics`` resolves a whole
+batch of codes with one query per tier.  ``refresh()`` is incremental: a new
+MDRM CSV is diffed row by row (mnemonic + item code + validity dates)
+against the previous one and only the affected entries are rewritten;
+``change_log()`` lists what changed.
 """
 
 from __future__ import annotations
 
+import hashlib
 import io
 import logging
 import os
 import re
+import sqlite3
+import threading
 import time
 import zipfile
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
 import requests
@@ -44,6 +57,10 @@ _CR_PREFIXES = re.compile(
     r"^(RIADB|RIADA|RIAD|UBPRE|UBPRM|UBPR|RCFD|RCFN|RCON|RCOA|RCOB|RCOW)"
 )
 
+# Compiled lookup store (bump the version when the index layout changes)
+_COMPILED_INDEX_NAME = "dictionary_index.sqlite"
+_COMPILED_INDEX_VERSION = 2
+
 # How many seconds to wait when hitting the FDIC API
 _FDIC_REQUEST_TIMEOUT = 30
 
@@ -400,6 +417,273 @@ LOCAL_DERIVED_METRICS: Dict[str, Dict[str, str]] = {
 }
 
 
+# Case-insensitive view of the local registry (first spelling wins)
+_LOCAL_BY_UPPER: Dict[str, Dict[str, str]] = {}
+for _code, _entry in LOCAL_DERIVED_METRICS.items():
+    _LOCAL_BY_UPPER.setdefault(_code.upper(), _entry)
+
+
+# ---------------------------------------------------------------------------
+#  Compiled Tier 1 / Tier 2 store
+# ---------------------------------------------------------------------------
+
+def _source_signature(path: Path) -> Optional[str]:
+    """Identity of a cached source file (None if missing or past the cache age)."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    age = datetime.now() - datetime.fromtimestamp(st.st_mtime)
+    if age >= timedelta(days=_MDRM_CACHE_MAX_AGE_DAYS):
+        return None
+    return f"v{_COMPILED_INDEX_VERSION}:{path.name}:{st.st_mtime_ns}:{st.st_size}"
+
+
+class CompiledDictionaryStore:
+    """SQLite file holding the compiled MDRM / FDIC lookup indexes.
+
+    One row per (tier, code) with the resolved ``name`` / ``description``
+    exactly as the in-memory index holds it.  Each tier records the
+    signature of the cached CSV it was compiled from; ``is_current``
+    compares it with the file on disk, so the store is rebuilt once per
+    cache refresh and trusted otherwise.
+
+    Updates are incremental: ``apply`` writes only the entries that
+    changed.  For the MDRM tier the store also keeps the content hash of
+    the source CSV and one hash per source row (``source_rows``) so the
+    next refresh can be diffed row by row; every delta is appended to the
+    ``changes`` log.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS tiers (tier TEXT PRIMARY KEY, signature TEXT NOT NULL, "
+        "content_hash TEXT)",
+        "CREATE TABLE IF NOT EXISTS entries (id INTEGER PRIMARY KEY, tier TEXT NOT NULL, "
+        "code TEXT NOT NULL, name TEXT NOT NULL, description TEXT NOT NULL, UNIQUE (tier, code))",
+        "CREATE TABLE IF NOT EXISTS source_rows (tier TEXT NOT NULL, row_key TEXT NOT NULL, "
+        "seq INTEGER NOT NULL, row_hash INTEGER NOT NULL, codes TEXT NOT NULL, "
+        "PRIMARY KEY (tier, row_key)) WITHOUT ROWID",
+        "CREATE TABLE IF NOT EXISTS changes (refreshed_at TEXT NOT NULL, tier TEXT NOT NULL, "
+        "level TEXT NOT NULL, change TEXT NOT NULL, key TEXT NOT NULL)",
+    )
+    _TABLES = ("meta", "tiers", "entries", "source_rows", "changes", "entries_fts")
+    # Batch lookups bind at most this many codes per statement
+    _CHUNK = 500
+    # Separator for the index codes a source row produces
+    CODE_SEP = "\x1f"
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._fts = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute(self._SCHEMA[0])
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(_COMPILED_INDEX_VERSION):
+                # Layout changed (or new file): start from an empty store
+                for table in self._TABLES[1:]:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                             (str(_COMPILED_INDEX_VERSION),))
+            for stmt in self._SCHEMA[1:]:
+                conn.execute(stmt)
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts "
+                    "USING fts5(tier UNINDEXED, code, name, description)"
+                )
+                self._fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: search_descriptions() falls back to LIKE
+                self._fts = False
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---- compile ---------------------------------------------------------
+
+    def is_current(self, tier: str, source: Path) -> bool:
+        """True if *tier* was compiled from the cached *source* as it is now."""
+        signature = _source_signature(source)
+        if signature is None or not self.path.exists():
+            return False
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT signature FROM tiers WHERE tier = ?", (tier,)
+                ).fetchone()
+        except sqlite3.DatabaseError as exc:
+            logger.warning("Compiled dictionary store unreadable, rebuilding: %s", exc)
+            self.close()
+            self.path.unlink(missing_ok=True)
+            return False
+        return row is not None and row[0] == signature
+
+    def content_hash(self, tier: str) -> Optional[str]:
+        """Content hash of the source *tier* was last compiled from."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT content_hash FROM tiers WHERE tier = ?", (tier,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def source_rows(self, tier: str) -> pd.DataFrame:
+        """Per-row state of the last compiled source, in file order."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT row_key, seq, row_hash, codes FROM source_rows WHERE tier = ? ORDER BY seq",
+                (tier,),
+            ).fetchall()
+        return pd.DataFrame(rows, columns=["row_key", "seq", "row_hash", "codes"])
+
+    def diff(self, tier: str, index: Dict[str, Dict[str, str]],
+             codes: Optional[Iterable[str]] = None) -> Tuple[Dict[str, Dict[str, str]], List[str]]:
+        """(upserts, deletes) that bring stored *tier* in line with *index*.
+
+        Only *codes* are compared when given; otherwise every stored and
+        indexed code is.
+        """
+        if codes is None:
+            stored = self.load(tier)
+            codes = set(stored) | set(index)
+        else:
+            codes = set(codes)
+            stored = self.get_many(tier, codes)
+        upserts = {c: index[c] for c in codes if c in index and stored.get(c) != index[c]}
+        deletes = sorted(c for c in codes if c not in index and c in stored)
+        return upserts, deletes
+
+    def apply(
+        self,
+        tier: str,
+        source: Path,
+        upserts: Dict[str, Dict[str, str]],
+        deletes: Iterable[str] = (),
+        content_hash: Optional[str] = None,
+        rows: Optional[List[Tuple[str, int, int, str]]] = None,
+        changes: Iterable[Tuple[str, str, str]] = (),
+    ) -> bool:
+        """Write an incremental update of *tier* in one transaction.
+
+        *rows* (``row_key, seq, row_hash, codes``) replaces the stored
+        source-row state; *changes* (``level, change, key``) is appended to
+        the change log.  Returns False if the store could not be written.
+        """
+        signature = _source_signature(source)
+        if signature is None:
+            return False
+        stamp = datetime.now().isoformat(timespec="seconds")
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    gone = list(deletes) + list(upserts)
+                    for start in range(0, len(gone), self._CHUNK):
+                        chunk = gone[start:start + self._CHUNK]
+                        marks = ",".join("?" * len(chunk))
+                        ids = [r[0] for r in conn.execute(
+                            f"SELECT id FROM entries WHERE tier = ? AND code IN ({marks})",
+                            (tier, *chunk))]
+                        conn.executemany("DELETE FROM entries WHERE id = ?", [(i,) for i in ids])
+                        if self._fts:
+                            conn.executemany("DELETE FROM entries_fts WHERE rowid = ?",
+                                             [(i,) for i in ids])
+                    for code, info in upserts.items():
+                        values = (tier, code, info.get("name", ""), info.get("description", ""))
+                        rowid = conn.execute(
+                            "INSERT INTO entries (tier, code, name, description) VALUES (?, ?, ?, ?)",
+                            values).lastrowid
+                        if self._fts:
+                            conn.execute("INSERT INTO entries_fts (rowid, tier, code, name, description) "
+                                         "VALUES (?, ?, ?, ?, ?)", (rowid, *values))
+                    if rows is not None:
+                        conn.execute("DELETE FROM source_rows WHERE tier = ?", (tier,))
+                        conn.executemany("INSERT INTO source_rows VALUES (?, ?, ?, ?, ?)",
+                                         [(tier, *r) for r in rows])
+                    conn.executemany("INSERT INTO changes VALUES (?, ?, ?, ?, ?)",
+                                     [(stamp, tier, *c) for c in changes])
+                    conn.execute("INSERT OR REPLACE INTO tiers VALUES (?, ?, ?)",
+                                 (tier, signature, content_hash))
+        except sqlite3.DatabaseError as exc:
+            logger.warning("Could not write compiled dictionary store: %s", exc)
+            return False
+        return True
+
+    def change_log(self, tier: Optional[str] = None) -> pd.DataFrame:
+        """Recorded changes (oldest first), optionally for one tier."""
+        sql = "SELECT refreshed_at, tier, level, change, key FROM changes"
+        params: Tuple[Any, ...] = ()
+        if tier is not None:
+            sql += " WHERE tier = ?"
+            params = (tier,)
+        with self._lock:
+            rows = self._connect().execute(sql + " ORDER BY rowid", params).fetchall()
+        return pd.DataFrame(rows, columns=["Refreshed_At", "Tier", "Level", "Change", "Key"])
+
+    # ---- queries ---------------------------------------------------------
+
+    def load(self, tier: str) -> Dict[str, Dict[str, str]]:
+        """The full compiled index of *tier*."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT code, name, description FROM entries WHERE tier = ?", (tier,)
+            ).fetchall()
+        return {code: {"name": name, "description": desc} for code, name, desc in rows}
+
+    def get_many(self, tier: str, codes: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """Entries of *tier* for the given (upper-case) codes that exist."""
+        codes = list(dict.fromkeys(codes))
+        found: Dict[str, Dict[str, str]] = {}
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(codes), self._CHUNK):
+                chunk = codes[start:start + self._CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for code, name, desc in conn.execute(
+                    f"SELECT code, name, description FROM entries "
+                    f"WHERE tier = ? AND code IN ({marks})", (tier, *chunk)
+                ):
+                    found[code] = {"name": name, "description": desc}
+        return found
+
+    def codes_with_prefix(self, tier: str, prefix: str) -> List[str]:
+        """Codes of *tier* starting with *prefix* (primary-key range scan)."""
+        prefix = prefix.upper()
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT code FROM entries WHERE tier = ? AND code >= ? AND code < ? ORDER BY code",
+                (tier, prefix, prefix + "\U0010ffff"),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def search_descriptions(self, text: str, limit: int = 50) -> pd.DataFrame:
+        """Entries whose name or description matches *text* (best matches first)."""
+        with self._lock:
+            conn = self._connect()
+            if self._fts:
+                terms = " ".join('"' + t.replace('"', '""') + '"' for t in text.split())
+                sql = ("SELECT tier, code, name, description FROM entries_fts "
+                       "WHERE entries_fts MATCH ? ORDER BY rank, code LIMIT ?")
+                params: Tuple[Any, ...] = (f"{{name description}} : ({terms})", limit)
+            else:
+                sql = ("SELECT tier, code, name, description FROM entries "
+                       "WHERE name LIKE ? OR description LIKE ? ORDER BY code LIMIT ?")
+                params = (f"%{text}%", f"%{text}%", limit)
+            rows = conn.execute(sql, params).fetchall() if text.strip() else []
+        return pd.DataFrame(rows, columns=["Tier", "Metric_Code", "Metric_Name", "Description"])
+
+
 # ---------------------------------------------------------------------------
 #  MasterDataDictionary
 # ---------------------------------------------------------------------------
@@ -411,9 +695,13 @@ class MasterDataDictionary:
 
         mdd = MasterDataDictionary(cache_dir="./data_cache")
         result = mdd.lookup_metric("RCON2170")
+        results = mdd.lookup_metrics(["RCON2170", "ASSET", "TTM_NCO_Rate"])
         report = mdd.export_dictionary_report()
     """
 
+    # Cached CSV each compiled tier is built from
+    _TIER_SOURCES = {"mdrm": "MDRM.csv", "fdic": "fdic_schema.csv"}
+
     def __init__(self, cache_dir: str = ".data_dictionary_cache") -> None:
         self._cache_dir = Path(cache_dir)
         self._cache_dir.mkdir(parents=True, exist_ok=True)
@@ -426,6 +714,12 @@ class MasterDataDictionary:
         self._mdrm_index: Optional[Dict[str, Dict[str, str]]] = None
         self._fdic_index: Optional[Dict[str, Dict[str, str]]] = None
 
+        # Compiled SQLite copy of the Tier 1 / Tier 2 indexes
+        self._store = CompiledDictionaryStore(self._cache_dir / _COMPILED_INDEX_NAME)
+        self._compiled_tiers: set = set()
+        # Summary of the last compiled-store sync per tier (see refresh())
+        self._last_sync: Dict[str, Dict[str, Any]] = {}
+
     # ------------------------------------------------------------------
     #  Public API
     # ------------------------------------------------------------------
@@ -439,10 +733,40 @@ class MasterDataDictionary:
         If no definition is found anywhere, Source_of_Truth will be
         ``"Not Found"`` and Description will be ``"Definition Not Found"``.
         """
-        normalized = self._normalize_key(code)
+        return self.lookup_metrics([code])[0]
 
+    def lookup_metrics(self, codes: Iterable[str]) -> List[Dict[str, Any]]:
+        """Resolve many codes at once; results are in input order.
+
+        Same waterfall as ``lookup_metric``, but each tier is queried once
+        for the whole batch (Tier 2 only for codes Tier 1 cannot resolve).
+        """
+        codes = list(codes)
+        if not codes:
+            return []
+        keys = [self._normalize_key(c) for c in codes]
+        bases = [self._strip_prefix(k) for k in keys]
+
+        mdrm = self._tier_entries("mdrm", keys + bases)
+        unresolved = [(k, b) for k, b in zip(keys, bases) if k not in mdrm and b not in mdrm]
+        fdic: Dict[str, Dict[str, str]] = {}
+        if unresolved:
+            fdic = self._tier_entries("fdic", [key for pair in unresolved for key in pair])
+
+        return [self._resolve(code, key, base, mdrm, fdic)
+                for code, key, base in zip(codes, keys, bases)]
+
+    def _resolve(
+        self,
+        code: str,
+        normalized: str,
+        base_item: str,
+        mdrm: Dict[str, Dict[str, str]],
+        fdic: Dict[str, Dict[str, str]],
+    ) -> Dict[str, Any]:
+        """Run the three-tier waterfall for one code against prefetched tier hits."""
         # --- Tier 1: Federal Reserve MDRM CSV ---
-        result = self._lookup_mdrm(normalized)
+        result = mdrm.get(normalized)
         if result is not None:
             return self._format_result(
                 code=code,
@@ -453,9 +777,8 @@ class MasterDataDictionary:
             )
 
         # If the full code (e.g. RCON2170) failed, try the stripped base item
-        base_item = self._strip_prefix(normalized)
         if base_item != normalized:
-            result = self._lookup_mdrm(base_item)
+            result = mdrm.get(base_item)
             if result is not None:
                 return self._format_result(
                     code=code,
@@ -466,7 +789,7 @@ class MasterDataDictionary:
                 )
 
         # --- Tier 2: FDIC BankFind API ---
-        result = self._lookup_fdic(normalized)
+        result = self._fdic_entry(normalized, fdic.get(normalized))
         if result is not None:
             return self._format_result(
                 code=code,
@@ -478,7 +801,7 @@ class MasterDataDictionary:
 
         # Also try base item against FDIC
         if base_item != normalized:
-            result = self._lookup_fdic(base_item)
+            result = self._fdic_entry(base_item, fdic.get(base_item))
             if result is not None:
                 return self._format_result(
                     code=code,
@@ -508,6 +831,15 @@ class MasterDataDictionary:
             is_derived=False,
         )
 
+    def search_descriptions(self, text: str, limit: int = 50) -> pd.DataFrame:
+        """Full-text search of Tier 1 / Tier 2 names and descriptions.
+
+        Columns: Tier, Metric_Code, Metric_Name, Description
+        """
+        for tier in self._TIER_SOURCES:
+            self._tier_entries(tier, [])
+        return self._store.search_descriptions(text, limit)
+
     def export_dictionary_report(self) -> pd.DataFrame:
         """Build a comprehensive DataFrame of every known metric definition.
 
@@ -566,6 +898,32 @@ class MasterDataDictionary:
         """
         return self._load_mdrm_dataframe()
 
+    # ------------------------------------------------------------------
+    #  Compiled store
+    # ------------------------------------------------------------------
+
+    def _is_compiled(self, tier: str) -> bool:
+        """True if *tier* can be served from the compiled store as-is."""
+        if tier not in self._compiled_tiers and self._store.is_current(
+            tier, self._cache_dir / self._TIER_SOURCES[tier]
+        ):
+            self._compiled_tiers.add(tier)
+        return tier in self._compiled_tiers
+
+    def _tier_entries(self, tier: str, codes: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """Entries of *tier* ("mdrm" / "fdic") for *codes*, keyed upper-case.
+
+        Served by indexed queries against the compiled store when it is
+        current; otherwise the index is built (and compiled) first.
+        """
+        keys = [c.upper() for c in codes]
+        index = self._mdrm_index if tier == "mdrm" else self._fdic_index
+        if index is None and self._is_compiled(tier):
+            return self._store.get_many(tier, keys)
+        if index is None:
+            index = self._get_mdrm_index() if tier == "mdrm" else self._get_fdic_index()
+        return {k: index[k] for k in keys if k in index}
+
     # ------------------------------------------------------------------
     #  Tier 1 — Federal Reserve MDRM
     # ------------------------------------------------------------------
@@ -585,51 +943,160 @@ class MasterDataDictionary:
         if self._mdrm_index is not None:
             return self._mdrm_index
 
+        if self._is_compiled("mdrm"):
+            self._mdrm_index = self._store.load("mdrm")
+            logger.info("MDRM index loaded from compiled store (%d entries).", len(self._mdrm_index))
+            return self._mdrm_index
+
         df = self._load_mdrm_dataframe()
         index: Dict[str, Dict[str, str]] = {}
 
         if df is not None and not df.empty:
-            col_map = self._detect_mdrm_columns(df)
-            mnemonic_col = col_map.get("mnemonic")    # e.g. "Mnemonic"
-            item_code_col = col_map.get("item_code")  # e.g. "Item Code"
-            name_col = col_map.get("name")             # e.g. "Item Name"
-            desc_col = col_map.get("description")      # e.g. "Description"
-
-            for _, row in df.iterrows():
-                mnemonic = (
-                    str(row.get(mnemonic_col, "")).strip().upper()
-                    if mnemonic_col else ""
-                )
-                item_code = (
-                    str(row.get(item_code_col, "")).strip().upper()
-                    if item_code_col else ""
-                )
-                name = str(row.get(name_col, "")).strip() if name_col else ""
-                desc = str(row.get(desc_col, "")).strip() if desc_col else name
+            fields = self._mdrm_fields(df)
+            index = self._build_mdrm_index(fields)
+            self._last_sync["mdrm"] = self._sync_mdrm(df, fields, index)
 
-                if not mnemonic and not item_code:
-                    continue
+        self._mdrm_index = index
+        logger.info("MDRM index built with %d entries.", len(index))
+        return index
 
-                entry = {"name": name or item_code, "description": desc}
+    def _mdrm_fields(self, df: pd.DataFrame) -> Dict[str, List[str]]:
+        """Per-row MDRM fields as cleaned strings (one list per role)."""
+        col_map = self._detect_mdrm_columns(df)
 
-                # Composite key: e.g. RCFD2170
-                if mnemonic and item_code:
-                    composite = mnemonic + item_code
-                    index[composite] = entry
+        def _col(role: str, upper: bool = False) -> Optional[List[str]]:
+            col = col_map.get(role)
+            if not col:
+                return None
+            values = [str(v).strip() for v in df[col].tolist()]
+            return [v.upper() for v in values] if upper else values
 
-                # Bare mnemonic key (e.g. RCFD) — only if not already set
-                if mnemonic and mnemonic not in index:
-                    index[mnemonic] = entry
+        blank = [""] * len(df)
+        name = _col("name") or blank
+        return {
+            "mnemonic": _col("mnemonic", upper=True) or blank,   # e.g. "Mnemonic"
+            "item_code": _col("item_code", upper=True) or blank,  # e.g. "Item Code"
+            "name": name,                                          # e.g. "Item Name"
+            "description": _col("description") or name,           # e.g. "Description"
+            "start": _col("start") or blank,                       # validity dates
+            "end": _col("end") or blank,
+        }
 
-                # Bare item code (e.g. 2170) — first seen wins so the most
-                # common reporting form takes precedence
-                if item_code and item_code not in index:
-                    index[item_code] = entry
+    @staticmethod
+    def _row_codes(mnemonic: str, item_code: str) -> List[str]:
+        """Index keys a source row can set (composite, mnemonic, item code)."""
+        codes = [mnemonic + item_code] if mnemonic and item_code else []
+        return codes + [c for c in (mnemonic, item_code) if c]
 
-        self._mdrm_index = index
-        logger.info("MDRM index built with %d entries.", len(index))
+    @staticmethod
+    def _build_mdrm_index(fields: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
+        index: Dict[str, Dict[str, str]] = {}
+        for mnemonic, item_code, name, desc in zip(
+            fields["mnemonic"], fields["item_code"], fields["name"], fields["description"]
+        ):
+            if not mnemonic and not item_code:
+                continue
+
+            entry = {"name": name or item_code, "description": desc}
+
+            # Composite key: e.g. RCFD2170
+            if mnemonic and item_code:
+                composite = mnemonic + item_code
+                index[composite] = entry
+
+            # Bare mnemonic key (e.g. RCFD) — only if not already set
+            if mnemonic and mnemonic not in index:
+                index[mnemonic] = entry
+
+            # Bare item code (e.g. 2170) — first seen wins so the most
+            # common reporting form takes precedence
+            if item_code and item_code not in index:
+                index[item_code] = entry
         return index
 
+    def _sync_mdrm(
+        self,
+        df: pd.DataFrame,
+        fields: Dict[str, List[str]],
+        index: Dict[str, Dict[str, str]],
+    ) -> Dict[str, Any]:
+        """Bring the compiled MDRM tier in line with a (re)loaded CSV.
+
+        Source rows are keyed by mnemonic + item code + validity dates.  If
+        the CSV's content hash is unchanged only the store's signature is
+        refreshed; otherwise rows are diffed against the previous compile
+        and only index entries set by added / removed / modified rows are
+        rewritten.  When unchanged rows were reordered ("first seen wins"
+        depends on order) every entry is compared instead.
+        """
+        source = self._cache_dir / self._TIER_SOURCES["mdrm"]
+        try:
+            digest = hashlib.sha256(source.read_bytes()).hexdigest()
+        except OSError:
+            digest = None
+        summary: Dict[str, Any] = {
+            "tier": "mdrm", "mode": "unchanged", "rows_added": 0, "rows_removed": 0,
+            "rows_modified": 0, "codes_changed": [],
+        }
+        if digest is not None and digest == self._store.content_hash("mdrm"):
+            self._store.apply("mdrm", source, {}, content_hash=digest)
+            logger.info("MDRM CSV unchanged since last compile.")
+            return summary
+
+        # Row identity (exact duplicates disambiguated by occurrence) and content
+        keys: List[str] = []
+        seen: Dict[str, int] = {}
+        for parts in zip(fields["mnemonic"], fields["item_code"], fields["start"], fields["end"]):
+            key = "|".join(parts)
+            n = seen[key] = seen.get(key, 0) + 1
+            keys.append(key if n == 1 else f"{key}#{n - 1}")
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy().view("int64").tolist()
+        codes = [self._row_codes(m, i) for m, i in zip(fields["mnemonic"], fields["item_code"])]
+        new = dict(zip(keys, zip(hashes, codes)))
+        rows = [(k, seq, h, CompiledDictionaryStore.CODE_SEP.join(c))
+                for seq, (k, h, c) in enumerate(zip(keys, hashes, codes))]
+
+        old_rows = self._store.source_rows("mdrm")
+        changes: List[Tuple[str, str, str]] = []
+        touched: Optional[set] = None
+        if not old_rows.empty:
+            old_keys = old_rows["row_key"].tolist()
+            old = dict(zip(old_keys, zip(old_rows["row_hash"].tolist(), old_rows["codes"].tolist())))
+            added = [k for k in new if k not in old]
+            removed = [k for k in old if k not in new]
+            modified = [k for k in new if k in old and old[k][0] != new[k][0]]
+            kept_old = [k for k in old_keys if k in new and old[k][0] == new[k][0]]
+            kept_new = [k for k in keys if k in old and old[k][0] == new[k][0]]
+            summary.update(mode="delta", rows_added=len(added), rows_removed=len(removed),
+                           rows_modified=len(modified))
+            changes = ([("row", "added", k) for k in added] + [("row", "removed", k) for k in removed]
+                       + [("row", "modified", k) for k in modified])
+            if kept_old == kept_new:
+                touched = set()
+                for k in removed + modified:
+                    touched.update(c for c in old[k][1].split(CompiledDictionaryStore.CODE_SEP) if c)
+                for k in added + modified:
+                    touched.update(new[k][1])
+            else:
+                summary["mode"] = "reordered"
+        else:
+            summary["mode"] = "initial"
+
+        upserts, deletes = self._store.diff("mdrm", index, touched)
+        changed = sorted(set(upserts) | set(deletes))
+        if summary["mode"] != "initial":
+            changes += [("code", "updated", c) for c in sorted(upserts)]
+            changes += [("code", "removed", c) for c in deletes]
+        summary["codes_changed"] = changed
+        if self._store.apply("mdrm", source, upserts, deletes, content_hash=digest,
+                             rows=rows, changes=changes):
+            logger.info(
+                "MDRM compiled store synced (%s): +%d / -%d / ~%d rows, %d entries rewritten.",
+                summary["mode"], summary["rows_added"], summary["rows_removed"],
+                summary["rows_modified"], len(changed),
+            )
+        return summary
+
     def _load_mdrm_dataframe(self) -> Optional[pd.DataFrame]:
         """Load the MDRM CSV, using local cache if fresh enough."""
         if self._mdrm_df is not None:
@@ -744,7 +1211,8 @@ class MasterDataDictionary:
     def _detect_mdrm_columns(df: pd.DataFrame) -> Dict[str, Optional[str]]:
         """Heuristically map MDRM CSV columns to semantic roles.
 
-        Returns a dict with keys: mnemonic, item_code, name, description.
+        Returns a dict with keys: mnemonic, item_code, name, description,
+        start, end (validity dates).
         """
         cols_lower = {c.strip().lower(): c for c in df.columns}
 
@@ -775,12 +1243,13 @@ class MasterDataDictionary:
                 "Description", "Long Definition", "Series Description",
                 "Item Description", "Definition",
             ]),
+            "start": _find(["Start Date", "Effective Date", "Begin Date"]),
+            "end": _find(["End Date", "Expiration Date"]),
         }
 
     def _lookup_mdrm(self, code: str) -> Optional[Dict[str, str]]:
         """Look up a single code in the MDRM index."""
-        idx = self._get_mdrm_index()
-        return idx.get(code.upper())
+        return self._tier_entries("mdrm", [code]).get(code.upper())
 
     # ------------------------------------------------------------------
     #  Tier 2 — FDIC BankFind API (Dynamic Schema)
@@ -791,11 +1260,29 @@ class MasterDataDictionary:
         if self._fdic_index is not None:
             return self._fdic_index
 
+        if self._is_compiled("fdic"):
+            self._fdic_index = self._store.load("fdic")
+            return self._fdic_index
+
         schema = self._fetch_fdic_schema()
         self._fdic_index = schema if schema else {}
+        if schema:
+            self._last_sync["fdic"] = self._sync_fdic(schema)
         return self._fdic_index
 
-    def _fetch_fdic_schema(self) -> Dict[str, Dict[str, str]]:
+    def _sync_fdic(self, schema: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+        """Write the FDIC schema entries that differ from the compiled tier."""
+        first = not self._store.load("fdic")
+        upserts, deletes = self._store.diff("fdic", schema)
+        changes = [] if first else (
+            [("code", "updated", c) for c in sorted(upserts)]
+            + [("code", "removed", c) for c in deletes])
+        self._store.apply("fdic", self._cache_dir / self._TIER_SOURCES["fdic"], upserts, deletes,
+                          changes=changes)
+        return {"tier": "fdic", "mode": "initial" if first else "delta",
+                "codes_changed": sorted(set(upserts) | set(deletes))}
+
+    def _fetch_fdic_schema(self, use_cache: bool = True) -> Dict[str, Dict[str, str]]:
         """Query the FDIC BankFind Suite API to extract field definitions.
 
         Strategy: Fetch a single row of financials data with all available
@@ -807,12 +1294,12 @@ class MasterDataDictionary:
         cache_path = self._cache_dir / "fdic_schema.csv"
 
         # Use cached schema if less than 30 days old
-        if cache_path.exists():
+        if use_cache and cache_path.exists():
             age = datetime.now() - datetime.fromtimestamp(cache_path.stat().st_mtime)
             if age < timedelta(days=_MDRM_CACHE_MAX_AGE_DAYS):
                 logger.info("Loading FDIC schema from cache (%s days old).", age.days)
                 try:
-                    df = pd.read_csv(cache_path, dtype=str)
+                    df = pd.read_csv(cache_path, dtype=str, keep_default_na=False)
                     return {
                         row["code"]: {"name": row.get("name", ""), "description": row.get("description", "")}
                         for _, row in df.iterrows()
@@ -971,8 +1458,11 @@ class MasterDataDictionary:
 
     def _lookup_fdic(self, code: str) -> Optional[Dict[str, str]]:
         """Look up a single code in the FDIC schema index."""
-        idx = self._get_fdic_index()
-        result = idx.get(code.upper())
+        return self._fdic_entry(code.upper(), self._tier_entries("fdic", [code]).get(code.upper()))
+
+    @staticmethod
+    def _fdic_entry(code: str, result: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """FDIC schema entry for *code*, with a stock description if it has none."""
         if result is not None:
             # If the FDIC API echoed the code as its own name (no real label),
             # provide a minimal description noting it's a confirmed FDIC field.
@@ -994,10 +1484,7 @@ class MasterDataDictionary:
         entry = LOCAL_DERIVED_METRICS.get(code)
         if entry is None:
             # Try case-insensitive match
-            for key, val in LOCAL_DERIVED_METRICS.items():
-                if key.upper() == code.upper():
-                    entry = val
-                    break
+            entry = _LOCAL_BY_UPPER.get(code.upper())
 
         if entry is not None:
             return {
@@ -1052,6 +1539,8 @@ class MasterDataDictionary:
 
     def clear_cache(self) -> None:
         """Remove all cached files, forcing a fresh download on next use."""
+        self._store.close()
+        self._compiled_tiers.clear()
         for path in self._cache_dir.iterdir():
             if path.is_file():
                 path.unlink()
@@ -1061,9 +1550,43 @@ class MasterDataDictionary:
         self._fdic_index = None
         logger.info("Data dictionary cache cleared.")
 
-    def refresh(self) -> None:
-        """Force re-download of all sources and rebuild indexes."""
-        self.clear_cache()
+    def refresh(self, full: bool = False) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Re-download all sources and bring the indexes up to date.
+
+        By default the refresh is incremental: the new MDRM CSV is diffed
+        against the previous one row by row and only the affected compiled
+        entries are rewritten (see ``change_log``).  A source that cannot
+        be downloaded keeps its cached copy.  ``full=True`` clears the
+        cache and rebuilds everything from scratch.
+
+        Returns one summary per tier (``mode``, ``rows_added``,
+        ``rows_removed``, ``rows_modified``, ``codes_changed``), or None
+        for a tier that was not refreshed.
+        """
+        if full:
+            self.clear_cache()
+        self._mdrm_df = None
+        self._mdrm_index = None
+        self._fdic_schema = None
+        self._fdic_index = None
+        self._compiled_tiers.clear()
+        self._last_sync = {}
+
+        if not full:
+            # Fetch into place; on failure the previous cached copy stays valid
+            self._mdrm_df = self._download_mdrm_zip(self._cache_dir / self._TIER_SOURCES["mdrm"])
+            schema = self._fetch_fdic_schema(use_cache=False)
+            if schema:
+                self._fdic_index = schema
+                self._last_sync["fdic"] = self._sync_fdic(schema)
         self._get_mdrm_index()
         self._get_fdic_index()
-        logger.info("Data dictionary refreshed from all sources.")
+        logger.info("Data dictionary refreshed from all sources (%s).", "full" if full else "delta")
+        return {tier: self._last_sync.get(tier) for tier in self._TIER_SOURCES}
+
+    def change_log(self) -> pd.DataFrame:
+        """Changes recorded by incremental refreshes (oldest first).
+
+        Columns: Refreshed_At, Tier, Level (row / code), Change, Key
+        """
+        return self._store.change_log()
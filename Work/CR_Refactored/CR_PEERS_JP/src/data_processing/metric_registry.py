@@ -14,10 +14,14 @@ Each metric is formally specified via a ``MetricSpec`` dataclass that captures:
 The validation engine (``run_upstream_validation_suite``) recomputes each metric
 from its declared formula, compares against the stored value, and flags mismatches.
 Results are written to the ``Data_Validation_Report`` sheet in the Excel output.
+
+Semantic rules (``run_semantic_validation``) declare the grouped statistics
+they read as ``StatSpec``s; ``PanelStats`` merges the declarations of the
+whole rule set and aggregates each grouping of the panel once.
 """
 
 from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -536,28 +540,231 @@ def run_upstream_validation_suite(
 # SEMANTIC VALIDATION RULES (A–E)
 # ═══════════════════════════════════════════════════════════════════════════
 
+@dataclass(frozen=True)
+class StatSpec:
+    """A grouped statistic a semantic rule reads.
+
+    ``aggs`` of each of ``columns`` (numeric-coerced) grouped by ``by``:
+    ``()`` is the whole panel, ``("CERT",)`` per bank, ``("REPDTE",)`` per
+    quarter.  With ``latest_only`` only the latest ``REPDTE`` is used.
+    Besides pandas reductions (``count``, ``nunique``, ``first``, ``min``,
+    ``max``, ``std`` ...) two engine aggregations are available:
+    ``any_nonzero`` (any non-null, non-zero value) and ``first_row`` (the
+    value on the group's first row, NaN included).
+    """
+    by: Tuple[str, ...]
+    columns: Tuple[str, ...]
+    aggs: Tuple[str, ...]
+    latest_only: bool = False
+
+
+class PanelStats:
+    """Shared aggregates for one semantic-validation run.
+
+    All ``StatSpec`` requests with the same grouping are merged and
+    computed with a single grouped aggregation the first time a rule asks
+    for that grouping; numeric coercion and the latest-quarter slice are
+    shared by every rule.
+    """
+
+    _ENGINE_AGGS = {"any_nonzero", "first_row"}
+
+    def __init__(self, df: pd.DataFrame, specs: Iterable[StatSpec] = ()):
+        self.df = df
+        self.latest_q = df["REPDTE"].max() if "REPDTE" in df.columns else None
+        self._numeric: Dict[str, pd.Series] = {}
+        self._latest: Optional[pd.DataFrame] = None
+        self._tables: Dict[Tuple[Tuple[str, ...], bool], pd.DataFrame] = {}
+        self._requests: Dict[Tuple[Tuple[str, ...], bool], Dict[str, List[str]]] = {}
+        for spec in specs:
+            wanted = self._requests.setdefault((tuple(spec.by), spec.latest_only), {})
+            for col in spec.columns:
+                aggs = wanted.setdefault(col, [])
+                aggs.extend(a for a in spec.aggs if a not in aggs)
+
+    def has(self, *cols: str) -> bool:
+        return all(c in self.df.columns for c in cols)
+
+    def numeric(self, col: str) -> pd.Series:
+        """``pd.to_numeric(df[col], errors="coerce")``, computed once."""
+        if col not in self._numeric:
+            self._numeric[col] = pd.to_numeric(self.df[col], errors="coerce")
+        return self._numeric[col]
+
+    @property
+    def latest(self) -> pd.DataFrame:
+        """Rows of the latest ``REPDTE`` (empty without ``REPDTE``)."""
+        if self._latest is None:
+            if self.latest_q is None:
+                self._latest = self.df.iloc[0:0]
+            else:
+                self._latest = self.df[self.df["REPDTE"] == self.latest_q]
+        return self._latest
+
+    def table(self, by: Tuple[str, ...] = (), latest_only: bool = False) -> pd.DataFrame:
+        """Aggregates for one grouping: rows = groups, columns = (column, agg).
+
+        Whole-panel groupings (``by=()``) have a single row labelled 0;
+        the table is empty when the grouping has no rows.
+        """
+        key = (tuple(by), latest_only)
+        if key not in self._tables:
+            self._tables[key] = self._aggregate(key[0], latest_only, self._requests.get(key, {}))
+        return self._tables[key]
+
+    def _aggregate(self, by: Tuple[str, ...], latest_only: bool,
+                   wanted: Dict[str, List[str]]) -> pd.DataFrame:
+        wanted = {c: aggs for c, aggs in wanted.items() if c in self.df.columns}
+        if not wanted or not self.has(*by) or (latest_only and self.latest_q is None):
+            return pd.DataFrame()
+        # Select positionally: panels may carry duplicate index labels
+        rows = (np.flatnonzero((self.df["REPDTE"] == self.latest_q).to_numpy())
+                if latest_only else slice(None))
+        data = pd.DataFrame({c: self.numeric(c).iloc[rows].reset_index(drop=True) for c in wanted})
+        keys = ([self.df[b].iloc[rows].reset_index(drop=True) for b in by] if by
+                else [pd.Series(0, index=data.index, name="_all")])
+
+        plan: Dict[str, List[str]] = {}
+        for col, aggs in wanted.items():
+            plan[col] = [a for a in aggs if a not in self._ENGINE_AGGS]
+            if "any_nonzero" in aggs:
+                flag = f"{col}\x00any_nonzero"
+                data[flag] = data[col].notna() & data[col].ne(0)
+                plan[flag] = ["any"]
+        plan = {c: aggs for c, aggs in plan.items() if aggs}
+        parts = []
+        if plan:
+            agg = data.groupby(keys, sort=False).agg(plan)
+            agg.columns = pd.MultiIndex.from_tuples(
+                [(c.split("\x00")[0], "any_nonzero") if "\x00" in c else (c, a)
+                 for c, a in agg.columns])
+            parts.append(agg)
+        first_cols = [c for c, aggs in wanted.items() if "first_row" in aggs]
+        if first_cols:
+            key_frame = pd.concat(keys, axis=1)
+            head = data.loc[~key_frame.duplicated().to_numpy() & key_frame.notna().all(axis=1).to_numpy(),
+                            first_cols]
+            head.index = pd.MultiIndex.from_frame(key_frame.loc[head.index]) if len(keys) > 1 \
+                else pd.Index(key_frame.loc[head.index].iloc[:, 0])
+            head.columns = pd.MultiIndex.from_tuples([(c, "first_row") for c in first_cols])
+            parts.append(head)
+        out = pd.concat(parts, axis=1) if len(parts) > 1 else parts[0]
+        if not by:
+            out.index = pd.RangeIndex(len(out))
+        return out
+
+    def value(self, by: Tuple[str, ...], group, col: str, agg: str,
+              latest_only: bool = False):
+        """One aggregate, or None if the group / column is absent."""
+        tbl = self.table(by, latest_only)
+        if (col, agg) not in tbl.columns or group not in tbl.index:
+            return None
+        return tbl.at[group, (col, agg)]
+
+
+def _round_significant(values: np.ndarray, digits: int) -> np.ndarray:
+    """Round to *digits* significant digits; -0.0 becomes 0.0, NaN stays NaN."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mag = np.floor(np.log10(np.abs(values)))
+        scale = 10.0 ** np.where(np.isfinite(mag), digits - 1 - mag, 0)
+        out = np.round(values * scale) / scale
+    return np.where(np.isfinite(out), out, values) + 0.0
+
+
+def find_duplicate_rows(
+    frame: pd.DataFrame,
+    columns: Sequence[str],
+    keys: Sequence[str] = (),
+    digits: int = 12,
+) -> List[list]:
+    """Clusters of index labels whose ``keys`` and metric vectors match.
+
+    Each row's (``keys``, ``columns``) vector is hashed with
+    ``pd.util.hash_pandas_object``; only rows sharing a hash bucket are
+    compared exactly, so finding duplicates among *n* rows is linear rather
+    than pairwise.  Metric values are rounded to *digits* significant digits
+    first (results differing only by summation order match) and NaN matches
+    NaN; rows whose metric vector is all NaN are ignored.  Clusters come in
+    order of first appearance.
+    """
+    values = frame[list(columns)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    present = ~np.isnan(values).all(axis=1) if values.shape[1] else np.zeros(len(frame), dtype=bool)
+    canon = pd.DataFrame(_round_significant(values[present], digits), index=frame.index[present])
+    for i, key in enumerate(keys):
+        canon.insert(i, key, frame.loc[present, key].to_numpy())
+    hashes = pd.util.hash_pandas_object(canon, index=False)
+    shared = hashes.duplicated(keep=False).to_numpy()
+    if not shared.any():
+        return []
+    # Exact confirmation inside each bucket (guards against hash collisions):
+    # group the candidate rows by (bucket, exact vector)
+    bucket = canon[shared].assign(_bucket=hashes[shared].to_numpy())
+    by = ["_bucket"] + [c for c in bucket.columns if c != "_bucket"]
+    groups = bucket.groupby(by, sort=False, dropna=False).indices
+    labels = bucket.index
+    clusters = [pos for pos in groups.values() if len(pos) > 1]
+    clusters.sort(key=lambda pos: pos[0])
+    return [list(labels[pos]) for pos in clusters]
+
+
 @dataclass
 class ValidationRule:
-    """A single semantic validation rule."""
+    """A single semantic validation rule.
+
+    Rules evaluate against a shared ``PanelStats`` (``evaluate``) and
+    declare the grouped statistics they read in ``stats`` so the engine
+    can compute them for all rules at once.  ``check(df)`` runs the rule on
+    its own.
+    """
     rule_id: str
     description: str
-    check: Callable[[pd.DataFrame], pd.DataFrame]
+    check: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None
     severity: str = "high"   # high, medium, low
+    stats: Tuple[StatSpec, ...] = ()
+    evaluate: Optional[Callable[[PanelStats], pd.DataFrame]] = None
+
+    def __post_init__(self):
+        if self.check is None and self.evaluate is not None:
+            self.check = lambda df: self.evaluate(PanelStats(df, self.stats))
+
+    def run(self, stats: PanelStats) -> pd.DataFrame:
+        return self.evaluate(stats) if self.evaluate is not None else self.check(stats.df)
+
+
+_OVER_EXCLUSION_PAIRS = [
+    ("Excluded_NCO_TTM", "Total_NCO_TTM", "NCO"),
+    ("Excluded_Nonaccrual", "Total_Nonaccrual", "Nonaccrual"),
+    ("Excluded_Balance", "Gross_Loans", "Balance"),
+]
+_FLATLINE_METRICS = ("Norm_NCO_Rate", "Norm_Nonaccrual_Rate", "Norm_Delinquency_Rate",
+                     "Norm_ACL_Coverage", "Norm_Exclusion_Pct")
+_COMPOSITE_PAIRS = [(90001, 90004), (90002, 90005), (90003, 90006)]
+_COMPOSITE_RATE_COLS = ("TTM_NCO_Rate", "NPL_to_Gross_Loans_Rate", "Norm_NCO_Rate", "Norm_Nonaccrual_Rate")
+_STD_COMPOSITES = (90001, 90002, 90003)
+_NORM_COMPOSITES = (90004, 90005, 90006)
+_NORM_RATE_COLS = ("Norm_NCO_Rate", "Norm_Nonaccrual_Rate")
+_STD_RATE_COLS = ("TTM_NCO_Rate", "NPL_to_Gross_Loans_Rate")
+_UNSUPPORTED_AUDIT_FLAGS = {
+    "_audit_unsupported_ndfi_pdna": "NDFI PD/NA unsupported in CR-only mode",
+    "_audit_ndfi_nco_unsupported": "NDFI NCO unsupported in CR-only mode",
+    "_audit_ag_pd_fallback_to_zero": "Ag PD fell back to 0 (P3AG/P9AG absent)",
+    "_audit_resi_balance_fallback_used": "Resi balance used LNRERES fallback (RC-C components absent)",
+}
+
+_FLATLINE_STATS = StatSpec((), _FLATLINE_METRICS, ("count", "nunique", "first"), latest_only=True)
+_COMPOSITE_STATS = StatSpec(("CERT",), _COMPOSITE_RATE_COLS, ("first_row",), latest_only=True)
+_CONTAMINATION_STATS = StatSpec(("CERT",), _NORM_RATE_COLS + _STD_RATE_COLS, ("any_nonzero",))
 
 
-def _check_over_exclusion(df: pd.DataFrame) -> pd.DataFrame:
+def _check_over_exclusion(stats: PanelStats) -> pd.DataFrame:
     """Rule A: Flag rows where Excluded_* > Total_* (over-exclusion)."""
+    df = stats.df
     rows = []
-    pairs = [
-        ("Excluded_NCO_TTM", "Total_NCO_TTM", "NCO"),
-        ("Excluded_Nonaccrual", "Total_Nonaccrual", "Nonaccrual"),
-        ("Excluded_Balance", "Gross_Loans", "Balance"),
-    ]
-    for excl_col, total_col, label in pairs:
-        if excl_col not in df.columns or total_col not in df.columns:
+    for excl_col, total_col, label in _OVER_EXCLUSION_PAIRS:
+        if not stats.has(excl_col, total_col):
             continue
-        excl = pd.to_numeric(df[excl_col], errors="coerce").fillna(0)
-        total = pd.to_numeric(df[total_col], errors="coerce").fillna(0)
+        excl = stats.numeric(excl_col).fillna(0)
+        total = stats.numeric(total_col).fillna(0)
         mask = excl > total
         if mask.any():
             flagged = df.loc[mask, ["CERT", "REPDTE"]].copy() if "CERT" in df.columns else pd.DataFrame(index=df.index[mask])
@@ -569,93 +776,85 @@ def _check_over_exclusion(df: pd.DataFrame) -> pd.DataFrame:
     return pd.concat(rows, ignore_index=True) if rows else pd.DataFrame()
 
 
-def _check_flatline_anomaly(df: pd.DataFrame) -> pd.DataFrame:
+def _check_flatline_anomaly(stats: PanelStats) -> pd.DataFrame:
     """Rule B: Flag metrics that are constant (zero or otherwise) across all CERTs for latest quarter."""
     rows = []
-    if "REPDTE" not in df.columns:
-        return pd.DataFrame()
-    latest_q = df["REPDTE"].max()
-    latest = df[df["REPDTE"] == latest_q]
-    norm_metrics = ["Norm_NCO_Rate", "Norm_Nonaccrual_Rate", "Norm_Delinquency_Rate",
-                    "Norm_ACL_Coverage", "Norm_Exclusion_Pct"]
-    for metric in norm_metrics:
-        if metric not in latest.columns:
+    latest_q = stats.latest_q
+    for metric in _FLATLINE_METRICS:
+        count = stats.value((), 0, metric, "count", latest_only=True)
+        if count is None:
             continue
-        vals = pd.to_numeric(latest[metric], errors="coerce").dropna()
-        if len(vals) > 1 and vals.nunique() <= 1:
+        if count > 1 and stats.value((), 0, metric, "nunique", latest_only=True) <= 1:
+            first = stats.value((), 0, metric, "first", latest_only=True)
             rows.append({
                 "Rule": f"Flatline_{metric}",
-                "Detail": f"All {len(vals)} values = {vals.iloc[0]:.6f} in {latest_q}",
+                "Detail": f"All {count} values = {first:.6f} in {latest_q}",
                 "Severity": "medium",
                 "REPDTE": latest_q,
             })
     return pd.DataFrame(rows) if rows else pd.DataFrame()
 
 
-def _check_duplicate_composites(df: pd.DataFrame) -> pd.DataFrame:
+def _close_value_candidates(values: pd.Series, rtol: float = 1e-6,
+                            atol: float = 1e-8) -> set:
+    """Label pairs whose values may satisfy ``np.isclose(a, b, rtol, atol)``.
+
+    Values are hashed onto two grids of width ``2 * (atol + rtol * max|v|)``
+    offset by half a cell; any two values within that tolerance share a
+    cell on at least one grid, so only pairs sharing a cell are returned.
+    Callers confirm each candidate with ``np.isclose``.
+    """
+    v = pd.to_numeric(values, errors="coerce").astype(float)
+    finite = v[np.isfinite(v)]
+    width = 2 * (atol + rtol * (finite.abs().max() if len(finite) else 0.0))
+    grids = pd.DataFrame({"lo": np.floor(v / width), "hi": np.floor(v / width + 0.5)},
+                         index=values.index)
+    pairs = set()
+    for grid in grids.columns:
+        for labels in find_duplicate_rows(grids, [grid]):
+            pairs.update(frozenset((a, b)) for i, a in enumerate(labels) for b in labels[i + 1:])
+    return pairs
+
+
+def _check_duplicate_composites(stats: PanelStats) -> pd.DataFrame:
     """Rule C: Flag if standard and normalized composites produce identical values."""
     rows = []
-    pairs_to_check = [(90001, 90004), (90002, 90005), (90003, 90006)]
-    rate_cols = ["TTM_NCO_Rate", "NPL_to_Gross_Loans_Rate", "Norm_NCO_Rate", "Norm_Nonaccrual_Rate"]
-    if "CERT" not in df.columns or "REPDTE" not in df.columns:
+    if not stats.has("CERT", "REPDTE"):
         return pd.DataFrame()
-    latest_q = df["REPDTE"].max()
-    latest = df[df["REPDTE"] == latest_q]
-    for std_cert, norm_cert in pairs_to_check:
-        std_row = latest[latest["CERT"] == std_cert]
-        norm_row = latest[latest["CERT"] == norm_cert]
-        if std_row.empty or norm_row.empty:
-            continue
-        for col in rate_cols:
-            if col not in latest.columns:
+    tbl = stats.table(("CERT",), latest_only=True)
+    cols = [c for c in _COMPOSITE_RATE_COLS if (c, "first_row") in tbl.columns]
+    latest = tbl.loc[tbl.index.isin(_STD_COMPOSITES + _NORM_COMPOSITES), [(c, "first_row") for c in cols]]
+    latest.columns = cols
+    # Bucket the composites per column rather than comparing each pair
+    candidates = {col: _close_value_candidates(latest[col]) for col in cols}
+    for std_cert, norm_cert in _COMPOSITE_PAIRS:
+        for col in cols:
+            if frozenset((std_cert, norm_cert)) not in candidates[col]:
                 continue
-            sv = pd.to_numeric(std_row[col].iloc[0], errors="coerce")
-            nv = pd.to_numeric(norm_row[col].iloc[0], errors="coerce")
-            if pd.notna(sv) and pd.notna(nv) and np.isclose(sv, nv, rtol=1e-6):
+            sv, nv = latest.at[std_cert, col], latest.at[norm_cert, col]
+            if np.isclose(sv, nv, rtol=1e-6):
                 rows.append({
                     "Rule": "DuplicateComposite",
                     "Detail": f"CERT {std_cert} vs {norm_cert}: {col} = {sv:.6f} (identical)",
                     "Severity": "medium",
-                    "REPDTE": latest_q,
+                    "REPDTE": stats.latest_q,
                 })
     return pd.DataFrame(rows) if rows else pd.DataFrame()
 
 
-def _check_output_contamination(df: pd.DataFrame) -> pd.DataFrame:
+def _check_output_contamination(stats: PanelStats) -> pd.DataFrame:
     """Rule D: Flag if composite CERTs appear where they shouldn't (e.g., 90004-90006 in standard metrics)."""
     rows = []
-    if "CERT" not in df.columns:
-        return pd.DataFrame()
-    std_composites = {90001, 90002, 90003}
-    norm_composites = {90004, 90005, 90006}
-    norm_rate_cols = ["Norm_NCO_Rate", "Norm_Nonaccrual_Rate"]
-    std_rate_cols = ["TTM_NCO_Rate", "NPL_to_Gross_Loans_Rate"]
-    # Standard composites should have NaN norm rates
-    for cert in std_composites:
-        cert_data = df[df["CERT"] == cert]
-        if cert_data.empty:
-            continue
-        for col in norm_rate_cols:
-            if col in cert_data.columns:
-                valid = pd.to_numeric(cert_data[col], errors="coerce").dropna()
-                if not valid.empty and (valid != 0).any():
+    # Standard composites should have NaN norm rates; normalized composites NaN standard rates
+    checks = [(_STD_COMPOSITES, _NORM_RATE_COLS, "Standard"),
+              (_NORM_COMPOSITES, _STD_RATE_COLS, "Normalized")]
+    for certs, cols, kind in checks:
+        for cert in certs:
+            for col in cols:
+                if stats.value(("CERT",), cert, col, "any_nonzero"):
                     rows.append({
                         "Rule": "OutputContamination",
-                        "Detail": f"Standard composite {cert} has non-null {col}",
-                        "Severity": "high",
-                    })
-    # Normalized composites should have NaN standard rates
-    for cert in norm_composites:
-        cert_data = df[df["CERT"] == cert]
-        if cert_data.empty:
-            continue
-        for col in std_rate_cols:
-            if col in cert_data.columns:
-                valid = pd.to_numeric(cert_data[col], errors="coerce").dropna()
-                if not valid.empty and (valid != 0).any():
-                    rows.append({
-                        "Rule": "OutputContamination",
-                        "Detail": f"Normalized composite {cert} has non-null {col}",
+                        "Detail": f"{kind} composite {cert} has non-null {col}",
                         "Severity": "high",
                     })
     return pd.DataFrame(rows) if rows else pd.DataFrame()
@@ -676,20 +875,14 @@ def _check_consumer_linkage(
     return pd.DataFrame(rows) if rows else pd.DataFrame()
 
 
-def _check_unsupported_mappings(df: pd.DataFrame) -> pd.DataFrame:
+def _check_unsupported_mappings(stats: PanelStats) -> pd.DataFrame:
     """Rule F: Flag rows with unsupported mapping audit flags set to True."""
     rows = []
-    audit_flags = {
-        "_audit_unsupported_ndfi_pdna": "NDFI PD/NA unsupported in CR-only mode",
-        "_audit_ndfi_nco_unsupported": "NDFI NCO unsupported in CR-only mode",
-        "_audit_ag_pd_fallback_to_zero": "Ag PD fell back to 0 (P3AG/P9AG absent)",
-        "_audit_resi_balance_fallback_used": "Resi balance used LNRERES fallback (RC-C components absent)",
-    }
-    if "REPDTE" not in df.columns:
+    if stats.latest_q is None:
         return pd.DataFrame()
-    latest_q = df["REPDTE"].max()
-    latest = df[df["REPDTE"] == latest_q]
-    for flag_col, desc in audit_flags.items():
+    latest_q = stats.latest_q
+    latest = stats.latest
+    for flag_col, desc in _UNSUPPORTED_AUDIT_FLAGS.items():
         if flag_col not in latest.columns:
             continue
         flagged = latest[latest[flag_col] == True]
@@ -703,21 +896,36 @@ def _check_unsupported_mappings(df: pd.DataFrame) -> pd.DataFrame:
 
 
 SEMANTIC_VALIDATION_RULES = [
-    ValidationRule("A_OverExclusion", "Excluded values exceed totals", _check_over_exclusion, "high"),
-    ValidationRule("B_FlatlineAnomaly", "Metric flatlines across all entities", _check_flatline_anomaly, "medium"),
-    ValidationRule("C_DuplicateComposite", "Standard/Normalized composites produce identical values", _check_duplicate_composites, "medium"),
-    ValidationRule("D_OutputContamination", "Composite CERTs have metric values they shouldn't", _check_output_contamination, "high"),
-    ValidationRule("E_ConsumerLinkage", "Metrics with no downstream consumers", lambda df: _check_consumer_linkage(), "low"),
-    ValidationRule("F_UnsupportedMappings", "Audit flags for unsupported CR-only mappings", _check_unsupported_mappings, "low"),
+    ValidationRule("A_OverExclusion", "Excluded values exceed totals",
+                   severity="high", evaluate=_check_over_exclusion),
+    ValidationRule("B_FlatlineAnomaly", "Metric flatlines across all entities",
+                   severity="medium", stats=(_FLATLINE_STATS,), evaluate=_check_flatline_anomaly),
+    ValidationRule("C_DuplicateComposite", "Standard/Normalized composites produce identical values",
+                   severity="medium", stats=(_COMPOSITE_STATS,), evaluate=_check_duplicate_composites),
+    ValidationRule("D_OutputContamination", "Composite CERTs have metric values they shouldn't",
+                   severity="high", stats=(_CONTAMINATION_STATS,), evaluate=_check_output_contamination),
+    ValidationRule("E_ConsumerLinkage", "Metrics with no downstream consumers",
+                   severity="low", evaluate=lambda stats: _check_consumer_linkage()),
+    ValidationRule("F_UnsupportedMappings", "Audit flags for unsupported CR-only mappings",
+                   severity="low", evaluate=_check_unsupported_mappings),
 ]
 
 
-def run_semantic_validation(df: pd.DataFrame) -> pd.DataFrame:
-    """Run all semantic validation rules and return a combined report."""
+def run_semantic_validation(
+    df: pd.DataFrame,
+    rules: Optional[List[ValidationRule]] = None,
+) -> pd.DataFrame:
+    """Run all semantic validation rules and return a combined report.
+
+    The statistics every rule declares are merged, so each grouping of the
+    panel is aggregated once for the whole rule set.
+    """
+    rules = SEMANTIC_VALIDATION_RULES if rules is None else rules
+    stats = PanelStats(df, [spec for rule in rules for spec in rule.stats])
     results = []
-    for rule in SEMANTIC_VALIDATION_RULES:
+    for rule in rules:
         try:
-            res = rule.check(df)
+            res = rule.run(stats)
             if not res.empty:
                 res["Rule_ID"] = rule.rule_id
                 res["Rule_Description"] = rule.description
@@ -6,8 +6,9 @@ Canonical peer group definitions for MSPBNA credit risk reporting.
 Contains:
   - ``PeerGroupType`` enum
   - ``PEER_GROUPS`` dict (4 active groups: Core PB + All Peers x Standard/Normalized)
-  - ``validate_peer_group_uniqueness()`` — enforcement that no two groups
-    within the same normalization mode share identical cert lists
+  - ``find_duplicate_peer_groups()`` / ``validate_peer_group_uniqueness()`` —
+    detection / enforcement that no two groups within the same
+    normalization mode share identical cert lists
   - ``get_all_peer_certs()`` — union of all distinct CERTs across groups
 
 Composite CERTs are auto-assigned: ``base_dummy_cert + display_order``.
@@ -98,22 +99,38 @@ PEER_GROUPS: Dict[PeerGroupType, dict] = {
 #  Validation & helpers
 # ---------------------------------------------------------------------------
 
+def find_duplicate_peer_groups(peer_groups: Dict = None) -> List[List]:
+    """Groups of peer-group keys with identical membership.
+
+    Each group is keyed by ``(use_normalized, sorted cert tuple)`` and
+    bucketed by that key's hash; keys are compared exactly only within a
+    bucket, so checking *n* groups is linear rather than pairwise.
+    Clusters are returned in definition order.
+    """
+    if peer_groups is None:
+        peer_groups = PEER_GROUPS
+    buckets: Dict[tuple, list] = {}
+    for gk, gv in peer_groups.items():
+        cert_key = (gv.get("use_normalized", False), tuple(sorted(gv["certs"])))
+        buckets.setdefault(cert_key, []).append(gk)
+    return [keys for keys in buckets.values() if len(keys) > 1]
+
+
 def validate_peer_group_uniqueness(peer_groups: Dict = None) -> None:
     """Raise ValueError if two groups with the same use_normalized flag
     have identical sorted cert membership."""
     if peer_groups is None:
         peer_groups = PEER_GROUPS
-    seen: dict = {}
-    for gk, gv in peer_groups.items():
-        norm_flag = gv.get("use_normalized", False)
-        cert_key = (norm_flag, tuple(sorted(gv["certs"])))
-        if cert_key in seen:
-            raise ValueError(
-                f"Peer group '{gk}' has identical cert membership as '{seen[cert_key]}' "
-                f"(use_normalized={norm_flag}, certs={sorted(gv['certs'])}). "
-                f"Remove the duplicate or provide distinct membership."
-            )
-        seen[cert_key] = gk
+    duplicates = find_duplicate_peer_groups(peer_groups)
+    if duplicates:
+        first, dup = duplicates[0][0], duplicates[0][1]
+        gv = peer_groups[dup]
+        others = "".join(f"; also {', '.join(map(str, keys))}" for keys in duplicates[1:])
+        raise ValueError(
+            f"Peer group '{dup}' has identical cert membership as '{first}' "
+            f"(use_normalized={gv.get('use_normalized', False)}, certs={sorted(gv['certs'])}). "
+            f"Remove the duplicate or provide distinct membership{others}."
+        )
 
 
 def get_all_peer_certs(peer_groups: Dict = None) -> List[int]:
@@ -0,0 +1,457 @@
+"""
+Pipeline DAG Runner
+====================
+
+Small dependency-aware runner for the stages inside
+``BankPerformanceDashboard.run()`` (Step 1) and ``generate_reports()``
+(Step 2).
+
+Each stage is declared as a ``PipelineNode`` with the names of the nodes it
+consumes.  ``PipelineDAG.run()`` starts every node as soon as its inputs are
+ready, on a thread pool, so independent work overlaps — e.g. the FRED,
+Case-Shiller and local-macro fetches no longer wait behind FDIC processing.
+
+Key concepts:
+  * **inputs** — upstream node names; their outputs are passed to ``fn``
+    positionally, in declaration order.
+  * **memoize** — output is pickled under ``cache_dir`` keyed by a hash of
+    (DAG version, node name, input digests).  Use only for deterministic
+    transforms; network fetches must not be memoized.
+  * **lock** — nodes sharing a lock name never run at the same time
+    (e.g. ``"pyplot"`` for matplotlib, which is not thread-safe).
+  * **io** — network-bound node.  ``fn`` may be a coroutine function.  In
+    overlapped mode every ready io node is launched at once on a single
+    background event loop (blocking fetches via its executor) and does not
+    occupy a compute worker, so CPU stages keep running while fetches wait
+    on the network and wall time approaches max(network, compute).
+  * **boundary** — optional callable applied to every node output before it
+    is memoized or handed downstream (Step 1 passes the panel dtype policy).
+    Each output's size is recorded, shown in ``summary_table()`` and checked
+    against the memory budget.
+
+Environment:
+  * ``PIPELINE_WORKERS`` — compute thread pool size (default 4; 1 = sequential).
+  * ``PIPELINE_MEMO``    — ``0`` disables memoization.
+  * ``PIPELINE_OVERLAP`` — ``1`` enables overlapped I/O mode.
+  * ``PIPELINE_MEMORY_BUDGET_MB`` — warn when a node output exceeds this size.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_KEY_LEN = 20
+
+
+# ---------------------------------------------------------------------------
+#  Hashing helpers
+# ---------------------------------------------------------------------------
+
+def _update_digest(h, obj: Any) -> None:
+    """Feed a stable representation of *obj* into *h*."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(type(obj).__name__.encode())
+        if isinstance(obj, pd.DataFrame):
+            h.update(repr(list(obj.columns)).encode())
+            h.update(repr([str(t) for t in obj.dtypes]).encode())
+        else:
+            h.update(f"{obj.name!r}|{obj.dtype}".encode())
+        try:
+            h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        except TypeError:
+            # Unhashable cells (lists, dicts) — fall back to the pickled frame
+            h.update(pickle.dumps(obj, protocol=4))
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for k in sorted(obj, key=repr):
+            h.update(repr(k).encode())
+            _update_digest(h, obj[k])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for item in obj:
+            _update_digest(h, item)
+        h.update(b"]")
+    else:
+        try:
+            h.update(pickle.dumps(obj, protocol=4))
+        except Exception:
+            h.update(repr(obj).encode())
+
+
+def value_digest(obj: Any) -> str:
+    """sha256 hex digest of an arbitrary stage output."""
+    h = hashlib.sha256()
+    _update_digest(h, obj)
+    return h.hexdigest()
+
+
+def value_memory_mb(obj: Any) -> float:
+    """Size of a stage output in MB (pandas objects, nested in dicts/lists)."""
+    if isinstance(obj, pd.DataFrame):
+        return float(obj.memory_usage(deep=True, index=True).sum()) / 2**20
+    if isinstance(obj, pd.Series):
+        return float(obj.memory_usage(deep=True, index=True)) / 2**20
+    if isinstance(obj, dict):
+        return sum(value_memory_mb(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(value_memory_mb(v) for v in obj)
+    return 0.0
+
+
+def source_version(paths: Iterable[str], *extra: Any) -> str:
+    """Hash of source files plus any extra settings that change stage output.
+
+    Pass this as ``PipelineDAG(version=...)`` so that editing the processing
+    code (or e.g. COMPOSITE_METHOD) invalidates memoized outputs.
+    """
+    h = hashlib.sha256()
+    for p in sorted(set(paths)):
+        try:
+            h.update(Path(p).read_bytes())
+        except OSError:
+            h.update(f"missing:{p}".encode())
+    for item in extra:
+        h.update(repr(item).encode())
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+#  Nodes & results
+# ---------------------------------------------------------------------------
+
+@dataclasses.dataclass(frozen=True)
+class PipelineNode:
+    """A declared pipeline stage."""
+    name: str
+    fn: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    memoize: bool = False
+    lock: Optional[str] = None
+    io: bool = False
+    description: str = ""
+
+
+@dataclasses.dataclass
+class NodeResult:
+    """Outcome of one node within a run."""
+    name: str
+    status: str                 # "ran" | "memoized" | "failed" | "skipped"
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    io: bool = False
+    memory_mb: Optional[float] = None
+
+
+class PipelineError(RuntimeError):
+    """Raised when a DAG is malformed (unknown input, cycle, duplicate)."""
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() not in ("0", "false", "off", "no")
+
+
+def _call(fn: Callable[..., Any], args: List[Any]) -> Any:
+    """Call *fn*; coroutine functions get their own event loop."""
+    if inspect.iscoroutinefunction(fn):
+        return asyncio.run(fn(*args))
+    return fn(*args)
+
+
+class _IOLoop:
+    """One asyncio event loop on a background thread, shared by all io nodes.
+
+    Coroutine nodes are awaited on the loop directly; blocking fetches run
+    in the loop's executor so they never hold a compute worker.
+    """
+
+    def __init__(self, name: str, max_blocking: int):
+        self.loop = asyncio.new_event_loop()
+        self._blocking = ThreadPoolExecutor(max_workers=max(1, max_blocking),
+                                            thread_name_prefix=f"{name}-io")
+        self.loop.set_default_executor(self._blocking)
+        self._thread = threading.Thread(target=self.loop.run_forever,
+                                        name=f"{name}-loop", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], args: List[Any],
+               post: Optional[Callable[[Any], Any]] = None):
+        """Schedule *fn(*args)* (then *post* on its result, in the executor).
+
+        Returns a concurrent.futures.Future.
+        """
+        return asyncio.run_coroutine_threadsafe(self._run(fn, args, post), self.loop)
+
+    async def _run(self, fn, args, post):
+        if inspect.iscoroutinefunction(fn):
+            value = await fn(*args)
+        else:
+            value = await self.loop.run_in_executor(None, functools.partial(fn, *args))
+        if post is not None:
+            value = await self.loop.run_in_executor(None, post, value)
+        return value
+
+    def close(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        self._blocking.shutdown(wait=True)
+
+
+# ---------------------------------------------------------------------------
+#  DAG
+# ---------------------------------------------------------------------------
+
+class PipelineDAG:
+    """Declared stages + a concurrent, memoizing scheduler."""
+
+    def __init__(self, name: str, cache_dir: Optional[str] = None,
+                 version: str = "", max_workers: Optional[int] = None,
+                 memoize: Optional[bool] = None, overlap_io: Optional[bool] = None,
+                 boundary: Optional[Callable[[Any], Any]] = None,
+                 memory_budget_mb: Optional[float] = None):
+        self.name = name
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.version = version
+        if max_workers is None:
+            max_workers = int(os.getenv("PIPELINE_WORKERS", "4") or 4)
+        self.max_workers = max(1, max_workers)
+        if memoize is None:
+            memoize = _env_flag("PIPELINE_MEMO", "1")
+        self.memoize = memoize and self.cache_dir is not None
+        if overlap_io is None:
+            overlap_io = _env_flag("PIPELINE_OVERLAP", "0")
+        self.overlap_io = overlap_io
+        self.boundary = boundary
+        if memory_budget_mb is None:
+            memory_budget_mb = float(os.getenv("PIPELINE_MEMORY_BUDGET_MB", "0") or 0)
+        self.memory_budget_mb = memory_budget_mb if memory_budget_mb > 0 else None
+        self._nodes: Dict[str, PipelineNode] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._digests: Dict[str, str] = {}
+        self.results: Dict[str, NodeResult] = {}
+
+    # ---- declaration -----------------------------------------------------
+
+    def add(self, name: str, fn: Callable[..., Any], inputs: Iterable[str] = (),
+            memoize: bool = False, lock: Optional[str] = None,
+            io: bool = False, description: str = "") -> PipelineNode:
+        """Declare a node.  Inputs may refer to nodes declared later."""
+        if name in self._nodes:
+            raise PipelineError(f"{self.name}: duplicate node '{name}'")
+        if io and (memoize or lock):
+            raise PipelineError(f"{self.name}: io node '{name}' cannot be memoized or locked")
+        node = PipelineNode(name=name, fn=fn, inputs=tuple(inputs), memoize=memoize,
+                            lock=lock, io=io, description=description)
+        self._nodes[name] = node
+        if lock and lock not in self._locks:
+            self._locks[lock] = threading.Lock()
+        return node
+
+    @property
+    def nodes(self) -> Dict[str, PipelineNode]:
+        return dict(self._nodes)
+
+    def order(self) -> List[str]:
+        """Topological order (declaration order among ready nodes).
+
+        Raises PipelineError for unknown inputs or cycles.
+        """
+        for node in self._nodes.values():
+            unknown = [i for i in node.inputs if i not in self._nodes]
+            if unknown:
+                raise PipelineError(f"{self.name}: node '{node.name}' has unknown inputs {unknown}")
+        done: List[str] = []
+        pending = list(self._nodes)
+        while pending:
+            ready = [n for n in pending if all(i in done for i in self._nodes[n].inputs)]
+            if not ready:
+                raise PipelineError(f"{self.name}: dependency cycle among {pending}")
+            done.extend(ready)
+            pending = [n for n in pending if n not in ready]
+        return done
+
+    # ---- memoization -----------------------------------------------------
+
+    def _digest(self, name: str, outputs: Dict[str, Any]) -> str:
+        if name not in self._digests:
+            self._digests[name] = value_digest(outputs[name])
+        return self._digests[name]
+
+    def _memo_key(self, node: PipelineNode, outputs: Dict[str, Any]) -> str:
+        h = hashlib.sha256()
+        h.update(f"{self.version}|{self.name}|{node.name}|".encode())
+        for inp in node.inputs:
+            h.update(f"{inp}={self._digest(inp, outputs)}|".encode())
+        return h.hexdigest()
+
+    def _memo_path(self, node: PipelineNode, key: str) -> Path:
+        return self.cache_dir / f"{node.name}_{key[:_KEY_LEN]}.pkl"
+
+    def _memo_load(self, node: PipelineNode, key: str) -> Tuple[bool, Any]:
+        path = self._memo_path(node, key)
+        if not path.is_file():
+            return False, None
+        try:
+            return True, pd.read_pickle(path)
+        except Exception as exc:
+            logger.warning(f"[{self.name}] memo for '{node.name}' unreadable ({exc}); recomputing")
+            return False, None
+
+    def _memo_store(self, node: PipelineNode, key: str, value: Any) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._memo_path(node, key)
+            prefix = f"{node.name}_"
+            for stale in self.cache_dir.glob(f"{prefix}*.pkl"):
+                tail = stale.stem[len(prefix):]
+                if stale != path and len(tail) == _KEY_LEN and "_" not in tail:
+                    stale.unlink()
+            pd.to_pickle(value, path)
+        except Exception as exc:
+            logger.warning(f"[{self.name}] could not memoize '{node.name}': {exc}")
+
+    # ---- execution -------------------------------------------------------
+
+    def _finalize(self, value: Any) -> Tuple[Any, float]:
+        """Apply the boundary callable and measure the output."""
+        if self.boundary is not None:
+            value = self.boundary(value)
+        return value, value_memory_mb(value)
+
+    def _execute(self, node: PipelineNode, outputs: Dict[str, Any]) -> Tuple[Any, str, float]:
+        key = None
+        if self.memoize and node.memoize:
+            key = self._memo_key(node, outputs)
+            hit, value = self._memo_load(node, key)
+            if hit:
+                return value, "memoized", value_memory_mb(value)
+        args = [outputs[i] for i in node.inputs]
+        if node.lock:
+            with self._locks[node.lock]:
+                value = _call(node.fn, args)
+        else:
+            value = _call(node.fn, args)
+        value, mem = self._finalize(value)
+        if key is not None:
+            self._memo_store(node, key, value)
+        return value, "ran", mem
+
+    def run(self, targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Run the DAG (or just *targets* and their ancestors).
+
+        Returns {node name: output}.  If a node raises, no new nodes are
+        started, running ones are allowed to finish, and the first exception
+        is re-raised.  With ``overlap_io`` the io nodes run on a shared event
+        loop instead of the compute pool.
+        """
+        order = self.order()
+        if targets is not None:
+            wanted = set()
+            stack = list(targets)
+            while stack:
+                n = stack.pop()
+                if n not in self._nodes:
+                    raise PipelineError(f"{self.name}: unknown target '{n}'")
+                if n not in wanted:
+                    wanted.add(n)
+                    stack.extend(self._nodes[n].inputs)
+            order = [n for n in order if n in wanted]
+
+        outputs: Dict[str, Any] = {}
+        self.results = {}
+        self._digests = {}
+        pending = list(order)
+        running = {}
+        first_error: Optional[BaseException] = None
+        t_run = time.perf_counter()
+        io_nodes = [n for n in order if self._nodes[n].io]
+        io_loop = _IOLoop(self.name, len(io_nodes)) if self.overlap_io and io_nodes else None
+        logger.info(f"[{self.name}] running {len(order)} nodes with {self.max_workers} worker(s)"
+                    + (f", {len(io_nodes)} on the I/O loop" if io_loop else ""))
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers,
+                                    thread_name_prefix=self.name) as pool:
+                while pending or running:
+                    if first_error is None:
+                        for n in [n for n in pending if all(i in outputs for i in self._nodes[n].inputs)]:
+                            pending.remove(n)
+                            node = self._nodes[n]
+                            if io_loop and node.io:
+                                fut = io_loop.submit(node.fn, [outputs[i] for i in node.inputs],
+                                                     post=self._finalize)
+                            else:
+                                fut = pool.submit(self._execute, node, outputs)
+                            running[fut] = (n, time.perf_counter())
+                    if not running:
+                        break
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        n, t0 = running.pop(fut)
+                        elapsed = time.perf_counter() - t0
+                        io = self._nodes[n].io
+                        try:
+                            result = fut.result()
+                        except BaseException as exc:
+                            self.results[n] = NodeResult(n, "failed", elapsed,
+                                                         f"{type(exc).__name__}: {exc}", io=io)
+                            logger.error(f"[{self.name}] node '{n}' failed after {elapsed:.1f}s: {exc}")
+                            if first_error is None:
+                                first_error = exc
+                            continue
+                        if io_loop and io:
+                            (value, mem), status = result, "ran"
+                        else:
+                            value, status, mem = result
+                        outputs[n] = value
+                        self.results[n] = NodeResult(n, status, elapsed, io=io, memory_mb=mem)
+                        logger.info(f"[{self.name}] {n}: {status} ({elapsed:.1f}s, {mem:.1f} MB)")
+                        if self.memory_budget_mb is not None and mem > self.memory_budget_mb:
+                            logger.warning(f"[{self.name}] {n} output is {mem:.1f} MB, over the "
+                                           f"{self.memory_budget_mb:.0f} MB budget")
+        finally:
+            if io_loop:
+                io_loop.close()
+
+        for n in pending:
+            self.results[n] = NodeResult(n, "skipped", io=self._nodes[n].io)
+        io_time = sum(r.elapsed for r in self.results.values() if r.io)
+        cpu_time = sum(r.elapsed for r in self.results.values() if not r.io)
+        peak = max(self.results.values(), key=lambda r: r.memory_mb or 0.0, default=None)
+        logger.info(f"[{self.name}] finished in {time.perf_counter() - t_run:.1f}s "
+                    f"(node time: I/O {io_time:.1f}s, compute {cpu_time:.1f}s)"
+                    + (f"; largest output {peak.name} {peak.memory_mb:.1f} MB"
+                       if peak is not None and peak.memory_mb else ""))
+        if first_error is not None:
+            raise first_error
+        return outputs
+
+    def summary_table(self) -> str:
+        """Human-readable per-node timing / output-size table for the last run."""
+        lines = [f"{'Node':<28} {'Status':<10} {'Time':>8} {'Memory':>10}  Inputs", "-" * 90]
+        for n in self.order():
+            r = self.results.get(n)
+            if r is None:
+                continue
+            label = f"{n} [io]" if r.io else n
+            mem = f"{r.memory_mb:.1f} MB" if r.memory_mb is not None else "-"
+            lines.append(f"{label:<28} {r.status:<10} {r.elapsed:>7.1f}s {mem:>10}  "
+                         f"{', '.join(self._nodes[n].inputs) or '-'}")
+        return "\n".join(lines)
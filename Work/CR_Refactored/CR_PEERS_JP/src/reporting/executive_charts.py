@@ -18,7 +18,10 @@ Three high-value executive visuals built from existing workbook data:
    8 quarters, suitable for PowerPoint / email embedding.
 
 All three consume the same ``FDIC_Data`` sheet already loaded by
-``generate_reports()``.  No new API dependencies.
+``generate_reports()``.  No new API dependencies.  Values are pulled as
+(bank × metric × quarter) blocks with one pivot (``quarter_cube``) or from
+the shared latest-quarter snapshot, and all sparkline coordinates are
+computed in one numpy pass (``_svg_sparklines``).
 """
 
 from __future__ import annotations
@@ -43,6 +46,8 @@ from metric_semantics import (
     get_semantic, get_polarity, get_direction, get_css_class,
     ordered_metrics, GROUP_ORDER,
 )
+from report_views import panel_views
+from rendering_mode import save_figure
 
 # Lazy-import matplotlib (only needed for bullet chart)
 plt = None
@@ -100,6 +105,61 @@ def _fmt_delta(delta: float, fmt: DisplayFormat) -> str:
     return f"{delta:+.2f}%"
 
 
+# =====================================================================
+# Batch data access — one pivot per chart, not one mask per value
+# =====================================================================
+
+def quarter_cube(
+    df: pd.DataFrame,
+    certs: List[int],
+    dates: list,
+    metrics: List[str],
+) -> np.ndarray:
+    """Metric values as a float64 array shaped (cert × metric × quarter).
+
+    One selection and pivot of the panel (``REPDTE`` as datetime); the
+    first row per (CERT, REPDTE) wins, as with the per-value lookups it
+    replaces.  Absent banks / quarters and non-numeric values are NaN.
+    """
+    certs, metrics = list(certs), list(metrics)
+    dates = pd.DatetimeIndex(list(dates))
+    rows = panel_views(df).group(certs)
+    rows = rows[rows["REPDTE"].isin(dates)]
+    rows = rows.loc[:, ~rows.columns.duplicated()].drop_duplicates(["CERT", "REPDTE"])
+    wide = rows.set_index(["CERT", "REPDTE"])[metrics].apply(pd.to_numeric, errors="coerce")
+    full = pd.MultiIndex.from_product([certs, dates])
+    values = wide.reindex(full).to_numpy(dtype=float, na_value=np.nan)
+    return values.reshape(len(certs), len(dates), len(metrics)).transpose(0, 2, 1)
+
+
+def _range_stats(block: np.ndarray, certs: List[int]) -> List[Optional[Dict]]:
+    """Peer range per metric from a (metric × member CERT) block.
+
+    Returns one dict per row (``lo``, ``hi``, ``median``, ``mean``,
+    ``min_cert``, ``max_cert``, ``count``), or None where no member has a
+    value.  Ties go to the first member, as ``min(vals, key=vals.get)``.
+    """
+    present = ~np.isnan(block)
+    count = present.sum(axis=1)
+    lo_idx = np.where(present, block, np.inf).argmin(axis=1)
+    hi_idx = np.where(present, block, -np.inf).argmax(axis=1)
+    median = np.full(len(block), np.nan)
+    mean = np.full(len(block), np.nan)
+    some = count > 0
+    if some.any():
+        median[some] = np.nanmedian(block[some], axis=1)
+        mean[some] = np.nansum(block[some], axis=1) / count[some]
+    rows = np.arange(len(block))
+    lo, hi = block[rows, lo_idx], block[rows, hi_idx]
+    return [
+        {"lo": float(lo[i]), "hi": float(hi[i]),
+         "median": float(median[i]), "mean": float(mean[i]),
+         "min_cert": certs[lo_idx[i]], "max_cert": certs[hi_idx[i]],
+         "count": int(count[i])} if some[i] else None
+        for i in rows
+    ]
+
+
 # =====================================================================
 # 1. YoY HEATMAP (HTML — both modes)
 # =====================================================================
@@ -141,8 +201,7 @@ def build_yoy_heatmap_data(
     """
     if "REPDTE" not in df.columns:
         return None
-    df = df.copy()
-    df["REPDTE"] = pd.to_datetime(df["REPDTE"])
+    df = panel_views(df).frame
 
     # Identify latest and year-ago quarter
     dates = sorted(df["REPDTE"].dropna().unique())
@@ -160,15 +219,27 @@ def build_yoy_heatmap_data(
     if not metrics:
         return None
 
-    def _row_for_cert(cert, dt):
-        mask = (df["CERT"] == cert) & (df["REPDTE"] == dt)
-        sub = df.loc[mask]
-        if sub.empty:
-            return pd.Series(dtype=float)
-        return sub.iloc[0]
+    # (subject, peer) × metric × (latest, prior) in one pivot
+    codes = ordered_metrics(metrics)
+    cube = quarter_cube(df, [subject_cert, peer_cert], [latest, prior], codes)
+    (subj_cur, subj_pri), (peer_cur, peer_pri) = cube.transpose(0, 2, 1)
+
+    # Composition/share metrics use percent-change YoY (balance growth)
+    # instead of simple subtraction to avoid confusing share-point deltas
+    # with true growth/shrinkage of the underlying balance.
+    is_comp = np.array([any(k in code for k in ("Composition", "Loan_Share", "ACL_Share"))
+                        for code in codes], dtype=bool)
+
+    def _yoy(cur, pri):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth = np.where(np.abs(pri) > 1e-12, cur / pri - 1.0, np.nan)
+        return np.where(is_comp, growth, cur - pri)
+
+    subj_yoy_all, peer_yoy_all = _yoy(subj_cur, subj_pri), _yoy(peer_cur, peer_pri)
+    vs_peer_all = subj_cur - peer_cur
 
     rows = []
-    for code in ordered_metrics(metrics):
+    for i, code in enumerate(codes):
         sem = get_semantic(code)
         if sem is None:
             # Build a minimal fallback
@@ -184,32 +255,7 @@ def build_yoy_heatmap_data(
             delta_fmt = sem.delta_format
             group = sem.group
 
-        subj_cur = _row_for_cert(subject_cert, latest).get(code, np.nan)
-        subj_pri = _row_for_cert(subject_cert, prior).get(code, np.nan)
-        peer_cur = _row_for_cert(peer_cert, latest).get(code, np.nan)
-        peer_pri = _row_for_cert(peer_cert, prior).get(code, np.nan)
-
-        subj_cur = pd.to_numeric(subj_cur, errors="coerce")
-        subj_pri = pd.to_numeric(subj_pri, errors="coerce")
-        peer_cur = pd.to_numeric(peer_cur, errors="coerce")
-        peer_pri = pd.to_numeric(peer_pri, errors="coerce")
-
-        # Composition/share metrics use percent-change YoY (balance growth)
-        # instead of simple subtraction to avoid confusing share-point deltas
-        # with true growth/shrinkage of the underlying balance.
-        _is_composition = any(k in code for k in ("Composition", "Loan_Share", "ACL_Share"))
-        if _is_composition:
-            subj_yoy = ((subj_cur / subj_pri) - 1.0 if (
-                pd.notna(subj_cur) and pd.notna(subj_pri)
-                and abs(subj_pri) > 1e-12) else np.nan)
-            peer_yoy = ((peer_cur / peer_pri) - 1.0 if (
-                pd.notna(peer_cur) and pd.notna(peer_pri)
-                and abs(peer_pri) > 1e-12) else np.nan)
-        else:
-            subj_yoy = subj_cur - subj_pri if pd.notna(subj_cur) and pd.notna(subj_pri) else np.nan
-            peer_yoy = peer_cur - peer_pri if pd.notna(peer_cur) and pd.notna(peer_pri) else np.nan
-        vs_peer = subj_cur - peer_cur if pd.notna(subj_cur) and pd.notna(peer_cur) else np.nan
-
+        subj_yoy, peer_yoy, vs_peer = subj_yoy_all[i], peer_yoy_all[i], vs_peer_all[i]
         rows.append({
             "metric": code,
             "display_name": display_name,
@@ -217,13 +263,13 @@ def build_yoy_heatmap_data(
             "polarity": polarity.value,
             "display_format": disp_fmt.value,
             "delta_format": delta_fmt.value,
-            "is_composition": _is_composition,
-            "subj_current": subj_cur,
-            "subj_prior": subj_pri,
+            "is_composition": bool(is_comp[i]),
+            "subj_current": subj_cur[i],
+            "subj_prior": subj_pri[i],
             "subj_yoy": subj_yoy,
             "subj_direction": get_direction(code, subj_yoy) if pd.notna(subj_yoy) else "N/A",
-            "peer_current": peer_cur,
-            "peer_prior": peer_pri,
+            "peer_current": peer_cur[i],
+            "peer_prior": peer_pri[i],
             "peer_yoy": peer_yoy,
             "peer_direction": get_direction(code, peer_yoy) if pd.notna(peer_yoy) else "N/A",
             "vs_peer_delta": vs_peer,
@@ -467,34 +513,25 @@ def generate_kri_bullet_chart(
         print("  Skipped KRI bullet chart: no matching metrics in data")
         return None
 
-    latest = df["REPDTE"].max()
-    latest_df = df[df["REPDTE"] == latest].copy()
-    for m in metrics:
-        latest_df[m] = pd.to_numeric(latest_df[m], errors="coerce")
-
-    def _val(cert, col):
-        row = latest_df[latest_df["CERT"] == cert]
-        return float(row[col].iloc[0]) if not row.empty and pd.notna(row[col].iloc[0]) else np.nan
-
-    def _range_for_group(certs, col):
-        """Compute (min, max, median, min_cert, max_cert) across a set of member CERTs."""
-        vals = {}
-        for c in certs:
-            v = _val(c, col)
-            if pd.notna(v):
-                vals[c] = v
-        if not vals:
+    # (metric × bank) blocks from the shared latest-quarter snapshot
+    snap = panel_views(df).latest
+    subj_vals = snap.block(metrics, [subject_cert])[:, 0]
+    all_comp, wealth_comp = snap.block(metrics, [all_peers_cert, wealth_cert]).T
+
+    def _group_ranges(certs):
+        """Per-metric range dicts (None where absent) across member CERTs."""
+        if not certs:
+            return [None] * len(metrics)
+        members = list(dict.fromkeys(certs))
+        return _range_stats(snap.block(metrics, members), members)
+
+    def _point_range(v, cert):
+        # Fallback: composite CERT value as a single-point band
+        if np.isnan(v):
             return None
-        min_cert = min(vals, key=vals.get)
-        max_cert = max(vals, key=vals.get)
-        values = list(vals.values())
-        return {
-            "lo": min(values), "hi": max(values),
-            "median": float(np.median(values)),
-            "mean": float(np.mean(values)),
-            "min_cert": min_cert, "max_cert": max_cert,
-            "count": len(values),
-        }
+        v = float(v)
+        return {"lo": v, "hi": v, "median": v, "mean": v,
+                "min_cert": cert, "max_cert": cert, "count": 1}
 
     # Try to resolve display label for edge annotations
     try:
@@ -505,8 +542,8 @@ def generate_kri_bullet_chart(
 
     def _cert_label(cert):
         if _has_resolver:
-            row = latest_df[latest_df["CERT"] == cert]
-            name = row["REPNM"].iloc[0] if not row.empty and "REPNM" in row.columns else ""
+            row = snap.row(cert)
+            name = row["REPNM"] if row is not None and snap.has_column("REPNM") else ""
             return resolve_display_label(cert, name)
         return str(cert)
 
@@ -517,42 +554,23 @@ def generate_kri_bullet_chart(
     _COLOR_MSPBNA = "#F7A81B"         # Gold
     _COLOR_REF = "#808080"            # Single-comparator reference line
 
+    all_ranges = _group_ranges(all_peers_member_certs)
+    wealth_ranges = _group_ranges(wealth_member_certs)
+
     chart_rows = []
-    for code in metrics:
-        sem = get_semantic(code)
-        label = sem.display_name if sem else code.replace("_", " ")
-        sv = _val(subject_cert, code)
-        if pd.isna(sv):
+    for i, code in enumerate(metrics):
+        sv = subj_vals[i]
+        if np.isnan(sv):
             continue
-
-        # Compute ranges from individual peer members if available
-        all_range = None
-        wealth_range = None
-        if all_peers_member_certs:
-            all_range = _range_for_group(all_peers_member_certs, code)
-        if wealth_member_certs:
-            wealth_range = _range_for_group(wealth_member_certs, code)
-
-        # Fallback: use composite CERT values as single-point bands
-        if all_range is None:
-            av = _val(all_peers_cert, code)
-            if pd.notna(av):
-                all_range = {"lo": av, "hi": av, "median": av, "mean": av,
-                             "min_cert": all_peers_cert, "max_cert": all_peers_cert, "count": 1}
-        if wealth_range is None:
-            wv = _val(wealth_cert, code)
-            if pd.notna(wv):
-                wealth_range = {"lo": wv, "hi": wv, "median": wv, "mean": wv,
-                                "min_cert": wealth_cert, "max_cert": wealth_cert, "count": 1}
-
-        has_all = all_range is not None
-        has_wealth = wealth_range is not None
-        if not has_all and not has_wealth:
+        all_range = all_ranges[i] or _point_range(all_comp[i], all_peers_cert)
+        wealth_range = wealth_ranges[i] or _point_range(wealth_comp[i], wealth_cert)
+        if all_range is None and wealth_range is None:
             # Neither comparator group available: skip metric
             continue
-
+        sem = get_semantic(code)
         chart_rows.append({
-            "label": label, "code": code, "sv": sv,
+            "label": sem.display_name if sem else code.replace("_", " "),
+            "code": code, "sv": float(sv),
             "all_range": all_range, "wealth_range": wealth_range,
         })
 
@@ -569,43 +587,42 @@ def generate_kri_bullet_chart(
     bar_height_outer = 0.38
     bar_height_inner = 0.24
 
-    labels = []
+    labels = [r["label"] for r in chart_rows]
+    ranges = {
+        side: np.array([(r[side]["lo"], r[side]["hi"], r[side]["median"], r[side]["mean"],
+                         r[side]["count"]) if r[side] else (np.nan,) * 5
+                        for r in chart_rows], dtype=float)
+        for side in ("all_range", "wealth_range")
+    }
+
+    def _bands(side, height, median_size, band_kw, median_color, ref_kw):
+        """Draw one range layer for every row: bands, medians, single-point refs."""
+        lo, hi, median, _, _ = ranges[side].T
+        band = hi > lo
+        if band.any():
+            ax.barh(y[band], (hi - lo)[band], left=lo[band], height=height * 2, **band_kw)
+            ax.plot(median[band], y[band], marker="|", linestyle="none", color=median_color,
+                    markersize=median_size, markeredgewidth=1.5, zorder=band_kw["zorder"] + 1)
+        point = lo == hi
+        if point.any():
+            # Single-point comparator: thin reference lines, NaN-separated
+            xs = np.column_stack([lo[point], lo[point], np.full(point.sum(), np.nan)]).ravel()
+            ys = np.column_stack([y[point] - height, y[point] + height,
+                                  np.full(point.sum(), np.nan)]).ravel()
+            ax.plot(xs, ys, **ref_kw)
+
+    # Outer band: All Peers range (median marker, or reference line if single-point)
+    _bands("all_range", bar_height_outer, 10,
+           dict(color=_COLOR_RANGE_ALL, alpha=0.5, edgecolor="#B0B0B0", linewidth=0.5, zorder=2),
+           "#888888", dict(color=_COLOR_REF, linewidth=1.5, zorder=3))
+    # Inner band: Wealth Peers range
+    _bands("wealth_range", bar_height_inner, 8,
+           dict(color=_COLOR_RANGE_WEALTH, alpha=0.7, edgecolor="#9070A0", linewidth=0.5, zorder=3),
+           "#6B3D7B", dict(color="#7B2D8E", linewidth=2.0, zorder=4))
+
+    # Edge labels: min/max peer tickers on the outer band
     for i, row in enumerate(chart_rows):
-        labels.append(row["label"])
         ar = row["all_range"]
-        wr = row["wealth_range"]
-
-        # Outer band: All Peers range
-        if ar and ar["hi"] > ar["lo"]:
-            ax.barh(y[i], ar["hi"] - ar["lo"], left=ar["lo"],
-                    height=bar_height_outer * 2,
-                    color=_COLOR_RANGE_ALL, alpha=0.5, edgecolor="#B0B0B0",
-                    linewidth=0.5, zorder=2)
-            # Median marker for All Peers
-            ax.plot([ar["median"]], [y[i]], marker="|", color="#888888",
-                    markersize=10, markeredgewidth=1.5, zorder=3)
-        elif ar:
-            # Single-point All Peers: thin reference line
-            ax.plot([ar["lo"], ar["lo"]],
-                    [y[i] - bar_height_outer, y[i] + bar_height_outer],
-                    color=_COLOR_REF, linewidth=1.5, zorder=3)
-
-        # Inner band: Wealth Peers range
-        if wr and wr["hi"] > wr["lo"]:
-            ax.barh(y[i], wr["hi"] - wr["lo"], left=wr["lo"],
-                    height=bar_height_inner * 2,
-                    color=_COLOR_RANGE_WEALTH, alpha=0.7, edgecolor="#9070A0",
-                    linewidth=0.5, zorder=3)
-            # Median marker for Wealth Peers
-            ax.plot([wr["median"]], [y[i]], marker="|", color="#6B3D7B",
-                    markersize=8, markeredgewidth=1.5, zorder=4)
-        elif wr:
-            # Single-point Wealth Peers: thin reference line
-            ax.plot([wr["lo"], wr["lo"]],
-                    [y[i] - bar_height_inner, y[i] + bar_height_inner],
-                    color="#7B2D8E", linewidth=2.0, zorder=4)
-
-        # Edge labels: min/max peer tickers on the outer band
         if ar and ar["count"] > 1:
             min_lbl = _cert_label(ar["min_cert"])
             max_lbl = _cert_label(ar["max_cert"])
@@ -624,22 +641,20 @@ def generate_kri_bullet_chart(
     # Wealth PB Avg markers (purple triangle-up) — mean of wealth peer members
     _COLOR_WEALTH_AVG = "#7B2D8E"   # Purple — matches Wealth Peers band
     _COLOR_ALL_AVG = "#5B9BD5"      # Blue — matches All Peers palette
-    _has_wealth_avg = False
-    _has_all_avg = False
-    for i, row in enumerate(chart_rows):
-        wr = row["wealth_range"]
-        if wr and wr["count"] > 1:
-            ax.scatter([wr["mean"]], [y[i]], s=80, color=_COLOR_WEALTH_AVG,
-                       edgecolor="black", linewidth=0.6, zorder=5, marker="^")
-            _has_wealth_avg = True
+    wealth_avg = ranges["wealth_range"][:, 4] > 1
+    _has_wealth_avg = bool(wealth_avg.any())
+    if _has_wealth_avg:
+        ax.scatter(ranges["wealth_range"][wealth_avg, 3], y[wealth_avg], s=80,
+                   color=_COLOR_WEALTH_AVG, edgecolor="black", linewidth=0.6,
+                   zorder=5, marker="^")
 
     # All Peers Avg markers (blue square) — mean of all peer members
-    for i, row in enumerate(chart_rows):
-        ar = row["all_range"]
-        if ar and ar["count"] > 1:
-            ax.scatter([ar["mean"]], [y[i]], s=70, color=_COLOR_ALL_AVG,
-                       edgecolor="black", linewidth=0.6, zorder=5, marker="s")
-            _has_all_avg = True
+    all_avg = ranges["all_range"][:, 4] > 1
+    _has_all_avg = bool(all_avg.any())
+    if _has_all_avg:
+        ax.scatter(ranges["all_range"][all_avg, 3], y[all_avg], s=70,
+                   color=_COLOR_ALL_AVG, edgecolor="black", linewidth=0.6,
+                   zorder=5, marker="s")
 
     # Value annotations next to MSPBNA diamond
     for i, row in enumerate(chart_rows):
@@ -691,7 +706,7 @@ def generate_kri_bullet_chart(
     plt.tight_layout()
     if save_path:
         Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -722,38 +737,55 @@ SPARKLINE_METRICS_NORMALIZED = [
 ]
 
 
-def _svg_sparkline(values: List[float], width: int = 120, height: int = 24,
-                   color: str = "#4C78A8") -> str:
-    """Generate an inline SVG sparkline from a list of numeric values."""
-    clean = [(i, v) for i, v in enumerate(values) if pd.notna(v)]
-    if len(clean) < 2:
-        return '<svg width="{}" height="{}"></svg>'.format(width, height)
+def _svg_sparklines(values: np.ndarray, colors: List[str], width: int = 120,
+                    height: int = 24) -> List[str]:
+    """Inline SVG sparklines for every row of a (series × quarter) matrix.
 
-    indices, vals = zip(*clean)
-    vmin, vmax = min(vals), max(vals)
-    vrange = max(vmax - vmin, 1e-9)
+    Scaling and polyline coordinates for all rows are computed in one numpy
+    pass; NaN quarters are skipped and rows with fewer than two values
+    render as an empty ``<svg>``.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    empty = '<svg width="{}" height="{}"></svg>'.format(width, height)
+    n = values.shape[1]
+    if n < 2:
+        return [empty] * len(colors)
+    present = ~np.isnan(values)
+    vmin = np.where(present, values, np.inf).min(axis=1, keepdims=True)
+    vmax = np.where(present, values, -np.inf).max(axis=1, keepdims=True)
+    vrange = np.maximum(vmax - vmin, 1e-9)
 
     padding = 2
     usable_w = width - 2 * padding
     usable_h = height - 2 * padding
+    xs = padding + (np.arange(n) / max(n - 1, 1)) * usable_w
+    with np.errstate(invalid="ignore"):
+        ys = padding + usable_h - ((values - vmin) / vrange) * usable_h
+
+    out = []
+    for row, color in enumerate(colors):
+        keep = present[row]
+        if keep.sum() < 2:
+            out.append(empty)
+            continue
+        points = [f"{x:.1f},{y:.1f}" for x, y in zip(xs[keep].tolist(), ys[row, keep].tolist())]
+        # Endpoint dot
+        last_x, last_y = points[-1].split(",")
+        out.append(
+            f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">'
+            f'<polyline fill="none" stroke="{color}" stroke-width="1.5" points="{" ".join(points)}"/>'
+            f'<circle cx="{last_x}" cy="{last_y}" r="2.5" fill="{color}"/>'
+            f'</svg>'
+        )
+    return out
 
-    n = len(values)
-    points = []
-    for idx, val in clean:
-        x = padding + (idx / max(n - 1, 1)) * usable_w
-        y = padding + usable_h - ((val - vmin) / vrange) * usable_h
-        points.append(f"{x:.1f},{y:.1f}")
-
-    polyline = " ".join(points)
-    # Endpoint dot
-    last_x, last_y = points[-1].split(",")
-
-    return (
-        f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">'
-        f'<polyline fill="none" stroke="{color}" stroke-width="1.5" points="{polyline}"/>'
-        f'<circle cx="{last_x}" cy="{last_y}" r="2.5" fill="{color}"/>'
-        f'</svg>'
-    )
+
+def _svg_sparkline(values: List[float], width: int = 120, height: int = 24,
+                   color: str = "#4C78A8") -> str:
+    """Generate an inline SVG sparkline from a list of numeric values."""
+    vals = pd.to_numeric(pd.Series(list(values), dtype=object), errors="coerce")
+    return _svg_sparklines(vals.to_numpy(dtype=float, na_value=np.nan), [color],
+                           width=width, height=height)[0]
 
 
 def generate_sparkline_table(
@@ -781,8 +813,7 @@ def generate_sparkline_table(
     """
     if "REPDTE" not in df.columns:
         return None
-    df = df.copy()
-    df["REPDTE"] = pd.to_datetime(df["REPDTE"])
+    df = panel_views(df).frame
 
     if metrics is None:
         metrics = SPARKLINE_METRICS
@@ -801,22 +832,36 @@ def generate_sparkline_table(
     target_prior = latest - pd.DateOffset(years=1)
     prior = min(dates, key=lambda d: abs(pd.Timestamp(d) - target_prior))
 
-    subj = df[df["CERT"] == subject_cert].copy()
-    subj = subj.sort_values("REPDTE")
-
-    def _subj_val(dt, col):
-        row = subj[subj["REPDTE"] == dt]
-        if row.empty:
-            return np.nan
-        return pd.to_numeric(row[col].iloc[0], errors="coerce")
-
-    def _peer_val(dt, col):
-        # Use normalized peer CERT for Norm_ metrics, standard peer for others
-        effective_cert = norm_peer_cert if col.startswith("Norm_") else peer_cert
-        row = df[(df["CERT"] == effective_cert) & (df["REPDTE"] == dt)]
-        if row.empty:
-            return np.nan
-        return pd.to_numeric(row[col].iloc[0], errors="coerce")
+    # (subject, peer, norm peer) × metric × quarter in one pivot
+    codes = ordered_metrics(metrics)
+    quarters = list(dict.fromkeys([*trail_dates, prior, latest]))
+    col = {d: j for j, d in enumerate(quarters)}
+    cube = quarter_cube(df, [subject_cert, peer_cert, norm_peer_cert], quarters, codes)
+    subj = cube[0]
+    trail = subj[:, [col[d] for d in trail_dates]]
+    cur, pri = subj[:, col[latest]], subj[:, col[prior]]
+    # Use normalized peer CERT for Norm_ metrics, standard peer for others
+    is_norm = np.array([c.startswith("Norm_") for c in codes], dtype=bool)
+    peer_v = np.where(is_norm, cube[2][:, col[latest]], cube[1][:, col[latest]])
+    yoy_all, vs_peer_all = cur - pri, cur - peer_v
+
+    # Sparkline color based on polarity and trend (first vs last clean value)
+    present = ~np.isnan(trail)
+    rows = np.arange(len(codes))
+    first = trail[rows, present.argmax(axis=1)]
+    last = trail[rows, trail.shape[1] - 1 - present[:, ::-1].argmax(axis=1)]
+    rising = (last - first) > 0
+    spark_colors = []
+    for i, code in enumerate(codes):
+        pol = get_polarity(code)
+        if present[i].any() and pol != Polarity.NEUTRAL:
+            if pol == Polarity.ADVERSE:
+                spark_colors.append("#d32f2f" if rising[i] else "#388e3c")
+            else:
+                spark_colors.append("#388e3c" if rising[i] else "#d32f2f")
+        else:
+            spark_colors.append("#4C78A8")
+    sparklines = _svg_sparklines(trail, spark_colors)
 
     date_str = latest.strftime("%B %d, %Y") if hasattr(latest, 'strftime') else str(latest)
     _peer_lbl = peer_label or "Peers"
@@ -852,48 +897,27 @@ def generate_sparkline_table(
         <tbody>
     """
 
-    for code in ordered_metrics(metrics):
+    body = []
+    for i, code in enumerate(codes):
         sem = get_semantic(code)
         label = sem.display_name if sem else code.replace("_", " ")
         disp_fmt = sem.display_format if sem else DisplayFormat.PERCENT
         delta_fmt = sem.delta_format if sem else DisplayFormat.BASIS_POINTS
-
-        # Trail values for sparkline
-        trail_vals = [_subj_val(d, code) for d in trail_dates]
-
-        # Sparkline color based on polarity and trend
-        pol = get_polarity(code)
-        first_clean = next((v for v in trail_vals if pd.notna(v)), None)
-        last_clean = next((v for v in reversed(trail_vals) if pd.notna(v)), None)
-        if first_clean is not None and last_clean is not None and pol != Polarity.NEUTRAL:
-            delta_sign = last_clean - first_clean
-            if pol == Polarity.ADVERSE:
-                spark_color = "#d32f2f" if delta_sign > 0 else "#388e3c"
-            else:
-                spark_color = "#388e3c" if delta_sign > 0 else "#d32f2f"
-        else:
-            spark_color = "#4C78A8"
-
-        sparkline = _svg_sparkline(trail_vals, color=spark_color)
-
-        cur = _subj_val(latest, code)
-        pri = _subj_val(prior, code)
-        peer_v = _peer_val(latest, code)
-
-        yoy = cur - pri if pd.notna(cur) and pd.notna(pri) else np.nan
-        vs_peer = cur - peer_v if pd.notna(cur) and pd.notna(peer_v) else np.nan
+        sparkline = sparklines[i]
+        yoy, vs_peer = yoy_all[i], vs_peer_all[i]
 
         yoy_cls = get_css_class(code, yoy) if pd.notna(yoy) else "neutral-trend"
         vp_cls = get_css_class(code, vs_peer) if pd.notna(vs_peer) else "neutral-trend"
 
-        html += f"""<tr>
+        body.append(f"""<tr>
             <td class="metric-name">{label}</td>
             <td class="spark-cell">{sparkline}</td>
-            <td class="val">{_fmt_val(cur, disp_fmt)}</td>
+            <td class="val">{_fmt_val(cur[i], disp_fmt)}</td>
             <td class="val {yoy_cls}">{_fmt_delta(yoy, delta_fmt)}</td>
             <td class="val {vp_cls}">{_fmt_delta(vs_peer, delta_fmt)}</td>
-        </tr>"""
+        </tr>""")
 
+    html += "".join(body)
     html += """</tbody></table>
         <p style="font-size:9px; color:#888; margin-top:8px;">
             Sparklines show trailing quarters for the subject bank. Color reflects directional trend.
@@ -942,13 +966,10 @@ def prepare_cumulative_growth_data(
         target_loans_cagr, target_acl_cagr
     or None if required columns are missing.
     """
-    ent = df[df["CERT"] == cert].copy()
+    ent = panel_views(df).history(cert)
     if ent.empty:
         return None
 
-    ent["REPDTE"] = pd.to_datetime(ent["REPDTE"])
-    ent = ent.sort_values("REPDTE")
-
     # Resolve column names
     cre_col = _find_col(ent, _CRE_BAL_COLS)
     resi_col = _find_col(ent, _RESI_BAL_COLS)
@@ -1144,7 +1165,7 @@ def plot_cumulative_growth_loans_vs_acl(
 
     if save_path:
         Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=150, bbox_inches="tight")
+        save_figure(fig, save_path, dpi=150, bbox_inches="tight")
         plt.close(fig)
 
     return save_path
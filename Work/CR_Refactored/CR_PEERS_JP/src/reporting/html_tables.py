@@ -0,0 +1,286 @@
+"""
+HTML Table Rendering Engine
+===========================
+
+Shared machinery for the Step 2 peer tables in ``report_generator.py``
+(executive summary, detailed / Wealth peer tables, segment focus tables and
+the flexible metric table):
+
+  * ``PeerSnapshot`` — the latest-REPDTE slice of the peer panel indexed by
+    CERT.  ``latest_snapshot(panel)`` builds it once per panel and hands the
+    same snapshot to every table, peer group and render mode.  The registry
+    only notices a change of shape, so panels must not be edited in place
+    once registered (``report_views.PanelViews.seal`` checks this);
+    ``block(codes, certs)`` pulls a whole (metric × bank) matrix with one
+    reindex instead of a boolean filter per cell.
+  * column formatters (``fmt_percent_col`` …) — vectorized counterparts of
+    the scalar ``_fmt_*`` helpers: scaling, sign and tier decisions are made
+    for a whole block with numpy, then one format spec is applied per group.
+    Missing values render as ``N/A``.  ``format_block`` applies a per-row
+    format kind to a block.
+  * precompiled ``string.Template`` pages built from shared CSS rules; rows
+    are assembled with ``"".join`` rather than repeated string concatenation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import weakref
+from string import Template
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+NA = "N/A"
+
+
+# ==================================================================================
+# LATEST-QUARTER SNAPSHOT
+# ==================================================================================
+
+class PeerSnapshot:
+    """Latest-quarter rows of a peer panel, one per CERT (first row wins)."""
+
+    def __init__(self, panel: pd.DataFrame):
+        self.date = panel["REPDTE"].max()
+        latest = panel[panel["REPDTE"] == self.date]
+        latest = latest.loc[:, ~latest.columns.duplicated()]
+        self.frame = latest.drop_duplicates("CERT").set_index("CERT", drop=False)
+
+    def __contains__(self, cert) -> bool:
+        return cert in self.frame.index
+
+    @property
+    def certs(self) -> list:
+        """CERTs in order of first appearance in the panel."""
+        return list(self.frame.index)
+
+    def has_column(self, code: str) -> bool:
+        return code in self.frame.columns
+
+    def row(self, cert) -> Optional[pd.Series]:
+        return self.frame.loc[cert] if cert in self.frame.index else None
+
+    def name(self, cert) -> str:
+        return str(self.frame.at[cert, "NAME"])
+
+    def block(self, codes: Sequence[str], certs: Sequence) -> np.ndarray:
+        """float64 matrix (len(codes) × len(certs)); NaN for absent banks / metrics."""
+        sub = self.frame.reindex(index=list(certs), columns=list(codes))
+        sub = sub.apply(pd.to_numeric, errors="coerce")
+        return sub.to_numpy(dtype=float, na_value=np.nan).T
+
+
+_SNAPSHOTS: Dict[int, Tuple[weakref.ref, Tuple[int, int], PeerSnapshot]] = {}
+
+
+def latest_snapshot(panel: pd.DataFrame) -> PeerSnapshot:
+    """Shared ``PeerSnapshot`` for *panel* (rebuilt if the frame changes shape)."""
+    key = id(panel)
+    hit = _SNAPSHOTS.get(key)
+    if hit is not None and hit[0]() is panel and hit[1] == panel.shape:
+        return hit[2]
+    snap = PeerSnapshot(panel)
+    ref = weakref.ref(panel, lambda _r, k=key: _SNAPSHOTS.pop(k, None))
+    _SNAPSHOTS[key] = (ref, panel.shape, snap)
+    return snap
+
+
+def discard_snapshot(panel: pd.DataFrame) -> None:
+    """Drop *panel*'s shared snapshot so the next lookup rebuilds it."""
+    hit = _SNAPSHOTS.get(id(panel))
+    if hit is not None and hit[0]() is panel:
+        _SNAPSHOTS.pop(id(panel), None)
+
+
+def panel_fingerprint(panel: pd.DataFrame) -> str:
+    """Digest of *panel*'s labels, dtypes and values (changes on any in-place edit)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((panel.shape, list(panel.columns), [str(t) for t in panel.dtypes])).encode())
+    digest.update(pd.util.hash_pandas_object(panel, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# ==================================================================================
+# COLUMN FORMATTERS
+# ==================================================================================
+
+def _render(values: np.ndarray, spec: str, out: Optional[np.ndarray] = None,
+            where: Optional[np.ndarray] = None) -> np.ndarray:
+    """Format the non-NaN entries of *values* (limited to *where*) with *spec*."""
+    v = np.asarray(values, dtype=float)
+    if out is None:
+        out = np.full(v.shape, NA, dtype=object)
+    sel = ~np.isnan(v) if where is None else (where & ~np.isnan(v))
+    out[sel] = [spec.format(x) for x in v[sel].tolist()]
+    return out
+
+
+def format_col(values, spec: str) -> np.ndarray:
+    """Apply one format spec (e.g. ``"{:.2f}%"``) to every present value."""
+    return _render(values, spec)
+
+
+def fmt_percent_col(values, signed: bool = False, ref=None) -> np.ndarray:
+    """Vectorized ``_fmt_percent`` / ``_fmt_percent_diff``.
+
+    Values with ``|v| < 1`` are decimals and are scaled by 100.  With *ref*
+    the scale is decided by the reference value instead (falling back to the
+    value itself where *ref* is missing), as for percentage-point deltas.
+    """
+    v = np.asarray(values, dtype=float)
+    basis = v if ref is None else np.where(np.isnan(ref), v, np.asarray(ref, dtype=float))
+    scaled = np.where(np.abs(basis) < 1.0, v * 100.0, v)
+    return _render(scaled, "{:+.2f}%" if signed else "{:.2f}%")
+
+
+def fmt_multiple_col(values, signed: bool = False) -> np.ndarray:
+    """Vectorized ``_fmt_multiple`` / ``_fmt_multiple_diff``: ``1.23x`` / ``+0.12x``."""
+    return _render(values, "{:+.2f}x" if signed else "{:.2f}x")
+
+
+def fmt_billions_col(values, signed: bool = False, grouping: bool = True) -> np.ndarray:
+    """FDIC $-thousands as billions: ``$254.7B``; deltas as ``+1.2B`` (no $)."""
+    spec = "{:" + ("+" if signed else "") + ("," if grouping else "") + ".1f}B"
+    return _render(np.asarray(values, dtype=float) / 1e6, spec if signed else "$" + spec)
+
+
+def fmt_money_col(values, signed: bool = False) -> np.ndarray:
+    """Vectorized ``_fmt_money_billions`` / ``_fmt_money_billions_diff`` ($B / $M / $K tiers)."""
+    v = np.asarray(values, dtype=float)
+    base = np.abs(v) if signed else v
+    av = np.abs(v)
+    out = np.full(v.shape, NA, dtype=object)
+    _render(base / 1e6, "${:,.1f}B", out, av >= 1e6)
+    _render(base / 1e3, "${:,.1f}M", out, (av >= 1e3) & (av < 1e6))
+    _render(base, "${:,.0f}K", out, av < 1e3)
+    if signed:
+        ok = ~np.isnan(v)
+        out[ok] = np.where(v[ok] >= 0, "+", "-").astype(object) + out[ok]
+    return out
+
+
+def format_block(values: np.ndarray, kinds: Sequence[str],
+                 formatters: Mapping[str, Callable[..., np.ndarray]],
+                 ref: Optional[np.ndarray] = None) -> np.ndarray:
+    """Format a block (or vector) where row *i* uses ``formatters[kinds[i]]``.
+
+    With *ref* (same leading length) each formatter is called as
+    ``fn(values[rows], ref[rows])``.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, NA, dtype=object)
+    kinds = np.asarray(kinds, dtype=object)
+    for kind in dict.fromkeys(kinds.tolist()):
+        rows = kinds == kind
+        out[rows] = (formatters[kind](values[rows]) if ref is None
+                     else formatters[kind](values[rows], ref[rows]))
+    return out
+
+
+def trend_classes(diff, direction, tolerance: float) -> np.ndarray:
+    """CSS trend class per delta.
+
+    *direction* is +1 where higher is better, -1 where lower is better and
+    0 where the metric has no preferred direction.  Deltas within
+    *tolerance* (or missing) are neutral.
+    """
+    d = np.asarray(diff, dtype=float)
+    direction = np.asarray(direction)
+    out = np.where(np.sign(d) == direction, "good-trend", "bad-trend").astype(object)
+    out[np.isnan(d) | (np.abs(d) < tolerance) | (direction == 0)] = "neutral-trend"
+    return out
+
+
+# ==================================================================================
+# MARKUP
+# ==================================================================================
+
+def cell(text, cls: str = "") -> str:
+    return f'<td class="{cls}">{text}</td>' if cls else f"<td>{text}</td>"
+
+
+def header_cells(labels: Iterable) -> str:
+    return "".join(f"<th>{lbl}</th>" for lbl in labels)
+
+
+def css(*rules: str) -> str:
+    return "\n".join(f"        {r}" for r in rules)
+
+
+def container_css(max_width: str) -> str:
+    return (".email-container { background-color: transparent; padding: 20px; "
+            f"max-width: {max_width}; margin: 0 auto; text-align: center; }}")
+
+
+# Navy-header email tables (executive summary, peer and segment tables)
+NAVY_BASE_CSS: Tuple[str, ...] = (
+    "body { font-family: Arial, sans-serif; background-color: transparent; }",
+    "h3 { color: #002F6C; margin-bottom: 5px; text-align: center; }",
+    "p.date-header { margin-top: 0; font-weight: bold; color: #555; text-align: center; margin-bottom: 20px; }",
+    "table { width: 100%; border-collapse: collapse; margin: 0 auto; font-size: 11px; background-color: transparent; }",
+    "th { background-color: #002F6C; color: white; padding: 8px; border: 1px solid #2c3e50; }",
+    "td { padding: 6px; text-align: center; border: 1px solid #e0e0e0; background-color: transparent; }",
+    ".metric-name { text-align: left !important; font-weight: bold; color: #2c3e50; min-width: 180px; background-color: transparent; }",
+)
+SUBJECT_VALUE_CSS = (".subject-value { background-color: #E6F3FF !important; font-weight: bold; color: #002F6C; "
+                     "border-left: 2px solid #002F6C; border-right: 2px solid #002F6C; }")
+TREND_CSS: Tuple[str, ...] = (
+    ".bad-trend { color: #d32f2f; font-weight: bold; }",
+    ".good-trend { color: #388e3c; font-weight: bold; }",
+    ".neutral-trend { color: #757575; font-weight: bold; }",
+)
+
+NAVY_PAGE = Template("""<html><head><style>
+$css
+    </style></head><body>
+    <div class="email-container">
+        <h3>$title</h3>
+        <p class="date-header">$date</p>
+        <table><thead><tr>$header</tr></thead><tbody>$rows</tbody></table>$footer</div></body></html>""")
+
+# Orange-header flexible metric table
+FLEX_CSS = css(
+    "body { font-family: Arial, sans-serif; margin: 0; background-color: #f3f4f6; }",
+    ".email-container { background-color: white; padding: 20px; border-radius: 8px; "
+    "box-shadow: 0 4px 6px rgba(0,0,0,0.1); max-width: 1200px; margin: 20px auto; }",
+    ".header { text-align: center; margin-bottom: 20px; }",
+    ".header h2 { margin: 0; font-size: 20px; color: #2d3748; }",
+    ".header p { margin: 5px 0 0 0; color: #718096; font-size: 12px; }",
+    "table { width: 100%; border-collapse: separate; border-spacing: 0; overflow: hidden; border-radius: 8px; }",
+    ".table-header { background-color: #f7a81b; color: #ffffff; font-weight: bold; }",
+    ".sub-header { background-color: #f7a81b; color: #ffffff; font-weight: bold; text-align: center; }",
+    "th, td { padding: 12px 15px; text-align: left; border: 1px solid #e2e8f0; }",
+    "th { font-size: 14px; text-transform: uppercase; letter-spacing: 0.05em; }",
+    ".metric-name { font-weight: normal; color: #2d3748; }",
+    ".value-cell { text-align: center; }",
+    "tr:nth-child(even) { background-color: #f7fafc; }",
+    "tr:hover { background-color: #edf2f7; }",
+    ".mspbna-row { background-color: #fff3cd; font-weight: 600; }",
+)
+
+FLEX_PAGE = Template("""<html>
+<head><style>
+$css
+</style></head>
+<body>
+    <div class="email-container">
+        <div class="header">
+            <h2>$title</h2>
+            <p>Report Date: $date</p>
+        </div>
+        <table>
+            <thead><tr class="table-header">$header</tr></thead>
+            <tbody>$rows</tbody>
+        </table>
+    </div>
+</body>
+</html>""")
+
+
+def render_navy_page(extra_css: Sequence[str], title: str, date: str, header: str,
+                     rows: List[str], footer: str = "") -> str:
+    """Fill the navy email-table page; *extra_css* follows the shared base rules."""
+    return NAVY_PAGE.substitute(css=css(*NAVY_BASE_CSS, *extra_css), title=title, date=date,
+                                header=header, rows="".join(rows), footer=footer)
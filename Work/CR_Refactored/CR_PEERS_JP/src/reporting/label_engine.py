@@ -0,0 +1,203 @@
+"""
+Label Placement Engine
+======================
+
+Shared collision index for chart annotations: ``ChartAnnotationHelper``,
+``LabelPlacer``, the credit-deterioration line tags and the scatter-plot
+labels in ``report_generator.py`` all place labels through it.
+
+Placed labels are display-coordinate rectangles bucketed in a uniform
+grid.  A collision test only looks at the rectangles in the cells a
+candidate touches, not at every label already on the chart, so placing
+*n* labels is roughly linear instead of quadratic.  All candidate offsets
+for one label are tested in a single numpy pass and the first free one
+(in preference order) wins.  ``to_display()`` converts many anchors with
+one ``transData.transform`` call.
+
+Two overlap rules are supported, matching the two legacy engines:
+  * closed rectangles (``strict=False``) — touching edges collide; used
+    for label bounding boxes.
+  * open rectangles (``strict=True``) — used for point-proximity checks
+    (``|dx| < x_threshold and |dy| < y_threshold``) via ``point_rects()``.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Rect = Tuple[float, float, float, float]   # (x0, y0, x1, y1) in display px
+
+# Rectangles spanning more cells than this are checked against every query
+# instead of being bucketed (e.g. an off-axis point far outside the figure).
+_MAX_SPAN_CELLS = 4096
+
+
+def label_size_px(text: str, tag_size: float, pad: float = 6) -> Tuple[float, float]:
+    """Estimated (width, height) of a boxed text label in display pixels."""
+    w = max(40.0, 0.62 * tag_size * len(text)) + 2 * pad
+    h = tag_size * 1.7 + 2 * pad
+    return w, h
+
+
+def to_display(ax, xs: Iterable[float], ys: Iterable[float]) -> np.ndarray:
+    """Data → display coordinates for many points at once; shape (n, 2)."""
+    pts = np.column_stack([np.asarray(list(xs), dtype=float),
+                           np.asarray(list(ys), dtype=float)])
+    if len(pts) == 0:
+        return pts.reshape(0, 2)
+    return np.asarray(ax.transData.transform(pts), dtype=float)
+
+
+def centered_rects(anchor: Sequence[float], offsets: Sequence[Tuple[float, float]],
+                   width: float, height: float) -> np.ndarray:
+    """Rectangles of one size centred on ``anchor + offset`` for each offset; shape (k, 4)."""
+    off = np.asarray(offsets, dtype=float).reshape(-1, 2)
+    cx = anchor[0] + off[:, 0]
+    cy = anchor[1] + off[:, 1]
+    return np.column_stack([cx - width / 2, cy - height / 2,
+                            cx + width / 2, cy + height / 2])
+
+
+def point_rects(points: np.ndarray, x_threshold: float, y_threshold: float) -> np.ndarray:
+    """Proximity boxes for points: two boxes overlap (strictly) iff the points
+    are closer than the thresholds on both axes."""
+    pts = np.asarray(points, dtype=float).reshape(-1, 2)
+    hx, hy = x_threshold / 2, y_threshold / 2
+    return np.column_stack([pts[:, 0] - hx, pts[:, 1] - hy,
+                            pts[:, 0] + hx, pts[:, 1] + hy])
+
+
+class PlacementIndex:
+    """Uniform-grid spatial index of placed rectangles in display coordinates.
+
+    Each rectangle gets an integer id (returned by ``add``) that stays valid
+    across ``update``.  Rectangles with non-finite coordinates (or far too
+    large to bucket) are kept in a side list and checked against every
+    query, so results match a pairwise comparison exactly.
+    """
+
+    def __init__(self, cell_px: float = 64.0, strict: bool = False):
+        self.cell_px = float(cell_px)
+        self.strict = strict
+        self._rects = np.empty((16, 4), dtype=float)
+        self._n = 0
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+        self._cells: Dict[int, List[Tuple[int, int]]] = {}
+        self._wild: List[int] = []
+
+    def __len__(self) -> int:
+        return self._n
+
+    def rect(self, idx: int) -> Rect:
+        return tuple(self._rects[idx])
+
+    # ---- maintenance -----------------------------------------------------
+
+    def _cell_span(self, rect) -> Optional[List[Tuple[int, int]]]:
+        """Grid cells covered by *rect*; None when non-finite or too large to bucket."""
+        x0, y0, x1, y1 = rect
+        if not all(math.isfinite(v) for v in (x0, y0, x1, y1)):
+            return None
+        c = self.cell_px
+        i0, i1 = math.floor(min(x0, x1) / c), math.floor(max(x0, x1) / c)
+        j0, j1 = math.floor(min(y0, y1) / c), math.floor(max(y0, y1) / c)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > _MAX_SPAN_CELLS:
+            return None
+        return [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+
+    def _link(self, idx: int, rect) -> None:
+        cells = self._cell_span(rect)
+        if cells is None:
+            self._wild.append(idx)
+            self._cells[idx] = []
+            return
+        self._cells[idx] = cells
+        for cell in cells:
+            self._grid.setdefault(cell, []).append(idx)
+
+    def _unlink(self, idx: int) -> None:
+        cells = self._cells.pop(idx)
+        if not cells:
+            self._wild.remove(idx)
+        for cell in cells:
+            self._grid[cell].remove(idx)
+
+    def add(self, rect) -> int:
+        """Register a rectangle; returns its id."""
+        if self._n == len(self._rects):
+            self._rects = np.concatenate([self._rects, np.empty_like(self._rects)])
+        idx = self._n
+        self._rects[idx] = rect
+        self._n += 1
+        self._link(idx, tuple(float(v) for v in rect))
+        return idx
+
+    def update(self, idx: int, rect) -> None:
+        """Move rectangle *idx* to *rect*."""
+        self._unlink(idx)
+        self._rects[idx] = rect
+        self._link(idx, tuple(float(v) for v in rect))
+
+    # ---- queries ---------------------------------------------------------
+
+    def _nearby(self, rects: np.ndarray) -> np.ndarray:
+        """Ids stored in the grid cells touched by any of *rects*."""
+        bounds = (float(np.min(rects[:, [0, 2]])), float(np.min(rects[:, [1, 3]])),
+                  float(np.max(rects[:, [0, 2]])), float(np.max(rects[:, [1, 3]])))
+        cells = self._cell_span(bounds)
+        if cells is None:
+            return np.arange(self._n)
+        ids = set(self._wild)
+        if len(cells) > len(self._grid):
+            wanted = set(cells)
+            for cell, members in self._grid.items():
+                if cell in wanted:
+                    ids.update(members)
+        else:
+            for cell in cells:
+                ids.update(self._grid.get(cell, ()))
+        return np.fromiter(ids, dtype=int, count=len(ids))
+
+    def overlaps(self, rects, skip: Optional[int] = None) -> np.ndarray:
+        """Boolean array: does each candidate rect collide with a placed one?"""
+        cand = np.asarray(rects, dtype=float).reshape(-1, 4)
+        if self._n == 0 or len(cand) == 0:
+            return np.zeros(len(cand), dtype=bool)
+        ids = self._nearby(cand)
+        if skip is not None:
+            ids = ids[ids != skip]
+        if len(ids) == 0:
+            return np.zeros(len(cand), dtype=bool)
+        placed = self._rects[ids]
+        a = cand[:, None, :]
+        b = placed[None, :, :]
+        if self.strict:
+            hit = ((a[..., 0] < b[..., 2]) & (b[..., 0] < a[..., 2])
+                   & (a[..., 1] < b[..., 3]) & (b[..., 1] < a[..., 3]))
+        else:
+            hit = ~((a[..., 2] < b[..., 0]) | (b[..., 2] < a[..., 0])
+                    | (a[..., 3] < b[..., 1]) | (b[..., 3] < a[..., 1]))
+        return hit.any(axis=1)
+
+    def first_free(self, rects, skip: Optional[int] = None) -> int:
+        """Index of the first candidate that collides with nothing, or -1."""
+        free = ~self.overlaps(rects, skip=skip)
+        return int(np.argmax(free)) if free.any() else -1
+
+    def colliding(self, rect, skip: Optional[int] = None) -> List[int]:
+        """Sorted ids of placed rectangles that collide with *rect*."""
+        cand = np.asarray(rect, dtype=float).reshape(1, 4)
+        if self._n == 0:
+            return []
+        ids = self._nearby(cand)
+        if skip is not None:
+            ids = ids[ids != skip]
+        return sorted(int(i) for i in ids if self._pair(cand[0], self._rects[i]))
+
+    def _pair(self, a, b) -> bool:
+        if self.strict:
+            return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+        return not (a[2] < b[0] or b[2] < a[0] or a[3] < b[1] or b[3] < a[1])
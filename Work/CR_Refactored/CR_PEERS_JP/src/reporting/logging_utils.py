@@ -33,6 +33,7 @@ import io
 import json
 import os
 import sys
+import threading
 import traceback
 import uuid
 from datetime import datetime
@@ -140,6 +141,7 @@ class CsvLogger:
     - log() is a no-op after close (never raises)
     - close() restores stdout/stderr before closing the file
     - close() and shutdown() are idempotent
+    - log() is thread-safe (pipeline stages run on a thread pool)
     """
 
     def __init__(
@@ -158,6 +160,7 @@ class CsvLogger:
         )
 
         self._closed = False
+        self._lock = threading.RLock()
 
         # Track original streams for restoration on close
         self._original_stdout = None
@@ -214,8 +217,9 @@ class CsvLogger:
                 "traceback": tb,
                 "context_json": json.dumps(context) if context else "",
             }
-            self._writer.writerow(row)
-            self._file.flush()
+            with self._lock:
+                self._writer.writerow(row)
+                self._file.flush()
         except Exception:
             pass
 
@@ -0,0 +1,139 @@
+"""
+Quarterly Macro Alignment Cube
+==============================
+
+FRED series aligned to bank reporting quarters, built once per report run
+and shared by the Step 2 macro charts (correlation heatmap and the
+credit-stress / rates-housing overlays).
+
+  * ``build_macro_cube(fred_long)`` pivots the long ``SeriesID / DATE /
+    VALUE`` FRED table and resamples every series to quarter-end (last
+    observation per quarter) in one pass.
+  * ``MacroCube.series(sid)`` returns one quarterly series (quarter-end
+    index, empty quarters dropped).
+  * ``MacroCube.lagged(k)`` is the cube shifted *k* whole quarters, i.e. the
+    row for quarter *t* holds macro values from *t-k*.  Lags listed in
+    ``lags`` are precomputed.
+  * ``pairwise_corr(a, b)`` computes Pearson correlations for every
+    (column of *a*, column of *b*) pair over their pairwise-complete rows as
+    a handful of matrix products.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class MacroCube:
+    """Quarter × series frame of FRED values plus precomputed lag variants."""
+
+    def __init__(self, quarterly: pd.DataFrame, lags: Iterable[int] = (1,)):
+        self.quarterly = quarterly
+        self._lagged: Dict[int, pd.DataFrame] = {}
+        for k in lags:
+            self.lagged(k)
+
+    def __contains__(self, series_id: str) -> bool:
+        return series_id in self.quarterly.columns
+
+    def __repr__(self) -> str:
+        # Content-based so artifact cache keys stay stable across runs
+        digest = int(pd.util.hash_pandas_object(self.quarterly, index=True).sum()) & 0xFFFFFFFFFFFF
+        return (f"MacroCube({self.quarterly.shape[1]} series x {len(self.quarterly)} quarters, "
+                f"{list(self.quarterly.columns)}, {digest:012x})")
+
+    @property
+    def series_ids(self) -> list:
+        return list(self.quarterly.columns)
+
+    def series(self, series_id: str) -> pd.Series:
+        """One quarterly series (NaN quarters dropped); empty if unavailable."""
+        if series_id not in self.quarterly.columns:
+            return pd.Series(dtype=float)
+        s = self.quarterly[series_id].dropna()
+        s.name = "VALUE"
+        s.index.name = "DATE"
+        return s
+
+    def frame(self, series_ids: Optional[Sequence[str]] = None, lag: int = 0) -> pd.DataFrame:
+        """Quarter × series frame for *series_ids* (available ones, in order)."""
+        cube = self.lagged(lag) if lag else self.quarterly
+        if series_ids is None:
+            return cube
+        return cube[[s for s in series_ids if s in cube.columns and cube[s].notna().any()]]
+
+    def lagged(self, k: int) -> pd.DataFrame:
+        """Cube shifted forward *k* quarters (row t = value at t-k)."""
+        if k == 0:
+            return self.quarterly
+        if k not in self._lagged:
+            q = self.quarterly
+            if q.empty:
+                self._lagged[k] = q
+            else:
+                idx = pd.date_range(q.index.min(), periods=len(q) + k, freq="QE")
+                self._lagged[k] = q.reindex(idx).shift(k).iloc[k:]
+        return self._lagged[k]
+
+
+def build_macro_cube(fred_long: pd.DataFrame, series_ids: Optional[Iterable[str]] = None,
+                     lags: Iterable[int] = (1,)) -> MacroCube:
+    """Build the cube from a long FRED table (``SeriesID``, ``DATE``, ``VALUE``)."""
+    sel = fred_long[["SeriesID", "DATE", "VALUE"]]
+    if series_ids is not None:
+        sel = sel[sel["SeriesID"].isin(list(series_ids))]
+    sel = sel.assign(VALUE=pd.to_numeric(sel["VALUE"], errors="coerce"),
+                     DATE=pd.to_datetime(sel["DATE"], errors="coerce"))
+    sel = sel.dropna(subset=["VALUE", "DATE"])
+    if sel.empty:
+        return MacroCube(pd.DataFrame(index=pd.DatetimeIndex([], freq="QE", name="DATE")), lags)
+    wide = (sel.sort_values("DATE", kind="stable")
+               .pivot_table(index="DATE", columns="SeriesID", values="VALUE", aggfunc="last"))
+    wide.columns.name = None
+    quarterly = wide.resample("QE").last()
+    quarterly.index.name = "DATE"
+    return MacroCube(quarterly, lags)
+
+
+def _centred(values: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """Subtract each column's mean over its present rows; absent rows become 0."""
+    count = present.sum(axis=0)
+    mean = np.where(present, values, 0.0).sum(axis=0) / np.maximum(count, 1)
+    return np.where(present, values - mean, 0.0)
+
+
+def pairwise_corr(a: pd.DataFrame, b: pd.DataFrame, min_periods: int = 4) -> pd.DataFrame:
+    """Pearson r for each (a column, b column) over rows where both are present.
+
+    *a* and *b* must share an index.  Pairs with fewer than *min_periods*
+    complete rows are NaN, as are pairs where either side is constant over
+    those rows.
+    """
+    x = a.to_numpy(dtype=float)
+    y = b.to_numpy(dtype=float)
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    # r is shift-invariant; centring first keeps the sums of squares well
+    # conditioned for large-level series (e.g. housing starts).
+    x0, y0 = _centred(x, mx), _centred(y, my)
+    fx, fy = mx.astype(float), my.astype(float)
+    n = fx.T @ fy
+    sx, sy = x0.T @ fy, fx.T @ y0
+    cov = n * (x0.T @ y0) - sx * sy
+    var_x = n * ((x0 ** 2).T @ fy) - sx ** 2
+    var_y = n * (fx.T @ (y0 ** 2)) - sy ** 2
+
+    # Exact constant-over-overlap test (rows x columns x columns is small)
+    joint = mx[:, :, None] & my[:, None, :]
+    xs = np.broadcast_to(x[:, :, None], joint.shape)
+    ys = np.broadcast_to(y[:, None, :], joint.shape)
+    const_x = np.where(joint, xs, -np.inf).max(axis=0) == np.where(joint, xs, np.inf).min(axis=0)
+    const_y = np.where(joint, ys, -np.inf).max(axis=0) == np.where(joint, ys, np.inf).min(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = cov / np.sqrt(np.clip(var_x, 0, None) * np.clip(var_y, 0, None))
+    r = np.clip(r, -1.0, 1.0)
+    r[(n < min_periods) | const_x | const_y] = np.nan
+    return pd.DataFrame(r, index=a.columns, columns=b.columns)
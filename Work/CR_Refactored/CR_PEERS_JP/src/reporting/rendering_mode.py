@@ -19,15 +19,27 @@ Key concepts:
     status (generated / skipped / failed), path, skip reason.
   * **RenderMode** — enum for the two modes.
   * **select_mode()** — resolves mode from env var / argument.
+  * **ArtifactCache** — content-addressed store of rendered artifacts so
+    unchanged charts/tables are copied instead of re-rendered.
+  * **ChartOutputPolicy** — chart file format (PNG, or vector-first SVG /
+    PDF with PNG rasterized only for the artifacts that need one);
+    charts are written through ``save_figure()``.
 """
 
 from __future__ import annotations
 
 import os
+import sys
 import enum
+import types
+import shutil
+import hashlib
+import inspect
+import threading
 import dataclasses
 from datetime import datetime
-from typing import List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
 
 
 # =====================================================================
@@ -287,6 +299,11 @@ class ArtifactOutcome:
     path: Optional[str] = None
     skip_reason: Optional[str] = None
     error: Optional[str] = None
+    cache_key: Optional[str] = None
+    cached: bool = False
+    output_format: Optional[str] = None   # primary chart format ("png", "svg", "pdf")
+    raster_path: Optional[str] = None     # PNG rendition of a vector chart
+    raster_dpi: Optional[int] = None      # requested PNG DPI (None → renderer default)
 
 
 class ArtifactManifest:
@@ -296,10 +313,18 @@ class ArtifactManifest:
         self.mode = mode
         self._outcomes: List[ArtifactOutcome] = []
 
-    def record_generated(self, name: str, path: str) -> None:
+    def record_generated(self, name: str, path: str,
+                         cache_key: Optional[str] = None,
+                         cached: bool = False,
+                         output_format: Optional[str] = None,
+                         raster_path: Optional[str] = None,
+                         raster_dpi: Optional[int] = None) -> None:
         self._outcomes.append(ArtifactOutcome(
             name=name, mode=self.mode.value,
             status=ArtifactStatus.GENERATED, path=path,
+            cache_key=cache_key, cached=cached,
+            output_format=output_format, raster_path=raster_path,
+            raster_dpi=raster_dpi,
         ))
 
     def record_skipped(self, name: str, reason: str) -> None:
@@ -327,6 +352,10 @@ class ArtifactManifest:
         ]
         for o in self._outcomes:
             detail = o.path or o.skip_reason or o.error or ""
+            if o.raster_path:
+                detail = f"{detail} (+png)"
+            if o.cached:
+                detail = f"{detail} (cached)"
             lines.append(
                 f"{o.name:<45} {o.mode:<12} {o.status.value:<10} {detail}"
             )
@@ -334,9 +363,11 @@ class ArtifactManifest:
         gen = sum(1 for o in self._outcomes if o.status == ArtifactStatus.GENERATED)
         skip = sum(1 for o in self._outcomes if o.status == ArtifactStatus.SKIPPED)
         fail = sum(1 for o in self._outcomes if o.status == ArtifactStatus.FAILED)
+        cached = sum(1 for o in self._outcomes if o.cached)
         lines.append("-" * 110)
         lines.append(f"Total: {len(self._outcomes)}  |  "
-                     f"Generated: {gen}  |  Skipped: {skip}  |  Failed: {fail}")
+                     f"Generated: {gen} ({cached} from cache)  |  "
+                     f"Skipped: {skip}  |  Failed: {fail}")
         return "\n".join(lines)
 
     def counts(self) -> dict[str, int]:
@@ -400,3 +431,370 @@ def should_produce(artifact_name: str, mode: RenderMode,
         return False
 
     return True
+
+
+# =====================================================================
+# Artifact Cache — content-hash reuse of unchanged artifacts
+# =====================================================================
+# Key = sha256 over (artifact name, RenderMode, renderer source hash,
+# positional/keyword arguments with DataFrames hashed by content and
+# workbook paths hashed by file bytes, rendering environment — Python and
+# plotting/data library versions plus the matplotlib rcParams in effect).
+# ``save_path`` is excluded: the same content under a new dated stem is
+# still a hit.
+#
+# Disable with REPORT_ARTIFACT_CACHE=0 (or generate_reports(use_cache=False)).
+
+_SRC_ROOT = Path(__file__).resolve().parents[1]
+_PLAIN_TYPES = (str, int, float, bool, type(None), tuple, list, dict,
+                set, frozenset)
+_IGNORED_KWARGS = {"save_path"}
+_KEY_LEN = 20
+_RENDER_LIBRARIES = ("matplotlib", "seaborn", "pandas", "numpy")
+
+
+def _project_source(obj) -> Optional[str]:
+    """Source text of *obj* if it is defined under src/, else None."""
+    try:
+        src_file = inspect.getsourcefile(obj)
+        if not src_file or _SRC_ROOT not in Path(src_file).resolve().parents:
+            return None
+        return inspect.getsource(obj)
+    except (TypeError, OSError):
+        return None
+
+
+def _code_names(code: types.CodeType) -> set:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def renderer_source_hash(fn, _seen: Optional[set] = None) -> str:
+    """Hash of *fn*'s source plus every project function, class and plain
+    constant it references by global name (transitively).
+
+    Editing one chart function changes only that chart's key; editing a
+    shared helper changes the key of every renderer that calls it.
+    """
+    seen = _seen if _seen is not None else set()
+    h = hashlib.sha256()
+    queue = [fn]
+    while queue:
+        obj = queue.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        src = _project_source(obj)
+        if src is None:
+            continue
+        h.update(f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', '')}".encode())
+        h.update(src.encode())
+        code = getattr(obj, "__code__", None)
+        env = getattr(obj, "__globals__", None)
+        if code is None or env is None:
+            continue
+        for name in sorted(_code_names(code)):
+            if name not in env:
+                continue
+            ref = env[name]
+            if inspect.isfunction(ref) or inspect.isclass(ref):
+                queue.append(ref)
+            elif isinstance(ref, _PLAIN_TYPES):
+                h.update(f"{name}={ref!r}".encode())
+    return h.hexdigest()
+
+
+def environment_fingerprint() -> str:
+    """Hash of the rendering environment outside src/: the Python and
+    ``_RENDER_LIBRARIES`` versions (as loaded) and matplotlib's effective
+    rcParams, so a library upgrade or style change misses the cache."""
+    h = hashlib.sha256(sys.version.encode())
+    for name in _RENDER_LIBRARIES:
+        mod = sys.modules.get(name)
+        h.update(f"|{name}={getattr(mod, '__version__', None)}".encode())
+    mpl = sys.modules.get("matplotlib")
+    if mpl is not None:
+        # dict.items: read stored values without resolving e.g. the auto backend
+        for k, v in sorted(dict.items(mpl.rcParams)):
+            h.update(f"|{k}={v!r}".encode())
+    return h.hexdigest()
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _update_digest(h, obj: Any) -> None:
+    """Feed a stable representation of a renderer argument into *h*."""
+    import pandas as pd  # deferred: rendering_mode stays import-light
+
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(type(obj).__name__.encode())
+        if isinstance(obj, pd.DataFrame):
+            h.update(repr(list(obj.columns)).encode())
+            h.update(repr([str(t) for t in obj.dtypes]).encode())
+        else:
+            h.update(f"{obj.name!r}|{obj.dtype}".encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, (str, os.PathLike)) and os.path.isfile(obj):
+        h.update(b"file:" + _file_digest(os.fspath(obj)).encode())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for k in sorted(obj, key=repr):
+            h.update(repr(k).encode())
+            _update_digest(h, obj[k])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for item in obj:
+            _update_digest(h, item)
+        h.update(b"]")
+    elif isinstance(obj, (set, frozenset)):
+        h.update(repr(sorted(obj, key=repr)).encode())
+    elif callable(obj):
+        h.update(f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', obj)!r}".encode())
+    else:
+        h.update(repr(obj).encode())
+
+
+class ArtifactCache:
+    """Content-addressed store of rendered artifacts for one output root.
+
+    Usage inside an artifact block::
+
+        key = cache.key_for(name, fn, args, kwargs)
+        if cache.restore(name, key, path):
+            manifest.record_generated(name, path, cache_key=key, cached=True)
+        else:
+            ...  # render to path
+            cache.store(name, key, path)
+    """
+
+    def __init__(self, cache_dir, mode: RenderMode, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.mode = mode
+        self.enabled = enabled
+        self._renderer_hashes: Dict[int, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, artifact_name: str, fn, args=(), kwargs=None,
+                variant: str = "") -> str:
+        """Cache key for rendering *artifact_name* via ``fn(*args, **kwargs)``.
+
+        *variant* distinguishes output settings that are not renderer
+        arguments (see ``ChartRequest.variant``).
+        """
+        fn_id = id(fn)
+        if fn_id not in self._renderer_hashes:
+            self._renderer_hashes[fn_id] = renderer_source_hash(fn)
+        h = hashlib.sha256()
+        h.update(f"{artifact_name}|{self.mode.value}|{variant}|".encode())
+        h.update(self._renderer_hashes[fn_id].encode())
+        h.update(environment_fingerprint().encode())
+        _update_digest(h, list(args))
+        _update_digest(h, {k: v for k, v in (kwargs or {}).items()
+                           if k not in _IGNORED_KWARGS})
+        return h.hexdigest()
+
+    def _entry(self, artifact_name: str, key: str, path: str) -> Path:
+        return self.cache_dir / f"{artifact_name}_{key[:_KEY_LEN]}{Path(path).suffix}"
+
+    def restore(self, artifact_name: str, key: str, path: str,
+                *extra_paths: str) -> bool:
+        """Copy a cached artifact to *path* (and its companion files, e.g. the
+        PNG of a vector chart, to *extra_paths*); True only if all are cached."""
+        if not self.enabled:
+            return False
+        targets = [(self._entry(artifact_name, key, p), p) for p in (path, *extra_paths)]
+        if not all(entry.is_file() for entry, _ in targets):
+            self.misses += 1
+            return False
+        for entry, target in targets:
+            shutil.copyfile(entry, target)
+        self.hits += 1
+        return True
+
+    def store(self, artifact_name: str, key: str, path: str) -> None:
+        """Save a freshly rendered artifact, replacing older entries for it."""
+        if not self.enabled or not os.path.isfile(path):
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(artifact_name, key, path)
+        prefix = f"{artifact_name}_"
+        for stale in self.cache_dir.glob(f"{prefix}*{entry.suffix}"):
+            tail = stale.stem[len(prefix):]
+            # tail check keeps "growth_vs_deterioration" from pruning "..._bookwide"
+            if stale != entry and len(tail) == _KEY_LEN and "_" not in tail:
+                stale.unlink()
+        shutil.copyfile(path, entry)
+
+
+def cache_enabled(explicit: Optional[bool] = None) -> bool:
+    """Resolve whether the artifact cache is on (argument, then
+    ``REPORT_ARTIFACT_CACHE`` env var, default on)."""
+    if explicit is not None:
+        return explicit
+    raw = os.getenv("REPORT_ARTIFACT_CACHE", "1").strip().lower()
+    return raw not in ("0", "false", "off", "no")
+
+
+# =====================================================================
+# Chart Output Format — vector-first charts, PNG only on demand
+# =====================================================================
+# PNG (default) keeps today's behaviour: every chart is rasterized at the
+# DPI its renderer passes to save_figure().  SVG / PDF make the vector file
+# the primary artifact; the expensive high-DPI rasterization runs only for
+# the artifacts listed in REPORT_PNG_ARTIFACTS (comma-separated names, or
+# "all"), from the same figure, at REPORT_RASTER_DPI when set.
+
+class ChartFormat(enum.Enum):
+    """Primary file format for matplotlib chart artifacts."""
+    PNG = "png"
+    SVG = "svg"
+    PDF = "pdf"
+
+    @property
+    def suffix(self) -> str:
+        return f".{self.value}"
+
+    @property
+    def is_vector(self) -> bool:
+        return self is not ChartFormat.PNG
+
+
+def select_chart_format(explicit: Optional[str] = None) -> ChartFormat:
+    """Resolve the chart format from *explicit*, then ``REPORT_CHART_FORMAT``,
+    default PNG.  Raises ``ValueError`` for unrecognised formats."""
+    raw = (explicit or os.getenv("REPORT_CHART_FORMAT") or "").strip().lower()
+    if not raw:
+        return ChartFormat.PNG
+    try:
+        return ChartFormat(raw)
+    except ValueError:
+        raise ValueError(
+            f"Unknown chart format '{raw}'. Valid values: png, svg, pdf"
+        ) from None
+
+
+def select_png_artifacts(explicit: Optional[Iterable[str]] = None) -> Optional[frozenset]:
+    """Artifacts that also get a PNG when charts are vector-first.
+
+    *explicit*, then ``REPORT_PNG_ARTIFACTS`` (comma-separated).  ``"all"``
+    returns None, meaning every chart; unset means none.
+    """
+    if explicit is None:
+        explicit = os.getenv("REPORT_PNG_ARTIFACTS", "").split(",")
+    names = frozenset(n.strip() for n in explicit if n and n.strip())
+    return None if "all" in names else names
+
+
+def select_raster_dpi(explicit: Optional[int] = None) -> Optional[int]:
+    """PNG DPI override from *explicit*, then ``REPORT_RASTER_DPI``; None keeps
+    each renderer's own DPI."""
+    if explicit is not None:
+        return int(explicit)
+    raw = os.getenv("REPORT_RASTER_DPI", "").strip()
+    return int(raw) if raw else None
+
+
+@dataclasses.dataclass(frozen=True)
+class ChartOutputPolicy:
+    """Which file(s) each chart artifact is written to."""
+    fmt: ChartFormat = ChartFormat.PNG
+    png_artifacts: Optional[frozenset] = frozenset()   # None → all charts
+    raster_dpi: Optional[int] = None
+
+    @classmethod
+    def from_env(cls, chart_format: Optional[str] = None,
+                 png_artifacts: Optional[Iterable[str]] = None,
+                 raster_dpi: Optional[int] = None) -> "ChartOutputPolicy":
+        return cls(select_chart_format(chart_format),
+                   select_png_artifacts(png_artifacts),
+                   select_raster_dpi(raster_dpi))
+
+    def wants_png(self, artifact_name: str) -> bool:
+        if not self.fmt.is_vector:
+            return True
+        return self.png_artifacts is None or artifact_name in self.png_artifacts
+
+    def request(self, artifact_name: str, path: str) -> "ChartRequest":
+        """Output plan for *artifact_name*, registered under the PNG *path*.
+
+        Only ``.png`` paths are redirected; HTML artifacts are untouched.
+        """
+        if Path(path).suffix.lower() != ".png":
+            return ChartRequest(artifact_name, path)
+        if not self.fmt.is_vector:
+            return ChartRequest(artifact_name, path, None, self.raster_dpi, ChartFormat.PNG)
+        primary = str(Path(path).with_suffix(self.fmt.suffix))
+        raster = path if self.wants_png(artifact_name) else None
+        return ChartRequest(artifact_name, primary, raster, self.raster_dpi, self.fmt)
+
+
+_ACTIVE_CHART = threading.local()
+
+
+@dataclasses.dataclass
+class ChartRequest:
+    """Where one chart artifact goes; active (for ``save_figure``) inside ``with``."""
+    artifact_name: str
+    primary_path: str
+    raster_path: Optional[str] = None
+    raster_dpi: Optional[int] = None
+    fmt: Optional[ChartFormat] = None     # None for non-chart (HTML) outputs
+
+    @property
+    def outputs(self) -> List[str]:
+        return [self.primary_path] + ([self.raster_path] if self.raster_path else [])
+
+    @property
+    def variant(self) -> str:
+        """Output settings that change the files written (part of the cache key)."""
+        if self.fmt is None or (self.fmt is ChartFormat.PNG and self.raster_dpi is None):
+            return ""   # default PNG output: keys unchanged from before formats existed
+        png = "+png" if self.raster_path else ""
+        return f"{self.fmt.value}{png}@{self.raster_dpi or 'default'}"
+
+    def manifest_fields(self) -> Dict[str, Any]:
+        """``record_generated`` keyword arguments for this request."""
+        if self.fmt is None:
+            return {}
+        raster = self.raster_path if self.fmt.is_vector else None
+        if raster and not os.path.isfile(raster):
+            raster = None
+        return {"output_format": self.fmt.value, "raster_path": raster,
+                "raster_dpi": self.raster_dpi if (raster or not self.fmt.is_vector) else None}
+
+    def __enter__(self) -> "ChartRequest":
+        self._outer = getattr(_ACTIVE_CHART, "request", None)
+        _ACTIVE_CHART.request = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _ACTIVE_CHART.request = self._outer
+
+
+def save_figure(fig, save_path: str, dpi: int = 300, **savefig_kwargs) -> None:
+    """Write a chart figure; drop-in for ``fig.savefig(save_path, dpi=..., ...)``.
+
+    Inside an active ``ChartRequest`` for *save_path* the request's DPI
+    override applies to PNG output, and a vector chart that needs a PNG is
+    rasterized from the same figure.  Elsewhere this is plain ``savefig``.
+    """
+    req = getattr(_ACTIVE_CHART, "request", None)
+    if req is None or os.path.abspath(save_path) != os.path.abspath(req.primary_path):
+        fig.savefig(save_path, dpi=dpi, **savefig_kwargs)
+        return
+    raster_dpi = req.raster_dpi or dpi
+    fig.savefig(save_path, dpi=dpi if req.fmt and req.fmt.is_vector else raster_dpi,
+                **savefig_kwargs)
+    if req.raster_path and req.raster_path != req.primary_path:
+        fig.savefig(req.raster_path, dpi=raster_dpi, **savefig_kwargs)
@@ -45,7 +45,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Callable, Dict, List, Tuple, Optional, Any
 from matplotlib.gridspec import GridSpec
 
 try:
@@ -65,7 +65,10 @@ from rendering_mode import (
     ArtifactAvailability, ArtifactCapability,
     ArtifactManifest, ArtifactStatus, ARTIFACT_REGISTRY,
     should_produce, is_artifact_available,
+    ArtifactCache, cache_enabled,
+    ChartOutputPolicy, ChartRequest, save_figure,
 )
+from pipeline_dag import PipelineDAG
 
 # Metric dependency and consumer mapping is centrally managed by metric_registry.py.
 # The REPORT_CONSUMER_MAP dict maps each metric code to the list of downstream
@@ -118,6 +121,17 @@ from chart_config import (
     resolve_display_label,
     CHART_COLORS, _build_cert_color_map,
 )
+from label_engine import (
+    PlacementIndex, centered_rects, label_size_px, point_rects, to_display,
+)
+from macro_cube import MacroCube, build_macro_cube, pairwise_corr
+from html_tables import (
+    FLEX_CSS, FLEX_PAGE, SUBJECT_VALUE_CSS, TREND_CSS, cell, container_css,
+    fmt_billions_col, fmt_money_col, fmt_multiple_col, fmt_percent_col,
+    format_block, format_col, header_cells, latest_snapshot, render_navy_page,
+    trend_classes,
+)
+from report_views import panel_views
 
 
 # ==================================================================================
@@ -138,6 +152,9 @@ class ChartAnnotationHelper:
       - Endpoint labels preferred on time-series charts
       - Value labels on bar/line combos are sparse and strategic
       - Leader lines allowed on scatter plots for displaced labels
+
+    Placed rectangles live in a ``PlacementIndex`` (uniform grid over display
+    coordinates); all candidate offsets for a label are tested in one pass.
     """
 
     # Priority tiers for label placement
@@ -146,27 +163,26 @@ class ChartAnnotationHelper:
     TIER_ALL_PEERS = 3  # All Peers — label only if explicitly plotted
     TIER_INDIVIDUAL = 4 # Individual peers — outlier/edge only
 
+    _DEFAULT_DIRECTIONS = [
+        (10, 12), (12, -12), (-10, 12), (-12, -12),
+        (16, 0), (-16, 0), (0, 16), (0, -16),
+        (22, 14), (-22, 14), (22, -14), (-22, -14),
+        (30, 0), (-30, 0), (0, 30), (0, -30),
+    ]
+
     def __init__(self, ax, tag_size: int = 12):
         self.ax = ax
         self.tag_size = tag_size
-        self._placed_rects = []  # list of (x0, y0, x1, y1) in display coords
+        self._index = PlacementIndex()  # placed (x0, y0, x1, y1) rects in display coords
 
     def _rect_for(self, x_data, y_data, xpx, ypx, text, pad=6):
         """Compute bounding rect in display coords for a label at (x_data, y_data) + pixel offset."""
-        xd, yd = self.ax.transData.transform((x_data, y_data))
-        cx, cy = xd + xpx, yd + ypx
-        w = max(40.0, 0.62 * self.tag_size * len(text)) + 2 * pad
-        h = self.tag_size * 1.7 + 2 * pad
-        return (cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2)
-
-    @staticmethod
-    def _rects_overlap(a, b):
-        ax0, ay0, ax1, ay1 = a
-        bx0, by0, bx1, by1 = b
-        return not (ax1 < bx0 or bx1 < ax0 or ay1 < by0 or by1 < ay0)
+        anchor = to_display(self.ax, [x_data], [y_data])[0]
+        w, h = label_size_px(text, self.tag_size, pad)
+        return tuple(centered_rects(anchor, [(xpx, ypx)], w, h)[0])
 
     def _can_place(self, rect):
-        return all(not self._rects_overlap(rect, r) for r in self._placed_rects)
+        return not self._index.overlaps([rect])[0]
 
     def place_label(self, x, y, text, tier=4, color="black", box=True,
                     preferred_directions=None, fontweight="bold"):
@@ -194,43 +210,48 @@ class ChartAnnotationHelper:
         bool
             True if label was placed successfully, False if skipped due to crowding.
         """
-        if preferred_directions is None:
-            preferred_directions = [
-                (10, 12), (12, -12), (-10, 12), (-12, -12),
-                (16, 0), (-16, 0), (0, 16), (0, -16),
-                (22, 14), (-22, 14), (22, -14), (-22, -14),
-                (30, 0), (-30, 0), (0, 30), (0, -30),
-            ]
+        anchor = to_display(self.ax, [x], [y])[0]
+        return self._place_at(anchor, x, y, text, tier, color, box,
+                              preferred_directions, fontweight)
 
-        for dx, dy in preferred_directions:
-            rect = self._rect_for(x, y, dx, dy, text)
-            if self._can_place(rect):
-                bbox_props = (dict(boxstyle="round,pad=0.25", fc="white", ec="black",
-                                   lw=0.6, alpha=0.95) if box else None)
-                arrow_props = (dict(arrowstyle="->", lw=1.0, color="black") if box else None)
-                self.ax.annotate(
-                    text, xy=(x, y), xytext=(dx, dy), textcoords="offset points",
-                    fontsize=self.tag_size, fontweight=fontweight, color=color,
-                    bbox=bbox_props, arrowprops=arrow_props, va="center", zorder=10,
-                )
-                self._placed_rects.append(rect)
-                return True
-
-        # Fallback: place at first candidate regardless of overlap (for tier 1-2 only)
-        if tier <= 2 and preferred_directions:
-            dx, dy = preferred_directions[0]
-            rect = self._rect_for(x, y, dx, dy, text)
-            bbox_props = (dict(boxstyle="round,pad=0.25", fc="white", ec="black",
-                               lw=0.6, alpha=0.95) if box else None)
-            arrow_props = (dict(arrowstyle="->", lw=1.0, color="black") if box else None)
-            self.ax.annotate(
-                text, xy=(x, y), xytext=(dx, dy), textcoords="offset points",
-                fontsize=self.tag_size, fontweight=fontweight, color=color,
-                bbox=bbox_props, arrowprops=arrow_props, va="center", zorder=10,
-            )
-            self._placed_rects.append(rect)
-            return True
-        return False
+    def place_labels(self, xs, ys, texts, tier=4, color="black", box=True,
+                     preferred_directions=None, fontweight="bold"):
+        """Place many labels in order, transforming all anchors in one call.
+
+        Returns a list of booleans as from ``place_label``.
+        """
+        anchors = to_display(self.ax, xs, ys)
+        return [self._place_at(anchor, x, y, text, tier, color, box,
+                               preferred_directions, fontweight)
+                for anchor, x, y, text in zip(anchors, xs, ys, texts)]
+
+    def _place_at(self, anchor, x, y, text, tier, color, box,
+                  preferred_directions, fontweight):
+        if preferred_directions is None:
+            preferred_directions = self._DEFAULT_DIRECTIONS
+        if not preferred_directions:
+            return False
+
+        w, h = label_size_px(text, self.tag_size)
+        rects = centered_rects(anchor, preferred_directions, w, h)
+        k = self._index.first_free(rects)
+        if k < 0:
+            # Fallback: place at first candidate regardless of overlap (for tier 1-2 only)
+            if tier > 2:
+                return False
+            k = 0
+
+        dx, dy = preferred_directions[k]
+        bbox_props = (dict(boxstyle="round,pad=0.25", fc="white", ec="black",
+                           lw=0.6, alpha=0.95) if box else None)
+        arrow_props = (dict(arrowstyle="->", lw=1.0, color="black") if box else None)
+        self.ax.annotate(
+            text, xy=(x, y), xytext=(dx, dy), textcoords="offset points",
+            fontsize=self.tag_size, fontweight=fontweight, color=color,
+            bbox=bbox_props, arrowprops=arrow_props, va="center", zorder=10,
+        )
+        self._index.add(rects[k])
+        return True
 
     def place_endpoint_label(self, x, y, text, color="black"):
         """Place a right-aligned endpoint label on a time-series chart.
@@ -244,7 +265,7 @@ class ChartAnnotationHelper:
 
     def register_fixed_rect(self, x0, y0, x1, y1):
         """Register a fixed rectangle (e.g., from bar labels) to avoid collisions."""
-        self._placed_rects.append((x0, y0, x1, y1))
+        self._index.add((x0, y0, x1, y1))
 
 
 # ==================================================================================
@@ -258,6 +279,8 @@ class _ReportContext:
     manifest: ArtifactManifest
     base_stem: str
     suppressed_charts: frozenset = field(default_factory=frozenset)
+    cache: Optional[ArtifactCache] = None
+    chart_output: ChartOutputPolicy = field(default_factory=ChartOutputPolicy)
 
 
 # ==================================================================================
@@ -359,7 +382,7 @@ def validate_composite_cert_regime(proc_df: pd.DataFrame) -> Dict[str, Any]:
         - warnings: list[str]
         - errors: list[str]
     """
-    certs_in_data = set(proc_df["CERT"].unique()) if not proc_df.empty else set()
+    certs_in_data = set(panel_views(proc_df).certs)
     active_certs = set(ACTIVE_STANDARD_COMPOSITES.values()) | set(ACTIVE_NORMALIZED_COMPOSITES.values())
     active_present = certs_in_data & active_certs
     active_missing = active_certs - certs_in_data
@@ -399,6 +422,9 @@ _ARTIFACT_NAMES = {
 class LabelPlacer:
     """Pixel-coordinate collision-avoidance engine for chart annotations.
 
+    Placed positions are kept in a ``PlacementIndex`` as proximity boxes, so
+    each label is checked only against nearby ones.
+
     Usage:
         placer = LabelPlacer(ax)
         placer.place(x, y, "MSPBNA", priority=1, color="black", box=True)
@@ -423,24 +449,28 @@ class LabelPlacer:
         self.tag_size = tag_size
         self.x_threshold = x_threshold
         self.y_threshold = y_threshold
-        self._placed: List[Tuple[float, float]] = []  # screen coords of placed labels
+        # screen coords of placed labels, as proximity boxes
+        self._placed = PlacementIndex(strict=True)
 
     def _screen(self, x_data: float, y_data: float) -> Tuple[float, float]:
-        return self.ax.transData.transform((x_data, y_data))
+        return tuple(to_display(self.ax, [x_data], [y_data])[0])
+
+    def _boxes(self, points) -> np.ndarray:
+        return point_rects(points, self.x_threshold, self.y_threshold)
 
     def _overlaps(self, sx: float, sy: float) -> bool:
-        return any(abs(sx - ox) < self.x_threshold and abs(sy - oy) < self.y_threshold
-                   for ox, oy in self._placed)
+        return bool(self._placed.overlaps(self._boxes([(sx, sy)]))[0])
 
     def _pick_offset(self, x_data: float, y_data: float,
                      inline: bool = False) -> Tuple[int, int]:
         candidates = self._INLINE_CANDIDATES if inline else self._DEFAULT_CANDIDATES
         sx, sy = self._screen(x_data, y_data)
-        for dx, dy in candidates:
-            if not self._overlaps(sx + dx, sy + dy):
-                self._placed.append((sx + dx, sy + dy))
-                return dx, dy
-        self._placed.append((sx, sy))
+        boxes = self._boxes(np.asarray(candidates, dtype=float) + (sx, sy))
+        k = self._placed.first_free(boxes)
+        if k >= 0:
+            self._placed.add(boxes[k])
+            return candidates[k]
+        self._placed.add(self._boxes([(sx, sy)])[0])
         return candidates[0]
 
     def place(self, x_data: float, y_data: float, text: str, *,
@@ -469,8 +499,7 @@ class LabelPlacer:
 
     def reserve(self, x_data: float, y_data: float) -> None:
         """Reserve a screen position to prevent future labels from overlapping."""
-        sx, sy = self._screen(x_data, y_data)
-        self._placed.append((sx, sy))
+        self._placed.add(self._boxes([self._screen(x_data, y_data)])[0])
 
 
 def validate_output_inputs(
@@ -907,6 +936,41 @@ def _fmt_call_report_date(d) -> str:
     return str(d)
 
 
+_EMAIL_FOOTNOTE = """
+    <div class="footnote">
+        <p><b>Methodology:</b></p>
+        <p><b>Risk-Adj ACL Ratio:</b> Total ACL / (Gross Loans - SBL). Removes low-risk SBL to show coverage on core credit.</p>
+        <p><b>CRE NPL Coverage:</b> CRE-Specific ACL / CRE Nonaccrual Loans.</p>
+    </div>"""
+
+_NORMALIZED_FOOTNOTE = '<p style="font-size: 10px; color: #555; text-align: left;">* Normalized for comparison</p>'
+
+
+def _email_cell_class(col: str, val, metric: str) -> str:
+    """CSS class for one executive-summary cell (entity highlight or delta trend)."""
+    cls = ""
+    if col == "Metric": cls = "metric-name"
+    elif col == "MSPBNA": cls = "subject-value"
+    elif col == "MSBNA": cls = "msbna-value"
+
+    # Trend Coloring Logic based on original files
+    if "Diff" in col and "N/A" not in str(val):
+        try:
+            num = float(str(val).replace('+','').replace('%','').replace('x','').replace('$','').replace('B','').replace(',',''))
+            if abs(num) < 0.001:
+                cls = "neutral-trend"
+            else:
+                # Coverage/ratio semantics checked FIRST — a higher ACL
+                # coverage ratio is safer even if the label contains "Risk".
+                is_safe = any(k in metric for k in ['Coverage', 'ACL Ratio', 'Equity', 'ROA', 'ROE', 'Yield', 'Margin'])
+                is_risk = not is_safe and any(k in metric for k in ['Nonaccrual', 'NCO', 'Delinq', 'Risk'])
+                if is_safe: cls = "good-trend" if num > 0 else "bad-trend"
+                elif is_risk: cls = "bad-trend" if num > 0 else "good-trend"
+                else: cls = "neutral-trend"
+        except: pass
+    return cls
+
+
 def generate_html_email_table_dynamic(df: pd.DataFrame, report_date: datetime,
                                       table_type: str, title: Optional[str] = None,
                                       is_normalized: bool = False) -> str:
@@ -917,78 +981,24 @@ def generate_html_email_table_dynamic(df: pd.DataFrame, report_date: datetime,
         title = "Executive Credit Summary" if table_type == "summary" else "Detailed Peer Analysis"
     max_width = "1200px" if table_type == "summary" else "1600px"
 
-    html = f"""
-    <html><head><style>
-        body {{ font-family: Arial, sans-serif; background-color: transparent; }}
-        .email-container {{
-            background-color: transparent; padding: 20px; max-width: {max_width}; margin: 0 auto; text-align: center;
-        }}
-        h3 {{ color: #002F6C; margin-bottom: 5px; text-align: center; }}
-        p.date-header {{ margin-top: 0; font-weight: bold; color: #555; text-align: center; margin-bottom: 20px; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 0 auto; font-size: 11px; background-color: transparent; }}
-        th {{ background-color: #002F6C; color: white; padding: 8px; border: 1px solid #2c3e50; }}
-        td {{ padding: 6px; text-align: center; border: 1px solid #e0e0e0; background-color: transparent; }}
-
-        .metric-name {{ text-align: left !important; font-weight: bold; color: #2c3e50; min-width: 180px; background-color: transparent; }}
-        .subject-value {{ background-color: #E6F3FF !important; font-weight: bold; color: #002F6C; border-left: 2px solid #002F6C; border-right: 2px solid #002F6C; }}
-        .msbna-value {{ background-color: rgba(76, 120, 168, 0.08) !important; font-weight: 600; color: #444; }}
-
-        .bad-trend {{ color: #d32f2f; font-weight: bold; }}
-        .good-trend {{ color: #388e3c; font-weight: bold; }}
-        .neutral-trend {{ color: #757575; font-weight: bold; }}
-
-        .footnote {{ font-size: 10px; color: #666; margin-top: 20px; border-top: 1px solid #ccc; padding-top: 10px; text-align: left; }}
-    </style></head><body>
-
-    <div class="email-container">
-        <h3>{title}</h3>
-        <p class="date-header">{date_str}</p>
-        <table><thead><tr>"""
-
-    for c in cols: html += f"<th>{c}</th>"
-    html += "</tr></thead><tbody>"
-
-    for _, row in df.iterrows():
-        metric = row['Metric']
-        html += "<tr>"
-        for c in cols:
-            val = row[c]
-            cls = ""
-            if c == "Metric": val = f"<b>{val}</b>"; cls = 'class="metric-name"'
-            elif c == "MSPBNA": cls = 'class="subject-value"'
-            elif c == "MSBNA": cls = 'class="msbna-value"'
-
-            # Trend Coloring Logic based on original files
-            if "Diff" in c and "N/A" not in str(val):
-                try:
-                    num = float(str(val).replace('+','').replace('%','').replace('x','').replace('$','').replace('B','').replace(',',''))
-                    if abs(num) < 0.001:
-                        cls = 'class="neutral-trend"'
-                    else:
-                        # Coverage/ratio semantics checked FIRST — a higher ACL
-                        # coverage ratio is safer even if the label contains "Risk".
-                        is_safe = any(k in metric for k in ['Coverage', 'ACL Ratio', 'Equity', 'ROA', 'ROE', 'Yield', 'Margin'])
-                        is_risk = not is_safe and any(k in metric for k in ['Nonaccrual', 'NCO', 'Delinq', 'Risk'])
-                        if is_safe: cls = 'class="good-trend"' if num > 0 else 'class="bad-trend"'
-                        elif is_risk: cls = 'class="bad-trend"' if num > 0 else 'class="good-trend"'
-                        else: cls = 'class="neutral-trend"'
-                except: pass
-
-            html += f"<td {cls}>{val}</td>"
-        html += "</tr>"
-
-    norm_footnote = ""
-    if is_normalized:
-        norm_footnote = '<p style="font-size: 10px; color: #555; text-align: left;">* Normalized for comparison</p>'
-    html += f"""</tbody></table>
-    {norm_footnote}
-    <div class="footnote">
-        <p><b>Methodology:</b></p>
-        <p><b>Risk-Adj ACL Ratio:</b> Total ACL / (Gross Loans - SBL). Removes low-risk SBL to show coverage on core credit.</p>
-        <p><b>CRE NPL Coverage:</b> CRE-Specific ACL / CRE Nonaccrual Loans.</p>
-    </div></div></body></html>"""
-
-    return html
+    rows = []
+    for rec in df.itertuples(index=False, name=None):
+        metric = rec[cols.index("Metric")]
+        cells = []
+        for c, val in zip(cols, rec):
+            if c == "Metric": val = f"<b>{val}</b>"
+            cells.append(cell(val, _email_cell_class(c, val, metric)))
+        rows.append("<tr>" + "".join(cells) + "</tr>")
+
+    extra_css = (
+        container_css(max_width),
+        SUBJECT_VALUE_CSS,
+        ".msbna-value { background-color: rgba(76, 120, 168, 0.08) !important; font-weight: 600; color: #444; }",
+        *TREND_CSS,
+        ".footnote { font-size: 10px; color: #666; margin-top: 20px; border-top: 1px solid #ccc; padding-top: 10px; text-align: left; }",
+    )
+    footer = (_NORMALIZED_FOOTNOTE if is_normalized else "") + _EMAIL_FOOTNOTE
+    return render_navy_page(extra_css, title, date_str, header_cells(cols), rows, footer)
 
 
 def generate_credit_metrics_email_table(
@@ -1053,73 +1063,55 @@ def generate_credit_metrics_email_table(
             "Provision_to_Loans_Rate": ("Provision Rate (%)", '%'),
         }
 
-    latest_date = proc_df_with_peers["REPDTE"].max()
-    latest_data = proc_df_with_peers[proc_df_with_peers["REPDTE"] == latest_date]
+    snap = latest_snapshot(proc_df_with_peers)
+    latest_date = snap.date
 
     # Wealth Peers = Core PB composite (90001 standard, 90004 normalized)
     wealth_peers_cert = ACTIVE_NORMALIZED_COMPOSITES["core_pb"] if is_normalized else ACTIVE_STANDARD_COMPOSITES["core_pb"]
 
     # Identify wealth peer constituents (Goldman, UBS) via resolver
     peer_certs = []  # (cert, label)
-    for c in latest_data["CERT"].unique():
+    for c in snap.certs:
         if c in ALL_COMPOSITE_CERTS or c == subject_bank_cert:
             continue
-        raw_name = str(latest_data[latest_data["CERT"] == c]["NAME"].iloc[0])
-        label = resolve_display_label(c, raw_name, subject_cert=subject_bank_cert)
+        label = resolve_display_label(c, snap.name(c), subject_cert=subject_bank_cert)
         if label in ("GS", "UBS"):
             peer_certs.append((c, label))
 
-    try:
-        subj = latest_data[latest_data["CERT"] == subject_bank_cert].iloc[0]
-    except IndexError:
+    if subject_bank_cert not in snap:
         return None, None
 
-    def _safe_row(cert):
-        if cert is None:
-            return None
-        sl = latest_data[latest_data["CERT"] == cert]
-        return sl.iloc[0] if not sl.empty else None
-
     # Build ordered column map: MSPBNA, peer tickers, Wealth Peers
-    col_entities = [("MSPBNA", subj)]
+    col_entities = [("MSPBNA", subject_bank_cert)]
     for pc, lbl in sorted(peer_certs, key=lambda x: x[1]):
-        col_entities.append((lbl, _safe_row(pc)))
+        col_entities.append((lbl, pc))
     wealth_label = resolve_display_label(wealth_peers_cert)
-    col_entities.append((wealth_label, _safe_row(wealth_peers_cert)))
+    col_entities.append((wealth_label, wealth_peers_cert))
+
+    codes = [code for code in metric_map if snap.has_column(code)]
+    vals = snap.block(codes, [cert for _, cert in col_entities])
+
+    # Dead-metric suppression
+    live = ~np.all(np.isnan(vals) | (np.abs(vals) < 1e-12), axis=1)
+    codes, vals = [c for c, keep in zip(codes, live) if keep], vals[live]
+    kinds = [metric_map[code][1] for code in codes]
+
+    v_subj, v_wealth = vals[:, 0], vals[:, -1]
+    delta = v_subj - v_wealth
+    cells = format_block(vals, kinds, {"B": fmt_money_col, "x": fmt_multiple_col, "%": fmt_percent_col})
+    # Percent deltas take their scale from the MSPBNA value (see _fmt_percent_diff)
+    deltas = format_block(delta, kinds, {
+        "B": lambda d, ref: fmt_money_col(d, signed=True),
+        "x": lambda d, ref: fmt_multiple_col(d, signed=True),
+        "%": lambda d, ref: fmt_percent_col(d, signed=True, ref=ref),
+    }, ref=v_subj)
 
     rows = []
-    for code, (disp, fmt) in metric_map.items():
-        if code not in subj.index:
-            continue
-
-        vals = {}
-        for lbl, entity_row in col_entities:
-            vals[lbl] = entity_row.get(code, np.nan) if entity_row is not None else np.nan
-
-        # Dead-metric suppression
-        if all(pd.isna(v) or (isinstance(v, (int, float)) and abs(v) < 1e-12) for v in vals.values()):
-            continue
-
-        v_subj = vals["MSPBNA"]
-        v_wealth = vals[wealth_label]
-        delta = v_subj - v_wealth if pd.notna(v_subj) and pd.notna(v_wealth) else np.nan
-
-        row = {"Metric": disp}
-        for lbl, _ in col_entities:
-            v = vals[lbl]
-            if fmt == 'B':
-                row[lbl] = _fmt_money_billions(v)
-            elif fmt == 'x':
-                row[lbl] = _fmt_multiple(v)
-            else:
-                row[lbl] = _fmt_percent(v)
-
-        if fmt == 'B':
-            row["Delta MSPBNA vs Wealth Peers"] = _fmt_money_billions_diff(delta)
-        elif fmt == 'x':
-            row["Delta MSPBNA vs Wealth Peers"] = _fmt_multiple_diff(delta)
-        else:
-            row["Delta MSPBNA vs Wealth Peers"] = _fmt_percent_diff(delta, v_subj)
+    for i, code in enumerate(codes):
+        row = {"Metric": metric_map[code][0]}
+        for j, (lbl, _) in enumerate(col_entities):
+            row[lbl] = cells[i, j]
+        row["Delta MSPBNA vs Wealth Peers"] = deltas[i]
         rows.append(row)
 
     df = pd.DataFrame(rows)
@@ -1146,8 +1138,8 @@ def generate_flexible_html_table(
     if proc_df_with_peers.empty or not metrics_to_display:
         return "<p>No data or metrics provided for table generation.</p>"
 
-    latest_date = proc_df_with_peers['REPDTE'].max()
-    latest_data = proc_df_with_peers[proc_df_with_peers['REPDTE'] == latest_date]
+    snap = latest_snapshot(proc_df_with_peers)
+    latest_date = snap.date
 
     if peer_certs is None:
         peer_certs = [ACTIVE_STANDARD_COMPOSITES["core_pb"], ACTIVE_STANDARD_COMPOSITES["all_peers"]]
@@ -1164,94 +1156,22 @@ def generate_flexible_html_table(
             '8Q_Avg': '8-Qtr Average'
         }
 
-    html = f"""
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 0; background-color: #f3f4f6; }}
-            .email-container {{
-                background-color: white;
-                padding: 20px;
-                border-radius: 8px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                max-width: 1200px;
-                margin: 20px auto;
-            }}
-            .header {{ text-align: center; margin-bottom: 20px; }}
-            .header h2 {{ margin: 0; font-size: 20px; color: #2d3748; }}
-            .header p {{ margin: 5px 0 0 0; color: #718096; font-size: 12px; }}
-            table {{
-                width: 100%;
-                border-collapse: separate;
-                border-spacing: 0;
-                overflow: hidden;
-                border-radius: 8px;
-            }}
-            .table-header {{ background-color: #f7a81b; color: #ffffff; font-weight: bold; }}
-            .sub-header {{ background-color: #f7a81b; color: #ffffff; font-weight: bold; text-align: center; }}
-            th, td {{ padding: 12px 15px; text-align: left; border: 1px solid #e2e8f0; }}
-            th {{ font-size: 14px; text-transform: uppercase; letter-spacing: 0.05em; }}
-            .metric-name {{ font-weight: normal; color: #2d3748; }}
-            .value-cell {{ text-align: center; }}
-            tr:nth-child(even) {{ background-color: #f7fafc; }}
-            tr:hover {{ background-color: #edf2f7; }}
-            .mspbna-row {{ background-color: #fff3cd; font-weight: 600; }}
-        </style>
-    </head>
-    <body>
-        <div class="email-container">
-            <div class="header">
-                <h2>{title}</h2>
-                <p>Report Date: {latest_date.strftime('%B %d, %Y')}</p>
-            </div>
-            <table>
-                <thead>
-                    <tr class="table-header">
-                        <th>Bank Name</th>
-                        <th>HQ State</th>
-    """
-
-    for display_name in metrics_to_display.values():
-        html += f'<th class="value-cell">{display_name}</th>'
-
-    html += """
-                    </tr>
-                </thead>
-                <tbody>
-    """
+    certs_to_include = [c for c in certs_to_include if c in snap]
+    values = format_col(snap.block(list(metrics_to_display), certs_to_include), "{:.2f}%")
 
-    for cert in certs_to_include:
-        latest_row = latest_data[latest_data['CERT'] == cert]
-        if latest_row.empty:
-            continue
-
-        latest_row = latest_row.iloc[0]
+    rows = []
+    for j, cert in enumerate(certs_to_include):
+        latest_row = snap.row(cert)
         name = latest_row.get('NAME', 'N/A')
         hq = latest_row.get('HQ_STATE', 'N/A')
-
         row_class = "mspbna-row" if cert == subject_bank_cert else ""
+        rows.append(f'<tr class="{row_class}">' + cell(name, "metric-name") + cell(hq)
+                    + "".join(cell(v, "value-cell") for v in values[:, j]) + "</tr>")
 
-        html += f"""
-                    <tr class="{row_class}">
-                        <td class="metric-name">{name}</td>
-                        <td>{hq}</td>
-        """
-
-        for metric_code in metrics_to_display.keys():
-            value = latest_row.get(metric_code, np.nan)
-            formatted_value = f"{value:.2f}%" if not pd.isna(value) else "N/A"
-            html += f'<td class="value-cell">{formatted_value}</td>'
-
-        html += "</tr>"
-
-    html += """
-                </tbody>
-            </table>
-        </div>
-    </body>
-    </html>
-    """
-    return html
+    header = "<th>Bank Name</th><th>HQ State</th>" + "".join(
+        f'<th class="value-cell">{display_name}</th>' for display_name in metrics_to_display.values())
+    return FLEX_PAGE.substitute(css=FLEX_CSS, title=title, date=latest_date.strftime('%B %d, %Y'),
+                                header=header, rows="".join(rows))
 
 
 # ==================================================================================
@@ -1306,14 +1226,13 @@ def generate_detailed_peer_table(
     subject_bank_cert: int = 34221,
     is_normalized: bool = False,
 ) -> Optional[str]:
-    latest_date = proc_df_with_peers["REPDTE"].max()
-    latest_data = proc_df_with_peers[proc_df_with_peers["REPDTE"] == latest_date].copy()
+    snap = latest_snapshot(proc_df_with_peers)
 
     msbna_cert = _MSBNA_CERT
 
     # 1. Individual peers excluding Subject, MSBNA, and Composites
     individual_peer_certs = [
-        c for c in latest_data["CERT"].unique()
+        c for c in snap.certs
         if c not in ALL_COMPOSITE_CERTS and c not in (subject_bank_cert, msbna_cert)
     ]
 
@@ -1322,8 +1241,7 @@ def generate_detailed_peer_table(
         msbna_cert: resolve_display_label(msbna_cert),
     }
     for c in individual_peer_certs:
-        raw_name = str(latest_data[latest_data["CERT"] == c]["NAME"].iloc[0])
-        col_mapping[c] = resolve_display_label(c, raw_name, subject_cert=subject_bank_cert)
+        col_mapping[c] = resolve_display_label(c, snap.name(c), subject_cert=subject_bank_cert)
 
     peer_avg_cert = ACTIVE_NORMALIZED_COMPOSITES["all_peers"] if is_normalized else ACTIVE_STANDARD_COMPOSITES["all_peers"]
     col_mapping[peer_avg_cert] = resolve_display_label(peer_avg_cert)
@@ -1367,7 +1285,7 @@ def generate_detailed_peer_table(
 
     return _build_dynamic_peer_html(
         title, ordered_certs, col_mapping, metrics,
-        latest_data, subject_bank_cert, peer_avg_cert, latest_date,
+        snap, subject_bank_cert, peer_avg_cert,
         is_normalized=is_normalized,
     )
 
@@ -1382,17 +1300,15 @@ def generate_core_pb_peer_table(
     No MS. Uses resolve_display_label() for ticker-style names.
     'Wealth Peers' = Core PB composite (90001 std, 90004 norm).
     """
-    latest_date = proc_df_with_peers["REPDTE"].max()
-    latest_data = proc_df_with_peers[proc_df_with_peers["REPDTE"] == latest_date].copy()
+    snap = latest_snapshot(proc_df_with_peers)
 
     # Identify Core PB constituents via resolver
     core_pb_certs = []
     col_mapping = {subject_bank_cert: resolve_display_label(subject_bank_cert, subject_cert=subject_bank_cert)}
-    for c in latest_data["CERT"].unique():
+    for c in snap.certs:
         if c in ALL_COMPOSITE_CERTS or c == subject_bank_cert:
             continue
-        raw_name = str(latest_data[latest_data["CERT"] == c]["NAME"].iloc[0])
-        label = resolve_display_label(c, raw_name, subject_cert=subject_bank_cert)
+        label = resolve_display_label(c, snap.name(c), subject_cert=subject_bank_cert)
         if label in ("GS", "UBS"):
             core_pb_certs.append(c)
             col_mapping[c] = label
@@ -1439,7 +1355,7 @@ def generate_core_pb_peer_table(
 
     return _build_dynamic_peer_html(
         title, ordered_certs, col_mapping, metrics,
-        latest_data, subject_bank_cert, peer_avg_cert, latest_date,
+        snap, subject_bank_cert, peer_avg_cert,
         is_normalized=is_normalized,
     )
 
@@ -1451,91 +1367,61 @@ def _normalize_display_name(disp: str) -> str:
     return disp
 
 
+# Value / delta formats shared by the peer and segment tables ("B" = FDIC $K as billions)
+def _peer_value_formats(grouping: bool) -> Dict[str, Callable]:
+    return {"x": fmt_multiple_col, "%": fmt_percent_col,
+            "B": lambda v: fmt_billions_col(v, grouping=grouping)}
+
+
+def _peer_delta_formats(grouping: bool) -> Dict[str, Callable]:
+    return {"x": lambda d: fmt_multiple_col(d, signed=True),
+            "%": lambda d: fmt_percent_col(d, signed=True),
+            "B": lambda d: fmt_billions_col(d, signed=True, grouping=grouping)}
+
+
 def _build_dynamic_peer_html(title, ordered_certs, col_mapping, metrics,
-                             latest_data, subject_cert, avg_cert, latest_date,
+                             snapshot, subject_cert, avg_cert,
                              is_normalized: bool = False):
     """Shared HTML builder for detailed peer and core PB tables."""
-    html = f"""<html><head><style>
-        body {{ font-family: Arial, sans-serif; background-color: transparent; }}
-        .email-container {{ background-color: transparent; padding: 20px; max-width: 1600px; margin: 0 auto; text-align: center; }}
-        h3 {{ color: #002F6C; margin-bottom: 5px; text-align: center; }}
-        p.date-header {{ margin-top: 0; font-weight: bold; color: #555; text-align: center; margin-bottom: 20px; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 0 auto; font-size: 11px; background-color: transparent; }}
-        th {{ background-color: #002F6C; color: white; padding: 8px; border: 1px solid #2c3e50; }}
-        td {{ padding: 6px; text-align: center; border: 1px solid #e0e0e0; background-color: transparent; }}
-        .metric-name {{ text-align: left !important; font-weight: bold; color: #2c3e50; min-width: 180px; background-color: transparent; }}
-        .subject-value {{ background-color: #E6F3FF !important; font-weight: bold; color: #002F6C; border-left: 2px solid #002F6C; border-right: 2px solid #002F6C; }}
-        .msbna-value {{ background-color: #F4F7F9 !important; font-weight: 600; color: #444; }}
-        .bad-trend {{ color: #d32f2f; font-weight: bold; }}
-        .good-trend {{ color: #388e3c; font-weight: bold; }}
-        .neutral-trend {{ color: #757575; font-weight: bold; }}
-    </style></head><body>
-    <div class="email-container">
-        <h3>{title}</h3>
-        <p class="date-header">{latest_date.strftime('%B %d, %Y')}</p>
-        <table><thead><tr><th>Metric</th>"""
-
-    for c in ordered_certs:
-        html += f"<th>{col_mapping[c]}</th>"
-    html += f"<th>Diff Vs {col_mapping[avg_cert]}</th></tr></thead><tbody>"
+    codes = [code for _, code, _ in metrics]
+    kinds = [fmt for _, _, fmt in metrics]
+    vals = snapshot.block(codes, ordered_certs)
+    cells = format_block(vals, kinds, _peer_value_formats(grouping=True))
+
+    subj_vals = vals[:, ordered_certs.index(subject_cert)] if subject_cert in ordered_certs else np.full(len(codes), np.nan)
+    avg_vals = vals[:, ordered_certs.index(avg_cert)] if avg_cert in ordered_certs else np.full(len(codes), np.nan)
+    diff = subj_vals - avg_vals
+    f_diff = format_block(diff, kinds, _peer_delta_formats(grouping=True))
+
+    # Risk labels (higher is worse) are checked before safe labels (higher is better)
+    direction = [
+        -1 if any(k in disp for k in ['Nonaccrual', 'NCO', 'Delinq', 'Risk', 'Past Due'])
+        else (1 if any(k in disp for k in ['Coverage', 'Ratio', 'Equity', 'ROA', 'ROE', 'Yield', 'Margin', 'Assets']) else 0)
+        for disp, _, _ in metrics
+    ]
+    diff_cls = trend_classes(diff, direction, tolerance=0.001)
 
-    for disp, code, fmt in metrics:
+    col_cls = ["subject-value" if c == subject_cert else ("msbna-value" if c == _MSBNA_CERT else "")
+               for c in ordered_certs]
+    rows = []
+    for i, (disp, _, _) in enumerate(metrics):
         # Normalize display: Norm prefix → trailing asterisk
         disp_clean = _normalize_display_name(disp) if is_normalized else disp
-        html += f'<tr><td class="metric-name"><b>{disp_clean}</b></td>'
-        subj_val, avg_val = np.nan, np.nan
-
-        for c in ordered_certs:
-            row_slice = latest_data[latest_data["CERT"] == c]
-            val = row_slice.iloc[0].get(code, np.nan) if not row_slice.empty else np.nan
-            if c == subject_cert:
-                subj_val = val
-            if c == avg_cert:
-                avg_val = val
-
-            if pd.isna(val):
-                f_v = "N/A"
-            elif fmt == "x":
-                f_v = f"{val:.2f}x"
-            elif fmt == "B":
-                f_v = f"${val / 1e6:,.1f}B"
-            else:
-                f_v = f"{val * 100:.2f}%" if abs(val) < 1.0 else f"{val:.2f}%"
-
-            cls = ('class="subject-value"' if c == subject_cert
-                   else ('class="msbna-value"' if c == _MSBNA_CERT else ''))
-            html += f"<td {cls}>{f_v}</td>"
-
-        diff = subj_val - avg_val if pd.notna(subj_val) and pd.notna(avg_val) else np.nan
-        if pd.isna(diff):
-            f_diff, diff_cls = "N/A", "neutral-trend"
-        else:
-            if fmt == "x":
-                f_diff = f"{diff:+.2f}x"
-            elif fmt == "B":
-                f_diff = f"{diff / 1e6:+,.1f}B"
-            else:
-                f_diff = f"{diff * 100:+.2f}%" if abs(diff) < 1.0 else f"{diff:+.2f}%"
-
-            is_risk = any(k in disp for k in ['Nonaccrual', 'NCO', 'Delinq', 'Risk', 'Past Due'])
-            is_safe = any(k in disp for k in ['Coverage', 'Ratio', 'Equity', 'ROA', 'ROE', 'Yield', 'Margin', 'Assets'])
-
-            if abs(diff) < 0.001:
-                diff_cls = "neutral-trend"
-            elif is_risk:
-                diff_cls = "bad-trend" if diff > 0 else "good-trend"
-            elif is_safe:
-                diff_cls = "good-trend" if diff > 0 else "bad-trend"
-            else:
-                diff_cls = "neutral-trend"
-
-        html += f'<td class="{diff_cls}">{f_diff}</td></tr>'
-
-    footnote = ""
-    if is_normalized:
-        footnote = '<p style="font-size: 10px; color: #555; text-align: left;">* Normalized for comparison</p>'
-    html += f"</tbody></table>{footnote}</div></body></html>"
-    return html
+        rows.append("<tr>" + cell(f"<b>{disp_clean}</b>", "metric-name")
+                    + "".join(cell(v, cls) for v, cls in zip(cells[i], col_cls))
+                    + cell(f_diff[i], diff_cls[i]) + "</tr>")
+
+    header = ("<th>Metric</th>" + header_cells(col_mapping[c] for c in ordered_certs)
+              + f"<th>Diff Vs {col_mapping[avg_cert]}</th>")
+    extra_css = (
+        container_css("1600px"),
+        SUBJECT_VALUE_CSS,
+        ".msbna-value { background-color: #F4F7F9 !important; font-weight: 600; color: #444; }",
+        *TREND_CSS,
+    )
+    footnote = _NORMALIZED_FOOTNOTE if is_normalized else ""
+    return render_navy_page(extra_css, title, snapshot.date.strftime('%B %d, %Y'),
+                            header, rows, footnote)
 
 
 def generate_normalized_comparison_table(
@@ -1567,8 +1453,9 @@ def generate_normalized_comparison_table(
 def generate_ratio_components_table(proc_df_with_peers: pd.DataFrame,
                                     subject_bank_cert: int = 34221,
                                     is_normalized: bool = False) -> Optional[str]:
-    latest_date = proc_df_with_peers["REPDTE"].max()
-    latest_data = proc_df_with_peers[proc_df_with_peers["REPDTE"] == latest_date].copy()
+    views = panel_views(proc_df_with_peers)
+    latest_date = views.latest_date
+    latest_data = views.latest_rows()
 
     # Synthesize _Total_Past_Due for standard delinquency row
     if 'TopHouse_PD30' in latest_data.columns and 'TopHouse_PD90' in latest_data.columns:
@@ -1706,7 +1593,7 @@ def generate_ratio_components_table(proc_df_with_peers: pd.DataFrame,
         p_rat = peer.get(rat_col, np.nan)
 
         # Suppress flatlined metrics: skip if both ratios are zero/NaN
-        if all(pd.isna(v) or (isinstance(v, (int, float)) and abs(v) < 1e-12) for v in [v_rat, p_rat]):
+        if all(pd.isna(v) or (isinstance(v, (int, float, np.number)) and abs(v) < 1e-12) for v in [v_rat, p_rat]):
             continue
 
         f_num = "N/A" if pd.isna(v_num) else _fmt_money_billions(v_num)
@@ -1747,28 +1634,21 @@ def generate_segment_focus_table(
     Uses resolve_display_label() for ticker-style names.
     'Wealth Peers' = Core PB composite (90001 standard, 90004 normalized).
     """
-    latest_date = proc_df_with_peers["REPDTE"].max()
-    latest_data = proc_df_with_peers[proc_df_with_peers["REPDTE"] == latest_date]
+    snap = latest_snapshot(proc_df_with_peers)
 
     # Wealth Peers = Core PB composite
     wealth_peers_cert = ACTIVE_NORMALIZED_COMPOSITES["core_pb"] if is_normalized else ACTIVE_STANDARD_COMPOSITES["core_pb"]
 
     # Identify wealth peer constituents via resolver
     col_certs = {"MSPBNA": subject_bank_cert}
-    for c in latest_data["CERT"].unique():
+    for c in snap.certs:
         if c in ALL_COMPOSITE_CERTS or c == subject_bank_cert:
             continue
-        raw_name = str(latest_data[latest_data["CERT"] == c]["NAME"].iloc[0])
-        label = resolve_display_label(c, raw_name, subject_cert=subject_bank_cert)
+        label = resolve_display_label(c, snap.name(c), subject_cert=subject_bank_cert)
         if label in ("GS", "UBS"):
             col_certs[label] = c
-    col_certs[resolve_display_label(wealth_peers_cert)] = wealth_peers_cert
-
-    row_data = {
-        k: latest_data[latest_data["CERT"] == v].iloc[0]
-        if v in latest_data["CERT"].values else pd.Series()
-        for k, v in col_certs.items()
-    }
+    wealth_label = resolve_display_label(wealth_peers_cert)
+    col_certs[wealth_label] = wealth_peers_cert
 
     if is_normalized:
         title = f"{segment_name} Segment Analysis (Normalized)"
@@ -1838,85 +1718,45 @@ def generate_segment_focus_table(
                 ("RIC_Resi_Delinquency_Rate", "Resi Delinquency Rate (%)*", "%", False),
             ]
 
-    # Build dynamic header from col_certs
-    col_headers = "".join(f"<th>{lbl}</th>" for lbl in col_certs.keys())
-
-    html = f"""<html><head><style>
-        body {{ font-family: Arial, sans-serif; background-color: transparent; }}
-        .email-container {{ background-color: transparent; padding: 20px; max-width: 1400px; margin: 0 auto; text-align: center; }}
-        h3 {{ color: #002F6C; margin-bottom: 5px; text-align: center; }}
-        p.date-header {{ margin-top: 0; font-weight: bold; color: #555; text-align: center; margin-bottom: 20px; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 0 auto; font-size: 11px; background-color: transparent; }}
-        th {{ background-color: #002F6C; color: white; padding: 8px; border: 1px solid #2c3e50; }}
-        td {{ padding: 6px; text-align: center; border: 1px solid #e0e0e0; background-color: transparent; }}
-        .metric-name {{ text-align: left !important; font-weight: bold; color: #2c3e50; min-width: 180px; background-color: transparent; }}
-        .mspbna-good {{ background-color: rgba(56, 142, 60, 0.15) !important; color: #2E7D32; font-weight: bold; border-left: 2px solid #002F6C; border-right: 2px solid #002F6C; }}
-        .mspbna-bad {{ background-color: rgba(211, 47, 47, 0.15) !important; color: #C62828; font-weight: bold; border-left: 2px solid #002F6C; border-right: 2px solid #002F6C; }}
-        .mspbna-neutral {{ background-color: rgba(0, 47, 108, 0.08) !important; font-weight: bold; color: #002F6C; border-left: 2px solid #002F6C; border-right: 2px solid #002F6C; }}
-        .good-trend {{ color: #388e3c; font-weight: bold; }}
-        .bad-trend {{ color: #d32f2f; font-weight: bold; }}
-        .neutral-trend {{ color: #795548; font-weight: normal; }}
-        .section-separator td {{ background-color: #f0f0f0; font-weight: bold; color: #555; font-size: 10px; text-transform: uppercase; letter-spacing: 0.5px; padding: 4px 8px; border-top: 2px solid #aaa; }}
-    </style></head><body>
-    <div class="email-container">
-        <h3>{title}</h3>
-        <p class="date-header">{latest_date.strftime('%B %d, %Y')}</p>
-        <table><thead><tr>
-            <th>Metric</th>{col_headers}<th>Delta vs Wealth Peers</th>
-        </tr></thead><tbody>
-    """
+    labels = list(col_certs)
+    data_rows = [m for m in metrics if m[0] != "__SEPARATOR__"]
+    kinds = [fmt for _, _, fmt, _ in data_rows]
+    vals = snap.block([code for code, _, _, _ in data_rows], list(col_certs.values()))
+    cells = format_block(vals, kinds, _peer_value_formats(grouping=False))
+    diff = vals[:, labels.index("MSPBNA")] - vals[:, labels.index(wealth_label)]
+    f_diff = format_block(diff, kinds, _peer_delta_formats(grouping=False))
+    diff_cls = trend_classes(diff, [1 if better else -1 for _, _, _, better in data_rows],
+                             tolerance=0.0001)
 
     n_cols = len(col_certs) + 2  # Metric col + bank cols + Delta col
+    rows = []
+    i = 0
     for code, disp, fmt, higher_is_better in metrics:
         # Separator row for regime-boundary labels
         if code == "__SEPARATOR__":
-            html += f'<tr class="section-separator"><td colspan="{n_cols}">{disp}</td></tr>'
+            rows.append(f'<tr class="section-separator"><td colspan="{n_cols}">{disp}</td></tr>')
             continue
-        vals = {k: row_data[k].get(code, np.nan) for k in col_certs}
-        v_subj = vals.get("MSPBNA", np.nan)
-        wealth_label = resolve_display_label(wealth_peers_cert)
-        v_wealth = vals.get(wealth_label, np.nan)
-        diff = v_subj - v_wealth if pd.notna(v_subj) and pd.notna(v_wealth) else np.nan
-
-        def fmt_val(v, fmt_type):
-            if pd.isna(v): return "N/A"
-            if fmt_type == "x": return f"{v:.2f}x"
-            if fmt_type == "B": return f"${v / 1e6:.1f}B"
-            return f"{v * 100:.2f}%" if abs(v) < 1.0 else f"{v:.2f}%"
-
-        if pd.isna(diff):
-            f_diff, diff_cls = "N/A", "neutral-trend"
-        else:
-            if fmt == "x":
-                f_diff = f"{diff:+.2f}x"
-            elif fmt == "B":
-                f_diff = f"{diff / 1e6:+.1f}B"
-            else:
-                f_diff = f"{diff * 100:+.2f}%" if abs(diff) < 1.0 else f"{diff:+.2f}%"
-
-            if abs(diff) < 0.0001:
-                diff_cls = "neutral-trend"
-            else:
-                is_good = (diff > 0) if higher_is_better else (diff < 0)
-                diff_cls = "good-trend" if is_good else "bad-trend"
-
-        subj_cls = f"mspbna-{diff_cls.split('-')[0]}" if diff_cls != "neutral-trend" else "mspbna-neutral"
+        subj_cls = f"mspbna-{diff_cls[i].split('-')[0]}"
+        row_cells = [cell(v, subj_cls if lbl == "MSPBNA" else "") for lbl, v in zip(labels, cells[i])]
+        rows.append("<tr>" + cell(f"<b>{disp}</b>", "metric-name") + "".join(row_cells)
+                    + cell(f_diff[i], diff_cls[i]) + "</tr>")
+        i += 1
 
-        html += f'<tr><td class="metric-name"><b>{disp}</b></td>'
-        for lbl in col_certs.keys():
-            v = vals[lbl]
-            f_v = fmt_val(v, fmt)
-            if lbl == "MSPBNA":
-                html += f'<td class="{subj_cls}">{f_v}</td>'
-            else:
-                html += f'<td>{f_v}</td>'
-        html += f'<td class="{diff_cls}">{f_diff}</td></tr>'
-
-    html += "</tbody></table>"
+    footnote = ""
     if is_normalized:
-        html += '<p style="font-size:10px;color:#777;margin-top:6px;text-align:left;">* Normalized metrics exclude C&amp;I, Consumer, ADC, OO CRE, Ag, and NDFI balances. Rows without * use standard Call Report segment fields.</p>'
-    html += "</div></body></html>"
-    return html
+        footnote = '<p style="font-size:10px;color:#777;margin-top:6px;text-align:left;">* Normalized metrics exclude C&amp;I, Consumer, ADC, OO CRE, Ag, and NDFI balances. Rows without * use standard Call Report segment fields.</p>'
+    extra_css = (
+        container_css("1400px"),
+        ".mspbna-good { background-color: rgba(56, 142, 60, 0.15) !important; color: #2E7D32; font-weight: bold; border-left: 2px solid #002F6C; border-right: 2px solid #002F6C; }",
+        ".mspbna-bad { background-color: rgba(211, 47, 47, 0.15) !important; color: #C62828; font-weight: bold; border-left: 2px solid #002F6C; border-right: 2px solid #002F6C; }",
+        ".mspbna-neutral { background-color: rgba(0, 47, 108, 0.08) !important; font-weight: bold; color: #002F6C; border-left: 2px solid #002F6C; border-right: 2px solid #002F6C; }",
+        ".good-trend { color: #388e3c; font-weight: bold; }",
+        ".bad-trend { color: #d32f2f; font-weight: bold; }",
+        ".neutral-trend { color: #795548; font-weight: normal; }",
+        ".section-separator td { background-color: #f0f0f0; font-weight: bold; color: #555; font-size: 10px; text-transform: uppercase; letter-spacing: 0.5px; padding: 4px 8px; border-top: 2px solid #aaa; }",
+    )
+    header = "<th>Metric</th>" + header_cells(labels) + "<th>Delta vs Wealth Peers</th>"
+    return render_navy_page(extra_css, title, snap.date.strftime('%B %d, %Y'), header, rows, footnote)
 
 
 # ==================================================================================
@@ -2108,7 +1948,7 @@ def plot_sbl_backdrop(
 
     fig.tight_layout()
     if save_path:
-        fig.savefig(save_path, dpi=150, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=150, bbox_inches="tight", transparent=True)
         plt.close(fig)
     return fig
 
@@ -2168,7 +2008,7 @@ def plot_jumbo_conditions(
 
     fig.tight_layout()
     if save_path:
-        fig.savefig(save_path, dpi=150, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=150, bbox_inches="tight", transparent=True)
         plt.close(fig)
     return fig
 
@@ -2215,7 +2055,7 @@ def plot_resi_credit_cycle(
 
     fig.tight_layout()
     if save_path:
-        fig.savefig(save_path, dpi=150, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=150, bbox_inches="tight", transparent=True)
         plt.close(fig)
     return fig
 
@@ -2290,7 +2130,7 @@ def plot_cre_cycle(
 
     fig.tight_layout()
     if save_path:
-        fig.savefig(save_path, dpi=150, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=150, bbox_inches="tight", transparent=True)
         plt.close(fig)
     return fig
 
@@ -2347,7 +2187,7 @@ def plot_cs_collateral_panel(
 
     fig.tight_layout()
     if save_path:
-        fig.savefig(save_path, dpi=150, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=150, bbox_inches="tight", transparent=True)
         plt.close(fig)
     return fig
 
@@ -2356,6 +2196,45 @@ def plot_cs_collateral_panel(
 # These use the canonical API from rendering_mode.py (should_produce,
 # ArtifactManifest.record_generated / record_skipped / record_failed).
 
+def _cache_lookup(ctx: _ReportContext, artifact_name: str, path: str, csv_log,
+                  phase: str, fn, args=(), kwargs=None,
+                  chart: Optional[ChartRequest] = None) -> Tuple[bool, Optional[str]]:
+    """Restore *artifact_name* from the artifact cache if its inputs are unchanged.
+
+    Returns ``(hit, key)``.  On a hit the artifact is already copied to
+    *path* (plus the PNG rendition of a vector *chart*) and recorded in the
+    manifest; on a miss the caller renders and passes *key* to
+    ``_cache_store``.
+    """
+    if ctx.cache is None or not ctx.cache.enabled:
+        return False, None
+    try:
+        key = ctx.cache.key_for(artifact_name, fn, args, kwargs,
+                                variant=chart.variant if chart else "")
+    except Exception as exc:
+        print(f"  [{artifact_name}] cache key unavailable ({exc}); rendering")
+        return False, None
+    extra = chart.outputs[1:] if chart else []
+    if ctx.cache.restore(artifact_name, key, path, *extra):
+        ctx.manifest.record_generated(artifact_name, path, cache_key=key, cached=True,
+                                      **(chart.manifest_fields() if chart else {}))
+        csv_log.log_file_written(path, phase=phase, component=artifact_name)
+        print(f"  {artifact_name} restored from cache: {path}")
+        return True, key
+    return False, key
+
+
+def _cache_store(ctx: _ReportContext, artifact_name: str, key: Optional[str],
+                 *paths: str) -> None:
+    """Save a freshly rendered artifact's file(s) under *key* (no-op without a key)."""
+    if ctx.cache is not None and key:
+        try:
+            for path in paths:
+                ctx.cache.store(artifact_name, key, path)
+        except OSError as exc:
+            print(f"  [{artifact_name}] could not cache artifact: {exc}")
+
+
 def _produce_table(ctx: _ReportContext, artifact_name: str, csv_log,
                    generator_fn, out_dir: Path, *args, **kwargs) -> None:
     """Produce an HTML table artifact with mode-check + manifest recording."""
@@ -2363,14 +2242,19 @@ def _produce_table(ctx: _ReportContext, artifact_name: str, csv_log,
         return  # skip already recorded by should_produce()
     cap = ARTIFACT_REGISTRY.get(artifact_name)
     suffix = cap.filename_suffix if cap else f"_{artifact_name}.html"
+    path = str(out_dir / f"{ctx.base_stem}{suffix}")
+    hit, key = _cache_lookup(ctx, artifact_name, path, csv_log, "tables",
+                             generator_fn, args, kwargs)
+    if hit:
+        return
     try:
         result = generator_fn(*args, **kwargs)
         html = result[0] if isinstance(result, tuple) else result
         if html:
-            path = str(out_dir / f"{ctx.base_stem}{suffix}")
             with open(path, "w", encoding="utf-8") as f:
                 f.write(html)
-            ctx.manifest.record_generated(artifact_name, path)
+            ctx.manifest.record_generated(artifact_name, path, cache_key=key)
+            _cache_store(ctx, artifact_name, key, path)
             csv_log.log_file_written(path, phase="tables", component=artifact_name)
             print(f"  {artifact_name} saved: {path}")
         else:
@@ -2388,12 +2272,20 @@ def _produce_chart(ctx: _ReportContext, artifact_name: str, csv_log,
     cap = ARTIFACT_REGISTRY.get(artifact_name)
     suffix = cap.filename_suffix if cap else f"_{artifact_name}.png"
     category = cap.category if cap else "chart"
+    chart = ctx.chart_output.request(artifact_name, str(out_dir / f"{ctx.base_stem}{suffix}"))
+    path = chart.primary_path
+    hit, key = _cache_lookup(ctx, artifact_name, path, csv_log, category,
+                             chart_fn, args, kwargs, chart=chart)
+    if hit:
+        return
     try:
-        path = str(out_dir / f"{ctx.base_stem}{suffix}")
         kwargs["save_path"] = path
-        result = chart_fn(*args, **kwargs)
+        with chart:
+            result = chart_fn(*args, **kwargs)
         if result is not None:
-            ctx.manifest.record_generated(artifact_name, path)
+            ctx.manifest.record_generated(artifact_name, path, cache_key=key,
+                                          **chart.manifest_fields())
+            _cache_store(ctx, artifact_name, key, *chart.outputs)
             csv_log.log_file_written(path, phase=category, component=artifact_name)
             print(f"  {artifact_name} saved: {path}")
             # Close figures promptly to prevent matplotlib "More than 20 figures" warning
@@ -2407,6 +2299,34 @@ def _produce_chart(ctx: _ReportContext, artifact_name: str, csv_log,
         print(f"  [{artifact_name}] FAILED: {exc}")
 
 
+def _produce_executive(ctx: _ReportContext, artifact_name: str, csv_log,
+                       generator_fn, save_path: str, *args, **kwargs) -> None:
+    """Produce an executive chart/table whose generator writes *save_path* itself."""
+    if not should_produce(artifact_name, ctx.mode, ctx.manifest, ctx.suppressed_charts):
+        return
+    chart = ctx.chart_output.request(artifact_name, save_path)
+    save_path = chart.primary_path
+    hit, key = _cache_lookup(ctx, artifact_name, save_path, csv_log, "executive_charts",
+                             generator_fn, args, kwargs, chart=chart)
+    if hit:
+        return
+    try:
+        with chart:
+            result = generator_fn(*args, save_path=save_path, **kwargs)
+        if result:
+            ctx.manifest.record_generated(artifact_name, save_path, cache_key=key,
+                                          **chart.manifest_fields())
+            _cache_store(ctx, artifact_name, key, *chart.outputs)
+            print(f"  Generated: {artifact_name}")
+            csv_log.log_file_written(save_path, phase="executive_charts",
+                                     component=artifact_name)
+        else:
+            ctx.manifest.record_failed(artifact_name, "insufficient data")
+    except Exception as exc:
+        ctx.manifest.record_failed(artifact_name, str(exc))
+        print(f"  Failed {artifact_name}: {exc}")
+
+
 def generate_reports(
     # data window & figure sizing
     start_date: str = "2023-01-01",
@@ -2428,6 +2348,12 @@ def generate_reports(
     fred_short_names: Optional[List[str]] = None,
     # Dual-mode rendering: "full_local" (default) or "corp_safe"
     render_mode: Optional[str] = None,
+    # Artifact cache: None → REPORT_ARTIFACT_CACHE env var (default on)
+    use_cache: Optional[bool] = None,
+    # Chart output: None → REPORT_CHART_FORMAT / REPORT_PNG_ARTIFACTS / REPORT_RASTER_DPI
+    chart_format: Optional[str] = None,
+    png_artifacts: Optional[List[str]] = None,
+    raster_dpi: Optional[int] = None,
 ) -> Optional[ArtifactManifest]:
     """
     End-to-end report runner with dual-mode architecture.
@@ -2439,6 +2365,21 @@ def generate_reports(
         "corp_safe" — HTML tables only; matplotlib charts are skipped gracefully.
         If None, resolved via select_mode(): REPORT_MODE env var (canonical),
         then REPORT_RENDER_MODE (backward-compatible alias), then full_local.
+    use_cache : bool, optional
+        Reuse artifacts whose inputs, parameters, mode and renderer source
+        are unchanged since a previous run (copied from
+        ``Peers/.artifact_cache``).  None → ``REPORT_ARTIFACT_CACHE`` env
+        var, default on.
+    chart_format : str, optional
+        "png" (default) — charts rasterized at each renderer's DPI.
+        "svg" / "pdf" — vector chart files; PNGs are rasterized only for
+        the artifacts named in *png_artifacts* (``["all"]`` for every
+        chart).  None → ``REPORT_CHART_FORMAT`` / ``REPORT_PNG_ARTIFACTS``
+        env vars.  The format chosen for each artifact is recorded in the
+        manifest.
+    raster_dpi : int, optional
+        DPI for PNG output, overriding each renderer's own (150 / 300).
+        None → ``REPORT_RASTER_DPI`` env var, else renderer default.
 
     Returns
     -------
@@ -2449,6 +2390,11 @@ def generate_reports(
     mode = select_mode(render_mode)
     manifest = ArtifactManifest(mode)
     print(f"Render mode: {mode.value}")
+    chart_output = ChartOutputPolicy.from_env(chart_format, png_artifacts, raster_dpi)
+    if chart_output.fmt.is_vector:
+        png_for = ("all charts" if chart_output.png_artifacts is None
+                   else ", ".join(sorted(chart_output.png_artifacts)) or "none")
+        print(f"Chart format: {chart_output.fmt.value} (PNG for: {png_for})")
 
     # ---- B7: MS Combined Entity ----
     REPORT_VIEW = os.getenv("REPORT_VIEW", "ALL_BANKS")
@@ -2557,452 +2503,431 @@ def generate_reports(
             manifest=manifest,
             base_stem=base,
             suppressed_charts=suppressed_charts,
+            cache=ArtifactCache(peers_root / ".artifact_cache", mode,
+                                enabled=cache_enabled(use_cache)),
+            chart_output=chart_output,
         )
 
+        # Producers share memoized views of the panel; it must not change
+        # in place from here on (checked after the DAG run).
+        panel_view = panel_views(proc_df_with_peers)
+        panel_view.seal()
+
+        # Scatter inputs: numeric before any node reads the frame
+        for c in ["NPL_to_Gross_Loans_Rate", "TTM_NCO_Rate", "Past_Due_Rate",
+                   "Norm_Nonaccrual_Rate", "Norm_NCO_Rate"]:
+            if c in rolling8q_df.columns:
+                rolling8q_df[c] = pd.to_numeric(rolling8q_df[c], errors="coerce")
+
+        # Each artifact family below is a node of the Step 2 DAG.  Families
+        # read the loaded frames only, so they are independent; matplotlib
+        # is not thread-safe, so every family that draws shares the "pyplot"
+        # lock and only the HTML tables overlap with chart rendering.
+        # Memoization is left to the artifact cache (ctx.cache).
+
         # ------------------------------------------------------------------
         # PHASE 3: HTML TABLES (both modes)
         # ------------------------------------------------------------------
-        print("\n" + "-" * 60)
-        print("GENERATING HTML TABLES")
-        print("-" * 60)
+        def _tables():
+            print("\n" + "-" * 60)
+            print("GENERATING HTML TABLES")
+            print("-" * 60)
 
-        # Executive Summary — Wealth-focused
-        for is_norm in [False, True]:
-            norm_str = "normalized" if is_norm else "standard"
-            _produce_table(ctx, f"executive_summary_{norm_str}", csv_log,
-                           generate_credit_metrics_email_table, tables_dir,
-                           proc_df_with_peers, subject_bank_cert, is_normalized=is_norm)
+            # Executive Summary — Wealth-focused
+            for is_norm in [False, True]:
+                norm_str = "normalized" if is_norm else "standard"
+                _produce_table(ctx, f"executive_summary_{norm_str}", csv_log,
+                               generate_credit_metrics_email_table, tables_dir,
+                               proc_df_with_peers, subject_bank_cert, is_normalized=is_norm)
 
-        # Detailed Peer, Core PB, Ratio Components, Segment tables
-        for is_norm in [False, True]:
-            norm_str = "normalized" if is_norm else "standard"
+            # Detailed Peer, Core PB, Ratio Components, Segment tables
+            for is_norm in [False, True]:
+                norm_str = "normalized" if is_norm else "standard"
 
-            _produce_table(ctx, f"detailed_peer_table_{norm_str}", csv_log,
-                           generate_detailed_peer_table, tables_dir,
-                           proc_df_with_peers, subject_bank_cert, is_normalized=is_norm)
+                _produce_table(ctx, f"detailed_peer_table_{norm_str}", csv_log,
+                               generate_detailed_peer_table, tables_dir,
+                               proc_df_with_peers, subject_bank_cert, is_normalized=is_norm)
 
-            _produce_table(ctx, f"core_pb_peer_table_{norm_str}", csv_log,
-                           generate_core_pb_peer_table, tables_dir,
-                           proc_df_with_peers, subject_bank_cert, is_normalized=is_norm)
+                _produce_table(ctx, f"core_pb_peer_table_{norm_str}", csv_log,
+                               generate_core_pb_peer_table, tables_dir,
+                               proc_df_with_peers, subject_bank_cert, is_normalized=is_norm)
 
-            _produce_table(ctx, f"ratio_components_{norm_str}", csv_log,
-                           generate_ratio_components_table, tables_dir,
-                           proc_df_with_peers, subject_bank_cert, is_normalized=is_norm)
+                _produce_table(ctx, f"ratio_components_{norm_str}", csv_log,
+                               generate_ratio_components_table, tables_dir,
+                               proc_df_with_peers, subject_bank_cert, is_normalized=is_norm)
 
-            _produce_table(ctx, f"cre_segment_{norm_str}", csv_log,
-                           generate_segment_focus_table, tables_dir,
-                           proc_df_with_peers, subject_bank_cert,
-                           segment_name="CRE", is_normalized=is_norm)
+                _produce_table(ctx, f"cre_segment_{norm_str}", csv_log,
+                               generate_segment_focus_table, tables_dir,
+                               proc_df_with_peers, subject_bank_cert,
+                               segment_name="CRE", is_normalized=is_norm)
 
-            _produce_table(ctx, f"resi_segment_{norm_str}", csv_log,
-                           generate_segment_focus_table, tables_dir,
-                           proc_df_with_peers, subject_bank_cert,
-                           segment_name="Resi", is_normalized=is_norm)
+                _produce_table(ctx, f"resi_segment_{norm_str}", csv_log,
+                               generate_segment_focus_table, tables_dir,
+                               proc_df_with_peers, subject_bank_cert,
+                               segment_name="Resi", is_normalized=is_norm)
 
-        # FRED macro table
-        _produce_table(ctx, "fred_table", csv_log,
-                       build_fred_macro_table, tables_dir,
-                       excel_file, list(fred_short_names))
+            # FRED macro table
+            _produce_table(ctx, "fred_table", csv_log,
+                           build_fred_macro_table, tables_dir,
+                           excel_file, list(fred_short_names))
 
         # ------------------------------------------------------------------
         # PHASE 4: CREDIT DETERIORATION CHARTS (full_local only)
         # ------------------------------------------------------------------
-        print("\n" + "-" * 60)
-        print("GENERATING CHARTS")
-        print("-" * 60)
+        def _credit_charts():
+            print("\n" + "-" * 60)
+            print("GENERATING CHARTS")
+            print("-" * 60)
 
-        _produce_chart(ctx, "standard_credit_chart", csv_log,
-                       create_credit_deterioration_chart_ppt, charts_dir,
-                       proc_df_with_peers=proc_df_with_peers,
-                       subject_bank_cert=subject_bank_cert,
-                       start_date=start_date,
-                       bar_metric="TTM_NCO_Rate",
-                       line_metric="NPL_to_Gross_Loans_Rate",
-                       bar_entities=[subject_bank_cert, ACTIVE_STANDARD_COMPOSITES["all_peers"], ACTIVE_STANDARD_COMPOSITES["core_pb"]],
-                       line_entities=[subject_bank_cert, ACTIVE_STANDARD_COMPOSITES["all_peers"], ACTIVE_STANDARD_COMPOSITES["core_pb"]],
-                       custom_title="TTM NCO Rate (bars) vs NPL to Gross Loans Rate (lines)")
-
-        # Normalized credit chart
-        norm_line_metric = "Norm_Nonaccrual_Rate"
-        if norm_line_metric not in proc_df_with_peers.columns:
-            norm_line_metric = "Norm_NPL_to_Gross_Loans_Rate"
-
-        _produce_chart(ctx, "normalized_credit_chart", csv_log,
-                       create_credit_deterioration_chart_ppt, charts_dir,
-                       proc_df_with_peers=proc_df_with_peers,
-                       subject_bank_cert=subject_bank_cert,
-                       start_date=start_date,
-                       bar_metric="Norm_NCO_Rate",
-                       line_metric=norm_line_metric,
-                       bar_entities=[subject_bank_cert, ACTIVE_NORMALIZED_COMPOSITES["all_peers"], ACTIVE_NORMALIZED_COMPOSITES["core_pb"]],
-                       line_entities=[subject_bank_cert, ACTIVE_NORMALIZED_COMPOSITES["all_peers"], ACTIVE_NORMALIZED_COMPOSITES["core_pb"]],
-                       figsize=credit_figsize,
-                       title_size=title_size,
-                       axis_label_size=axis_label_size,
-                       tick_size=tick_size,
-                       tag_size=tag_size,
-                       legend_fontsize=legend_fontsize,
-                       economist_style=True,
-                       custom_title=credit_title or "Norm NCO Rate (bars) vs Norm Nonaccrual Rate (lines)")
+            _produce_chart(ctx, "standard_credit_chart", csv_log,
+                           create_credit_deterioration_chart_ppt, charts_dir,
+                           proc_df_with_peers=proc_df_with_peers,
+                           subject_bank_cert=subject_bank_cert,
+                           start_date=start_date,
+                           bar_metric="TTM_NCO_Rate",
+                           line_metric="NPL_to_Gross_Loans_Rate",
+                           bar_entities=[subject_bank_cert, ACTIVE_STANDARD_COMPOSITES["all_peers"], ACTIVE_STANDARD_COMPOSITES["core_pb"]],
+                           line_entities=[subject_bank_cert, ACTIVE_STANDARD_COMPOSITES["all_peers"], ACTIVE_STANDARD_COMPOSITES["core_pb"]],
+                           custom_title="TTM NCO Rate (bars) vs NPL to Gross Loans Rate (lines)")
+
+            # Normalized credit chart
+            norm_line_metric = "Norm_Nonaccrual_Rate"
+            if norm_line_metric not in proc_df_with_peers.columns:
+                norm_line_metric = "Norm_NPL_to_Gross_Loans_Rate"
+
+            _produce_chart(ctx, "normalized_credit_chart", csv_log,
+                           create_credit_deterioration_chart_ppt, charts_dir,
+                           proc_df_with_peers=proc_df_with_peers,
+                           subject_bank_cert=subject_bank_cert,
+                           start_date=start_date,
+                           bar_metric="Norm_NCO_Rate",
+                           line_metric=norm_line_metric,
+                           bar_entities=[subject_bank_cert, ACTIVE_NORMALIZED_COMPOSITES["all_peers"], ACTIVE_NORMALIZED_COMPOSITES["core_pb"]],
+                           line_entities=[subject_bank_cert, ACTIVE_NORMALIZED_COMPOSITES["all_peers"], ACTIVE_NORMALIZED_COMPOSITES["core_pb"]],
+                           figsize=credit_figsize,
+                           title_size=title_size,
+                           axis_label_size=axis_label_size,
+                           tick_size=tick_size,
+                           tag_size=tag_size,
+                           legend_fontsize=legend_fontsize,
+                           economist_style=True,
+                           custom_title=credit_title or "Norm NCO Rate (bars) vs Norm Nonaccrual Rate (lines)")
 
         # ------------------------------------------------------------------
         # PHASE 5: SCATTER PLOTS (full_local only)
         # ------------------------------------------------------------------
-        # Ensure numeric columns for scatter
-        for c in ["NPL_to_Gross_Loans_Rate", "TTM_NCO_Rate", "Past_Due_Rate",
-                   "Norm_Nonaccrual_Rate", "Norm_NCO_Rate"]:
-            if c in rolling8q_df.columns:
-                rolling8q_df[c] = pd.to_numeric(rolling8q_df[c], errors="coerce")
-
-        scatter_common = dict(
-            show_peers_avg_label=True,
-            show_mspbna_label=True,
-            identify_outliers=True,
-            outliers_topn=outlier_topn,
-            figsize=(scatter_size, scatter_size),
-            title_size=16,
-            axis_label_size=12,
-            tick_size=tick_size,
-            tag_size=tag_size,
-            economist_style=True,
-            transparent_bg=True,
-            square_axes=True,
-        )
+        def _scatter_charts():
+            scatter_common = dict(
+                show_peers_avg_label=True,
+                show_mspbna_label=True,
+                identify_outliers=True,
+                outliers_topn=outlier_topn,
+                figsize=(scatter_size, scatter_size),
+                title_size=16,
+                axis_label_size=12,
+                tick_size=tick_size,
+                tag_size=tag_size,
+                economist_style=True,
+                transparent_bg=True,
+                square_axes=True,
+            )
 
-        _produce_chart(ctx, "scatter_nco_vs_npl", csv_log,
-                       plot_scatter_dynamic, scatter_dir,
-                       df=rolling8q_df,
-                       x_col="NPL_to_Gross_Loans_Rate",
-                       y_col="TTM_NCO_Rate",
-                       subject_cert=subject_bank_cert,
-                       peer_avg_cert_primary=ACTIVE_STANDARD_COMPOSITES["all_peers"],
-                       peer_avg_cert_alt=ACTIVE_STANDARD_COMPOSITES["core_pb"],
-                       wealth_peer_cert=ACTIVE_STANDARD_COMPOSITES["core_pb"],
-                       use_alt_peer_avg=False,
-                       **scatter_common)
-
-        _produce_chart(ctx, "scatter_pd_vs_npl", csv_log,
-                       plot_scatter_dynamic, scatter_dir,
-                       df=rolling8q_df,
-                       x_col="NPL_to_Gross_Loans_Rate",
-                       y_col="Past_Due_Rate",
-                       subject_cert=subject_bank_cert,
-                       peer_avg_cert_primary=ACTIVE_STANDARD_COMPOSITES["all_peers"],
-                       peer_avg_cert_alt=ACTIVE_STANDARD_COMPOSITES["core_pb"],
-                       wealth_peer_cert=ACTIVE_STANDARD_COMPOSITES["core_pb"],
-                       use_alt_peer_avg=False,
-                       **scatter_common)
-
-        _produce_chart(ctx, "scatter_norm_nco_vs_nonaccrual", csv_log,
-                       plot_scatter_dynamic, scatter_dir,
-                       df=rolling8q_df,
-                       x_col="Norm_Nonaccrual_Rate",
-                       y_col="Norm_NCO_Rate",
-                       subject_cert=subject_bank_cert,
-                       peer_avg_cert_primary=ACTIVE_NORMALIZED_COMPOSITES["all_peers"],
-                       peer_avg_cert_alt=ACTIVE_NORMALIZED_COMPOSITES["core_pb"],
-                       wealth_peer_cert=ACTIVE_NORMALIZED_COMPOSITES["core_pb"],
-                       use_alt_peer_avg=False,
-                       **scatter_common)
-
-        # CRE segment scatter — NCO Rate vs Nonaccrual Rate
-        _produce_chart(ctx, "scatter_cre_nco_vs_nonaccrual", csv_log,
-                       plot_scatter_dynamic, scatter_dir,
-                       df=rolling8q_df,
-                       x_col="RIC_CRE_Nonaccrual_Rate",
-                       y_col="RIC_CRE_NCO_Rate",
-                       subject_cert=subject_bank_cert,
-                       peer_avg_cert_primary=ACTIVE_STANDARD_COMPOSITES["all_peers"],
-                       peer_avg_cert_alt=ACTIVE_STANDARD_COMPOSITES["core_pb"],
-                       wealth_peer_cert=ACTIVE_STANDARD_COMPOSITES["core_pb"],
-                       use_alt_peer_avg=False,
-                       **scatter_common)
-
-        # Normalized bankwide — ACL Coverage vs Delinquency Rate
-        _produce_chart(ctx, "scatter_norm_acl_vs_delinquency", csv_log,
-                       plot_scatter_dynamic, scatter_dir,
-                       df=rolling8q_df,
-                       x_col="Norm_Delinquency_Rate",
-                       y_col="Norm_ACL_Coverage",
-                       subject_cert=subject_bank_cert,
-                       peer_avg_cert_primary=ACTIVE_NORMALIZED_COMPOSITES["all_peers"],
-                       peer_avg_cert_alt=ACTIVE_NORMALIZED_COMPOSITES["core_pb"],
-                       wealth_peer_cert=ACTIVE_NORMALIZED_COMPOSITES["core_pb"],
-                       use_alt_peer_avg=False,
-                       **scatter_common)
+            _produce_chart(ctx, "scatter_nco_vs_npl", csv_log,
+                           plot_scatter_dynamic, scatter_dir,
+                           df=rolling8q_df,
+                           x_col="NPL_to_Gross_Loans_Rate",
+                           y_col="TTM_NCO_Rate",
+                           subject_cert=subject_bank_cert,
+                           peer_avg_cert_primary=ACTIVE_STANDARD_COMPOSITES["all_peers"],
+                           peer_avg_cert_alt=ACTIVE_STANDARD_COMPOSITES["core_pb"],
+                           wealth_peer_cert=ACTIVE_STANDARD_COMPOSITES["core_pb"],
+                           use_alt_peer_avg=False,
+                           **scatter_common)
+
+            _produce_chart(ctx, "scatter_pd_vs_npl", csv_log,
+                           plot_scatter_dynamic, scatter_dir,
+                           df=rolling8q_df,
+                           x_col="NPL_to_Gross_Loans_Rate",
+                           y_col="Past_Due_Rate",
+                           subject_cert=subject_bank_cert,
+                           peer_avg_cert_primary=ACTIVE_STANDARD_COMPOSITES["all_peers"],
+                           peer_avg_cert_alt=ACTIVE_STANDARD_COMPOSITES["core_pb"],
+                           wealth_peer_cert=ACTIVE_STANDARD_COMPOSITES["core_pb"],
+                           use_alt_peer_avg=False,
+                           **scatter_common)
+
+            _produce_chart(ctx, "scatter_norm_nco_vs_nonaccrual", csv_log,
+                           plot_scatter_dynamic, scatter_dir,
+                           df=rolling8q_df,
+                           x_col="Norm_Nonaccrual_Rate",
+                           y_col="Norm_NCO_Rate",
+                           subject_cert=subject_bank_cert,
+                           peer_avg_cert_primary=ACTIVE_NORMALIZED_COMPOSITES["all_peers"],
+                           peer_avg_cert_alt=ACTIVE_NORMALIZED_COMPOSITES["core_pb"],
+                           wealth_peer_cert=ACTIVE_NORMALIZED_COMPOSITES["core_pb"],
+                           use_alt_peer_avg=False,
+                           **scatter_common)
+
+            # CRE segment scatter — NCO Rate vs Nonaccrual Rate
+            _produce_chart(ctx, "scatter_cre_nco_vs_nonaccrual", csv_log,
+                           plot_scatter_dynamic, scatter_dir,
+                           df=rolling8q_df,
+                           x_col="RIC_CRE_Nonaccrual_Rate",
+                           y_col="RIC_CRE_NCO_Rate",
+                           subject_cert=subject_bank_cert,
+                           peer_avg_cert_primary=ACTIVE_STANDARD_COMPOSITES["all_peers"],
+                           peer_avg_cert_alt=ACTIVE_STANDARD_COMPOSITES["core_pb"],
+                           wealth_peer_cert=ACTIVE_STANDARD_COMPOSITES["core_pb"],
+                           use_alt_peer_avg=False,
+                           **scatter_common)
+
+            # Normalized bankwide — ACL Coverage vs Delinquency Rate
+            _produce_chart(ctx, "scatter_norm_acl_vs_delinquency", csv_log,
+                           plot_scatter_dynamic, scatter_dir,
+                           df=rolling8q_df,
+                           x_col="Norm_Delinquency_Rate",
+                           y_col="Norm_ACL_Coverage",
+                           subject_cert=subject_bank_cert,
+                           peer_avg_cert_primary=ACTIVE_NORMALIZED_COMPOSITES["all_peers"],
+                           peer_avg_cert_alt=ACTIVE_NORMALIZED_COMPOSITES["core_pb"],
+                           wealth_peer_cert=ACTIVE_NORMALIZED_COMPOSITES["core_pb"],
+                           use_alt_peer_avg=False,
+                           **scatter_common)
 
         # ------------------------------------------------------------------
         # PHASE 6: SEGMENT & ROADMAP CHARTS (full_local only)
         # ------------------------------------------------------------------
-        _produce_chart(ctx, "portfolio_mix", csv_log,
-                       plot_portfolio_mix, charts_dir,
-                       proc_df_with_peers, subject_bank_cert)
-
-        _produce_chart(ctx, "problem_asset_attribution", csv_log,
-                       plot_problem_asset_attribution, charts_dir,
-                       proc_df_with_peers, subject_bank_cert)
-
-        _produce_chart(ctx, "reserve_risk_allocation", csv_log,
-                       plot_reserve_risk_allocation, charts_dir,
-                       proc_df_with_peers, subject_bank_cert)
-
-        _produce_chart(ctx, "migration_ladder", csv_log,
-                       plot_migration_ladder, charts_dir,
-                       proc_df_with_peers, subject_bank_cert)
-
-        _produce_chart(ctx, "years_of_reserves", csv_log,
-                       plot_years_of_reserves, charts_dir,
-                       proc_df_with_peers, subject_bank_cert)
-
-        _produce_chart(ctx, "growth_vs_deterioration", csv_log,
-                       plot_growth_vs_deterioration, charts_dir,
-                       proc_df_with_peers, subject_bank_cert)
-
-        _produce_chart(ctx, "growth_vs_deterioration_bookwide", csv_log,
-                       plot_growth_vs_deterioration_bookwide, charts_dir,
-                       proc_df_with_peers, subject_bank_cert)
-
-        # risk_adjusted_return SUPPRESSED: both axes (Norm_Loss_Adj_Yield,
-        # Norm_Risk_Adj_Return) inherit the inflated Norm_Loan_Yield numerator/
-        # denominator mismatch. Re-enable when normalized interest income is available.
-        # _produce_chart(ctx, "risk_adjusted_return", csv_log,
-        #                plot_risk_adjusted_return, charts_dir,
-        #                proc_df_with_peers, subject_bank_cert)
-
-        _produce_chart(ctx, "concentration_vs_capital", csv_log,
-                       plot_concentration_vs_capital, charts_dir,
-                       proc_df_with_peers, subject_bank_cert)
-
-        _produce_chart(ctx, "liquidity_overlay", csv_log,
-                       plot_liquidity_overlay, charts_dir,
-                       proc_df_with_peers, subject_bank_cert)
-
-        # Macro correlation heatmap (HTML — BOTH modes)
-        art_name = "macro_corr_heatmap_lag1"
-        if should_produce(art_name, mode, manifest, suppressed_charts):
-            try:
-                cap = ARTIFACT_REGISTRY.get(art_name)
-                suffix = cap.filename_suffix if cap else f"_{art_name}.html"
-                save = str(tables_dir / f"{base}{suffix}")
-                html = generate_macro_corr_heatmap(
-                    proc_df_with_peers, subject_bank_cert, excel_file,
-                    save_path=save,
-                )
-                if html is not None:
-                    manifest.record_generated(art_name, save)
-                    csv_log.log_file_written(save, phase="table", component=art_name)
-                    print(f"  {art_name} saved: {save}")
-                else:
-                    manifest.record_failed(art_name, "generator returned None")
-            except Exception as exc:
-                manifest.record_failed(art_name, str(exc)[:200])
-                print(f"  [{art_name}] FAILED: {exc}")
-
-        # Macro overlay — credit stress (PNG — full_local only)
-        _produce_chart(ctx, "macro_overlay_credit_stress", csv_log,
-                       plot_macro_overlay_credit_stress, charts_dir,
-                       proc_df_with_peers, subject_bank_cert, excel_file)
-
-        # Macro overlay — rates & housing (PNG — full_local only)
-        _produce_chart(ctx, "macro_overlay_rates_housing", csv_log,
-                       plot_macro_overlay_rates_housing, charts_dir,
-                       proc_df_with_peers, subject_bank_cert, excel_file)
-
-        # MSA macro panel — reads from workbook Local_Macro_Latest sheet.
-        # Data is produced by local_macro.py via MSPBNA_CR_Normalized.py (Step 1).
-        # No synthetic data — skips cleanly if workbook lacks required sheets.
-        _produce_chart(ctx, "msa_macro_panel", csv_log,
-                       plot_msa_macro_panel, charts_dir, excel_file)
+        def _segment_charts():
+            _produce_chart(ctx, "portfolio_mix", csv_log,
+                           plot_portfolio_mix, charts_dir,
+                           proc_df_with_peers, subject_bank_cert)
+
+            _produce_chart(ctx, "problem_asset_attribution", csv_log,
+                           plot_problem_asset_attribution, charts_dir,
+                           proc_df_with_peers, subject_bank_cert)
+
+            _produce_chart(ctx, "reserve_risk_allocation", csv_log,
+                           plot_reserve_risk_allocation, charts_dir,
+                           proc_df_with_peers, subject_bank_cert)
+
+            _produce_chart(ctx, "migration_ladder", csv_log,
+                           plot_migration_ladder, charts_dir,
+                           proc_df_with_peers, subject_bank_cert)
+
+            _produce_chart(ctx, "years_of_reserves", csv_log,
+                           plot_years_of_reserves, charts_dir,
+                           proc_df_with_peers, subject_bank_cert)
+
+            _produce_chart(ctx, "growth_vs_deterioration", csv_log,
+                           plot_growth_vs_deterioration, charts_dir,
+                           proc_df_with_peers, subject_bank_cert)
+
+            _produce_chart(ctx, "growth_vs_deterioration_bookwide", csv_log,
+                           plot_growth_vs_deterioration_bookwide, charts_dir,
+                           proc_df_with_peers, subject_bank_cert)
+
+            # risk_adjusted_return SUPPRESSED: both axes (Norm_Loss_Adj_Yield,
+            # Norm_Risk_Adj_Return) inherit the inflated Norm_Loan_Yield numerator/
+            # denominator mismatch. Re-enable when normalized interest income is available.
+            # _produce_chart(ctx, "risk_adjusted_return", csv_log,
+            #                plot_risk_adjusted_return, charts_dir,
+            #                proc_df_with_peers, subject_bank_cert)
+
+            _produce_chart(ctx, "concentration_vs_capital", csv_log,
+                           plot_concentration_vs_capital, charts_dir,
+                           proc_df_with_peers, subject_bank_cert)
+
+            _produce_chart(ctx, "liquidity_overlay", csv_log,
+                           plot_liquidity_overlay, charts_dir,
+                           proc_df_with_peers, subject_bank_cert)
+
+        # Macro alignment cube: FRED_Data read and resampled to quarters once
+        def _macro_cube():
+            if not any(is_artifact_available(n, mode, suppressed_charts)
+                       for n in ("macro_corr_heatmap_lag1", "macro_overlay_credit_stress",
+                                 "macro_overlay_rates_housing")):
+                return None
+            return _load_macro_cube(excel_file)
+
+        # Macro heatmap / overlays / MSA panel
+        def _macro_charts(macro_cube):
+            # Macro correlation heatmap (HTML — BOTH modes; writes its own file)
+            _produce_chart(ctx, "macro_corr_heatmap_lag1", csv_log,
+                           generate_macro_corr_heatmap, tables_dir,
+                           proc_df_with_peers, subject_bank_cert, excel_file,
+                           macro_cube=macro_cube)
+
+            # Macro overlay — credit stress (PNG — full_local only)
+            _produce_chart(ctx, "macro_overlay_credit_stress", csv_log,
+                           plot_macro_overlay_credit_stress, charts_dir,
+                           proc_df_with_peers, subject_bank_cert, excel_file,
+                           macro_cube=macro_cube)
+
+            # Macro overlay — rates & housing (PNG — full_local only)
+            _produce_chart(ctx, "macro_overlay_rates_housing", csv_log,
+                           plot_macro_overlay_rates_housing, charts_dir,
+                           proc_df_with_peers, subject_bank_cert, excel_file,
+                           macro_cube=macro_cube)
+
+            # MSA macro panel — reads from workbook Local_Macro_Latest sheet.
+            # Data is produced by local_macro.py via MSPBNA_CR_Normalized.py (Step 1).
+            # No synthetic data — skips cleanly if workbook lacks required sheets.
+            _produce_chart(ctx, "msa_macro_panel", csv_log,
+                           plot_msa_macro_panel, charts_dir, excel_file)
 
         # ------------------------------------------------------------------
         # PHASE 7: FRED EXPANSION CHARTS (full_local only)
         # ------------------------------------------------------------------
-        fred_chart_names = ["sbl_backdrop", "jumbo_conditions", "resi_credit_cycle",
-                            "cre_cycle", "cs_collateral_panel"]
-        fred_chart_fns = [plot_sbl_backdrop, plot_jumbo_conditions, plot_resi_credit_cycle,
-                          plot_cre_cycle, plot_cs_collateral_panel]
-
-        # Only attempt loading FRED data if any FRED charts are available in this mode
-        any_fred_available = any(is_artifact_available(n, mode, suppressed_charts) for n in fred_chart_names)
-        if any_fred_available:
-            try:
-                fred_expansion_df = None
-                with pd.ExcelFile(excel_file) as xls:
-                    for sheet_cand in ["FRED_SBL_Backdrop", "FRED_Residential_Jumbo",
-                                       "FRED_CRE", "FRED_CaseShiller_Selected"]:
-                        if sheet_cand in xls.sheet_names:
-                            _df = pd.read_excel(xls, sheet_name=sheet_cand)
-                            if "DATE" in _df.columns:
-                                _df["DATE"] = pd.to_datetime(_df["DATE"])
-                                _df = _df.set_index("DATE")
-                            if fred_expansion_df is None:
-                                fred_expansion_df = _df
-                            else:
-                                fred_expansion_df = fred_expansion_df.join(_df, how="outer")
-
-                if fred_expansion_df is not None and not fred_expansion_df.empty:
-                    for fname, ffn in zip(fred_chart_names, fred_chart_fns):
-                        _produce_chart(ctx, fname, csv_log, ffn, charts_dir, fred_expansion_df)
-                else:
+        def _fred_charts():
+            fred_chart_names = ["sbl_backdrop", "jumbo_conditions", "resi_credit_cycle",
+                                "cre_cycle", "cs_collateral_panel"]
+            fred_chart_fns = [plot_sbl_backdrop, plot_jumbo_conditions, plot_resi_credit_cycle,
+                              plot_cre_cycle, plot_cs_collateral_panel]
+
+            # Only attempt loading FRED data if any FRED charts are available in this mode
+            any_fred_available = any(is_artifact_available(n, mode, suppressed_charts) for n in fred_chart_names)
+            if any_fred_available:
+                try:
+                    fred_expansion_df = None
+                    with pd.ExcelFile(excel_file) as xls:
+                        for sheet_cand in ["FRED_SBL_Backdrop", "FRED_Residential_Jumbo",
+                                           "FRED_CRE", "FRED_CaseShiller_Selected"]:
+                            if sheet_cand in xls.sheet_names:
+                                _df = pd.read_excel(xls, sheet_name=sheet_cand)
+                                if "DATE" in _df.columns:
+                                    _df["DATE"] = pd.to_datetime(_df["DATE"])
+                                    _df = _df.set_index("DATE")
+                                if fred_expansion_df is None:
+                                    fred_expansion_df = _df
+                                else:
+                                    fred_expansion_df = fred_expansion_df.join(_df, how="outer")
+
+                    if fred_expansion_df is not None and not fred_expansion_df.empty:
+                        for fname, ffn in zip(fred_chart_names, fred_chart_fns):
+                            _produce_chart(ctx, fname, csv_log, ffn, charts_dir, fred_expansion_df)
+                    else:
+                        for fname in fred_chart_names:
+                            manifest.record_skipped(fname, "FRED expansion sheets not found")
+                        print("  No FRED expansion sheets found — run fred_ingestion_engine.py first")
+                except Exception as e:
                     for fname in fred_chart_names:
-                        manifest.record_skipped(fname, "FRED expansion sheets not found")
-                    print("  No FRED expansion sheets found — run fred_ingestion_engine.py first")
-            except Exception as e:
-                for fname in fred_chart_names:
-                    manifest.record_failed(fname, str(e)[:200])
-                print(f"  Skipped FRED expansion charts: {e}")
+                        manifest.record_failed(fname, str(e)[:200])
+                    print(f"  Skipped FRED expansion charts: {e}")
 
         # ------------------------------------------------------------------
         # PHASE 8: EXECUTIVE CHARTS (YoY Heatmap, KRI Bullet, Sparkline)
         # ------------------------------------------------------------------
-        if _HAS_EXECUTIVE_CHARTS:
-            print("\n" + "-" * 60)
-            print("GENERATING EXECUTIVE CHARTS")
-            print("-" * 60)
+        def _executive_charts():
+            if _HAS_EXECUTIVE_CHARTS:
+                print("\n" + "-" * 60)
+                print("GENERATING EXECUTIVE CHARTS")
+                print("-" * 60)
+
+                # YoY Heatmap — 4 variants: Standard/Normalized × Wealth/All Peers
+                _heatmap_specs = [
+                    (False, "wealth",   ACTIVE_STANDARD_COMPOSITES["core_pb"],   "Wealth Peers"),
+                    (False, "allpeers", ACTIVE_STANDARD_COMPOSITES["all_peers"], "All Peers"),
+                    (True,  "wealth",   ACTIVE_NORMALIZED_COMPOSITES["core_pb"], "Wealth Peers"),
+                    (True,  "allpeers", ACTIVE_NORMALIZED_COMPOSITES["all_peers"], "All Peers"),
+                ]
+                for is_norm, pg_suffix, peer_cert, peer_label in _heatmap_specs:
+                    norm_str = "normalized" if is_norm else "standard"
+                    art_name = f"yoy_heatmap_{norm_str}_{pg_suffix}"
+                    _produce_executive(ctx, art_name, csv_log, generate_yoy_heatmap,
+                                       str(tables_dir / f"{base}_{art_name}.html"),
+                                       proc_df_with_peers, subject_bank_cert, peer_cert,
+                                       is_normalized=is_norm, peer_label=peer_label)
+
+                # KRI Football-Field Charts — split by unit family
+                # Standard: 2 charts (% rates + x-multiple coverage)
+                # Normalized: 2 charts (rates + composition)
+                _bullet_specs = [
+                    # Standard family
+                    ("kri_bullet_standard", BULLET_METRICS_STANDARD_RATES,
+                     "Key Risk Indicators — MSPBNA vs Peer Range (Standard Rates)",
+                     False, ACTIVE_STANDARD_COMPOSITES),
+                    ("kri_bullet_standard_coverage", BULLET_METRICS_STANDARD_COVERAGE,
+                     "Key Risk Indicators — MSPBNA vs Peer Range (Standard Coverage)",
+                     False, ACTIVE_STANDARD_COMPOSITES),
+                    # Normalized family
+                    ("kri_bullet_normalized_rates", BULLET_METRICS_NORMALIZED_RATES,
+                     "Key Risk Indicators — MSPBNA vs Peer Range (Normalized Rates)",
+                     True, ACTIVE_NORMALIZED_COMPOSITES),
+                    ("kri_bullet_normalized_composition", BULLET_METRICS_NORMALIZED_COMPOSITION,
+                     "Key Risk Indicators — MSPBNA vs Peer Range (Normalized Composition)",
+                     True, ACTIVE_NORMALIZED_COMPOSITES),
+                ]
+                for art_name, metric_list, chart_title, is_norm, composites in _bullet_specs:
+                    _produce_executive(ctx, art_name, csv_log, generate_kri_bullet_chart,
+                                       str(charts_dir / f"{base}_{art_name}.png"),
+                                       proc_df_with_peers, subject_bank_cert,
+                                       wealth_cert=composites["core_pb"],
+                                       all_peers_cert=composites["all_peers"],
+                                       metrics=metric_list,
+                                       is_normalized=is_norm,
+                                       title_override=chart_title,
+                                       wealth_member_certs=_WEALTH_MEMBER_CERTS,
+                                       all_peers_member_certs=_ALL_PEERS_MEMBER_CERTS)
+
+                # Sparkline Summary Tables — 4 variants: Standard/Normalized × Wealth/All Peers
+                _sparkline_specs = [
+                    ("standard", "wealth",   SPARKLINE_METRICS_STANDARD,
+                     ACTIVE_STANDARD_COMPOSITES["core_pb"],
+                     ACTIVE_NORMALIZED_COMPOSITES["core_pb"], "Wealth Peers"),
+                    ("standard", "allpeers", SPARKLINE_METRICS_STANDARD,
+                     ACTIVE_STANDARD_COMPOSITES["all_peers"],
+                     ACTIVE_NORMALIZED_COMPOSITES["all_peers"], "All Peers"),
+                    ("normalized", "wealth", SPARKLINE_METRICS_NORMALIZED,
+                     ACTIVE_NORMALIZED_COMPOSITES["core_pb"],
+                     ACTIVE_NORMALIZED_COMPOSITES["core_pb"], "Wealth Peers"),
+                    ("normalized", "allpeers", SPARKLINE_METRICS_NORMALIZED,
+                     ACTIVE_NORMALIZED_COMPOSITES["all_peers"],
+                     ACTIVE_NORMALIZED_COMPOSITES["all_peers"], "All Peers"),
+                ]
+                for norm_str, pg_suffix, metric_list, p_cert, np_cert, p_label in _sparkline_specs:
+                    art_name = f"sparkline_{norm_str}_{pg_suffix}"
+                    _produce_executive(ctx, art_name, csv_log, generate_sparkline_table,
+                                       str(tables_dir / f"{base}_{art_name}.html"),
+                                       proc_df_with_peers, subject_bank_cert,
+                                       peer_cert=p_cert,
+                                       norm_peer_cert=np_cert,
+                                       metrics=metric_list,
+                                       peer_label=p_label)
+
+                # Cumulative Growth: Target Loans vs CRE ACL — 2 variants
+                _cumul_specs = [
+                    ("cumul_growth_loans_vs_acl_wealth",
+                     ACTIVE_STANDARD_COMPOSITES["core_pb"], "Wealth Peers"),
+                    ("cumul_growth_loans_vs_acl_allpeers",
+                     ACTIVE_STANDARD_COMPOSITES["all_peers"], "All Peers"),
+                ]
+                for art_name, peer_cert, p_label in _cumul_specs:
+                    _produce_executive(ctx, art_name, csv_log,
+                                       plot_cumulative_growth_loans_vs_acl,
+                                       str(charts_dir / f"{base}_{art_name}.png"),
+                                       proc_df_with_peers,
+                                       subject_cert=subject_bank_cert,
+                                       peer_cert=peer_cert,
+                                       peer_label=p_label)
+            else:
+                print("\n  Executive charts module not available — skipping")
+
+        dag = PipelineDAG("step2")
+        dag.add("tables", _tables)
+        dag.add("macro_cube", _macro_cube)
+        for node_name, node_fn, inputs in [("credit_charts", _credit_charts, ()),
+                                           ("scatter", _scatter_charts, ()),
+                                           ("segment_charts", _segment_charts, ()),
+                                           ("macro", _macro_charts, ("macro_cube",)),
+                                           ("fred_charts", _fred_charts, ()),
+                                           ("executive", _executive_charts, ())]:
+            dag.add(node_name, node_fn, inputs, lock="pyplot")
+        try:
+            dag.run()
+        finally:
+            print("\n" + dag.summary_table())
+        panel_view.verify_sealed()
 
-            # YoY Heatmap — 4 variants: Standard/Normalized × Wealth/All Peers
-            _heatmap_specs = [
-                (False, "wealth",   ACTIVE_STANDARD_COMPOSITES["core_pb"],   "Wealth Peers"),
-                (False, "allpeers", ACTIVE_STANDARD_COMPOSITES["all_peers"], "All Peers"),
-                (True,  "wealth",   ACTIVE_NORMALIZED_COMPOSITES["core_pb"], "Wealth Peers"),
-                (True,  "allpeers", ACTIVE_NORMALIZED_COMPOSITES["all_peers"], "All Peers"),
-            ]
-            for is_norm, pg_suffix, peer_cert, peer_label in _heatmap_specs:
-                norm_str = "normalized" if is_norm else "standard"
-                art_name = f"yoy_heatmap_{norm_str}_{pg_suffix}"
-                if should_produce(art_name, mode, manifest, suppressed_charts):
-                    try:
-                        save = str(tables_dir / f"{base}_{art_name}.html")
-                        html = generate_yoy_heatmap(
-                            proc_df_with_peers, subject_bank_cert, peer_cert,
-                            is_normalized=is_norm, save_path=save,
-                            peer_label=peer_label,
-                        )
-                        if html:
-                            manifest.record_generated(art_name, save)
-                            print(f"  Generated: {art_name}")
-                            csv_log.log_file_written(save, phase="executive_charts",
-                                                     component=art_name)
-                        else:
-                            manifest.record_failed(art_name, "insufficient data")
-                    except Exception as exc:
-                        manifest.record_failed(art_name, str(exc))
-                        print(f"  Failed {art_name}: {exc}")
-
-            # KRI Football-Field Charts — split by unit family
-            # Standard: 2 charts (% rates + x-multiple coverage)
-            # Normalized: 2 charts (rates + composition)
-            _bullet_specs = [
-                # Standard family
-                ("kri_bullet_standard", BULLET_METRICS_STANDARD_RATES,
-                 "Key Risk Indicators — MSPBNA vs Peer Range (Standard Rates)",
-                 False, ACTIVE_STANDARD_COMPOSITES),
-                ("kri_bullet_standard_coverage", BULLET_METRICS_STANDARD_COVERAGE,
-                 "Key Risk Indicators — MSPBNA vs Peer Range (Standard Coverage)",
-                 False, ACTIVE_STANDARD_COMPOSITES),
-                # Normalized family
-                ("kri_bullet_normalized_rates", BULLET_METRICS_NORMALIZED_RATES,
-                 "Key Risk Indicators — MSPBNA vs Peer Range (Normalized Rates)",
-                 True, ACTIVE_NORMALIZED_COMPOSITES),
-                ("kri_bullet_normalized_composition", BULLET_METRICS_NORMALIZED_COMPOSITION,
-                 "Key Risk Indicators — MSPBNA vs Peer Range (Normalized Composition)",
-                 True, ACTIVE_NORMALIZED_COMPOSITES),
-            ]
-            for art_name, metric_list, chart_title, is_norm, composites in _bullet_specs:
-                if should_produce(art_name, mode, manifest, suppressed_charts):
-                    try:
-                        save = str(charts_dir / f"{base}_{art_name}.png")
-                        fig = generate_kri_bullet_chart(
-                            proc_df_with_peers, subject_bank_cert,
-                            wealth_cert=composites["core_pb"],
-                            all_peers_cert=composites["all_peers"],
-                            metrics=metric_list,
-                            is_normalized=is_norm,
-                            save_path=save,
-                            title_override=chart_title,
-                            wealth_member_certs=_WEALTH_MEMBER_CERTS,
-                            all_peers_member_certs=_ALL_PEERS_MEMBER_CERTS,
-                        )
-                        if fig is not None:
-                            manifest.record_generated(art_name, save)
-                            print(f"  Generated: {art_name}")
-                            csv_log.log_file_written(save, phase="executive_charts",
-                                                     component=art_name)
-                        else:
-                            manifest.record_failed(art_name, "insufficient data")
-                    except Exception as exc:
-                        manifest.record_failed(art_name, str(exc))
-                        print(f"  Failed {art_name}: {exc}")
-
-            # Sparkline Summary Tables — 4 variants: Standard/Normalized × Wealth/All Peers
-            _sparkline_specs = [
-                ("standard", "wealth",   SPARKLINE_METRICS_STANDARD,
-                 ACTIVE_STANDARD_COMPOSITES["core_pb"],
-                 ACTIVE_NORMALIZED_COMPOSITES["core_pb"], "Wealth Peers"),
-                ("standard", "allpeers", SPARKLINE_METRICS_STANDARD,
-                 ACTIVE_STANDARD_COMPOSITES["all_peers"],
-                 ACTIVE_NORMALIZED_COMPOSITES["all_peers"], "All Peers"),
-                ("normalized", "wealth", SPARKLINE_METRICS_NORMALIZED,
-                 ACTIVE_NORMALIZED_COMPOSITES["core_pb"],
-                 ACTIVE_NORMALIZED_COMPOSITES["core_pb"], "Wealth Peers"),
-                ("normalized", "allpeers", SPARKLINE_METRICS_NORMALIZED,
-                 ACTIVE_NORMALIZED_COMPOSITES["all_peers"],
-                 ACTIVE_NORMALIZED_COMPOSITES["all_peers"], "All Peers"),
-            ]
-            for norm_str, pg_suffix, metric_list, p_cert, np_cert, p_label in _sparkline_specs:
-                art_name = f"sparkline_{norm_str}_{pg_suffix}"
-                if should_produce(art_name, mode, manifest, suppressed_charts):
-                    try:
-                        save = str(tables_dir / f"{base}_{art_name}.html")
-                        html = generate_sparkline_table(
-                            proc_df_with_peers, subject_bank_cert,
-                            peer_cert=p_cert,
-                            norm_peer_cert=np_cert,
-                            metrics=metric_list,
-                            save_path=save,
-                            peer_label=p_label,
-                        )
-                        if html:
-                            manifest.record_generated(art_name, save)
-                            print(f"  Generated: {art_name}")
-                            csv_log.log_file_written(save, phase="executive_charts",
-                                                     component=art_name)
-                        else:
-                            manifest.record_failed(art_name, "insufficient data")
-                    except Exception as exc:
-                        manifest.record_failed(art_name, str(exc))
-                        print(f"  Failed {art_name}: {exc}")
-
-            # Cumulative Growth: Target Loans vs CRE ACL — 2 variants
-            _cumul_specs = [
-                ("cumul_growth_loans_vs_acl_wealth",
-                 ACTIVE_STANDARD_COMPOSITES["core_pb"], "Wealth Peers"),
-                ("cumul_growth_loans_vs_acl_allpeers",
-                 ACTIVE_STANDARD_COMPOSITES["all_peers"], "All Peers"),
-            ]
-            for art_name, peer_cert, p_label in _cumul_specs:
-                if should_produce(art_name, mode, manifest, suppressed_charts):
-                    try:
-                        save = str(charts_dir / f"{base}_{art_name}.png")
-                        result = plot_cumulative_growth_loans_vs_acl(
-                            proc_df_with_peers,
-                            subject_cert=subject_bank_cert,
-                            peer_cert=peer_cert,
-                            peer_label=p_label,
-                            save_path=save,
-                        )
-                        if result:
-                            manifest.record_generated(art_name, save)
-                            print(f"  Generated: {art_name}")
-                            csv_log.log_file_written(save, phase="executive_charts",
-                                                     component=art_name)
-                        else:
-                            manifest.record_failed(art_name, "insufficient data")
-                    except Exception as exc:
-                        manifest.record_failed(art_name, str(exc))
-                        print(f"  Failed {art_name}: {exc}")
-        else:
-            print("\n  Executive charts module not available — skipping")
         print("\n" + "=" * 80)
         print("REPORT GENERATION COMPLETE")
         print("=" * 80)
@@ -3020,6 +2945,9 @@ def generate_reports(
         print("ARTIFACT MANIFEST")
         print("-" * 60)
         print(manifest.summary_table())
+        if ctx.cache.enabled:
+            print(f"Artifact cache: {ctx.cache.hits} reused, "
+                  f"{ctx.cache.misses} rendered ({ctx.cache.cache_dir})")
 
         return manifest
 
@@ -3159,65 +3087,69 @@ def create_credit_deterioration_chart_ppt(
 
     DPI = fig.dpi
 
-    def rects_overlap(a, b):
-        ax0,ay0,ax1,ay1 = a; bx0,by0,bx1,by1 = b
-        return not (ax1 < bx0 or bx1 < ax0 or ay1 < by0 or by1 < ay0)
-
     class Placer:
+        """Fixed bar labels + movable line tags in one PlacementIndex."""
         def __init__(self, ax, tag_sz):
             self.ax = ax
             self.tag_sz = tag_sz
-            self.fixed_rects = []
+            self.index = PlacementIndex()
             self.items = []
 
         def _rect_for(self, x_data, y_data, xpx, ypx, text, pad=6):
-            xd, yd = self.ax.transData.transform((x_data, y_data))
-            cx, cy = xd + xpx, yd + ypx
-            w = max(40.0, 0.62*self.tag_sz*len(text)) + 2*pad
-            h = self.tag_sz*1.7 + 2*pad
-            return (cx - w/2, cy - h/2, cx + w/2, cy + h/2)
+            w, h = label_size_px(text, self.tag_sz, pad)
+            anchor = to_display(self.ax, [x_data], [y_data])[0]
+            return tuple(centered_rects(anchor, [(xpx, ypx)], w, h)[0])
 
         def can_place(self, rect, skip_index: Optional[int] = None):
-            for r in self.fixed_rects:
-                if rects_overlap(rect, r): return False
-            for i, it in enumerate(self.items):
-                if skip_index is not None and i == skip_index:
-                    continue
-                if rects_overlap(rect, it["rect"]): return False
-            return True
+            skip = self.items[skip_index]["id"] if skip_index is not None else None
+            return not self.index.overlaps([rect], skip=skip)[0]
+
+        def first_free(self, rects):
+            return self.index.first_free(rects)
 
         def add_fixed(self, rect):
-            self.fixed_rects.append(rect)
+            self.index.add(rect)
 
         def add_line_ann(self, ann, rect):
-            self.items.append({"ann": ann, "rect": rect})
+            self.items.append({"ann": ann, "rect": rect, "id": self.index.add(rect)})
+
+        def _set_rect(self, idx, rect):
+            self.items[idx]["rect"] = rect
+            self.index.update(self.items[idx]["id"], rect)
+
+        def _next_overlap(self, i, after):
+            """Smallest item index > after whose rect overlaps item i's rect."""
+            item_of = {it["id"]: k for k, it in enumerate(self.items)}
+            hits = [item_of[h] for h in self.index.colliding(self.items[i]["rect"], skip=self.items[i]["id"])
+                    if h in item_of and item_of[h] > after]
+            return min(hits) if hits else None
 
         def relax(self, max_iter=30, step_px=7):
             for _ in range(max_iter):
                 moved = False
                 for i in range(len(self.items)):
-                    for j in range(i+1, len(self.items)):
-                        ri, rj = self.items[i]["rect"], self.items[j]["rect"]
-                        if rects_overlap(ri, rj):
-                            for idx, sgn in ((i, +1), (j, -1)):
-                                ann = self.items[idx]["ann"]
-                                xoff, yoff = ann.get_position()
-                                new = (xoff, yoff + sgn*step_px)
-                                ann.set_position(new)
-                                xd, yd = self.ax.transData.transform(ann.xy)
-                                rect = (xd + new[0] - (ri[2]-ri[0])/2,
-                                        yd + new[1] - (ri[3]-ri[1])/2,
-                                        xd + new[0] + (ri[2]-ri[0])/2,
-                                        yd + new[1] + (ri[3]-ri[1])/2)
-                                if not self.can_place(rect, skip_index=idx):
-                                    ann.set_position((new[0] + (6 if sgn>0 else -6), new[1]))
-                                    xd, yd = self.ax.transData.transform(ann.xy)
-                                    rect = (xd + ann.get_position()[0] - (ri[2]-ri[0])/2,
-                                            yd + ann.get_position()[1] - (ri[3]-ri[1])/2,
-                                            xd + ann.get_position()[0] + (ri[2]-ri[0])/2,
-                                            yd + ann.get_position()[1] + (ri[3]-ri[1])/2)
-                                self.items[idx]["rect"] = rect
-                                moved = True
+                    j = self._next_overlap(i, i)
+                    while j is not None:
+                        ri = self.items[i]["rect"]
+                        for idx, sgn in ((i, +1), (j, -1)):
+                            ann = self.items[idx]["ann"]
+                            xoff, yoff = ann.get_position()
+                            new = (xoff, yoff + sgn*step_px)
+                            ann.set_position(new)
+                            xd, yd = self.ax.transData.transform(ann.xy)
+                            rect = (xd + new[0] - (ri[2]-ri[0])/2,
+                                    yd + new[1] - (ri[3]-ri[1])/2,
+                                    xd + new[0] + (ri[2]-ri[0])/2,
+                                    yd + new[1] + (ri[3]-ri[1])/2)
+                            if not self.can_place(rect, skip_index=idx):
+                                ann.set_position((new[0] + (6 if sgn>0 else -6), new[1]))
+                                rect = (xd + ann.get_position()[0] - (ri[2]-ri[0])/2,
+                                        yd + ann.get_position()[1] - (ri[3]-ri[1])/2,
+                                        xd + ann.get_position()[0] + (ri[2]-ri[0])/2,
+                                        yd + ann.get_position()[1] + (ri[3]-ri[1])/2)
+                            self._set_rect(idx, rect)
+                            moved = True
+                        j = self._next_overlap(i, j)
                 if not moved:
                     break
 
@@ -3253,10 +3185,9 @@ def create_credit_deterioration_chart_ppt(
             color="#2B2B2B", clip_on=False, zorder=9,
             bbox=dict(boxstyle="round,pad=0.25", fc="white", ec="none", alpha=0.95)
         )
-        xd, yd = ax.transData.transform((x_data, y_data))
-        w = max(40.0, 0.62*tag_size*len(text)) + 2*6
-        h = tag_size*1.7 + 2*6
-        placer.add_fixed((xd - w/2, yd - h/2, xd + w/2, yd + h/2))
+        w, h = label_size_px(text, tag_size)
+        anchor = to_display(ax, [x_data], [y_data])[0]
+        placer.add_fixed(tuple(centered_rects(anchor, [(0, 0)], w, h)[0]))
 
     for i in idx_to_label:
         for j, c in enumerate(bar_entities):
@@ -3278,27 +3209,17 @@ def create_credit_deterioration_chart_ppt(
         verticals = base_offsets if pref_up else [-b for b in base_offsets]
         for dy in verticals + [-b for b in base_offsets]:
             candidates += [(0, dy), (12, dy), (-12, dy), (22, dy), (-22, dy)]
-        for xpx, ypx in candidates:
-            rect = placer.rect_for_text(xd_data, yd_data, xpx, ypx, text)
-            if placer.can_place(rect):
-                ann = ax2.annotate(
-                    text, xy=(xd_data, yd_data), xytext=(xpx, ypx),
-                    textcoords="offset pixels", fontsize=tag_size,
-                    fontweight="bold", color="#1F2937", zorder=10,
-                    bbox=dict(boxstyle="round,pad=0.25", fc=fc, ec="none", alpha=0.96)
-                )
-                placer.add_line_ann(ann, rect)
-                return
+        w, h = label_size_px(text, tag_size)
+        rects = centered_rects(to_display(ax2, [xd_data], [yd_data])[0], candidates, w, h)
+        k = placer.first_free(rects)
+        xpx, ypx = candidates[k] if k >= 0 else (0, 0)
         ann = ax2.annotate(
-            text, xy=(xd_data, yd_data), xytext=(0, 0),
+            text, xy=(xd_data, yd_data), xytext=(xpx, ypx),
             textcoords="offset pixels", fontsize=tag_size,
             fontweight="bold", color="#1F2937", zorder=10,
             bbox=dict(boxstyle="round,pad=0.25", fc=fc, ec="none", alpha=0.96)
         )
-        xd, yd = ax2.transData.transform((xd_data, yd_data))
-        w = max(40.0, 0.62*tag_size*len(text)) + 12
-        h = tag_size*1.7 + 12
-        placer.add_line_ann(ann, (xd - w/2, yd - h/2, xd + w/2, yd + h/2))
+        placer.add_line_ann(ann, tuple(rects[k if k >= 0 else 0]))
 
     # Label placement strategy to reduce clutter:
     # - Subject bank: label at every Q4 + latest (full context)
@@ -3336,7 +3257,7 @@ def create_credit_deterioration_chart_ppt(
     # noisy warnings. savefig(..., bbox_inches="tight") handles layout instead.
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig, ax
 
 
@@ -3445,15 +3366,20 @@ def plot_scatter_dynamic(
     SUFFIX_RE = re.compile(r"(\s*,?\s*THE)?(\s*\(.*?\))?(\s+(NATIONAL(\s+ASSOCIATION|(\s+ASSN\.?))|N\.?A\.?|NA|FEDERAL(\s+SAVINGS\s+BANK)?|SAVINGS\s+BANK|STATE\s+BANK|NATIONAL\s+BANK|BANK|BANCORP(?:ORATION)?|CORP(?:ORATION)?|COMPANY|CO\.?|INC|INC\.?|LTD\.?|LIMITED|FSB|F\.S\.B\.?|ASSOCIATION|ASSN\.?))+\s*$", re.IGNORECASE)
     def short_name(s): s=str(s).strip(); s=re.sub(r"\s+"," ",s); return SUFFIX_RE.sub("", s).strip(", ").strip() or s
 
-    placed=[]
-    def pick_offset(px_, py_, along_line=False):
-        cands = ([(12,0), (18,0), (-42,0), (-60,0)] if along_line
-                 else [(10,12),(12,-12),(-10,12),(-12,-12),(16,0),(-16,0),(0,16),(0,-16)])
-        for dx,dy in cands:
-            sx,sy = ax.transData.transform((px_,py_)); tx,ty = sx+dx, sy+dy
-            if all(abs(tx-ox)>=58 or abs(ty-oy)>=22 for ox,oy in placed):
-                placed.append((tx,ty)); return dx,dy
-        placed.append(ax.transData.transform((px_,py_))); return (10,12)
+    # Labels are collected first, then placed against a grid index of
+    # 58x22 px proximity boxes with one batched data→display transform.
+    placed = PlacementIndex(strict=True)
+    _LINE_CANDS = [(12,0), (18,0), (-42,0), (-60,0)]
+    _POINT_CANDS = [(10,12),(12,-12),(-10,12),(-12,-12),(16,0),(-16,0),(0,16),(0,-16)]
+    labels = []  # (x, y, text, color, box, along_line)
+
+    def pick_offset(anchor, along_line=False):
+        cands = _LINE_CANDS if along_line else _POINT_CANDS
+        boxes = point_rects(np.asarray(cands, dtype=float) + anchor, 58, 22)
+        k = placed.first_free(boxes)
+        if k >= 0:
+            placed.add(boxes[k]); return cands[k]
+        placed.add(point_rects(anchor, 58, 22)[0]); return (10,12)
 
     def tag(px_, py_, text, xytext, color="black", box=True):
         ax.annotate(text, xy=(px_,py_), xytext=xytext, textcoords="offset points",
@@ -3462,16 +3388,13 @@ def plot_scatter_dynamic(
                     arrowprops=(dict(arrowstyle="->", lw=1.0, color="black") if box else None), va="center")
 
     if show_peers_avg_label and (px is not None):
-        dx, dy = pick_offset(px, py, along_line=True)
-        tag(px, py, "All Peers", (dx, dy), color=CC["guide"], box=False)
+        labels.append((px, py, "All Peers", CC["guide"], False, True))
 
     if show_mspbna_label and (xi is not None):
-        dx, dy = pick_offset(xi, yi)
-        tag(xi, yi, "MSPBNA", (dx, dy), color="black", box=True)
+        labels.append((xi, yi, "MSPBNA", "black", True, False))
 
     if wx is not None:
-        dx, dy = pick_offset(wx, wy)
-        tag(wx, wy, "Wealth Peers", (dx, dy), color=CC["wealth_peers"], box=True)
+        labels.append((wx, wy, "Wealth Peers", CC["wealth_peers"], True, False))
 
     if identify_outliers and outliers_topn > 0:
         X_all = to_decimals_series(df[x_col]); Y_all = to_decimals_series(df[y_col])
@@ -3493,8 +3416,11 @@ def plot_scatter_dynamic(
             cert_i = int(df.loc[i, "CERT"]) if "CERT" in df.columns else None
             name_i = df.loc[i, "NAME"] if "NAME" in df.columns else None
             label = resolve_display_label(cert_i, name=name_i, subject_cert=subject_cert) if cert_i is not None else str(i)
-            dx, dy = pick_offset(ox, oy)
-            tag(ox, oy, label, (dx, dy), color="black", box=True)
+            labels.append((ox, oy, label, "black", True, False))
+
+    anchors = to_display(ax, [l[0] for l in labels], [l[1] for l in labels])
+    for (lx, ly, text, color, box, along_line), anchor in zip(labels, anchors):
+        tag(lx, ly, text, pick_offset(anchor, along_line=along_line), color=color, box=box)
 
     _extra_x = [s for s in [xi, px, wx] if s is not None]
     _extra_y = [s for s in [yi, py, wy] if s is not None]
@@ -3518,7 +3444,7 @@ def plot_scatter_dynamic(
     plt.tight_layout()
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig, ax
 
 
@@ -3539,12 +3465,11 @@ def plot_portfolio_mix(
         print("  Skipped portfolio mix: no composition columns found")
         return None
 
-    subj = df[df["CERT"] == subject_bank_cert].copy()
+    subj = panel_views(df).history(subject_bank_cert)
     if subj.empty:
         print("  Skipped portfolio mix: no subject bank data")
         return None
 
-    subj = subj.sort_values("REPDTE")
     for c in available:
         subj[c] = pd.to_numeric(subj[c], errors="coerce").fillna(0)
 
@@ -3574,7 +3499,7 @@ def plot_portfolio_mix(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -3591,12 +3516,11 @@ def plot_problem_asset_attribution(
         print("  Skipped problem-asset attribution: no RIC nonaccrual columns found")
         return None
 
-    subj = df[df["CERT"] == subject_bank_cert].copy()
+    subj = panel_views(df).history(subject_bank_cert)
     if subj.empty:
         print("  Skipped problem-asset attribution: no subject bank data")
         return None
 
-    subj = subj.sort_values("REPDTE")
     for c in available:
         subj[c] = pd.to_numeric(subj[c], errors="coerce").fillna(0)
 
@@ -3633,7 +3557,7 @@ def plot_problem_asset_attribution(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -3656,12 +3580,10 @@ def plot_reserve_risk_allocation(
         print("  Skipped reserve-risk allocation: no matching ACL/Loan share pairs found")
         return None
 
-    latest_date = df["REPDTE"].max()
-    subj = df[(df["CERT"] == subject_bank_cert) & (df["REPDTE"] == latest_date)]
-    if subj.empty:
+    subj = panel_views(df).latest_row(subject_bank_cert)
+    if subj is None:
         print("  Skipped reserve-risk allocation: no subject bank data for latest quarter")
         return None
-    subj = subj.iloc[0]
 
     seg_labels, acl_vals, loan_vals = [], [], []
     for seg, acl_col, loan_col in segments:
@@ -3697,7 +3619,7 @@ def plot_reserve_risk_allocation(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -3732,8 +3654,8 @@ def plot_migration_ladder(
         all_peers_cert: ("All Peers", ":", 1.6),
     }
 
-    subj = df[df["CERT"] == subject_bank_cert].copy()
-    if subj.empty:
+    views = panel_views(df)
+    if views.history(subject_bank_cert).empty:
         print("  Skipped migration ladder: no subject bank data")
         return None
 
@@ -3742,10 +3664,9 @@ def plot_migration_ladder(
     ax.set_facecolor("none")
 
     for cert, (ent_label, lstyle, lw) in entity_map.items():
-        ent = df[df["CERT"] == cert].copy()
+        ent = views.history(cert)
         if ent.empty:
             continue
-        ent = ent.sort_values("REPDTE")
         for c in available:
             ent[c] = pd.to_numeric(ent[c], errors="coerce")
         for col, (metric_label, color) in available.items():
@@ -3783,7 +3704,7 @@ def plot_migration_ladder(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -3815,18 +3736,15 @@ def plot_years_of_reserves(
         return None
 
     CC = CHART_COLORS
-    latest_date = df["REPDTE"].max()
-    subj = df[(df["CERT"] == subject_bank_cert) & (df["REPDTE"] == latest_date)]
-    if subj.empty:
+    views = panel_views(df)
+    subj = views.latest_row(subject_bank_cert)
+    if subj is None:
         print("  Skipped years-of-reserves: no subject bank data")
         return None
-    subj = subj.iloc[0]
 
     # Get All Peers (90003) and Wealth Peers (90001) for comparison
-    all_peer = df[(df["CERT"] == ACTIVE_STANDARD_COMPOSITES["all_peers"]) & (df["REPDTE"] == latest_date)]
-    all_peer = all_peer.iloc[0] if not all_peer.empty else None
-    wealth_peer = df[(df["CERT"] == ACTIVE_STANDARD_COMPOSITES["core_pb"]) & (df["REPDTE"] == latest_date)]
-    wealth_peer = wealth_peer.iloc[0] if not wealth_peer.empty else None
+    all_peer = views.latest_row(ACTIVE_STANDARD_COMPOSITES["all_peers"])
+    wealth_peer = views.latest_row(ACTIVE_STANDARD_COMPOSITES["core_pb"])
 
     segments, subj_vals, all_peer_vals, wealth_peer_vals = [], [], [], []
     for col, seg_label in reserve_cols.items():
@@ -3872,7 +3790,7 @@ def plot_years_of_reserves(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -3894,8 +3812,7 @@ def plot_growth_vs_deterioration(
         print("  Skipped growth-vs-deterioration: missing growth or NCO columns")
         return None
 
-    latest_date = df["REPDTE"].max()
-    latest = df[df["REPDTE"] == latest_date].copy()
+    latest = panel_views(df).latest_rows()
     latest[growth_col] = pd.to_numeric(latest[growth_col], errors="coerce")
     latest[nco_col] = pd.to_numeric(latest[nco_col], errors="coerce")
     latest = latest.dropna(subset=[growth_col, nco_col])
@@ -3942,7 +3859,7 @@ def plot_growth_vs_deterioration(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -3977,8 +3894,7 @@ def plot_growth_vs_deterioration_bookwide(
         print("  Skipped growth-vs-deterioration-bookwide: no deterioration column")
         return None
 
-    latest_date = df["REPDTE"].max()
-    latest = df[df["REPDTE"] == latest_date].copy()
+    latest = panel_views(df).latest_rows()
     latest[growth_col] = pd.to_numeric(latest[growth_col], errors="coerce")
     latest[y_col] = pd.to_numeric(latest[y_col], errors="coerce")
     latest = latest.dropna(subset=[growth_col, y_col])
@@ -4027,7 +3943,7 @@ def plot_growth_vs_deterioration_bookwide(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -4046,8 +3962,7 @@ def plot_risk_adjusted_return(
         print(f"  Skipped risk-adjusted return: missing columns {missing}")
         return None
 
-    latest_date = df["REPDTE"].max()
-    latest = df[df["REPDTE"] == latest_date].copy()
+    latest = panel_views(df).latest_rows()
     for c in [x_col, y_col, size_col]:
         latest[c] = pd.to_numeric(latest[c], errors="coerce")
     latest = latest.dropna(subset=[x_col, y_col])
@@ -4099,7 +4014,7 @@ def plot_risk_adjusted_return(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -4116,8 +4031,7 @@ def plot_concentration_vs_capital(
         print(f"  Skipped concentration-vs-capital: missing {x_col} or {y_col}")
         return None
 
-    latest_date = df["REPDTE"].max()
-    latest = df[df["REPDTE"] == latest_date].copy()
+    latest = panel_views(df).latest_rows()
     latest[x_col] = pd.to_numeric(latest[x_col], errors="coerce")
     latest[y_col] = pd.to_numeric(latest[y_col], errors="coerce")
     latest = latest.dropna(subset=[x_col, y_col])
@@ -4170,7 +4084,7 @@ def plot_concentration_vs_capital(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -4190,11 +4104,10 @@ def plot_liquidity_overlay(
         print("  Skipped liquidity overlay: no liquidity columns found")
         return None
 
-    subj = df[df["CERT"] == subject_bank_cert].copy()
+    subj = panel_views(df).history(subject_bank_cert)
     if subj.empty:
         print("  Skipped liquidity overlay: no subject bank data")
         return None
-    subj = subj.sort_values("REPDTE")
     for c in available:
         subj[c] = pd.to_numeric(subj[c], errors="coerce")
 
@@ -4216,7 +4129,7 @@ def plot_liquidity_overlay(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -4248,20 +4161,21 @@ _FRED_DISPLAY = {
 }
 
 
-def _fred_to_quarterly(fred_df: pd.DataFrame, series_id: str) -> pd.Series:
-    """Extract a single FRED series and resample to quarter-end frequency.
+def _load_macro_cube(excel_file: str, caller: str = "macro_cube") -> Optional[MacroCube]:
+    """Quarterly macro cube (all FRED_Data series, t-1 lag precomputed).
 
-    Returns a Series indexed by quarterly period-end dates.
+    Built once per report run by ``generate_reports`` and passed to every
+    macro chart.  Returns None (after printing why) if FRED data is missing.
     """
-    sel = fred_df[fred_df["SeriesID"] == series_id].copy()
-    if sel.empty:
-        return pd.Series(dtype=float)
-    sel = sel.sort_values("DATE")
-    sel["VALUE"] = pd.to_numeric(sel["VALUE"], errors="coerce")
-    sel = sel.dropna(subset=["VALUE"]).set_index("DATE")
-    # Resample to quarter-end, taking the last available observation per quarter
-    qtr = sel["VALUE"].resample("QE").last().dropna()
-    return qtr
+    try:
+        fred_raw, _desc = _load_fred_tables(excel_file)
+    except Exception as e:
+        print(f"  Skipped {caller}: {e}")
+        return None
+    if _validate_fred_schema(fred_raw, {"SeriesID", "DATE", "VALUE"}, caller=caller):
+        print(f"  Skipped {caller}: FRED data missing SeriesID/DATE/VALUE")
+        return None
+    return build_macro_cube(fred_raw, lags=(1,))
 
 
 def generate_macro_corr_heatmap(
@@ -4272,13 +4186,15 @@ def generate_macro_corr_heatmap(
     internal_metrics: Optional[list] = None,
     fred_series: Optional[list] = None,
     save_path: Optional[str] = None,
+    macro_cube: Optional[MacroCube] = None,
 ) -> Optional[str]:
     """Generate a self-contained HTML correlation heatmap.
 
     Rows = internal bank metrics, Columns = FRED macro series.
     Macro series are lagged +1 quarter relative to internal metrics
     (i.e., macro Q(t-1) correlated with bank metric Q(t)).
-    Pearson correlation over trailing window.  Insufficient overlap → N/A.
+    Pearson correlation over trailing window, computed for all pairs at
+    once from the macro cube.  Insufficient overlap / constant series → N/A.
     """
     if internal_metrics is None:
         internal_metrics = MACRO_CORR_INTERNAL_METRICS
@@ -4288,39 +4204,26 @@ def generate_macro_corr_heatmap(
     # --- Load internal bank data ---
     if "REPDTE" not in df.columns:
         return None
-    subj = df[df["CERT"] == subject_cert].copy()
+    subj = panel_views(df).indexed(subject_cert)
     if subj.empty:
         print("  Skipped macro_corr_heatmap: no subject bank data")
         return None
-    subj["REPDTE"] = pd.to_datetime(subj["REPDTE"])
-    subj = subj.sort_values("REPDTE").set_index("REPDTE")
     available_internal = [m for m in internal_metrics if m in subj.columns]
     if not available_internal:
         print("  Skipped macro_corr_heatmap: no internal metrics in data")
         return None
 
-    # --- Load FRED data ---
-    try:
-        fred_raw, desc = _load_fred_tables(excel_file)
-    except Exception as e:
-        print(f"  Skipped macro_corr_heatmap: {e}")
-        return None
-    _validate_fred_schema(fred_raw, {"SeriesID", "DATE", "VALUE"}, caller="macro_corr_heatmap")
-
-    # Build quarterly FRED DataFrame
-    fred_q_dict = {}
-    for sid in fred_series:
-        qtr = _fred_to_quarterly(fred_raw, sid)
-        if not qtr.empty:
-            fred_q_dict[sid] = qtr
-    if not fred_q_dict:
+    # --- Load FRED data (quarterly cube) ---
+    if macro_cube is None:
+        macro_cube = _load_macro_cube(excel_file, caller="macro_corr_heatmap")
+        if macro_cube is None:
+            return None
+
+    # --- Align: lag FRED by +1 quarter (row t holds macro Q(t-1)) ---
+    fred_q_lagged = macro_cube.frame(fred_series, lag=1)
+    if fred_q_lagged.empty or not len(fred_q_lagged.columns):
         print("  Skipped macro_corr_heatmap: no FRED series available")
         return None
-    fred_q = pd.DataFrame(fred_q_dict)
-
-    # --- Align: lag FRED by +1 quarter (shift FRED index forward by 1Q) ---
-    fred_q_lagged = fred_q.copy()
-    fred_q_lagged.index = fred_q_lagged.index + pd.DateOffset(months=3)
 
     # Restrict internal metrics to trailing window
     dates = sorted(subj.index.unique())
@@ -4336,31 +4239,23 @@ def generate_macro_corr_heatmap(
     sub_aligned = subj_trail.loc[common_idx]
     fred_aligned = fred_q_lagged.loc[common_idx]
 
-    # --- Compute Pearson correlations ---
+    # --- Compute Pearson correlations (all metric × series pairs at once) ---
     from metric_semantics import get_semantic
-    import scipy.stats as stats
 
-    n_rows = len(available_internal)
-    n_cols = len(fred_q_dict)
+    sub_numeric = sub_aligned.apply(pd.to_numeric, errors="coerce")
+    corr = pairwise_corr(sub_numeric, fred_aligned, min_periods=4)
+    fred_cols = list(fred_q_lagged.columns)
     corr_data = []
     for m in available_internal:
         sem = get_semantic(m)
         label = sem.display_name if sem else m.replace("_", " ")
         row = {"metric": label}
-        m_vals = pd.to_numeric(sub_aligned[m], errors="coerce")
-        for sid in fred_q_dict:
-            f_vals = pd.to_numeric(fred_aligned[sid], errors="coerce") if sid in fred_aligned.columns else pd.Series(dtype=float)
-            valid = m_vals.notna() & f_vals.notna()
-            n_valid = valid.sum()
-            if n_valid >= 4:
-                r, _ = stats.pearsonr(m_vals[valid], f_vals[valid])
-                row[sid] = r
-            else:
-                row[sid] = None  # N/A — insufficient overlap
+        for sid in fred_cols:
+            r = corr.at[m, sid]
+            row[sid] = None if pd.isna(r) else float(r)  # N/A — insufficient overlap
         corr_data.append(row)
 
     # --- Build HTML ---
-    fred_cols = list(fred_q_dict.keys())
     dt = common_idx.max()
     date_str = f"{dt.year} Q{(dt.month - 1) // 3 + 1}" if hasattr(dt, 'year') else str(dt)
 
@@ -4451,6 +4346,7 @@ def plot_macro_overlay_credit_stress(
     subject_bank_cert: int,
     excel_file: str,
     save_path: Optional[str] = None,
+    macro_cube: Optional[MacroCube] = None,
 ) -> Optional[plt.Figure]:
     """Dual-axis chart: MSPBNA Norm_NCO_Rate (left) vs BAMLH0A0HYM2 & NFCI z-scores (right).
 
@@ -4463,24 +4359,20 @@ def plot_macro_overlay_credit_stress(
         print("  Skipped macro_overlay_credit_stress: Norm_NCO_Rate not in data")
         return None
 
-    subj = df[df["CERT"] == subject_bank_cert].copy()
+    subj = panel_views(df).history(subject_bank_cert)
     if subj.empty:
         print("  Skipped macro_overlay_credit_stress: no subject bank data")
         return None
-    subj = subj.sort_values("REPDTE")
-    subj["REPDTE"] = pd.to_datetime(subj["REPDTE"])
     subj[nco_col] = pd.to_numeric(subj[nco_col], errors="coerce")
 
-    try:
-        fred_raw, desc = _load_fred_tables(excel_file)
-    except Exception as e:
-        print(f"  Skipped macro_overlay_credit_stress: {e}")
-        return None
-    _validate_fred_schema(fred_raw, {"SeriesID", "DATE", "VALUE"}, caller="macro_overlay_credit_stress")
+    if macro_cube is None:
+        macro_cube = _load_macro_cube(excel_file, caller="macro_overlay_credit_stress")
+        if macro_cube is None:
+            return None
 
     # Extract quarterly FRED series — deterministic IDs, no fallback
-    hy_oas = _fred_to_quarterly(fred_raw, "BAMLH0A0HYM2")
-    nfci = _fred_to_quarterly(fred_raw, "NFCI")
+    hy_oas = macro_cube.series("BAMLH0A0HYM2")
+    nfci = macro_cube.series("NFCI")
     if hy_oas.empty and nfci.empty:
         print("  Skipped macro_overlay_credit_stress: neither BAMLH0A0HYM2 nor NFCI available")
         return None
@@ -4532,7 +4424,7 @@ def plot_macro_overlay_credit_stress(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -4541,6 +4433,7 @@ def plot_macro_overlay_rates_housing(
     subject_bank_cert: int,
     excel_file: str,
     save_path: Optional[str] = None,
+    macro_cube: Optional[MacroCube] = None,
 ) -> Optional[plt.Figure]:
     """Dual-axis chart: Resi credit quality (left) vs rates & housing macro (right).
 
@@ -4558,25 +4451,21 @@ def plot_macro_overlay_rates_housing(
         print("  Skipped macro_overlay_rates_housing: no resi/norm nonaccrual metric")
         return None
 
-    subj = df[df["CERT"] == subject_bank_cert].copy()
+    subj = panel_views(df).history(subject_bank_cert)
     if subj.empty:
         print("  Skipped macro_overlay_rates_housing: no subject bank data")
         return None
-    subj = subj.sort_values("REPDTE")
-    subj["REPDTE"] = pd.to_datetime(subj["REPDTE"])
     subj[left_col] = pd.to_numeric(subj[left_col], errors="coerce")
 
-    try:
-        fred_raw, desc = _load_fred_tables(excel_file)
-    except Exception as e:
-        print(f"  Skipped macro_overlay_rates_housing: {e}")
-        return None
-    _validate_fred_schema(fred_raw, {"SeriesID", "DATE", "VALUE"}, caller="macro_overlay_rates_housing")
+    if macro_cube is None:
+        macro_cube = _load_macro_cube(excel_file, caller="macro_overlay_rates_housing")
+        if macro_cube is None:
+            return None
 
     # Extract quarterly FRED series — deterministic IDs
-    fedfunds = _fred_to_quarterly(fred_raw, "FEDFUNDS")
-    mortgage30 = _fred_to_quarterly(fred_raw, "MORTGAGE30US")
-    csushpisa_raw = _fred_to_quarterly(fred_raw, "CSUSHPISA")
+    fedfunds = macro_cube.series("FEDFUNDS")
+    mortgage30 = macro_cube.series("MORTGAGE30US")
+    csushpisa_raw = macro_cube.series("CSUSHPISA")
 
     # Convert CSUSHPISA to YoY % change
     csushpisa_yoy = csushpisa_raw.pct_change(4) * 100 if len(csushpisa_raw) > 4 else pd.Series(dtype=float)
@@ -4627,7 +4516,7 @@ def plot_macro_overlay_rates_housing(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
@@ -4807,7 +4696,7 @@ def plot_msa_macro_panel(
 
     if save_path:
         Path(os.path.dirname(save_path)).mkdir(parents=True, exist_ok=True)
-        fig.savefig(save_path, dpi=300, bbox_inches="tight", transparent=True)
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight", transparent=True)
     return fig
 
 
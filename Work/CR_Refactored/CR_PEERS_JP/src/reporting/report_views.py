@@ -0,0 +1,189 @@
+"""
+Shared Report Views
+===================
+
+Lazily materialized, memoized views of the Step 2 peer panel
+(``proc_df_with_peers``).  Every table, chart and executive producer in
+``report_generator.py`` / ``executive_charts.py`` used to re-derive its own
+subset — a boolean ``CERT`` filter plus sort per chart, a full-frame copy
+to convert ``REPDTE``, a ``REPDTE == max`` slice per latest-quarter chart.
+``panel_views(panel)`` returns one ``PanelViews`` per panel object, so each
+view is computed once on first use and shared by every producer (and by
+the Step 2 DAG threads; building a view is serialized by a lock).
+
+  * ``frame`` — the panel with ``REPDTE`` as datetime64 (the panel itself
+    when it already is).
+  * ``history(cert)`` / ``indexed(cert)`` — one bank's rows sorted by
+    ``REPDTE``, the latter indexed by it.
+  * ``latest_date`` / ``latest_rows()`` / ``latest`` — the latest quarter,
+    as raw rows or as the ``html_tables.PeerSnapshot`` shared with the
+    peer tables; ``latest_row(cert)`` is one bank's latest row.
+  * ``group(certs)`` — the rows of a peer group.
+  * ``certs`` — the set of CERTs present.
+
+Frame-valued views are handed out as shallow copies, which relies on
+copy-on-write: a caller's ``view[c] = ...`` or ``view.loc[...] = x`` copies
+the touched data instead of writing into the memoized frame.  Copy-on-write
+is always on from pandas 3; under pandas 2 this module switches it on when
+imported.
+
+The panel itself must be treated as immutable once registered: the registry
+keys on the panel object and only notices a change of shape, so an in-place
+value update would keep serving the memoized views.  Hashing the panel on
+every lookup would cost more than the views save, so ``seal()`` records a
+content fingerprint once and ``verify_sealed()`` compares against it —
+``generate_reports`` seals the panel before the Step 2 DAG and verifies it
+after, failing the run (and dropping the stale views) if a producer wrote
+into it.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from html_tables import PeerSnapshot, discard_snapshot, latest_snapshot, panel_fingerprint
+
+# Shared views are shallow copies; see the module docstring
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+class PanelViews:
+    """Memoized views of one peer panel (``CERT`` / ``REPDTE`` long format)."""
+
+    def __init__(self, panel: pd.DataFrame):
+        self.panel = panel
+        self._views: Dict[Hashable, object] = {}
+        self._lock = threading.RLock()
+        self._sealed: Optional[str] = None
+
+    def _memo(self, key: Hashable, build: Callable[[], object]):
+        hit = self._views.get(key)
+        if hit is None:
+            with self._lock:
+                hit = self._views.get(key)
+                if hit is None:
+                    hit = self._views[key] = build()
+        return hit
+
+    # ---- immutability check ----------------------------------------------
+
+    def seal(self) -> None:
+        """Record the panel's content fingerprint for ``verify_sealed``."""
+        self._sealed = panel_fingerprint(self.panel)
+
+    def verify_sealed(self) -> None:
+        """Raise ``RuntimeError`` if the panel changed in place since ``seal()``.
+
+        The stale views and snapshot are dropped first, so the next
+        ``panel_views`` call rebuilds them from the current values.
+        """
+        if self._sealed is None or panel_fingerprint(self.panel) == self._sealed:
+            return
+        discard_panel_views(self.panel)
+        raise RuntimeError("peer panel was modified in place after its views were "
+                           "sealed; memoized views may be stale")
+
+    # ---- whole-panel views -----------------------------------------------
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The panel with ``REPDTE`` converted to datetime64 (not copied)."""
+        def build():
+            p = self.panel
+            if "REPDTE" not in p.columns or pd.api.types.is_datetime64_any_dtype(p["REPDTE"]):
+                return p
+            return p.assign(REPDTE=pd.to_datetime(p["REPDTE"]))
+        return self._memo("frame", build)
+
+    @property
+    def repdte(self) -> pd.Series:
+        """Datetime ``REPDTE`` column."""
+        return self.frame["REPDTE"]
+
+    @property
+    def certs(self) -> frozenset:
+        """CERTs present in the panel."""
+        def build():
+            return frozenset(self.panel["CERT"].unique()) if not self.panel.empty else frozenset()
+        return self._memo("certs", build)
+
+    def _by_cert(self) -> Dict[Hashable, np.ndarray]:
+        # One groupby pass serves every later history()/group() call
+        return self._memo("by_cert", lambda: self.frame.groupby("CERT", sort=False).indices)
+
+    # ---- per-bank histories ----------------------------------------------
+
+    def history(self, cert) -> pd.DataFrame:
+        """Rows for *cert* sorted by ``REPDTE`` (original index); empty if absent."""
+        def build():
+            pos = self._by_cert().get(cert)
+            if pos is None:
+                return self.frame.iloc[0:0]
+            return self.frame.iloc[pos].sort_values("REPDTE", kind="stable")
+        return self._memo(("history", cert), build).copy(deep=False)
+
+    def indexed(self, cert) -> pd.DataFrame:
+        """``history(cert)`` indexed by ``REPDTE``."""
+        return self._memo(("indexed", cert),
+                          lambda: self.history(cert).set_index("REPDTE")).copy(deep=False)
+
+    def group(self, certs: Iterable) -> pd.DataFrame:
+        """Rows whose CERT is in *certs*, in panel order."""
+        key = frozenset(certs)
+
+        def build():
+            return self.frame[self.frame["CERT"].isin(key)]
+        return self._memo(("group", key), build).copy(deep=False)
+
+    # ---- latest quarter --------------------------------------------------
+
+    @property
+    def latest_date(self):
+        return self._memo("latest_date", lambda: self.frame["REPDTE"].max())
+
+    def latest_rows(self) -> pd.DataFrame:
+        """All rows of the latest quarter, in panel order."""
+        def build():
+            return self.frame[self.repdte == self.latest_date]
+        return self._memo("latest_rows", build).copy(deep=False)
+
+    @property
+    def latest(self) -> PeerSnapshot:
+        """Latest-quarter snapshot indexed by CERT (shared with the peer tables)."""
+        return latest_snapshot(self.panel)
+
+    def latest_row(self, cert) -> Optional[pd.Series]:
+        """*cert*'s latest-quarter row, or None."""
+        return self.latest.row(cert)
+
+
+_VIEWS: Dict[int, Tuple[weakref.ref, Tuple[int, int], PanelViews]] = {}
+_VIEWS_LOCK = threading.Lock()
+
+
+def panel_views(panel: pd.DataFrame) -> PanelViews:
+    """Shared ``PanelViews`` for *panel* (rebuilt if the frame changes shape)."""
+    key = id(panel)
+    with _VIEWS_LOCK:
+        hit = _VIEWS.get(key)
+        if hit is not None and hit[0]() is panel and hit[1] == panel.shape:
+            return hit[2]
+        views = PanelViews(panel)
+        ref = weakref.ref(panel, lambda _r, k=key: _VIEWS.pop(k, None))
+        _VIEWS[key] = (ref, panel.shape, views)
+        return views
+
+
+def discard_panel_views(panel: pd.DataFrame) -> None:
+    """Drop the shared views and snapshot of *panel*."""
+    with _VIEWS_LOCK:
+        hit = _VIEWS.get(id(panel))
+        if hit is not None and hit[0]() is panel:
+            _VIEWS.pop(id(panel), None)
+    discard_snapshot(panel)
@@ -933,6 +933,187 @@ def test_active_composites_preserved():
     print("  [PASS] test_active_composites_preserved")
 
 
+def test_artifact_cache_key_tracks_inputs():
+    """Cache key changes with data, params and mode; save_path is ignored."""
+    from rendering_mode import ArtifactCache, RenderMode
+
+    def render(df, scale=1, save_path=None):
+        return df * scale
+
+    df = pd.DataFrame({"CERT": [1, 2], "X": [0.1, 0.2]})
+    full = ArtifactCache("unused", RenderMode.FULL_LOCAL)
+    safe = ArtifactCache("unused", RenderMode.CORP_SAFE)
+    key = full.key_for("t", render, (df,), {"scale": 2, "save_path": "a.png"})
+    assert key == full.key_for("t", render, (df.copy(),), {"scale": 2, "save_path": "b.png"})
+    assert key != full.key_for("t", render, (df.assign(X=[0.1, 0.3]),), {"scale": 2})
+    assert key != full.key_for("t", render, (df,), {"scale": 3})
+    assert key != safe.key_for("t", render, (df,), {"scale": 2})
+    assert key != full.key_for("u", render, (df,), {"scale": 2})
+    print("  [PASS] test_artifact_cache_key_tracks_inputs")
+
+
+def test_artifact_cache_key_tracks_render_environment():
+    """Library versions and effective rcParams are part of the cache key."""
+    import matplotlib
+    from rendering_mode import ArtifactCache, RenderMode
+
+    def render(df, save_path=None):
+        return df
+
+    df = pd.DataFrame({"CERT": [1, 2], "X": [0.1, 0.2]})
+    cache = ArtifactCache("unused", RenderMode.FULL_LOCAL)
+    key = cache.key_for("t", render, (df,))
+    with matplotlib.rc_context({"font.size": matplotlib.rcParams["font.size"] + 1}):
+        assert key != cache.key_for("t", render, (df,))
+    assert key == cache.key_for("t", render, (df,))
+    version = pd.__version__
+    try:
+        pd.__version__ = version + ".post1"
+        assert key != cache.key_for("t", render, (df,))
+    finally:
+        pd.__version__ = version
+    print("  [PASS] test_artifact_cache_key_tracks_render_environment")
+
+
+def test_artifact_cache_restore_and_prune():
+    """store() then restore() copies the artifact; newer keys prune older ones
+    without touching artifacts whose names share a prefix."""
+    import tempfile
+    from rendering_mode import ArtifactCache, RenderMode
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ArtifactCache(Path(tmpdir) / "cache", RenderMode.FULL_LOCAL)
+        out = Path(tmpdir) / "chart.png"
+        out.write_bytes(b"v1")
+        cache.store("growth", "a" * 64, str(out))
+        cache.store("growth_bookwide", "c" * 64, str(out))
+        out.write_bytes(b"v2")
+        cache.store("growth", "b" * 64, str(out))
+
+        out.unlink()
+        assert cache.restore("growth", "b" * 64, str(out))
+        assert out.read_bytes() == b"v2"
+        assert not cache.restore("growth", "a" * 64, str(out))
+        assert cache.restore("growth_bookwide", "c" * 64, str(out))
+        assert (cache.hits, cache.misses) == (2, 1)
+    print("  [PASS] test_artifact_cache_restore_and_prune")
+
+
+def test_produce_table_uses_artifact_cache():
+    """A second _produce_table call with unchanged inputs copies from cache."""
+    import tempfile
+    from rendering_mode import ArtifactCache, ArtifactManifest, RenderMode
+    from report_generator import _ReportContext, _produce_table
+
+    class _Log:
+        def log_file_written(self, *args, **kwargs):
+            pass
+
+    calls = []
+
+    def gen(df):
+        calls.append(1)
+        return f"<table>{len(df)}</table>"
+
+    df = pd.DataFrame({"CERT": [1, 2, 3]})
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest = ArtifactManifest(RenderMode.FULL_LOCAL)
+        ctx = _ReportContext(mode=RenderMode.FULL_LOCAL, manifest=manifest,
+                             base_stem="Bank_Performance_Dashboard_20260101",
+                             cache=ArtifactCache(Path(tmpdir) / ".artifact_cache",
+                                                 RenderMode.FULL_LOCAL))
+        for _ in range(2):
+            _produce_table(ctx, "fred_table", _Log(), gen, Path(tmpdir), df)
+        _produce_table(ctx, "fred_table", _Log(), gen, Path(tmpdir), df.head(2))
+
+        assert len(calls) == 2
+        assert [o.cached for o in manifest.outcomes] == [False, True, False]
+        assert manifest.outcomes[0].cache_key == manifest.outcomes[1].cache_key
+        assert "(cached)" in manifest.summary_table()
+    print("  [PASS] test_produce_table_uses_artifact_cache")
+
+
+def test_chart_output_policy_selection():
+    """Chart format / PNG list / DPI resolve from arguments, then env vars."""
+    from rendering_mode import ChartFormat, ChartOutputPolicy
+
+    assert ChartOutputPolicy.from_env().fmt is ChartFormat.PNG
+    os.environ["REPORT_CHART_FORMAT"] = "SVG"
+    os.environ["REPORT_PNG_ARTIFACTS"] = "portfolio_mix, liquidity_overlay"
+    try:
+        policy = ChartOutputPolicy.from_env()
+        assert policy.fmt is ChartFormat.SVG
+        assert policy.png_artifacts == {"portfolio_mix", "liquidity_overlay"}
+        assert ChartOutputPolicy.from_env("pdf", ["all"], 200) == ChartOutputPolicy(
+            ChartFormat.PDF, None, 200)
+    finally:
+        del os.environ["REPORT_CHART_FORMAT"], os.environ["REPORT_PNG_ARTIFACTS"]
+    try:
+        ChartOutputPolicy.from_env("gif")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+    req = policy.request("portfolio_mix", "/out/stem_portfolio_mix.png")
+    assert (req.primary_path, req.raster_path) == ("/out/stem_portfolio_mix.svg",
+                                                   "/out/stem_portfolio_mix.png")
+    assert policy.request("migration_ladder", "/out/m.png").outputs == ["/out/m.svg"]
+    assert policy.request("macro_corr_heatmap_lag1", "/out/h.html").outputs == ["/out/h.html"]
+    assert ChartOutputPolicy().request("portfolio_mix", "/out/p.png").variant == ""
+    print("  [PASS] test_chart_output_policy_selection")
+
+
+def test_produce_chart_vector_first_with_png_on_demand():
+    """SVG is the primary chart file; only requested artifacts are rasterized,
+    the choice is recorded in the manifest and both files are cached."""
+    import tempfile
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from rendering_mode import (ArtifactCache, ArtifactManifest, ChartFormat,
+                                ChartOutputPolicy, RenderMode, save_figure)
+    from report_generator import _ReportContext, _produce_chart
+
+    class _Log:
+        def log_file_written(self, *args, **kwargs):
+            pass
+
+    dpis = []
+
+    def chart(n, save_path=None):
+        fig, ax = plt.subplots(figsize=(2, 1))
+        ax.plot(range(n))
+        real_savefig = fig.savefig
+
+        def spy(path, dpi=None, **kwargs):
+            dpis.append((Path(path).suffix, dpi))
+            real_savefig(path, dpi=dpi, **kwargs)
+        fig.savefig = spy
+        save_figure(fig, save_path, dpi=300, bbox_inches="tight")
+        return fig
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest = ArtifactManifest(RenderMode.FULL_LOCAL)
+        ctx = _ReportContext(mode=RenderMode.FULL_LOCAL, manifest=manifest, base_stem="stem",
+                             cache=ArtifactCache(Path(tmpdir) / "cache", RenderMode.FULL_LOCAL),
+                             chart_output=ChartOutputPolicy(ChartFormat.SVG,
+                                                            frozenset({"portfolio_mix"}), 96))
+        for _ in range(2):
+            _produce_chart(ctx, "portfolio_mix", _Log(), chart, Path(tmpdir), 3)
+            _produce_chart(ctx, "migration_ladder", _Log(), chart, Path(tmpdir), 3)
+
+        files = sorted(p.name for p in Path(tmpdir).iterdir() if p.is_file())
+        assert files == ["stem_migration_ladder.svg", "stem_portfolio_mix.png",
+                         "stem_portfolio_mix.svg"]
+        assert dpis == [(".svg", 300), (".png", 96), (".svg", 300)]
+        mix, ladder, mix_cached, _ = manifest.outcomes
+        assert (mix.output_format, mix.raster_dpi) == ("svg", 96)
+        assert mix.path.endswith(".svg") and mix.raster_path.endswith(".png")
+        assert ladder.raster_path is None and ladder.raster_dpi is None
+        assert mix_cached.cached and mix_cached.raster_path == mix.raster_path
+        assert "(+png)" in manifest.summary_table()
+    print("  [PASS] test_produce_chart_vector_first_with_png_on_demand")
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 13. EXECUTIVE CHARTS — metric_semantics + executive_charts + integration
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1282,6 +1463,19 @@ class TestPeerGroupUniqueness(unittest.TestCase):
         with self.assertRaises(ValueError):
             validate_peer_group_uniqueness(bad_groups)
 
+    def test_find_duplicate_peer_groups_reports_every_cluster(self):
+        from peer_assembly import PEER_GROUPS, find_duplicate_peer_groups
+        self.assertEqual(find_duplicate_peer_groups(PEER_GROUPS), [])
+        groups = {
+            'A': {'certs': [3, 1, 2], 'use_normalized': False},
+            'B': {'certs': [1, 2, 3], 'use_normalized': False},
+            'C': {'certs': [1, 2, 3], 'use_normalized': True},
+            'D': {'certs': [4, 5], 'use_normalized': False},
+            'E': {'certs': [5, 4], 'use_normalized': False},
+            'F': {'certs': [2, 1, 3], 'use_normalized': False},
+        }
+        self.assertEqual(find_duplicate_peer_groups(groups), [['A', 'B', 'F'], ['D', 'E']])
+
 
 class TestMetricNaming(unittest.TestCase):
     """Tests for correct metric naming conventions."""
@@ -2032,6 +2226,464 @@ class TestHTMLTableResilience(unittest.TestCase):
                        "Matplotlib tight_layout warning must be filtered")
 
 
+class TestHTMLTableEngine(unittest.TestCase):
+    """Snapshot, vectorized formatters and templates behind the peer tables."""
+
+    @staticmethod
+    def _panel():
+        rows = []
+        for d in ["2024-09-30", "2024-12-31"]:
+            for cert, name in [(34221, "MORGAN STANLEY PRIVATE BANK"), (33124, "GOLDMAN SACHS BANK USA"),
+                               (57565, "UBS BANK USA"), (90001, "Core PB")]:
+                rows.append({"CERT": cert, "NAME": name, "REPDTE": pd.Timestamp(d)})
+        df = pd.DataFrame(rows)
+        df["ASSET"] = [2.5e8, 3.1e8, 1.2e8, 2.0e8] * 2
+        df["TTM_NCO_Rate"] = np.array([0.004, 0.002, np.nan, 0.003] * 2, dtype="float32")
+        df["SBL_Composition"] = np.zeros(8, dtype="float32")   # dead metric
+        return df
+
+    def test_column_formatters_match_scalar(self):
+        import report_generator as rg
+        from html_tables import fmt_money_col, fmt_multiple_col, fmt_percent_col
+        vals = np.array([np.nan, 0.0, -0.0, 0.0123, -0.5, 0.999, 1.0, 12.345, -250.0,
+                         999.4, 1500.0, -7.5e5, 2.54706e8])
+        ref = np.roll(vals, 3)
+        self.assertEqual(list(fmt_percent_col(vals)), [rg._fmt_percent(v) for v in vals])
+        self.assertEqual(list(fmt_percent_col(vals, signed=True, ref=ref)),
+                         [rg._fmt_percent_diff(v, r) for v, r in zip(vals, ref)])
+        self.assertEqual(list(fmt_multiple_col(vals, signed=True)), [rg._fmt_multiple_diff(v) for v in vals])
+        self.assertEqual(list(fmt_money_col(vals)), [rg._fmt_money_billions(v) for v in vals])
+        self.assertEqual(list(fmt_money_col(vals, signed=True)), [rg._fmt_money_billions_diff(v) for v in vals])
+
+    def test_snapshot_shared_and_aligned(self):
+        from html_tables import latest_snapshot
+        df = self._panel()
+        snap = latest_snapshot(df)
+        self.assertIs(latest_snapshot(df), snap)
+        self.assertEqual(snap.date, pd.Timestamp("2024-12-31"))
+        block = snap.block(["ASSET", "Missing_Metric"], [33124, 99999])
+        self.assertEqual(block.shape, (2, 2))
+        self.assertEqual(block[0, 0], 3.1e8)
+        self.assertTrue(np.isnan(block[0, 1]) and np.isnan(block[1]).all())
+
+    def test_executive_summary_rendering(self):
+        import report_generator as rg
+        html, df = rg.generate_credit_metrics_email_table(self._panel(), 34221)
+        self.assertEqual(list(df.columns), ["Metric", "MSPBNA", "GS", "UBS", "Wealth Peers",
+                                            "Delta MSPBNA vs Wealth Peers"])
+        self.assertNotIn("SBL % of Loans", list(df["Metric"]))   # all-zero float32 row suppressed
+        nco = df[df["Metric"] == "NCO Rate (TTM) (%)"].iloc[0]
+        self.assertEqual((nco["MSPBNA"], nco["UBS"], nco["Delta MSPBNA vs Wealth Peers"]),
+                         ("0.40%", "N/A", "+0.10%"))
+        self.assertIn('<td class="subject-value">$250.0B</td>', html)
+        self.assertIn('<td>+$50.0B</td></tr>', html)
+
+    def test_dead_metric_rows_dropped_for_any_numeric_dtype(self):
+        """All-zero / all-NaN metric rows are dropped whatever the column dtype
+        (the old isinstance(v, (int, float)) check only caught float64 zeros)."""
+        import re
+        import report_generator as rg
+        df = self._panel()
+        df["ROA"] = np.zeros(8, dtype="int64")
+        df["ROE"] = np.zeros(8)
+        df["EEFFR"] = np.nan
+        df["Liquidity_Ratio"] = 1e-13
+        df["NIMY"] = [0.0, 0.02, 0.0, 0.0] * 2      # zero for MSPBNA only
+        _, table = rg.generate_credit_metrics_email_table(df, 34221)
+        self.assertEqual(list(table["Metric"]), ["Total Assets ($B)", "NCO Rate (TTM) (%)",
+                                                 "Net Interest Margin (%)"])
+
+        peers = df[df["CERT"] == 90001].assign(CERT=rg.ACTIVE_STANDARD_COMPOSITES["all_peers"])
+        df = pd.concat([df, peers], ignore_index=True)
+        df["Fund_Finance_Composition"] = np.zeros(len(df), dtype="int64")
+        df["RIC_CRE_Loan_Share"] = np.where(df["CERT"].eq(34221), 0.0, 0.1)
+        html = rg.generate_ratio_components_table(df, 34221)
+        shown = re.findall(r'<td class="ratio-name">(.*?)</td>', html)
+        self.assertEqual(shown, ["NCO Rate (TTM)", "CRE % of Loans"])
+
+    @staticmethod
+    def _normalized_html(html):
+        """(sorted CSS rules, markup with insignificant whitespace removed)."""
+        import re
+        style = re.search(r"<style>(.*?)</style>", html, re.S)
+        rules = sorted({" ".join(r.split()) + " }" for r in style.group(1).split("}") if r.strip()})
+        markup = " ".join((html[:style.start()] + html[style.end():]).split())
+        markup = re.sub(r"\s+>", ">", re.sub(r">\s+<", "><", markup))
+        return rules, markup
+
+    def test_executive_summary_matches_legacy_markup(self):
+        """Same CSS rules and markup as the pre-html_tables renderer (which
+        emitted different rule order / whitespace) for a float64 panel."""
+        import report_generator as rg
+        df = self._panel().drop(columns="SBL_Composition")
+        df["TTM_NCO_Rate"] = df["TTM_NCO_Rate"].astype("float64").round(6)
+        html, _ = rg.generate_credit_metrics_email_table(df, 34221)
+        rules, markup = self._normalized_html(html)
+        self.assertEqual(rules, [
+            ".bad-trend { color: #d32f2f; font-weight: bold; }",
+            ".email-container { background-color: transparent; padding: 20px; max-width: 1200px; "
+            "margin: 0 auto; text-align: center; }",
+            ".footnote { font-size: 10px; color: #666; margin-top: 20px; border-top: 1px solid #ccc; "
+            "padding-top: 10px; text-align: left; }",
+            ".good-trend { color: #388e3c; font-weight: bold; }",
+            ".metric-name { text-align: left !important; font-weight: bold; color: #2c3e50; "
+            "min-width: 180px; background-color: transparent; }",
+            ".msbna-value { background-color: rgba(76, 120, 168, 0.08) !important; font-weight: 600; color: #444; }",
+            ".neutral-trend { color: #757575; font-weight: bold; }",
+            ".subject-value { background-color: #E6F3FF !important; font-weight: bold; color: #002F6C; "
+            "border-left: 2px solid #002F6C; border-right: 2px solid #002F6C; }",
+            "body { font-family: Arial, sans-serif; background-color: transparent; }",
+            "h3 { color: #002F6C; margin-bottom: 5px; text-align: center; }",
+            "p.date-header { margin-top: 0; font-weight: bold; color: #555; text-align: center; margin-bottom: 20px; }",
+            "table { width: 100%; border-collapse: collapse; margin: 0 auto; font-size: 11px; "
+            "background-color: transparent; }",
+            "td { padding: 6px; text-align: center; border: 1px solid #e0e0e0; background-color: transparent; }",
+            "th { background-color: #002F6C; color: white; padding: 8px; border: 1px solid #2c3e50; }",
+        ])
+        self.assertEqual(markup, (
+            '<html><head></head><body><div class="email-container"><h3>Executive Summary (Standard)</h3>'
+            '<p class="date-header">December 31, 2024</p><table><thead><tr><th>Metric</th><th>MSPBNA</th>'
+            '<th>GS</th><th>UBS</th><th>Wealth Peers</th><th>Delta MSPBNA vs Wealth Peers</th></tr></thead>'
+            '<tbody><tr><td class="metric-name"><b>Total Assets ($B)</b></td>'
+            '<td class="subject-value">$250.0B</td><td>$310.0B</td><td>$120.0B</td><td>$200.0B</td>'
+            '<td>+$50.0B</td></tr><tr><td class="metric-name"><b>NCO Rate (TTM) (%)</b></td>'
+            '<td class="subject-value">0.40%</td><td>0.20%</td><td>N/A</td><td>0.30%</td><td>+0.10%</td>'
+            '</tr></tbody></table><div class="footnote"><p><b>Methodology:</b></p>'
+            '<p><b>Risk-Adj ACL Ratio:</b> Total ACL / (Gross Loans - SBL). Removes low-risk SBL to show '
+            'coverage on core credit.</p><p><b>CRE NPL Coverage:</b> CRE-Specific ACL / CRE Nonaccrual Loans.'
+            '</p></div></div></body></html>'))
+
+
+class TestSharedReportViews(unittest.TestCase):
+    """Memoized panel views shared by the Step 2 producers."""
+
+    @staticmethod
+    def _panel():
+        rows = [{"CERT": cert, "REPDTE": d, "TTM_NCO_Rate": 0.001 * i}
+                for i, d in enumerate(["2024-12-31", "2024-06-30", "2024-09-30"])
+                for cert in (34221, 90001, 90003)]
+        return pd.DataFrame(rows)
+
+    def test_views_memoized_per_panel(self):
+        from html_tables import latest_snapshot
+        from report_views import panel_views
+        df = self._panel()
+        views = panel_views(df)
+        self.assertIs(panel_views(df), views)
+        self.assertIsNot(panel_views(self._panel()), views)
+        self.assertIs(views.frame, views.frame)
+        self.assertEqual(views.certs, frozenset({34221, 90001, 90003}))
+        self.assertIs(views.latest, latest_snapshot(df))
+
+    def test_views_match_inline_derivations(self):
+        from report_views import panel_views
+        df = self._panel()
+        views = panel_views(df)
+        # REPDTE strings are converted once, without touching the panel
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(views.repdte))
+        self.assertFalse(pd.api.types.is_datetime64_any_dtype(df["REPDTE"]))
+        hist = views.history(90001)
+        self.assertEqual(list(hist["TTM_NCO_Rate"]), [0.001, 0.002, 0.0])
+        self.assertTrue(hist["REPDTE"].is_monotonic_increasing)
+        self.assertEqual(views.indexed(90001).index.name, "REPDTE")
+        self.assertTrue(views.history(99999).empty)
+        self.assertEqual(views.latest_date, pd.Timestamp("2024-12-31"))
+        self.assertEqual(list(views.latest_rows()["CERT"]), [34221, 90001, 90003])
+        self.assertEqual(views.latest_row(90003)["TTM_NCO_Rate"], 0.0)
+        self.assertIsNone(views.latest_row(99999))
+        self.assertEqual(sorted(views.group([90001, 90003])["CERT"].unique()), [90001, 90003])
+
+    def test_views_are_not_mutated_by_callers(self):
+        from report_views import panel_views
+        views = panel_views(self._panel())
+        hist = views.history(34221)
+        hist["TTM_NCO_Rate"] = -1.0
+        hist["Extra"] = 1
+        again = views.history(34221)
+        self.assertNotIn("Extra", again.columns)
+        self.assertEqual(list(again["TTM_NCO_Rate"]), [0.001, 0.002, 0.0])
+
+    def test_in_place_view_edit_not_seen_by_next_caller(self):
+        from report_views import panel_views
+        df = self._panel()
+        views = panel_views(df)
+        edits = [
+            ("history", lambda: views.history(34221), [0.001, 0.002, 0.0]),
+            ("indexed", lambda: views.indexed(34221), [0.001, 0.002, 0.0]),
+            ("group", lambda: views.group([90001]), [0.0, 0.001, 0.002]),
+            ("latest_rows", views.latest_rows, [0.0, 0.0, 0.0]),
+        ]
+        for name, get, expected in edits:
+            with self.subTest(view=name):
+                view = get()
+                view.loc[view.index[0], "TTM_NCO_Rate"] = -1.0
+                view.iloc[-1, view.columns.get_loc("TTM_NCO_Rate")] = -2.0
+                self.assertEqual(list(get()["TTM_NCO_Rate"]), expected)
+        self.assertEqual(list(df["TTM_NCO_Rate"]), [0.0] * 3 + [0.001] * 3 + [0.002] * 3)
+
+    def test_in_place_panel_edit_fails_sealed_check(self):
+        from html_tables import latest_snapshot
+        from report_views import panel_views
+        df = self._panel()
+        views = panel_views(df)
+        views.seal()
+        snap = views.latest
+        self.assertEqual(views.latest_row(90001)["TTM_NCO_Rate"], 0.0)
+        views.verify_sealed()
+        # Same shape, new value: the registry alone would keep serving stale views
+        df.loc[df["CERT"].eq(90001) & df["REPDTE"].eq("2024-12-31"), "TTM_NCO_Rate"] = 0.5
+        self.assertIs(panel_views(df), views)
+        with self.assertRaises(RuntimeError):
+            views.verify_sealed()
+        fresh = panel_views(df)
+        self.assertIsNot(fresh, views)
+        self.assertIsNot(latest_snapshot(df), snap)
+        self.assertEqual(fresh.latest_row(90001)["TTM_NCO_Rate"], 0.5)
+        self.assertEqual(list(fresh.latest_rows()["TTM_NCO_Rate"]), [0.0, 0.5, 0.0])
+
+
+class TestExecutiveBatchRenderer(unittest.TestCase):
+    """Executive sparkline / heatmap / bullet data built from one pivot."""
+
+    @staticmethod
+    def _panel():
+        rows = [{"CERT": cert, "REPDTE": d, "TTM_NCO_Rate": 0.001 * i + 0.0001 * k}
+                for i, d in enumerate(["2023-12-31", "2024-03-31", "2024-06-30",
+                                       "2024-09-30", "2024-12-31"])
+                for k, cert in enumerate((34221, 90003, 1001, 1002))]
+        return pd.DataFrame(rows)
+
+    def test_quarter_cube_matches_row_lookup(self):
+        import executive_charts as ec
+        df = self._panel()
+        dates = pd.to_datetime(["2024-12-31", "2023-12-31", "2025-03-31"])
+        cube = ec.quarter_cube(df, [90003, 99999], dates, ["TTM_NCO_Rate"])
+        self.assertEqual(cube.shape, (2, 1, 3))
+        self.assertAlmostEqual(cube[0, 0, 0], 0.0041)
+        self.assertAlmostEqual(cube[0, 0, 1], 0.0001)
+        self.assertTrue(np.isnan(cube[0, 0, 2]))
+        self.assertTrue(np.isnan(cube[1]).all())
+
+    def test_batch_sparklines_match_single(self):
+        import executive_charts as ec
+        matrix = np.array([[1.0, np.nan, 3.0, 2.0], [np.nan, np.nan, 5.0, np.nan],
+                           [2.0, 2.0, 2.0, 2.0]])
+        batch = ec._svg_sparklines(matrix, ["#d32f2f", "#388e3c", "#4C78A8"])
+        self.assertEqual(batch, [ec._svg_sparkline(list(r), color=c)
+                                 for r, c in zip(matrix, ["#d32f2f", "#388e3c", "#4C78A8"])])
+        self.assertIn('points="2.0,22.0 79.3,2.0 118.0,12.0"', batch[0])
+        self.assertEqual(batch[1], '<svg width="120" height="24"></svg>')
+
+    def test_range_stats_and_heatmap(self):
+        import executive_charts as ec
+        block = np.array([[3.0, np.nan, 1.0, 1.0], [np.nan] * 4])
+        first, missing = ec._range_stats(block, [11, 12, 13, 14])
+        self.assertEqual((first["lo"], first["hi"], first["count"]), (1.0, 3.0, 3))
+        self.assertEqual((first["min_cert"], first["max_cert"]), (13, 11))
+        self.assertAlmostEqual(first["mean"], 5.0 / 3)
+        self.assertEqual(first["median"], 1.0)
+        self.assertIsNone(missing)
+        hm = ec.build_yoy_heatmap_data(self._panel(), 34221, 90003, metrics=["TTM_NCO_Rate"])
+        row = hm.iloc[0]
+        self.assertAlmostEqual(row["subj_yoy"], 0.004)
+        self.assertAlmostEqual(row["vs_peer_delta"], -0.0001)
+
+
+class TestCompiledDataDictionary(unittest.TestCase):
+    """MasterDataDictionary lookups served from the compiled SQLite store."""
+
+    def setUp(self):
+        import tempfile
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = self._tmp.name
+        with open(os.path.join(self.cache, "MDRM.csv"), "w", encoding="utf-8") as f:
+            f.write("PUBLIC\n")
+            pd.DataFrame({
+                "Mnemonic": ["RCFD", "RCON", "RIAD"],
+                "Item Code": ["2170", "2170", "4340"],
+                "Item Name": ["TOTAL ASSETS", "TOTAL ASSETS (DOM)", "NET INCOME"],
+                "Description": ["Total assets of the bank", "Domestic total assets",
+                                "Net income attributable to the bank"],
+            }).to_csv(f, index=False)
+        pd.DataFrame({"code": ["ASSET", "LNLS"], "name": ["Total assets", "Loans"],
+                      "description": ["Total assets", ""]}).to_csv(
+            os.path.join(self.cache, "fdic_schema.csv"), index=False)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_batch_lookup_matches_single_lookup(self):
+        from master_data_dictionary import MasterDataDictionary
+        codes = ["RCFD2170", "RCOA2170", "asset", "LNLS", "TTM_NCO_Rate", "ZZZ9"]
+        mdd = MasterDataDictionary(cache_dir=self.cache)
+        batch = mdd.lookup_metrics(codes)
+        self.assertEqual(batch, [mdd.lookup_metric(c) for c in codes])
+        self.assertEqual([r["Source_of_Truth"] for r in batch], [
+            "Tier 1 — Federal Reserve MDRM", "Tier 1 — Federal Reserve MDRM (base item)",
+            "Tier 2 — FDIC BankFind API", "Tier 2 — FDIC BankFind API",
+            "Tier 3 — Local/Derived", "Not Found"])
+        self.assertIn("FDIC BankFind API field: LNLS", batch[3]["Description"])
+        self.assertEqual(mdd.lookup_metrics([]), [])
+
+    def test_compiled_store_reused_without_csv_parse(self):
+        from unittest import mock
+        from master_data_dictionary import MasterDataDictionary
+        first = MasterDataDictionary(cache_dir=self.cache).lookup_metrics(["RCON2170", "ASSET"])
+        self.assertTrue(os.path.exists(os.path.join(self.cache, "dictionary_index.sqlite")))
+        with mock.patch.object(MasterDataDictionary, "_read_mdrm_csv",
+                               side_effect=AssertionError("MDRM CSV re-parsed")):
+            mdd = MasterDataDictionary(cache_dir=self.cache)
+            self.assertEqual(mdd.lookup_metrics(["RCON2170", "ASSET"]), first)
+            self.assertEqual(mdd._store.codes_with_prefix("mdrm", "RCFD"), ["RCFD", "RCFD2170"])
+            hits = mdd.search_descriptions("net income")
+            self.assertIn("RIAD4340", list(hits["Metric_Code"]))
+            self.assertNotIn("RCON2170", list(hits["Metric_Code"]))
+
+    def test_compiled_store_rebuilt_when_source_changes(self):
+        from master_data_dictionary import MasterDataDictionary
+        MasterDataDictionary(cache_dir=self.cache).lookup_metric("RCFD2170")
+        path = os.path.join(self.cache, "MDRM.csv")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("RCFD,9999,NEW ITEM,Added after compile\n")
+        mdd = MasterDataDictionary(cache_dir=self.cache)
+        self.assertEqual(mdd.lookup_metric("RCFD9999")["Metric_Name"], "NEW ITEM")
+        mdd.clear_cache()
+        self.assertFalse(os.path.exists(os.path.join(self.cache, "dictionary_index.sqlite")))
+
+    def test_delta_refresh_rewrites_only_changed_rows(self):
+        from unittest import mock
+        from master_data_dictionary import MasterDataDictionary
+        mdrm = pd.DataFrame({
+            "Mnemonic": ["RCFD", "RCON", "RIAD"], "Item Code": ["2170", "2170", "4340"],
+            "Start Date": ["1/1/2001"] * 3, "End Date": ["12/31/9999"] * 3,
+            "Item Name": ["TOTAL ASSETS", "TOTAL ASSETS (DOM)", "NET INCOME"],
+            "Description": ["Total assets", "Domestic total assets", "Net income"],
+        })
+        state = {"mdrm": mdrm}
+
+        def download(self, dest):
+            state["mdrm"].to_csv(dest, index=False)
+            return self._read_mdrm_csv(dest)
+
+        schema = {"ASSET": {"name": "Total assets", "description": "Total assets"}}
+        with mock.patch.object(MasterDataDictionary, "_download_mdrm_zip", download), \
+                mock.patch.object(MasterDataDictionary, "_fetch_fdic_schema_via_financials",
+                                  lambda self: dict(schema)):
+            mdd = MasterDataDictionary(cache_dir=self.cache)
+            self.assertEqual(mdd.refresh()["mdrm"]["mode"], "initial")
+            self.assertEqual(mdd.refresh()["mdrm"]["mode"], "unchanged")
+
+            changed = mdrm.copy()
+            changed.loc[2, "Description"] = "Net income (loss)"
+            changed.loc[3] = ["RCFD", "J454", "1/1/2020", "12/31/9999", "NEW ITEM", "New"]
+            state["mdrm"] = changed
+            summary = mdd.refresh()["mdrm"]
+            self.assertEqual(summary["mode"], "delta")
+            self.assertEqual((summary["rows_added"], summary["rows_removed"],
+                              summary["rows_modified"]), (1, 0, 1))
+            self.assertEqual(summary["codes_changed"], ["4340", "J454", "RCFDJ454", "RIAD", "RIAD4340"])
+
+        fresh = MasterDataDictionary(cache_dir=self.cache)
+        self.assertEqual(fresh.lookup_metric("RIAD4340")["Description"], "Net income (loss)")
+        self.assertEqual(fresh.lookup_metric("RCFDJ454")["Metric_Name"], "NEW ITEM")
+        self.assertEqual(fresh.lookup_metric("RCON2170")["Description"], "Domestic total assets")
+        log = fresh.change_log()
+        self.assertEqual(sorted(log.loc[log["Level"] == "row", "Change"]), ["added", "modified"])
+
+
+class TestSemanticRuleEngine(unittest.TestCase):
+    """Semantic rules evaluated against one shared set of grouped aggregates."""
+
+    def _panel(self):
+        return pd.DataFrame({
+            "CERT": [90001, 90004, 90001, 90004, 19977],
+            "REPDTE": pd.to_datetime(["2024-12-31", "2024-12-31", "2025-03-31",
+                                      "2025-03-31", "2025-03-31"]),
+            "TTM_NCO_Rate": [0.01, 0.0, 0.02, 0.02, 0.03],
+            "Norm_NCO_Rate": [np.nan, 0.0, np.nan, 0.015, 0.01],
+            "Norm_ACL_Coverage": [0.5, 0.5, 0.02, 0.02, 0.02],
+        })
+
+    def test_grouping_aggregated_once_for_all_specs(self):
+        from metric_registry import PanelStats, StatSpec
+        df = self._panel()
+        stats = PanelStats(df, [
+            StatSpec(("CERT",), ("TTM_NCO_Rate",), ("max",)),
+            StatSpec(("CERT",), ("Norm_NCO_Rate",), ("any_nonzero", "count")),
+            StatSpec(("CERT",), ("TTM_NCO_Rate",), ("first_row",), latest_only=True),
+        ])
+        tbl = stats.table(("CERT",))
+        self.assertIs(tbl, stats.table(("CERT",)))
+        self.assertEqual(set(tbl.columns), {("TTM_NCO_Rate", "max"), ("Norm_NCO_Rate", "any_nonzero"),
+                                            ("Norm_NCO_Rate", "count")})
+        self.assertEqual(stats.value(("CERT",), 90001, "TTM_NCO_Rate", "max"), 0.02)
+        self.assertTrue(stats.value(("CERT",), 90004, "Norm_NCO_Rate", "any_nonzero"))
+        self.assertFalse(stats.value(("CERT",), 90001, "Norm_NCO_Rate", "any_nonzero"))
+        self.assertEqual(stats.value(("CERT",), 19977, "TTM_NCO_Rate", "first_row", latest_only=True), 0.03)
+        self.assertIsNone(stats.value(("CERT",), 12345, "TTM_NCO_Rate", "max"))
+
+    def test_engine_matches_standalone_checks(self):
+        from metric_registry import SEMANTIC_VALIDATION_RULES, run_semantic_validation
+        df = self._panel()
+        # Per-quarter frames concatenated without a reset: index labels repeat
+        stacked = pd.concat([q.reset_index(drop=True) for _, q in df.groupby("REPDTE")])
+        self.assertFalse(stacked.index.is_unique)
+        baseline = run_semantic_validation(df)
+        for panel in (df, stacked):
+            with self.subTest(unique_index=panel.index.is_unique):
+                report = run_semantic_validation(panel)
+                self.assertEqual(set(report["Rule"]), {"Flatline_Norm_ACL_Coverage", "DuplicateComposite",
+                                                       "OutputContamination", "OrphanedMetric"})
+                self.assertEqual(report["Detail"].tolist(), baseline["Detail"].tolist())
+                for rule in SEMANTIC_VALIDATION_RULES:
+                    expected = rule.check(panel)
+                    got = report[report["Rule_ID"] == rule.rule_id]
+                    self.assertEqual(len(got), len(expected), rule.rule_id)
+                    if len(expected):
+                        self.assertEqual(got["Detail"].tolist(), expected["Detail"].tolist())
+
+    def test_duplicate_composites_flagged_per_column(self):
+        from metric_registry import run_semantic_validation
+        # Partial overlap: the first two rates repeat, the normalized ones differ
+        df = pd.DataFrame({
+            "CERT": [90001, 90004, 90002, 90005],
+            "REPDTE": pd.to_datetime(["2025-03-31"] * 4),
+            "TTM_NCO_Rate": [0.02, 0.02, 0.02, 0.03],
+            "NPL_to_Gross_Loans_Rate": [0.005, 0.005, np.nan, np.nan],
+            "Norm_NCO_Rate": [np.nan, 0.015, np.nan, np.nan],
+            "Norm_Nonaccrual_Rate": [np.nan, 0.004, np.nan, np.nan],
+        })
+        report = run_semantic_validation(df)
+        got = report.loc[report["Rule"] == "DuplicateComposite", "Detail"].tolist()
+        self.assertEqual(got, ["CERT 90001 vs 90004: TTM_NCO_Rate = 0.020000 (identical)",
+                               "CERT 90001 vs 90004: NPL_to_Gross_Loans_Rate = 0.005000 (identical)"])
+
+    def test_duplicate_composites_match_within_isclose_tolerance(self):
+        from metric_registry import run_semantic_validation
+        # float32 ratios one ulp apart still count as identical (np.isclose, rtol=1e-6)
+        df = pd.DataFrame({
+            "CERT": [90001, 90004, 90002, 90005],
+            "REPDTE": pd.to_datetime(["2025-03-31"] * 4),
+            "TTM_NCO_Rate": np.array([0.0123456, 0.012345601, 0.02, 0.02001], dtype=np.float32),
+        })
+        self.assertNotEqual(df.at[0, "TTM_NCO_Rate"], df.at[1, "TTM_NCO_Rate"])
+        report = run_semantic_validation(df)
+        got = report.loc[report["Rule"] == "DuplicateComposite", "Detail"].tolist()
+        self.assertEqual(got, ["CERT 90001 vs 90004: TTM_NCO_Rate = 0.012346 (identical)"])
+
+    def test_duplicate_rows_found_through_hash_buckets(self):
+        from metric_registry import find_duplicate_rows
+        df = pd.DataFrame({
+            "REPDTE": [1, 1, 1, 2, 1, 1],
+            "a": [0.1 + 0.2, 0.3, 0.3, 0.3, np.nan, np.nan],
+            "b": [np.nan, np.nan, 1.0, np.nan, np.nan, np.nan],
+        }, index=[90001, 90004, 90002, 90005, 90003, 90006])
+        # Summation-order noise matches, NaN matches NaN, all-NaN rows are ignored
+        self.assertEqual(find_duplicate_rows(df, ["a", "b"]), [[90001, 90004, 90005]])
+        self.assertEqual(find_duplicate_rows(df, ["a", "b"], keys=["REPDTE"]), [[90001, 90004]])
+        self.assertEqual(find_duplicate_rows(df.iloc[:0], ["a", "b"]), [])
+
+
 class TestNormalizedComparisonFlags(unittest.TestCase):
     """Verifies that create_normalized_comparison generates performance flags
     and that descriptive metrics get blank flags."""
@@ -5402,14 +6054,40 @@ class TestMacroChartTranche(unittest.TestCase):
                      "macro_overlay_rates_housing"]:
             self.assertIn(art, source, f"Missing {art} in report_generator.py")
 
-    def test_fred_to_quarterly_helper_exists(self):
-        """_fred_to_quarterly helper must exist for quarterly alignment."""
-        try:
-            from report_generator import _fred_to_quarterly
-        except ImportError:
-            self.skipTest("report_generator import failed")
-            return
-        self.assertTrue(callable(_fred_to_quarterly))
+    def test_macro_cube_series_matches_per_series_resample(self):
+        """MacroCube.series() equals the old per-series quarter-end resample
+        (last observation per quarter) for daily, weekly and monthly series."""
+        from macro_cube import build_macro_cube
+
+        def fred_to_quarterly(fred_df, series_id):
+            # Former report_generator._fred_to_quarterly
+            sel = fred_df[fred_df["SeriesID"] == series_id].copy()
+            if sel.empty:
+                return pd.Series(dtype=float)
+            sel = sel.sort_values("DATE")
+            sel["VALUE"] = pd.to_numeric(sel["VALUE"], errors="coerce")
+            sel = sel.dropna(subset=["VALUE"]).set_index("DATE")
+            return sel["VALUE"].resample("QE").last().dropna()
+
+        rng = np.random.default_rng(7)
+        parts = []
+        for sid, dates in [("DGS10", pd.bdate_range("2021-11-15", "2024-02-10")),
+                           ("ICSA", pd.date_range("2022-01-01", "2024-06-30", freq="W-SAT")),
+                           ("UNRATE", pd.date_range("2020-01-01", "2024-03-01", freq="MS"))]:
+            values = rng.normal(size=len(dates)).round(3).astype(object)
+            values[rng.random(len(dates)) < 0.1] = "."          # FRED missing marker
+            parts.append(pd.DataFrame({"SeriesID": sid, "DATE": dates, "VALUE": values}))
+        fred = pd.concat(parts, ignore_index=True).sample(frac=1, random_state=1)
+        fred.loc[fred["SeriesID"].eq("UNRATE") & fred["DATE"].dt.month.isin([4, 5, 6])
+                 & fred["DATE"].dt.year.eq(2021), "VALUE"] = "."   # a fully missing quarter
+
+        cube = build_macro_cube(fred, lags=())
+        for sid in ("DGS10", "ICSA", "UNRATE"):
+            with self.subTest(series=sid):
+                expected = fred_to_quarterly(fred, sid)
+                pd.testing.assert_series_equal(cube.series(sid), expected, check_freq=False)
+        self.assertNotIn(pd.Timestamp("2021-06-30"), cube.series("UNRATE").index)
+        self.assertTrue(cube.series("MISSING").empty)
 
     def test_z_scoring_in_credit_stress(self):
         """Credit stress overlay must z-score the right-axis series."""
@@ -5439,6 +6117,64 @@ class TestMacroChartTranche(unittest.TestCase):
         self.assertIn("'CSUSHPISA'", source, "CSUSHPISA missing from MSPBNA_CR_Normalized.py")
 
 
+class TestMacroAlignmentCube(unittest.TestCase):
+    """Quarterly macro cube shared by the Step 2 macro charts."""
+
+    @staticmethod
+    def _fred_long():
+        days = pd.date_range("2019-01-01", "2021-12-31", freq="D")
+        weeks = pd.date_range("2019-01-04", "2021-12-31", freq="W-FRI")
+        months = pd.date_range("2019-01-01", "2021-12-01", freq="MS")
+        rng = np.random.default_rng(7)
+        parts = [
+            pd.DataFrame({"SeriesID": "DAILY", "DATE": days, "VALUE": rng.normal(size=len(days))}),
+            pd.DataFrame({"SeriesID": "WEEKLY", "DATE": weeks, "VALUE": rng.normal(size=len(weeks))}),
+            pd.DataFrame({"SeriesID": "MONTHLY", "DATE": months,
+                          "VALUE": np.arange(len(months), dtype=float)}),
+        ]
+        fred = pd.concat(parts, ignore_index=True)
+        fred.loc[fred.sample(frac=0.1, random_state=1).index, "VALUE"] = np.nan
+        return fred.sample(frac=1.0, random_state=2)
+
+    def test_series_matches_per_series_resample(self):
+        from macro_cube import build_macro_cube
+        fred = self._fred_long()
+        cube = build_macro_cube(fred)
+        for sid in ["DAILY", "WEEKLY", "MONTHLY"]:
+            sel = fred[fred["SeriesID"] == sid].sort_values("DATE")
+            sel = sel.dropna(subset=["VALUE"]).set_index("DATE")
+            expected = sel["VALUE"].resample("QE").last().dropna()
+            pd.testing.assert_series_equal(cube.series(sid), expected, check_freq=False)
+        self.assertTrue(cube.series("MISSING").empty)
+
+    def test_lag_one_is_previous_quarter(self):
+        """Row for quarter t holds macro Q(t-1), including Q3 -> Q4."""
+        from macro_cube import build_macro_cube
+        cube = build_macro_cube(self._fred_long())
+        lagged = cube.frame(["MONTHLY", "MISSING"], lag=1)
+        self.assertEqual(list(lagged.columns), ["MONTHLY"])
+        self.assertEqual(lagged.loc[pd.Timestamp("2020-12-31"), "MONTHLY"],
+                         cube.quarterly.loc[pd.Timestamp("2020-09-30"), "MONTHLY"])
+        self.assertEqual(lagged.index[-1], pd.Timestamp("2022-03-31"))
+
+    def test_pairwise_corr_matches_pearsonr(self):
+        from macro_cube import pairwise_corr
+        from scipy import stats
+        rng = np.random.default_rng(3)
+        a = pd.DataFrame(rng.normal(size=(20, 3)) * [1, 1e6, 1], columns=list("abc"))
+        b = pd.DataFrame(rng.normal(size=(20, 2)), columns=["x", "y"])
+        a.iloc[::3, 0] = np.nan
+        a.iloc[:17, 2] = np.nan          # only 3 rows -> below min_periods
+        b["y"] = 5.0                     # constant -> undefined
+        r = pairwise_corr(a, b, min_periods=4)
+        for col in ["a", "b"]:
+            ok = a[col].notna()
+            expected, _ = stats.pearsonr(a.loc[ok, col], b.loc[ok, "x"])
+            self.assertAlmostEqual(r.at[col, "x"], expected, places=9)
+        self.assertTrue(np.isnan(r.at["c", "x"]))
+        self.assertTrue(r["y"].isna().all())
+
+
 # =====================================================================
 # Corp Overlay Module Tests
 # =====================================================================
@@ -7032,6 +7768,62 @@ class TestChartAnnotationHelper(unittest.TestCase):
         self.assertTrue(hasattr(ChartAnnotationHelper, 'register_fixed_rect'))
 
 
+class TestLabelPlacementIndex(unittest.TestCase):
+    """Grid-indexed placement must pick the same offsets as pairwise checks."""
+
+    @staticmethod
+    def _brute_first_free(rects, placed, strict):
+        for k, a in enumerate(rects):
+            if strict:
+                hit = any(a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3] for b in placed)
+            else:
+                hit = any(not (a[2] < b[0] or b[2] < a[0] or a[3] < b[1] or b[3] < a[1]) for b in placed)
+            if not hit:
+                return k
+        return -1
+
+    def test_first_free_matches_pairwise(self):
+        from label_engine import PlacementIndex, centered_rects
+        rng = np.random.default_rng(7)
+        offsets = [(10, 12), (12, -12), (-10, 12), (0, 16), (30, 0), (-30, 0)]
+        for strict in (False, True):
+            index, placed = PlacementIndex(strict=strict), []
+            for _ in range(200):
+                rects = centered_rects(rng.uniform(0, 600, 2).round(), offsets,
+                                       float(rng.integers(40, 120)), 32.0)
+                k = index.first_free(rects)
+                self.assertEqual(k, self._brute_first_free(rects, placed, strict))
+                index.add(rects[max(k, 0)])
+                placed.append(rects[max(k, 0)])
+
+    def test_touching_edges_and_update(self):
+        from label_engine import PlacementIndex
+        index = PlacementIndex(cell_px=10)
+        rid = index.add((0, 0, 10, 10))
+        self.assertTrue(index.overlaps([(10, 0, 20, 10)])[0])      # closed rects touch
+        self.assertFalse(PlacementIndex(strict=True).overlaps([(10, 0, 20, 10)])[0])
+        index.update(rid, (100, 100, 110, 110))
+        self.assertFalse(index.overlaps([(0, 0, 10, 10)])[0])
+        self.assertEqual(index.colliding((105, 105, 106, 106)), [rid])
+        self.assertFalse(index.overlaps([(105, 105, 106, 106)], skip=rid)[0])
+
+    def test_annotation_helper_avoids_placed_labels(self):
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from report_generator import ChartAnnotationHelper
+        fig, ax = plt.subplots()
+        try:
+            ax.set_xlim(0, 1); ax.set_ylim(0, 1)
+            helper = ChartAnnotationHelper(ax)
+            placed = helper.place_labels([0.5, 0.5], [0.5, 0.5], ["MSPBNA", "GS"])
+            self.assertEqual(placed, [True, True])
+            offsets = [t.get_position() for t in ax.texts]
+            self.assertNotEqual(offsets[0], offsets[1])
+        finally:
+            plt.close(fig)
+
+
 class TestWealthPeersInclusion(unittest.TestCase):
     """Verify Wealth Peers is included in designated high-value charts."""
 
@@ -7599,5 +8391,273 @@ class TestCompletenessFlags(unittest.TestCase):
         self.assertIn("CENSUS_API_KEY", src)
 
 
+# =====================================================================
+# Pipeline DAG runner (pipeline_dag.py)
+# =====================================================================
+
+class TestPipelineDAG(unittest.TestCase):
+    """Declared stages run concurrently, memoize by input hash, fail fast."""
+
+    def setUp(self):
+        import tempfile
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_independent_nodes_overlap(self):
+        """Two nodes without inputs start together; a consumer waits for both."""
+        import threading
+        from pipeline_dag import PipelineDAG
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch(value):
+            barrier.wait()  # deadlocks (BrokenBarrierError) if run sequentially
+            return value
+
+        dag = PipelineDAG("t", max_workers=2, memoize=False)
+        dag.add("fdic", lambda: fetch(1))
+        dag.add("fred", lambda: fetch(2))
+        dag.add("merge", lambda a, b: a + b, ["fdic", "fred"])
+        out = dag.run()
+        self.assertEqual(out["merge"], 3)
+        self.assertEqual(dag.order(), ["fdic", "fred", "merge"])
+
+    def test_memoized_node_skips_recompute_on_same_inputs(self):
+        from pipeline_dag import PipelineDAG
+        calls = []
+        data = {"df": pd.DataFrame({"CERT": [1, 2], "X": [0.1, 0.2]})}
+
+        def build(version="v1"):
+            dag = PipelineDAG("t", cache_dir=self.cache_dir, version=version, memoize=True)
+            dag.add("fetch", lambda: data["df"])
+            dag.add("derive", lambda df: calls.append(1) or df.assign(Y=df["X"] * 2),
+                    ["fetch"], memoize=True)
+            return dag
+
+        first = build().run()["derive"]
+        dag = build()
+        second = dag.run()["derive"]
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(dag.results["derive"].status, "memoized")
+        pd.testing.assert_frame_equal(first, second)
+
+        data["df"] = data["df"].assign(X=[0.1, 0.3])
+        build().run()
+        build(version="v2").run()
+        self.assertEqual(len(calls), 3)
+
+    def test_cycle_and_unknown_input_rejected(self):
+        from pipeline_dag import PipelineDAG, PipelineError
+        dag = PipelineDAG("t", memoize=False)
+        dag.add("a", lambda b: b, ["b"])
+        dag.add("b", lambda a: a, ["a"])
+        with self.assertRaises(PipelineError):
+            dag.order()
+        dag = PipelineDAG("t", memoize=False)
+        dag.add("a", lambda x: x, ["missing"])
+        with self.assertRaises(PipelineError):
+            dag.run()
+
+    def test_failure_propagates_and_skips_dependents(self):
+        from pipeline_dag import PipelineDAG
+
+        def boom():
+            raise ValueError("No FDIC data retrieved.")
+
+        dag = PipelineDAG("t", max_workers=1, memoize=False)
+        dag.add("fdic", boom)
+        dag.add("derive", lambda df: df, ["fdic"])
+        with self.assertRaises(ValueError):
+            dag.run()
+        self.assertEqual(dag.results["fdic"].status, "failed")
+        self.assertEqual(dag.results["derive"].status, "skipped")
+
+    def test_locked_nodes_never_overlap(self):
+        import threading
+        import time
+        from pipeline_dag import PipelineDAG
+        active, peak = [0], [0]
+        guard = threading.Lock()
+
+        def draw():
+            with guard:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with guard:
+                active[0] -= 1
+
+        dag = PipelineDAG("t", max_workers=3, memoize=False)
+        for name in ("credit", "scatter", "executive"):
+            dag.add(name, draw, lock="pyplot")
+        dag.run()
+        self.assertEqual(peak[0], 1)
+
+    def test_overlapped_io_nodes_do_not_hold_compute_workers(self):
+        """With overlap_io, fetches run on the I/O loop beside a compute node
+        even when the compute pool has a single worker."""
+        import asyncio
+        import threading
+        from pipeline_dag import PipelineDAG
+        barrier = threading.Barrier(3, timeout=5)
+
+        def meet(value):
+            barrier.wait()
+            return value
+
+        async def fred():
+            await asyncio.sleep(0.01)
+            return "fred"
+
+        dag = PipelineDAG("t", max_workers=1, memoize=False, overlap_io=True)
+        dag.add("fdic", lambda: meet("fdic"), io=True)
+        dag.add("local_macro", lambda: meet("lm"), io=True)
+        dag.add("fred", fred, io=True)
+        dag.add("derive", lambda: meet("derived"))
+        dag.add("write", lambda a, b, c, d: (a, b, c, d), ["fdic", "local_macro", "fred", "derive"])
+        out = dag.run()
+        self.assertEqual(out["write"], ("fdic", "lm", "fred", "derived"))
+        self.assertTrue(dag.results["fred"].io)
+        self.assertIn("fred [io]", dag.summary_table())
+
+    def test_coroutine_node_runs_without_overlap(self):
+        from pipeline_dag import PipelineDAG, PipelineError
+
+        async def fetch():
+            return 42
+
+        dag = PipelineDAG("t", memoize=False, overlap_io=False)
+        dag.add("fred", fetch, io=True)
+        self.assertEqual(dag.run()["fred"], 42)
+        with self.assertRaises(PipelineError):
+            dag.add("bad", fetch, io=True, memoize=True)
+
+    def test_step1_declares_fetches_without_inputs(self):
+        """FRED / Case-Shiller / local macro must not wait behind FDIC processing."""
+        src = open(os.path.join(_REPO_ROOT, "src", "data_processing",
+                                "MSPBNA_CR_Normalized.py")).read()
+        for stage in ("fred_fetch", "case_shiller", "local_macro", "bank_locations"):
+            self.assertRegex(src, rf'dag\.add\("{stage}", self\._stage_{stage}, io=True\)')
+
+    def test_fred_post_processing_runs_off_the_io_loop(self):
+        """The io node only awaits the FRED fetch; post-processing runs on a compute worker."""
+        import logging
+        import threading
+        from types import SimpleNamespace
+        from unittest import mock
+        from pipeline_dag import PipelineDAG
+        try:
+            import MSPBNA_CR_Normalized as cr
+        except ImportError:
+            self.skipTest("Cannot import MSPBNA_CR_Normalized (missing dependencies)")
+        threads, received = {}, {}
+
+        class Fetcher:
+            last_fred_obs_df = pd.DataFrame()
+
+            async def fetch_all_series_async(self, series_ids, series_descriptions):
+                threads["fred_fetch"] = threading.current_thread().name
+                fred_df = pd.DataFrame({"date": pd.to_datetime(["2024-12-31", "2025-03-31"]),
+                                        "SOFR": [4.3, 4.2], "TB3MS": [4.2, 4.0]})
+                meta = pd.DataFrame({"Series ID": ["SOFR", "TB3MS"], "frequency": "Daily",
+                                     "frequency_short": "D", "units": "Percent"})
+                return fred_df, series_descriptions.reset_index(drop=True), [], meta
+
+        def fred_data(fetched):
+            threads["fred_data"] = threading.current_thread().name
+            return cr.BankPerformanceDashboard._stage_fred_data(dash, fetched)
+
+        def sink(node, value, result):
+            received[node] = value
+            return result
+
+        dash = cr.BankPerformanceDashboard.__new__(cr.BankPerformanceDashboard)
+        dash.config = SimpleNamespace()
+        dash.fred_fetcher = Fetcher()
+        dash.processor = dash.analyzer = mock.Mock()
+        dash._stage_fred_data = fred_data
+        dash._stage_macro_analysis = lambda fred: sink("macro_analysis", fred, "macro")
+        dash._stage_excel_write = lambda *args: sink("excel_write", args[5], "book.xlsx")
+
+        # Step 1 as declared, with every stage outside the FRED path stubbed
+        fred_path = {"fred_fetch", "fred_data", "macro_analysis", "excel_write"}
+        dag = PipelineDAG("step1", memoize=False, overlap_io=True)
+        for name, node in dash.build_dag().nodes.items():
+            fn = node.fn if name in fred_path else (lambda *args, name=name: name)
+            dag.add(name, fn, node.inputs, io=node.io)
+        # The module logger is only set up by main()
+        with mock.patch.object(cr, "logger", logging.getLogger(cr.__name__)):
+            out = dag.run()
+
+        self.assertEqual(threads["fred_fetch"], "step1-loop")
+        self.assertTrue(threads["fred_data"].startswith("step1_"), threads["fred_data"])
+        self.assertIn("SOFR3MTB3M", out["fred_data"]["fred_df"].columns)
+        self.assertIs(received["macro_analysis"], out["fred_data"])
+        self.assertIs(received["excel_write"], out["fred_data"])
+        self.assertEqual(out["excel_write"], "book.xlsx")
+
+    def test_boundary_applied_and_memory_reported(self):
+        """Every output passes the boundary callable; sizes land in the summary."""
+        from pipeline_dag import PipelineDAG
+        dag = PipelineDAG("t", cache_dir=self.cache_dir, memoize=True,
+                          boundary=lambda v: v.astype("float32") if isinstance(v, pd.DataFrame) else v)
+        dag.add("fetch", lambda: pd.DataFrame({"X": np.arange(1000, dtype="float64")}))
+        dag.add("derive", lambda df: df * 2, ["fetch"], memoize=True)
+        out = dag.run()
+        self.assertEqual(out["derive"]["X"].dtype, np.float32)
+        self.assertGreater(dag.results["derive"].memory_mb, 0)
+        self.assertIn("MB", dag.summary_table())
+        # memo holds the post-boundary value
+        out = dag.run()
+        self.assertEqual(dag.results["derive"].status, "memoized")
+        self.assertEqual(out["derive"]["X"].dtype, np.float32)
+
+
+class TestPanelDtypePolicy(unittest.TestCase):
+    """Ratios float32, dollar levels float64, CERT int32, names category."""
+
+    def test_policy_by_metric_semantics_and_name(self):
+        from dtype_policy import apply_panel_dtypes
+        df = pd.DataFrame({
+            "CERT": np.array([34221, 32992], dtype="int64"),
+            "NAME": ["A", "B"],
+            "HQ_STATE": ["NY", "NY"],
+            "REPDTE": pd.to_datetime(["2025-03-31", "2025-03-31"]),
+            "ASSET": [1.23456789e9, 2.0e9],          # DOLLARS_B in metric_semantics
+            "ROA": [1.1, 0.9],                       # FDIC percentage field
+            "Custom_Loss_Rate": [0.01, 0.02],        # rate-like derived name
+            "RIC_CRE_Cost": [100.0, 200.0],          # unclassified -> level
+            "Flag": [True, False],
+        })
+        out = apply_panel_dtypes(df)
+        self.assertEqual(out["CERT"].dtype, np.int32)
+        self.assertIsInstance(out["NAME"].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(out["HQ_STATE"].dtype, pd.CategoricalDtype)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(out["REPDTE"]))
+        self.assertEqual(out["ASSET"].dtype, np.float64)
+        self.assertEqual(out["ASSET"].iloc[0], 1.23456789e9)
+        self.assertEqual(out["ROA"].dtype, np.float32)
+        self.assertEqual(out["Custom_Loss_Rate"].dtype, np.float32)
+        self.assertEqual(out["RIC_CRE_Cost"].dtype, np.float64)
+        self.assertEqual(out["Flag"].dtype, bool)
+        # input untouched
+        self.assertEqual(df["ROA"].dtype, np.float64)
+
+    def test_cert_with_missing_values_and_nested_outputs(self):
+        from dtype_policy import apply_panel_dtypes
+        df = pd.DataFrame({"CERT": [1.0, np.nan], "NIMY": [3.0, 3.1]})
+        out = apply_panel_dtypes({"sheet": df, "meta": "x"})
+        self.assertEqual(out["sheet"]["CERT"].dtype, np.float64)
+        self.assertEqual(out["sheet"]["NIMY"].dtype, np.float32)
+        self.assertEqual(out["meta"], "x")
+
+    def test_step1_dag_uses_policy_boundary(self):
+        src = (Path(__file__).resolve().parent.parent / "src" / "data_processing"
+               / "MSPBNA_CR_Normalized.py").read_text(encoding="utf-8")
+        self.assertIn("boundary=apply_panel_dtypes", src)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -281,10 +281,76 @@ def _divider_row(ws, row, max_col):
     ws.row_dimensions[row].height = 4
 
 
+# ── Matching engine ──────────────────────────────────────────────────────────
+
+def normalize_borrower_key(names):
+    """Normalized borrower key used for both dedup and extract matching."""
+    return names.fillna("").astype(str).str.upper().str.strip()
+
+
+def flag_matrix(df, flag_cols):
+    """Boolean frame: True where a Y/N tracker flag column holds "Y"."""
+    if not flag_cols:
+        return pd.DataFrame(index=df.index)
+    return pd.DataFrame({
+        col: df[col].astype(str).str.strip().str.upper().to_numpy() == "Y" for col in flag_cols
+    }, index=df.index)
+
+
+def combine_flag_columns(df, flag_cols):
+    """ "Y" where any of flag_cols is "Y", else "N" — one vectorized OR across columns."""
+    return pd.Series("N", index=df.index).mask(flag_matrix(df, flag_cols).any(axis=1), "Y")
+
+
+def dedup_latest_per_quarter(tracker):
+    """Keep the latest deal per (borrower, quarter): one sort + drop_duplicates."""
+    ordered = tracker.sort_values(["_BORROWER_KEY_NORM", "_QUARTER", "_DATE"],
+                                  ascending=[True, True, False], kind="stable")
+    return ordered.drop_duplicates(subset=["_BORROWER_KEY_NORM", "_QUARTER"], keep="first").copy()
+
+
+def match_tracker_to_extract(tracker_deduped, tagged_df, borrower_col="BORROWER"):
+    """Hash-join deduped tracker deals to the tagged extract on the borrower key.
+
+    Both sides are keyed by normalize_borrower_key; the extract side is reduced
+    to one row per borrower (largest CREDIT_LII) before the join.
+
+    Returns:
+        tracker_deduped with EXTRACT_MATCH, EXTRACT_WMLC_FLAGS and
+        EXTRACT_CREDIT_LII columns added.
+    """
+    extract = pd.DataFrame({
+        "_BORROWER_KEY_NORM": normalize_borrower_key(tagged_df[borrower_col]),
+        "EXTRACT_WMLC_FLAGS": tagged_df.get("WMLC_FLAGS", pd.Series("", index=tagged_df.index)),
+        "EXTRACT_CREDIT_LII": pd.to_numeric(tagged_df.get("CREDIT_LII"), errors="coerce"),
+    })
+    extract = extract[extract["_BORROWER_KEY_NORM"] != ""]
+    extract = extract.sort_values("EXTRACT_CREDIT_LII", ascending=False, kind="stable") \
+        .drop_duplicates("_BORROWER_KEY_NORM").set_index("_BORROWER_KEY_NORM")
+    matched = tracker_deduped.join(extract, on="_BORROWER_KEY_NORM")
+    matched["EXTRACT_MATCH"] = matched["_BORROWER_KEY_NORM"].isin(extract.index)
+    return matched
+
+
+def _crosstab_matrix(df, row_col, col_col, row_labels, col_labels, values=None):
+    """Row x column counts (or sums of values, rounded to 0.1) as a list of lists."""
+    if values is None:
+        table = df.groupby([row_col, col_col]).size()
+    else:
+        table = df.groupby([row_col, col_col])[values].sum().round(1)
+    table = table.unstack(fill_value=0).reindex(index=row_labels, columns=col_labels, fill_value=0)
+    cast = int if values is None else float
+    return [[cast(v) for v in row] for row in table.to_numpy().tolist()]
+
+
 # ── Core builder (same logic as scripts/build_tracker_analytics.py) ──────────
 
-def build_tracker_analytics_sheet(wb, tracker_path):
-    """Build the 'Tracker Analytics' sheet into an existing openpyxl Workbook."""
+def build_tracker_analytics_sheet(wb, tracker_path, tagged_df=None):
+    """Build the 'Tracker Analytics' sheet into an existing openpyxl Workbook.
+
+    When tagged_df (the ETL's tagged extract) is given, deduped tracker deals
+    are also matched to it by borrower and the match rate is logged.
+    """
     logger.info("Building Tracker Analytics from %s", tracker_path)
 
     if not os.path.exists(tracker_path):
@@ -386,15 +452,13 @@ def build_tracker_analytics_sheet(wb, tracker_path):
     # A2: Combine FA- and DD- prefixed flags
     fa_columns = [col for col in actual_flag_cols if col.upper().startswith("FA")]
     if fa_columns:
-        tracker["_FA_MSSB_COMBINED"] = tracker[fa_columns].apply(
-            lambda row: "Y" if any(str(v).strip().upper() == "Y" for v in row) else "N", axis=1)
+        tracker["_FA_MSSB_COMBINED"] = combine_flag_columns(tracker, fa_columns)
         actual_flag_cols = [c for c in actual_flag_cols if not c.upper().startswith("FA")]
         actual_flag_cols.append("_FA_MSSB_COMBINED")
 
     dd_columns = [col for col in actual_flag_cols if col.upper().startswith("DD") and col != "_DD_MSSB_COMBINED"]
     if dd_columns:
-        tracker["_DD_MSSB_COMBINED"] = tracker[dd_columns].apply(
-            lambda row: "Y" if any(str(v).strip().upper() == "Y" for v in row) else "N", axis=1)
+        tracker["_DD_MSSB_COMBINED"] = combine_flag_columns(tracker, dd_columns)
         actual_flag_cols = [c for c in actual_flag_cols if not (c.upper().startswith("DD") and c != "_DD_MSSB_COMBINED")]
         actual_flag_cols.append("_DD_MSSB_COMBINED")
 
@@ -407,18 +471,23 @@ def build_tracker_analytics_sheet(wb, tracker_path):
         else:
             flag_display_names[fc] = fc
 
-    # A4: Dedup
-    tracker.sort_values("_DATE", ascending=False, inplace=True)
-    tracker["_BORROWER_KEY"] = tracker.get("Tracker File V", pd.Series(dtype=str)).fillna("")
+    # A4: Dedup — same borrower in same quarter, keep latest
+    tracker["_BORROWER_KEY"] = tracker.get("Tracker File V", pd.Series("", index=tracker.index)).fillna("")
     mask_empty = tracker["_BORROWER_KEY"].str.strip() == ""
     if "Relationship Name" in tracker.columns:
         tracker.loc[mask_empty, "_BORROWER_KEY"] = tracker.loc[mask_empty, "Relationship Name"].fillna("")
-    tracker["_BORROWER_KEY_NORM"] = tracker["_BORROWER_KEY"].str.upper().str.strip()
+    tracker["_BORROWER_KEY_NORM"] = normalize_borrower_key(tracker["_BORROWER_KEY"])
     n_before = len(tracker)
-    tracker_deduped = tracker.drop_duplicates(subset=["_BORROWER_KEY_NORM", "_QUARTER"], keep="first").copy()
+    tracker_deduped = dedup_latest_per_quarter(tracker)
     n_after = len(tracker_deduped)
     logger.info("Dedup: %d -> %d rows", n_before, n_after)
 
+    if tagged_df is not None and "BORROWER" in tagged_df.columns:
+        matched = match_tracker_to_extract(tracker_deduped, tagged_df)
+        n_matched = int(matched["EXTRACT_MATCH"].sum())
+        logger.info("Tracker -> tagged extract borrower match: %d/%d deals (%.1f%%)",
+                    n_matched, n_after, 100.0 * n_matched / n_after if n_after else 0.0)
+
     quarters = sorted(tracker_deduped["_QUARTER"].unique())
     years = sorted(tracker_deduped["_YEAR"].unique())
 
@@ -462,14 +531,9 @@ def build_tracker_analytics_sheet(wb, tracker_path):
     current_row += 1
 
     hm_row_labels = [flag_display_names[fc] for fc in actual_flag_cols]
-    hm_matrix = []
-    for fc in actual_flag_cols:
-        row_vals = []
-        for q in quarters:
-            q_mask = tracker_deduped["_QUARTER"] == q
-            is_flagged = tracker_deduped.loc[q_mask, fc].astype(str).str.strip().str.upper() == "Y"
-            row_vals.append(int(is_flagged.sum()))
-        hm_matrix.append(row_vals)
+    hm_counts = flag_matrix(tracker_deduped, actual_flag_cols).groupby(tracker_deduped["_QUARTER"]).sum()
+    hm_matrix = [[int(v) for v in row] for row in
+                 hm_counts.reindex(index=quarters, fill_value=0).T.to_numpy().tolist()]
 
     current_row = _write_heatmap_table(ws, current_row, hm_row_labels, quarters, hm_matrix)
     current_row += 1
@@ -481,13 +545,7 @@ def build_tracker_analytics_sheet(wb, tracker_path):
     ct_max_col = 1 + len(quarters)
     _write_section_header(ws, current_row, "Deal Count by Quarter", ct_max_col)
     current_row += 1
-    ct_matrix = []
-    for area in count_areas:
-        row_vals = []
-        for q in quarters:
-            mask = (tracker_deduped[prod_area_col] == area) & (tracker_deduped["_QUARTER"] == q)
-            row_vals.append(int(mask.sum()))
-        ct_matrix.append(row_vals)
+    ct_matrix = _crosstab_matrix(tracker_deduped, prod_area_col, "_QUARTER", count_areas, quarters)
     ct_data_start = current_row
     current_row = _write_data_table(ws, current_row, count_areas, quarters, ct_matrix, COUNT_FMT)
     chart1_anchor = f"A{current_row + 1}"
@@ -502,13 +560,8 @@ def build_tracker_analytics_sheet(wb, tracker_path):
     if gross_col:
         _write_section_header(ws, current_row, "Gross Transaction Size ($MM) by Quarter", ct_max_col)
         current_row += 1
-        gross_matrix = []
-        for area in dollar_areas:
-            row_vals = []
-            for q in quarters:
-                mask = (tracker_deduped[prod_area_col] == area) & (tracker_deduped["_QUARTER"] == q)
-                row_vals.append(round(float(tracker_deduped.loc[mask, gross_col].sum()), 1))
-            gross_matrix.append(row_vals)
+        gross_matrix = _crosstab_matrix(tracker_deduped, prod_area_col, "_QUARTER",
+                                        dollar_areas, quarters, values=gross_col)
         gross_data_start = current_row
         current_row = _write_data_table(ws, current_row, dollar_areas, quarters, gross_matrix, DOLLAR_FMT)
         chart2_anchor = f"A{current_row + 1}"
@@ -523,13 +576,8 @@ def build_tracker_analytics_sheet(wb, tracker_path):
     if net_col:
         _write_section_header(ws, current_row, "Net Transaction Size ($MM) by Quarter", ct_max_col)
         current_row += 1
-        net_matrix = []
-        for area in dollar_areas:
-            row_vals = []
-            for q in quarters:
-                mask = (tracker_deduped[prod_area_col] == area) & (tracker_deduped["_QUARTER"] == q)
-                row_vals.append(round(float(tracker_deduped.loc[mask, net_col].sum()), 1))
-            net_matrix.append(row_vals)
+        net_matrix = _crosstab_matrix(tracker_deduped, prod_area_col, "_QUARTER",
+                                      dollar_areas, quarters, values=net_col)
         net_data_start = current_row
         current_row = _write_data_table(ws, current_row, dollar_areas, quarters, net_matrix, DOLLAR_FMT)
         chart3_anchor = f"A{current_row + 1}"
@@ -547,13 +595,7 @@ def build_tracker_analytics_sheet(wb, tracker_path):
             dt_max_col = 1 + len(quarters)
             _write_section_header(ws, current_row, "Deal Type Breakdown by Quarter", dt_max_col)
             current_row += 1
-            dt_q_matrix = []
-            for dt in deal_types:
-                row_vals = []
-                for q in quarters:
-                    mask = (tracker_deduped[deal_type_col] == dt) & (tracker_deduped["_QUARTER"] == q)
-                    row_vals.append(int(mask.sum()))
-                dt_q_matrix.append(row_vals)
+            dt_q_matrix = _crosstab_matrix(tracker_deduped, deal_type_col, "_QUARTER", deal_types, quarters)
             dt_q_data_start = current_row
             current_row = _write_data_table(ws, current_row, deal_types, quarters, dt_q_matrix, COUNT_FMT)
             chart4_anchor = f"A{current_row + 1}"
@@ -568,13 +610,7 @@ def build_tracker_analytics_sheet(wb, tracker_path):
             dt_y_max_col = 1 + len(years)
             _write_section_header(ws, current_row, "Deal Type Breakdown by Year", dt_y_max_col)
             current_row += 1
-            dt_y_matrix = []
-            for dt in deal_types:
-                row_vals = []
-                for y in years:
-                    mask = (tracker_deduped[deal_type_col] == dt) & (tracker_deduped["_YEAR"] == y)
-                    row_vals.append(int(mask.sum()))
-                dt_y_matrix.append(row_vals)
+            dt_y_matrix = _crosstab_matrix(tracker_deduped, deal_type_col, "_YEAR", deal_types, years)
             dt_y_data_start = current_row
             current_row = _write_data_table(ws, current_row, deal_types, years, dt_y_matrix, COUNT_FMT)
             chart5_anchor = f"A{current_row + 1}"
@@ -630,8 +666,15 @@ def main():
         print("Removing old Tracker Analytics sheet ...")
         del wb["Tracker Analytics"]
 
+    # Tagged extract (optional) — used to report tracker/extract match rate
+    tagged_df = None
+    tagged_raw = config.get("output", {}).get("tagged_file", "")
+    tagged_path = os.path.normpath(os.path.join(REPO_ROOT, tagged_raw.lstrip("./"))) if tagged_raw else ""
+    if tagged_path and os.path.exists(tagged_path):
+        tagged_df = pd.read_csv(tagged_path, dtype=str, keep_default_na=False)
+
     # Build new sheet
-    result = build_tracker_analytics_sheet(wb, tracker_path)
+    result = build_tracker_analytics_sheet(wb, tracker_path, tagged_df=tagged_df)
     if result is None:
         print("Failed to build Tracker Analytics — dashboard unchanged.")
         wb.close()
@@ -4,33 +4,168 @@ import os
 import re
 import logging
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+from corp_etl.column_matcher import _normalize_name
 
 logger = logging.getLogger("wmlc_etl.file_utils")
 
 
-def read_file(path, skip_rows=0):
+# ── Typed reading ─────────────────────────────────────────────────────────
+
+# Schema kinds accepted under input_files.<source>.schema in config.yaml
+SCHEMA_KINDS = ("numeric", "date", "key", "categorical")
+
+DEFAULT_CSV_CHUNKSIZE = 100_000
+
+
+def _detect_excel_engine():
+    """Prefer the Rust-backed calamine reader; fall back to openpyxl."""
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        return "openpyxl"
+
+
+EXCEL_ENGINE = _detect_excel_engine()
+
+
+def load_schema(source_cfg):
+    """Build a {NORMALIZED_COLUMN: kind} map from a config.yaml input entry.
+
+    Args:
+        source_cfg: one entry of config["input_files"] (may have no "schema")
+
+    Returns:
+        dict mapping normalized column name -> one of SCHEMA_KINDS
+        (empty dict when no schema is declared).
+    """
+    schema = {}
+    declared = (source_cfg or {}).get("schema") or {}
+    for kind, columns in declared.items():
+        if kind not in SCHEMA_KINDS:
+            logger.warning(f"Unknown schema kind '{kind}' ignored — expected one of {SCHEMA_KINDS}")
+            continue
+        for col in columns or []:
+            schema[_normalize_name(col)] = kind
+    return schema
+
+
+def _as_str(series):
+    """Convert to str like dtype=str does on read: values become str, nulls stay NaN."""
+    return series.where(series.isna(), series.astype(str))
+
+
+def apply_schema(df, schema):
+    """Cast columns to their declared kind. Undeclared columns are kept as str.
+
+    Columns are matched on their normalized name, so this works both before
+    and after normalize_columns().
+
+    Args:
+        df: pandas DataFrame (modified in place)
+        schema: dict from load_schema()
+
+    Returns:
+        The same DataFrame with typed columns.
+    """
+    for col in df.columns:
+        kind = schema.get(_normalize_name(col))
+        series = df[col]
+        if kind == "numeric":
+            if not pd.api.types.is_numeric_dtype(series):
+                df[col] = pd.to_numeric(series, errors="coerce")
+        elif kind == "date":
+            if not pd.api.types.is_datetime64_any_dtype(series):
+                df[col] = pd.to_datetime(series, errors="coerce")
+        elif kind == "categorical":
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                df[col] = _as_str(series).astype("category")
+        elif not pd.api.types.is_string_dtype(series):
+            # Keys and undeclared columns keep the historical all-string contract
+            df[col] = _as_str(series)
+    return df
+
+
+def _csv_dtypes(path, skip_rows, schema):
+    """Map raw CSV header names to read_csv dtypes from the normalized schema.
+
+    Numeric and date columns are left to the C parser (then coerced by
+    apply_schema) so they never materialize as Python strings.
+    """
+    header = pd.read_csv(path, skiprows=skip_rows, nrows=0).columns
+    dtypes = {}
+    for raw in header:
+        kind = schema.get(_normalize_name(raw))
+        if kind in ("numeric", "date"):
+            continue
+        dtypes[raw] = "category" if kind == "categorical" else str
+    return dtypes
+
+
+def _concat_chunks(chunks):
+    """Concatenate CSV chunks, unioning categories so categoricals survive."""
+    if len(chunks) == 1:
+        return chunks[0]
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            categories = union_categoricals([c[col] for c in chunks]).categories
+            for c in chunks:
+                c[col] = c[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def read_file(path, skip_rows=0, schema=None, chunksize=None):
     """Auto-detect file type by extension and read accordingly.
 
-    Supports .xlsx, .xls, and .csv. All data read as str dtype.
+    Supports .xlsx, .xls, and .csv. Without a schema all data is read as
+    str dtype. With a schema (see load_schema) numeric/date columns are
+    parsed natively, key columns stay str, and categorical columns use
+    pandas categoricals. CSVs are read in chunks of `chunksize` rows;
+    Excel files use calamine when python-calamine is installed.
 
     Args:
         path: file path
         skip_rows: rows to skip before header
+        schema: optional {NORMALIZED_COLUMN: kind} map from load_schema()
+        chunksize: CSV rows per chunk (default DEFAULT_CSV_CHUNKSIZE)
 
     Returns:
-        pandas DataFrame (all columns as str)
+        pandas DataFrame (raw column names; typed per schema, else all str)
     """
     ext = os.path.splitext(path)[1].lower()
     logger.info(f"Detected {ext} format, skip_rows={skip_rows}")
 
     if ext in (".xlsx", ".xls"):
-        return pd.read_excel(path, skiprows=skip_rows, dtype=str, engine="openpyxl")
+        logger.debug(f"Excel engine: {EXCEL_ENGINE}")
+        if not schema:
+            return pd.read_excel(path, skiprows=skip_rows, dtype=str, engine=EXCEL_ENGINE)
+        df = pd.read_excel(path, skiprows=skip_rows, dtype=object, engine=EXCEL_ENGINE)
+        return apply_schema(df, schema)
     elif ext == ".csv":
-        return pd.read_csv(path, skiprows=skip_rows, dtype=str)
+        if not schema:
+            return pd.read_csv(path, skiprows=skip_rows, dtype=str)
+        dtypes = _csv_dtypes(path, skip_rows, schema)
+        reader = pd.read_csv(path, skiprows=skip_rows, dtype=dtypes,
+                             chunksize=chunksize or DEFAULT_CSV_CHUNKSIZE)
+        chunks = [apply_schema(chunk, schema) for chunk in reader]
+        if not chunks:
+            return pd.read_csv(path, skiprows=skip_rows, dtype=str)
+        df = _concat_chunks(chunks)
+        logger.debug(f"Read {len(df)} rows in {len(chunks)} chunk(s)")
+        return df
     else:
         raise ValueError(f"Unsupported file type: {ext} for {path}")
 
 
+def log_memory(df, label, log=None):
+    """Log the deep memory footprint of a DataFrame."""
+    mb = df.memory_usage(deep=True).sum() / 1_048_576
+    (log or logger).info(f"{label}: {mb:,.1f} MB in memory")
+    return mb
+
+
 def normalize_columns(df):
     """Normalize column names: UPPERCASE, spaces to underscores, strip special chars.
 
@@ -104,6 +239,34 @@ def strip_dash_pad12(val):
     return digits.zfill(12)
 
 
+# Precompiled patterns for the column-level key formatters
+_TRAILING_DOT_ZERO = re.compile(r'\.0$')
+_NON_DIGITS = re.compile(r'\D')
+_PADDED_NULL = r'^(0*(nan|none|nat).*|\s*)$'
+
+
+def _format_key_series(series, strip_dash):
+    """Column-level pad12/strip_dash_pad12 using pandas string methods."""
+    s = series.astype(str).str.strip()
+    null = series.isna() | s.str.lower().isin(_NULL_STRINGS)
+    if strip_dash:
+        s = s.str.replace("-", "", regex=False)
+    s = s.str.replace(_TRAILING_DOT_ZERO, "", regex=True)
+    s = s.str.replace(_NON_DIGITS, "", regex=True)
+    null |= s.str.len() == 0
+    return s.str.zfill(12).where(~null, None)
+
+
+def pad12_series(series):
+    """Vectorized pad12 over a whole column. Same output as series.apply(pad12)."""
+    return _format_key_series(series, strip_dash=False)
+
+
+def strip_dash_pad12_series(series):
+    """Vectorized strip_dash_pad12. Same output as series.apply(strip_dash_pad12)."""
+    return _format_key_series(series, strip_dash=True)
+
+
 def clean_key_column(series, logger_name=""):
     """Clean a key column: convert nan-like strings to None, log stats.
 
@@ -115,10 +278,8 @@ def clean_key_column(series, logger_name=""):
         Cleaned pandas Series with real None for null values.
     """
     # Convert padded-nan strings like "000000000nan", "0000000nan00", etc.
-    cleaned = series.replace(
-        to_replace=[r'(?i)^0*nan.*$', r'(?i)^0*none.*$', r'(?i)^0*nat.*$', r'^\s*$'],
-        value=None, regex=True
-    )
+    null_like = series.isna() | series.astype(str).str.match(_PADDED_NULL, case=False)
+    cleaned = series.where(~null_like, None)
     nulls = cleaned.isna().sum()
     valid = len(cleaned) - nulls
     if logger_name:
@@ -0,0 +1,197 @@
+"""Incremental tagging — re-tag only the rows that changed since the last run.
+
+Each base row gets a fingerprint: a hash over the columns the taggers read
+plus a digest of every side-input row it joins to. The previous run's
+fingerprints and tag results are kept in a local store; rows whose
+fingerprint is unchanged reuse their stored tags, the rest go through
+apply_intermediate_tags / apply_wmlc_flags as usual.
+
+Join keys follow intermediate_tags:
+  LAL_Credit          ACCOUNT_NUMBER_KEY  →  base ACCOUNT_NUMBER
+  Loan_Reserve_Report ACCOUNT_NUMBER_KEY  →  base TL_FACILITY_DIGITS12
+  DAR_Tracker         FACILITY_ID_KEY     →  base TL_FACILITY_DIGITS12
+"""
+
+import os
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+
+from corp_etl.taggers import intermediate_tags, wmlc_tagger
+from corp_etl.taggers.intermediate_tags import apply_intermediate_tags
+from corp_etl.taggers.wmlc_tagger import apply_wmlc_flags
+
+logger = logging.getLogger("wmlc_etl.incremental")
+
+# Base columns read by the two taggers — a change in any of them re-tags the row
+TAGGER_INPUT_COLUMNS = [
+    "PRODUCT_BUCKET", "CREDIT_LII", "FOCUS_LIST", "NEW_CAMP_YN",
+    "NEW_COMMITMENT_AMOUNT", "NEW_COMMITMENT_REASON",
+    "TXT_MSTR_FACIL_COLLATERAL_DESC", "SBL_PERC", "IS_LAL_NFP",
+    "ACCOUNT_NUMBER", "TL_FACILITY_DIGITS12",
+]
+
+# Columns the taggers add or overwrite, in the order a full run produces them
+TAG_COLUMNS = [
+    "CREDIT_LII_COMMITMENT_BUCKET", "CREDIT_LII_COMMITMENT_FLOOR", "NEW_CAMP_YN",
+    "IS_NTC", "IS_OFFICE", "HAS_CREDIT_POLICY_EXCEPTION",
+    "WMLC_FLAGS", "WMLC_FLAG_COUNT", "WMLC_QUALIFIED",
+]
+
+# side input label -> (side key column, base join column)
+SIDE_INPUT_JOINS = {
+    "LAL_Credit": ("ACCOUNT_NUMBER_KEY", "ACCOUNT_NUMBER"),
+    "Loan_Reserve_Report": ("ACCOUNT_NUMBER_KEY", "TL_FACILITY_DIGITS12"),
+    "DAR_Tracker": ("FACILITY_ID_KEY", "TL_FACILITY_DIGITS12"),
+}
+
+DEFAULT_ROW_KEY = ["FACILITY_ID", "ACCOUNT_NUMBER"]
+
+
+def tagger_version():
+    """Hash of the tagger sources — a logic change invalidates the whole store."""
+    digest = hashlib.sha256()
+    for module in (intermediate_tags, wmlc_tagger):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def row_keys(df, key_columns=None):
+    """Stable identity for each row: key columns plus an occurrence counter for duplicates."""
+    cols = [c for c in (key_columns or DEFAULT_ROW_KEY) if c in df.columns]
+    if not cols:
+        raise ValueError(f"None of the row key columns {key_columns or DEFAULT_ROW_KEY} are present")
+    base = df[cols].astype(str).agg("|".join, axis=1)
+    return base + "#" + base.groupby(base).cumcount().astype(str)
+
+
+def side_input_digests(side_df, key_column):
+    """Per-key digest of a side input: wrapping sum of its row hashes (order-independent)."""
+    if side_df is None or len(side_df) == 0 or key_column not in side_df.columns:
+        return pd.Series(dtype="uint64")
+    hashes = pd.util.hash_pandas_object(side_df, index=False)
+    return hashes.groupby(side_df[key_column].to_numpy()).sum()
+
+
+def fingerprint_rows(base_df, side_inputs):
+    """uint64 fingerprint per base row over tagger inputs and joined side-input rows."""
+    cols = [c for c in TAGGER_INPUT_COLUMNS if c in base_df.columns]
+    parts = base_df[cols].copy()
+    for label, (side_key, base_key) in SIDE_INPUT_JOINS.items():
+        if base_key not in base_df.columns:
+            continue
+        digests = side_input_digests(side_inputs.get(label), side_key)
+        parts[f"_{label}"] = base_df[base_key].map(digests).fillna(0).astype("uint64")
+    return pd.util.hash_pandas_object(parts, index=False).to_numpy()
+
+
+def load_store(path, version):
+    """Previous run's rows (indexed by row key), or None if missing or stale."""
+    if not os.path.exists(path):
+        logger.info(f"No tag store at {path} — full tagging run")
+        return None
+    store = pd.read_pickle(path)
+    if store.get("version") != version:
+        logger.info("Tagger logic changed since the stored run — full tagging run")
+        return None
+    return store["rows"]
+
+
+def save_store(path, version, keys, fingerprints, tagged_df):
+    """Persist this run's fingerprints and tag results."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    rows = tagged_df[[c for c in TAG_COLUMNS if c in tagged_df.columns]].copy()
+    rows.index = keys.to_numpy()
+    rows.insert(0, "FINGERPRINT", fingerprints)
+    pd.to_pickle({"version": version, "rows": rows}, path)
+    logger.info(f"Tag store saved: {path} ({len(rows)} rows)")
+
+
+def build_change_report(keys, status, prev_rows, tagged_df):
+    """One row per new / changed / removed loan with its WMLC flags before and after."""
+    moved = status != "unchanged"
+    report = pd.DataFrame({
+        "ROW_KEY": keys[moved].to_numpy(),
+        "CHANGE": status[moved].to_numpy(),
+        "WMLC_FLAGS_BEFORE": "",
+        "WMLC_FLAGS_AFTER": tagged_df.loc[moved, "WMLC_FLAGS"].to_numpy(),
+    })
+    if prev_rows is not None:
+        before = report["ROW_KEY"].map(prev_rows["WMLC_FLAGS"])
+        report["WMLC_FLAGS_BEFORE"] = before.fillna("").to_numpy()
+        removed = prev_rows.index.difference(pd.Index(keys))
+        report = pd.concat([report, pd.DataFrame({
+            "ROW_KEY": removed,
+            "CHANGE": "removed",
+            "WMLC_FLAGS_BEFORE": prev_rows.loc[removed, "WMLC_FLAGS"].to_numpy(),
+            "WMLC_FLAGS_AFTER": "",
+        })], ignore_index=True)
+    report["FLAGS_CHANGED"] = report["WMLC_FLAGS_BEFORE"] != report["WMLC_FLAGS_AFTER"]
+    return report
+
+
+def apply_tags_incremental(base_df, lal_credit_df, loan_reserve_df, dar_tracker_df,
+                           store_path, key_columns=None):
+    """Tag base_df, re-running the taggers only on new or changed rows.
+
+    Produces the same output as apply_intermediate_tags + apply_wmlc_flags on
+    the full extract.
+
+    Args:
+        base_df: normalized base extract
+        lal_credit_df, loan_reserve_df, dar_tracker_df: side inputs (may be empty)
+        store_path: pickle file holding the previous run's fingerprints and tags
+        key_columns: columns identifying a row across extracts
+
+    Returns:
+        (tagged_df, change_report) — change_report lists new, changed and
+        removed rows with their WMLC flags before and after.
+    """
+    side_inputs = {
+        "LAL_Credit": lal_credit_df,
+        "Loan_Reserve_Report": loan_reserve_df,
+        "DAR_Tracker": dar_tracker_df,
+    }
+    version = tagger_version()
+    keys = row_keys(base_df, key_columns)
+    fingerprints = fingerprint_rows(base_df, side_inputs)
+    prev_rows = load_store(store_path, version)
+
+    if prev_rows is None:
+        status = pd.Series("new", index=base_df.index)
+    else:
+        # Compare only known keys so FINGERPRINT stays uint64 (NaN would cast to float)
+        known = keys.isin(prev_rows.index).to_numpy()
+        same = np.zeros(len(keys), dtype=bool)
+        same[known] = prev_rows["FINGERPRINT"].reindex(keys[known]).to_numpy() == fingerprints[known]
+        status = pd.Series(np.where(~known, "new", np.where(same, "unchanged", "changed")),
+                           index=base_df.index)
+
+    retag = status != "unchanged"
+    logger.info(f"Incremental tagging: {int(retag.sum())} of {len(base_df)} rows to tag "
+                f"({int((status == 'new').sum())} new, {int((status == 'changed').sum())} changed)")
+
+    columns = list(base_df.columns) + [c for c in TAG_COLUMNS if c not in base_df.columns]
+    tagged_df = base_df.reindex(columns=columns)
+    if retag.any():
+        delta = apply_intermediate_tags(base_df[retag], lal_credit_df, loan_reserve_df, dar_tracker_df)
+        delta = apply_wmlc_flags(delta)
+    else:
+        delta = pd.DataFrame(columns=TAG_COLUMNS)
+    cached = prev_rows.loc[keys[~retag]] if prev_rows is not None else pd.DataFrame(columns=TAG_COLUMNS)
+    cached.index = base_df.index[~retag]
+    for col in TAG_COLUMNS:
+        if col in delta.columns:
+            parts = [part[col] for part in (delta, cached) if len(part)]
+            tagged_df[col] = pd.concat(parts).reindex(base_df.index)
+
+    report = build_change_report(keys, status, prev_rows, tagged_df)
+    logger.info(f"Change report: {int((report['CHANGE'] == 'new').sum())} new, "
+                f"{int((report['CHANGE'] == 'changed').sum())} changed, "
+                f"{int((report['CHANGE'] == 'removed').sum())} removed, "
+                f"{int(report['FLAGS_CHANGED'].sum())} with different WMLC flags")
+
+    save_store(store_path, version, keys, fingerprints, tagged_df)
+    return tagged_df, report
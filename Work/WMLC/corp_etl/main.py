@@ -21,12 +21,15 @@ REPO_ROOT = os.path.dirname(SCRIPT_DIR)
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
+from corp_etl.file_utils import load_schema
 from corp_etl.readers.base_reader import read_base_extract
 from corp_etl.readers.lal_credit_reader import read_lal_credit
 from corp_etl.readers.loan_reserve_reader import read_loan_reserve_report
 from corp_etl.readers.dar_tracker_reader import read_dar_tracker
+from corp_etl.readers.loader import load_sources
 from corp_etl.taggers.intermediate_tags import apply_intermediate_tags
 from corp_etl.taggers.wmlc_tagger import apply_wmlc_flags
+from corp_etl.incremental import apply_tags_incremental
 
 
 def setup_logging(output_dir="./output"):
@@ -119,59 +122,85 @@ def main():
     dar_path = resolve_path(dar_cfg["path"])
     dar_exists = check_file_exists(dar_path, "DAR_Tracker", logger)
 
-    # 3. Read all input files (with graceful degradation)
+    # 3. Read all input files concurrently (with graceful degradation)
     logger.info("--- Reading Input Files ---")
-    base_df = read_base_extract(base_path)
-
-    lal_df = pd.DataFrame()
+    base_cfg = inputs["base_extract"]
+    sources = [("Base extract", read_base_extract, base_path, {
+        "schema": load_schema(base_cfg),
+        "chunksize": base_cfg.get("chunksize"),
+    })]
     if lal_exists:
-        try:
-            lal_df = read_lal_credit(
-                lal_path,
-                skip_rows=lal_cfg.get("skip_rows", 3),
-                key_column=lal_cfg.get("key_column", "Account Number"),
-            )
-        except Exception as e:
-            logger.error(f"Failed to read LAL_Credit: {e}", exc_info=True)
-            logger.warning("Continuing without LAL_Credit — NTC/CSE tags will be incomplete")
-    else:
-        logger.warning("Continuing without LAL_Credit — NTC/CSE tags will be incomplete")
-
-    lrr_df = pd.DataFrame()
+        sources.append(("LAL_Credit", read_lal_credit, lal_path, {
+            "skip_rows": lal_cfg.get("skip_rows", 3),
+            "key_column": lal_cfg.get("key_column", "Account Number"),
+            "schema": load_schema(lal_cfg),
+        }))
     if lrr_exists:
-        try:
-            lrr_df = read_loan_reserve_report(
-                lrr_path,
-                skip_rows=lrr_cfg.get("skip_rows", 6),
-                key_column=lrr_cfg.get("key_column", "Facility Account Number"),
-            )
-        except Exception as e:
-            logger.error(f"Failed to read Loan_Reserve_Report: {e}", exc_info=True)
-            logger.warning("Continuing without Loan_Reserve_Report — TL NTC tags will be incomplete")
-    else:
-        logger.warning("Continuing without Loan_Reserve_Report — TL NTC tags will be incomplete")
-
-    dar_df = pd.DataFrame()
+        sources.append(("Loan_Reserve_Report", read_loan_reserve_report, lrr_path, {
+            "skip_rows": lrr_cfg.get("skip_rows", 6),
+            "key_column": lrr_cfg.get("key_column", "Facility Account Number"),
+            "schema": load_schema(lrr_cfg),
+        }))
     if dar_exists:
-        try:
-            dar_df = read_dar_tracker(
-                dar_path,
-                skip_rows=dar_cfg.get("skip_rows", 0),
-                key_column=dar_cfg.get("key_column", "Facility ID"),
-            )
-        except Exception as e:
-            logger.error(f"Failed to read DAR_Tracker: {e}", exc_info=True)
-            logger.warning("Continuing without DAR_Tracker — is_office tags will be incomplete")
+        sources.append(("DAR_Tracker", read_dar_tracker, dar_path, {
+            "skip_rows": dar_cfg.get("skip_rows", 0),
+            "key_column": dar_cfg.get("key_column", "Facility ID"),
+            "schema": load_schema(dar_cfg),
+        }))
+
+    loading_cfg = config.get("loading", {})
+    loaded = load_sources(
+        sources,
+        parallel=loading_cfg.get("parallel", True),
+        max_workers=loading_cfg.get("max_workers"),
+    )
+
+    base_result = loaded["Base extract"]
+    if base_result["error"]:
+        logger.error(f"Failed to read base extract: {base_result['error']}\n{base_result['traceback']}")
+        return 1
+    base_df = base_result["df"]
+
+    side_inputs = {}
+    for label, impact in [
+        ("LAL_Credit", "NTC/CSE tags will be incomplete"),
+        ("Loan_Reserve_Report", "TL NTC tags will be incomplete"),
+        ("DAR_Tracker", "is_office tags will be incomplete"),
+    ]:
+        result = loaded.get(label)
+        if result is not None and result["error"] is None:
+            side_inputs[label] = result["df"]
+            continue
+        if result is not None:
+            logger.error(f"Failed to read {label}: {result['error']}\n{result['traceback']}")
+        logger.warning(f"Continuing without {label} — {impact}")
+        side_inputs[label] = pd.DataFrame()
+
+    lal_df = side_inputs["LAL_Credit"]
+    lrr_df = side_inputs["Loan_Reserve_Report"]
+    dar_df = side_inputs["DAR_Tracker"]
+
+    incremental_cfg = config.get("incremental", {})
+    if incremental_cfg.get("enabled", False):
+        # 4-5. Tag only new/changed rows, reuse stored tags for the rest
+        logger.info("--- Incremental Tagging ---")
+        tagged_df, change_report = apply_tags_incremental(
+            base_df, lal_df, lrr_df, dar_df,
+            store_path=resolve_path(incremental_cfg["store"]),
+            key_columns=incremental_cfg.get("row_key"),
+        )
+        report_path = resolve_path(incremental_cfg["change_report"])
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        change_report.to_csv(report_path, index=False)
+        logger.info(f"Change report written: {report_path} ({len(change_report)} rows)")
     else:
-        logger.warning("Continuing without DAR_Tracker — is_office tags will be incomplete")
-
-    # 4. Compute intermediate tags
-    logger.info("--- Computing Intermediate Tags ---")
-    tagged_df = apply_intermediate_tags(base_df, lal_df, lrr_df, dar_df)
+        # 4. Compute intermediate tags
+        logger.info("--- Computing Intermediate Tags ---")
+        tagged_df = apply_intermediate_tags(base_df, lal_df, lrr_df, dar_df)
 
-    # 5. Evaluate WMLC flags
-    logger.info("--- Evaluating WMLC Flags ---")
-    tagged_df = apply_wmlc_flags(tagged_df)
+        # 5. Evaluate WMLC flags
+        logger.info("--- Evaluating WMLC Flags ---")
+        tagged_df = apply_wmlc_flags(tagged_df)
 
     # 6. Write output
     output_path = resolve_path(output_cfg["tagged_file"])
@@ -2,37 +2,41 @@
 
 import logging
 import pandas as pd
-from corp_etl.file_utils import read_file, normalize_columns, pad12, clean_key_column
+from corp_etl.file_utils import read_file, normalize_columns, pad12_series, clean_key_column, log_memory
 
 logger = logging.getLogger("wmlc_etl.readers.base")
 
 
-def read_base_extract(path):
+def read_base_extract(path, schema=None, chunksize=None):
     """Read loan_extract and normalise columns + key fields.
 
     Args:
         path: file path to the CSV or XLSX.
+        schema: optional typed-read schema from file_utils.load_schema()
+        chunksize: CSV rows per chunk
 
     Returns:
         pandas DataFrame with normalized column names and
         clean key columns (ACCOUNT_NUMBER, FACILITY_ID, TL_FACILITY_DIGITS12).
     """
     logger.info(f"Reading base extract: {path}")
-    df = read_file(path, skip_rows=0)
+    df = read_file(path, skip_rows=0, schema=schema, chunksize=chunksize)
     logger.info(f"Loaded {len(df)} rows, {len(df.columns)} columns")
+    log_memory(df, "Base extract", logger)
     logger.debug(f"Raw columns: {list(df.columns)}")
 
     # Normalize column names
     df, changed = normalize_columns(df)
 
-    # Convert numeric columns back to proper types
+    # Convert numeric columns back to proper types (no-op when the schema
+    # already read them as numbers)
     numeric_cols = [
         "SBL_PERC", "BALANCE", "CREDIT_LIMIT", "AMT_ORIGINAL_COMT",
         "CREDIT_LII", "BASE_COMMIT", "LATEST_COMMIT", "COMMIT_DELTA",
         "NEW_COMMITMENT_AMOUNT", "CREDIT_LII_COMMITMENT_FLOOR",
     ]
     for col in numeric_cols:
-        if col in df.columns:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
     # Boolean columns
@@ -41,10 +45,10 @@ def read_base_extract(path):
             {"true": True, "false": False, "1": True, "0": False}
         ).fillna(False)
 
-    # Format and clean key columns using shared pad12 (handles nan/none/empty)
+    # Format and clean key columns using vectorized pad12 (handles nan/none/empty)
     for key_col in ["ACCOUNT_NUMBER", "FACILITY_ID", "TL_FACILITY_DIGITS12"]:
         if key_col in df.columns:
-            df[key_col] = df[key_col].apply(pad12)
+            df[key_col] = pad12_series(df[key_col])
 
     # Clean key columns: ensure padded "nan" strings become real None
     for key_col in ["ACCOUNT_NUMBER", "FACILITY_ID", "TL_FACILITY_DIGITS12"]:
@@ -5,19 +5,23 @@ Key format: pad12 (zero-pad Facility ID to 12 digits).
 """
 
 import logging
-from corp_etl.file_utils import read_file, normalize_columns, pad12
+from corp_etl.file_utils import read_file, normalize_columns, pad12_series
 
 logger = logging.getLogger("wmlc_etl.readers.dar_tracker")
 
 
-def read_dar_tracker(path, skip_rows=0, key_column="Facility ID"):
+def read_dar_tracker(path, skip_rows=0, key_column="Facility ID", schema=None, chunksize=None):
     """Read DAR_Tracker and normalise the facility key.
 
+    Args:
+        schema: optional typed-read schema from file_utils.load_schema()
+        chunksize: CSV rows per chunk when the source is a CSV
+
     Returns:
         DataFrame with normalised 'FACILITY_ID_KEY' column.
     """
     logger.info(f"Reading DAR_Tracker: {path} (skip_rows={skip_rows})")
-    df = read_file(path, skip_rows=skip_rows)
+    df = read_file(path, skip_rows=skip_rows, schema=schema, chunksize=chunksize)
     logger.info(f"Loaded {len(df)} rows, {len(df.columns)} columns")
     logger.debug(f"Raw columns: {list(df.columns)}")
 
@@ -30,7 +34,7 @@ def read_dar_tracker(path, skip_rows=0, key_column="Facility ID"):
         df["FACILITY_ID_KEY"] = None
         return df
 
-    df["FACILITY_ID_KEY"] = df[key_col].apply(pad12)
+    df["FACILITY_ID_KEY"] = pad12_series(df[key_col])
     valid_keys = df["FACILITY_ID_KEY"].notna().sum()
     unique_keys = df["FACILITY_ID_KEY"].nunique()
     logger.info(f"Key column '{key_col}' found, {valid_keys} valid keys, {unique_keys} unique")
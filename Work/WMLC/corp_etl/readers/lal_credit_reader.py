@@ -5,19 +5,23 @@ Key format: strip_dash_pad12  ("001-234567" -> "000001234567").
 """
 
 import logging
-from corp_etl.file_utils import read_file, normalize_columns, strip_dash_pad12
+from corp_etl.file_utils import read_file, normalize_columns, strip_dash_pad12_series
 
 logger = logging.getLogger("wmlc_etl.readers.lal_credit")
 
 
-def read_lal_credit(path, skip_rows=3, key_column="Account Number"):
+def read_lal_credit(path, skip_rows=3, key_column="Account Number", schema=None, chunksize=None):
     """Read LAL_Credit file and normalise the account key.
 
+    Args:
+        schema: optional typed-read schema from file_utils.load_schema()
+        chunksize: CSV rows per chunk when the source is a CSV
+
     Returns:
         DataFrame with normalised 'ACCOUNT_NUMBER_KEY' column.
     """
     logger.info(f"Reading LAL_Credit: {path} (skip_rows={skip_rows})")
-    df = read_file(path, skip_rows=skip_rows)
+    df = read_file(path, skip_rows=skip_rows, schema=schema, chunksize=chunksize)
     logger.info(f"Loaded {len(df)} rows, {len(df.columns)} columns")
     logger.debug(f"Raw columns: {list(df.columns)}")
 
@@ -32,7 +36,7 @@ def read_lal_credit(path, skip_rows=3, key_column="Account Number"):
         df["ACCOUNT_NUMBER_KEY"] = None
         return df
 
-    df["ACCOUNT_NUMBER_KEY"] = df[key_col].apply(strip_dash_pad12)
+    df["ACCOUNT_NUMBER_KEY"] = strip_dash_pad12_series(df[key_col])
     valid_keys = df["ACCOUNT_NUMBER_KEY"].notna().sum()
     unique_keys = df["ACCOUNT_NUMBER_KEY"].nunique()
     logger.info(f"Key column '{key_col}' found, {valid_keys} valid keys, {unique_keys} unique")
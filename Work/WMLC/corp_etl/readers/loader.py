@@ -0,0 +1,125 @@
+"""Concurrent loader for the independent ETL input files.
+
+The base extract and the three Excel side inputs have no dependency on each
+other, and Excel parsing is CPU-bound and GIL-heavy, so each source is read
+in its own worker process. Every read is timed; a failing source is reported
+back (message and formatted traceback) instead of raised so main.py keeps its
+graceful-degradation behaviour.
+
+Logging is not configured in worker processes, so records the readers emit
+there are captured and replayed through the parent's ``wmlc_etl`` handlers.
+"""
+
+import os
+import time
+import logging
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger("wmlc_etl.readers.loader")
+
+ROOT_LOGGER = "wmlc_etl"
+
+
+class _RecordCapture(logging.Handler):
+    """Collects picklable copies of log records emitted in a worker."""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.records.append(record)
+
+
+def _timed_read(reader, path, kwargs, capture_logs=False):
+    """Run one reader and return (df, seconds, error_message, traceback, records).
+
+    With *capture_logs* the ``wmlc_etl`` log records emitted during the read
+    are returned instead of handled (worker processes have no handlers).
+    """
+    capture = None
+    if capture_logs:
+        root = logging.getLogger(ROOT_LOGGER)
+        saved = (root.handlers[:], root.level, root.propagate)
+        capture = _RecordCapture()
+        root.handlers = [capture]
+        root.setLevel(logging.DEBUG)
+        root.propagate = False
+    start = time.perf_counter()
+    try:
+        df = reader(path, **kwargs)
+        error = tb = None
+    except Exception as e:
+        df = None
+        error = f"{type(e).__name__}: {e}"
+        tb = traceback.format_exc().rstrip()
+    seconds = time.perf_counter() - start
+    if capture is not None:
+        handlers, level, propagate = saved
+        root.handlers = handlers
+        root.setLevel(level)
+        root.propagate = propagate
+    return df, seconds, error, tb, capture.records if capture is not None else []
+
+
+def _replay(records):
+    """Hand worker log records to the parent's handlers."""
+    for record in records:
+        logging.getLogger(record.name).handle(record)
+
+
+def load_sources(sources, parallel=True, max_workers=None):
+    """Read several input files, concurrently when possible.
+
+    Args:
+        sources: list of (label, reader_fn, path, kwargs) tuples. reader_fn
+            must be a module-level function so it can be sent to a worker.
+        parallel: read in worker processes; False reads in-process, in order
+        max_workers: process cap (default: one per source, bounded by CPUs)
+
+    Returns:
+        dict label -> {"df": DataFrame or None, "seconds": float,
+                       "error": str or None, "traceback": str or None}
+    """
+    results = {}
+    wall_start = time.perf_counter()
+
+    if parallel and len(sources) > 1:
+        workers = max_workers or min(len(sources), os.cpu_count() or 1)
+        logger.info(f"Reading {len(sources)} input files in {workers} worker processes")
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    label: pool.submit(_timed_read, reader, path, kwargs, True)
+                    for label, reader, path, kwargs in sources
+                }
+                for label, future in futures.items():
+                    df, seconds, error, tb, records = future.result()
+                    _replay(records)
+                    results[label] = {"df": df, "seconds": seconds, "error": error, "traceback": tb}
+        except (OSError, RuntimeError) as e:
+            # Locked-down hosts can refuse to spawn processes — read serially instead
+            logger.warning(f"Process pool unavailable ({e}) — falling back to serial reads")
+            results = {}
+
+    for label, reader, path, kwargs in sources:
+        if label not in results:
+            df, seconds, error, tb, _ = _timed_read(reader, path, kwargs)
+            results[label] = {"df": df, "seconds": seconds, "error": error, "traceback": tb}
+
+    wall = time.perf_counter() - wall_start
+    serial_total = sum(r["seconds"] for r in results.values())
+    logger.info("=== Input Read Times ===")
+    for label, r in results.items():
+        rows = len(r["df"]) if r["df"] is not None else 0
+        status = "FAILED" if r["error"] else f"{rows:,} rows"
+        logger.info(f"  {label:25s} {r['seconds']:7.2f}s  {status}")
+    logger.info(f"  {'Load phase wall time':25s} {wall:7.2f}s "
+                f"(sum of reads {serial_total:.2f}s)")
+    return results
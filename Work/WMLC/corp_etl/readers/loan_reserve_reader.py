@@ -5,19 +5,24 @@ Key format: pad12 (zero-pad to 12 digits).
 """
 
 import logging
-from corp_etl.file_utils import read_file, normalize_columns, pad12
+from corp_etl.file_utils import read_file, normalize_columns, pad12_series
 
 logger = logging.getLogger("wmlc_etl.readers.loan_reserve")
 
 
-def read_loan_reserve_report(path, skip_rows=6, key_column="Facility Account Number"):
+def read_loan_reserve_report(path, skip_rows=6, key_column="Facility Account Number",
+                             schema=None, chunksize=None):
     """Read Loan_Reserve_Report and normalise the account key.
 
+    Args:
+        schema: optional typed-read schema from file_utils.load_schema()
+        chunksize: CSV rows per chunk when the source is a CSV
+
     Returns:
         DataFrame with normalised 'ACCOUNT_NUMBER_KEY' column.
     """
     logger.info(f"Reading Loan_Reserve_Report: {path} (skip_rows={skip_rows})")
-    df = read_file(path, skip_rows=skip_rows)
+    df = read_file(path, skip_rows=skip_rows, schema=schema, chunksize=chunksize)
     logger.info(f"Loaded {len(df)} rows, {len(df.columns)} columns")
     logger.debug(f"Raw columns: {list(df.columns)}")
 
@@ -30,7 +35,7 @@ def read_loan_reserve_report(path, skip_rows=6, key_column="Facility Account Num
         df["ACCOUNT_NUMBER_KEY"] = None
         return df
 
-    df["ACCOUNT_NUMBER_KEY"] = df[key_col].apply(pad12)
+    df["ACCOUNT_NUMBER_KEY"] = pad12_series(df[key_col])
     valid_keys = df["ACCOUNT_NUMBER_KEY"].notna().sum()
     unique_keys = df["ACCOUNT_NUMBER_KEY"].nunique()
     logger.info(f"Key column '{key_col}' found, {valid_keys} valid keys, {unique_keys} unique")
@@ -10,6 +10,7 @@ Join key reference:
 """
 
 import logging
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger("wmlc_etl.taggers.intermediate")
@@ -262,14 +263,59 @@ def _assign_bucket(credit_lii):
     return "$1", 1
 
 
+def assign_ladder(values, thresholds=_BUCKET_THRESHOLDS):
+    """Vectorized floor lookup: same result as _assign_bucket for every value.
+
+    Binary-searches the ascending floors (np.searchsorted), so a whole column
+    is bucketed in O(n log k) with no Python loop. Values below the lowest
+    floor (and NaN) land in the lowest bucket, matching _assign_bucket.
+
+    Args:
+        values: array-like of numeric exposures
+        thresholds: (floor, label, floor_int) tuples in descending order
+
+    Returns:
+        (labels, floors) — an ordered Categorical of labels and an int64 array.
+    """
+    ascending = thresholds[::-1]
+    floors = np.array([t[0] for t in ascending], dtype="float64")
+    labels = [t[1] for t in ascending]
+    floor_ints = np.array([t[2] for t in ascending], dtype="int64")
+
+    vals = np.nan_to_num(np.asarray(values, dtype="float64"), nan=-np.inf)
+    codes = np.searchsorted(floors, vals, side="right") - 1
+    codes = np.clip(codes, 0, None)
+    return (pd.Categorical.from_codes(codes, categories=labels, ordered=True),
+            floor_ints[codes])
+
+
+# Exposure column -> (bucket column, floor column, threshold ladder).
+# Add an entry to bucket another exposure column in the same pass.
+BUCKET_LADDERS = {
+    "CREDIT_LII": ("CREDIT_LII_COMMITMENT_BUCKET", "CREDIT_LII_COMMITMENT_FLOOR", _BUCKET_THRESHOLDS),
+}
+
+
+def compute_ladder_buckets(df, ladders=None):
+    """Bucket every configured exposure column present in df."""
+    for source_col, (bucket_col, floor_col, thresholds) in (ladders or BUCKET_LADDERS).items():
+        if source_col not in df.columns:
+            logger.warning(f"{source_col} missing — cannot compute {bucket_col}/{floor_col}")
+            continue
+        values = pd.to_numeric(df[source_col], errors="coerce").fillna(0)
+        df[bucket_col], df[floor_col] = assign_ladder(values.to_numpy(), thresholds)
+    return df
+
+
 def compute_bucket_columns(df):
     """Always (re)compute CREDIT_LII_COMMITMENT_BUCKET and _FLOOR from CREDIT_LII."""
-    credit_lii = pd.to_numeric(df["CREDIT_LII"], errors="coerce").fillna(0)
-    buckets = credit_lii.apply(_assign_bucket)
-    df["CREDIT_LII_COMMITMENT_BUCKET"] = buckets.apply(lambda x: x[0])
-    df["CREDIT_LII_COMMITMENT_FLOOR"] = buckets.apply(lambda x: x[1])
+    bucket_col = BUCKET_LADDERS["CREDIT_LII"][0]
+    df = compute_ladder_buckets(df, {"CREDIT_LII": BUCKET_LADDERS["CREDIT_LII"]})
+    if "CREDIT_LII" not in df.columns:
+        return df  # compute_ladder_buckets already warned
     logger.info("Computed CREDIT_LII_COMMITMENT_BUCKET/FLOOR from CREDIT_LII")
-    logger.debug(f"Bucket distribution:\n{df['CREDIT_LII_COMMITMENT_BUCKET'].value_counts().to_string()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Bucket distribution:\n{df[bucket_col].value_counts().to_string()}")
     return df
 
 
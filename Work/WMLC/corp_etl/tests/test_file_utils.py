@@ -0,0 +1,110 @@
+"""Unit tests for corp_etl.file_utils readers and key formatting."""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+
+# Ensure imports work
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from corp_etl.file_utils import (
+    load_schema, read_file, pad12, strip_dash_pad12, pad12_series,
+    strip_dash_pad12_series, clean_key_column,
+)
+
+_CSV = (
+    "Account Number,credit_lii,book_date,product_bucket,note\n"
+    "000000001234,1500000.50,2024-01-31,TL CRE,a\n"
+    "000000005678,,2024-02-29,LAL Diversified,\n"
+    "000000009012,abc,not a date,TL CRE,c\n"
+    "000000003456,250000000,2024-03-31,RESI,d\n"
+    "000000007890,75000000,2024-04-30,TL PHA,e\n"
+)
+
+_SCHEMA_CFG = {
+    "schema": {
+        "numeric": ["CREDIT_LII"],
+        "date": ["BOOK_DATE"],
+        "key": ["Account Number"],
+        "categorical": ["PRODUCT_BUCKET"],
+    }
+}
+
+
+class TestTypedRead(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "extract.csv")
+        with open(self.path, "w") as f:
+            f.write(_CSV)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_load_schema_normalizes_names(self):
+        schema = load_schema(_SCHEMA_CFG)
+        self.assertEqual(schema["ACCOUNT_NUMBER"], "key")
+        self.assertEqual(schema["CREDIT_LII"], "numeric")
+        self.assertEqual(load_schema({}), {})
+
+    def test_no_schema_reads_all_str(self):
+        df = read_file(self.path)
+        self.assertEqual(df.loc[0, "credit_lii"], "1500000.50")
+        self.assertEqual(df.loc[0, "Account Number"], "000000001234")
+
+    def test_schema_types(self):
+        df = read_file(self.path, schema=load_schema(_SCHEMA_CFG))
+        self.assertTrue(pd.api.types.is_float_dtype(df["credit_lii"]))
+        self.assertTrue(pd.isna(df.loc[2, "credit_lii"]))
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["book_date"]))
+        self.assertTrue(pd.isna(df.loc[2, "book_date"]))
+        self.assertIsInstance(df["product_bucket"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df.loc[0, "Account Number"], "000000001234")
+        self.assertEqual(df.loc[0, "note"], "a")
+
+    def test_chunked_read_matches_single_read(self):
+        schema = load_schema(_SCHEMA_CFG)
+        whole = read_file(self.path, schema=schema)
+        chunked = read_file(self.path, schema=schema, chunksize=2)
+        self.assertIsInstance(chunked["product_bucket"].dtype, pd.CategoricalDtype)
+        self.assertEqual(set(chunked["product_bucket"].cat.categories),
+                         {"TL CRE", "LAL Diversified", "RESI", "TL PHA"})
+        pd.testing.assert_frame_equal(
+            whole.astype({"product_bucket": str}),
+            chunked.astype({"product_bucket": str}),
+        )
+
+
+_KEY_SAMPLES = [
+    "1234", " 000000001234 ", "1234.0", "001-234567", "12-34-56", "nan", "NaN",
+    "None", "", "   ", "<NA>", "abc", "A1B2", 1234, 1234.0, None, float("nan"),
+    "123456789012", "12.5",
+]
+
+
+class TestKeyFormatting(unittest.TestCase):
+    def _assert_matches_scalar(self, vectorized, scalar):
+        series = pd.Series(_KEY_SAMPLES, dtype=object)
+        expected = [scalar(v) for v in _KEY_SAMPLES]
+        actual = [None if pd.isna(v) else v for v in vectorized(series)]
+        self.assertEqual(actual, expected)
+
+    def test_pad12_series_matches_pad12(self):
+        self._assert_matches_scalar(pad12_series, pad12)
+
+    def test_strip_dash_series_matches_scalar(self):
+        self._assert_matches_scalar(strip_dash_pad12_series, strip_dash_pad12)
+
+    def test_clean_key_column_padded_nan(self):
+        cleaned = clean_key_column(pd.Series(["000000000nan", "0000NONE", " ", "000000001234"]))
+        self.assertEqual(cleaned.isna().tolist(), [True, True, True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Unit tests for incremental tagging (corp_etl.incremental)."""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+
+# Ensure imports work
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from corp_etl.incremental import apply_tags_incremental, row_keys
+from corp_etl.taggers.intermediate_tags import apply_intermediate_tags
+from corp_etl.taggers.wmlc_tagger import apply_wmlc_flags
+
+
+def _base():
+    return pd.DataFrame({
+        "FACILITY_ID": ["000000000001", "000000000002", "000000000003", "000000000004"],
+        "TL_FACILITY_DIGITS12": ["000000000001", "000000000002", "000000000003", "000000000004"],
+        "ACCOUNT_NUMBER": ["000000000101", "000000000102", "000000000103", "000000000104"],
+        "PRODUCT_BUCKET": ["TL CRE", "TL CRE", "LAL NFPs", "RESI"],
+        "CREDIT_LII": [80_000_000.0, 20_000_000.0, 60_000_000.0, 5_000_000.0],
+        "FOCUS_LIST": ["", "", "", "Non-Pass"],
+        "NEW_CAMP_YN": ["N", "N", "N", "Y"],
+        "TXT_MSTR_FACIL_COLLATERAL_DESC": ["Commercial Real Estate"] * 2 + ["Cash", "Residential Property"],
+        "SBL_PERC": [0.0] * 4,
+        "IS_LAL_NFP": [False, False, True, False],
+    })
+
+
+def _dar(property_type="Retail"):
+    return pd.DataFrame({"FACILITY_ID_KEY": ["000000000002"], "PROPERTY_TYPE": [property_type]})
+
+
+def _full_run(base, dar):
+    return apply_wmlc_flags(apply_intermediate_tags(base, pd.DataFrame(), pd.DataFrame(), dar))
+
+
+class TestIncrementalTagging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = os.path.join(self.tmp, "tag_store.pkl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _run(self, base, dar):
+        return apply_tags_incremental(base, pd.DataFrame(), pd.DataFrame(), dar, self.store)
+
+    def test_first_run_matches_full_run(self):
+        tagged, report = self._run(_base(), _dar())
+        pd.testing.assert_frame_equal(tagged, _full_run(_base(), _dar()), check_dtype=False)
+        self.assertEqual(list(report["CHANGE"]), ["new"] * 4)
+
+    def test_unchanged_rerun_retags_nothing(self):
+        self._run(_base(), _dar())
+        tagged, report = self._run(_base(), _dar())
+        self.assertEqual(len(report), 0)
+        pd.testing.assert_frame_equal(tagged, _full_run(_base(), _dar()), check_dtype=False)
+
+    def test_changed_new_and_removed_rows(self):
+        self._run(_base(), _dar())
+        base = _base()
+        base.loc[3, "CREDIT_LII"] = 15_000_000.0
+        base = pd.concat([base.drop(index=0), base.head(1).assign(
+            FACILITY_ID="000000000009", TL_FACILITY_DIGITS12="000000000009")], ignore_index=True)
+        tagged, report = self._run(base, _dar())
+        pd.testing.assert_frame_equal(tagged, _full_run(base, _dar()), check_dtype=False)
+        changes = dict(zip(report["CHANGE"], report["FLAGS_CHANGED"]))
+        self.assertEqual(sorted(report["CHANGE"]), ["changed", "new", "removed"])
+        self.assertTrue(changes["changed"])
+
+    def test_side_input_change_retags_joined_rows(self):
+        self._run(_base(), _dar())
+        tagged, report = self._run(_base(), _dar("Office"))
+        self.assertEqual(list(report["ROW_KEY"]), list(row_keys(_base())[[1]]))
+        self.assertEqual(tagged.loc[1, "WMLC_FLAGS"], "TL-CRE Office >$10MM")
+
+    def test_duplicate_keys_are_distinct_rows(self):
+        base = pd.concat([_base(), _base().head(1)], ignore_index=True)
+        keys = row_keys(base)
+        self.assertTrue(keys.is_unique)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Unit tests for commitment bucket assignment in intermediate_tags."""
+
+import logging
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+# Ensure imports work
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from corp_etl.taggers.intermediate_tags import (
+    _BUCKET_THRESHOLDS, _assign_bucket, assign_ladder, compute_bucket_columns,
+    compute_ladder_buckets,
+)
+
+
+class TestLadderBuckets(unittest.TestCase):
+    def test_matches_scalar_at_every_boundary(self):
+        values = [-5, 0, 0.5, 1, 2]
+        for floor_val, _, _ in _BUCKET_THRESHOLDS:
+            values += [floor_val - 1, floor_val - 0.01, floor_val, floor_val + 1]
+        values += [5e9, np.inf]
+        labels, floors = assign_ladder(values)
+        for v, label, floor in zip(values, labels, floors):
+            self.assertEqual((label, floor), _assign_bucket(v), f"value={v}")
+
+    def test_nan_goes_to_lowest_bucket(self):
+        labels, floors = assign_ladder([np.nan])
+        self.assertEqual((labels[0], floors[0]), ("$1", 1))
+
+    def test_compute_bucket_columns(self):
+        df = pd.DataFrame({"CREDIT_LII": ["80000000", "abc", None, "1000000000"]})
+        df = compute_bucket_columns(df)
+        self.assertEqual(list(df["CREDIT_LII_COMMITMENT_BUCKET"]),
+                         ["$75,000,000", "$1", "$1", "$1,000,000,000"])
+        self.assertEqual(list(df["CREDIT_LII_COMMITMENT_FLOOR"]),
+                         [75_000_000, 1, 1, 1_000_000_000])
+
+    def test_compute_bucket_columns_without_credit_lii(self):
+        df = pd.DataFrame({"ACCOUNT": ["000000001234"]})
+        logger = logging.getLogger("wmlc_etl.taggers.intermediate")
+        for level in (logging.INFO, logging.DEBUG):
+            with self.subTest(level=logging.getLevelName(level)), \
+                    self.assertLogs(logger, level) as logs:
+                out = compute_bucket_columns(df.copy())
+            self.assertEqual(list(out.columns), ["ACCOUNT"])
+            self.assertEqual(len(logs.records), 1)
+            self.assertIn("CREDIT_LII missing", logs.output[0])
+
+    def test_multiple_ladders_in_one_call(self):
+        small_ladder = [(100, "100+", 100), (0, "0+", 0)]
+        df = pd.DataFrame({"CREDIT_LII": [20_000_000.0], "BALANCE": [150.0]})
+        df = compute_ladder_buckets(df, {
+            "CREDIT_LII": ("LII_BUCKET", "LII_FLOOR", _BUCKET_THRESHOLDS),
+            "BALANCE": ("BAL_BUCKET", "BAL_FLOOR", small_ladder),
+        })
+        self.assertEqual(df.loc[0, "LII_BUCKET"], "$20,000,000")
+        self.assertEqual(df.loc[0, "BAL_BUCKET"], "100+")
+
+
+if __name__ == "__main__":
+    unittest.main()
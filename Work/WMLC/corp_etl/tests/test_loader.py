@@ -0,0 +1,93 @@
+"""Unit tests for the concurrent input loader (corp_etl.readers.loader)."""
+
+import os
+import sys
+import logging
+import unittest
+from unittest import mock
+import pandas as pd
+
+# Ensure imports work
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from corp_etl.readers import loader
+from corp_etl.readers.loader import load_sources
+
+reader_logger = logging.getLogger("wmlc_etl.readers.test_reader")
+
+
+# Readers are module-level so they can be sent to worker processes
+def read_rows(path, n=3):
+    reader_logger.warning(f"reading {path}")
+    return pd.DataFrame({"source": [path] * n, "pid": [os.getpid()] * n})
+
+
+def read_broken(path):
+    raise ValueError(f"cannot parse {path}")
+
+
+def _sources():
+    return [
+        ("A", read_rows, "a.csv", {"n": 2}),
+        ("B", read_rows, "b.xlsx", {}),
+        ("C", read_broken, "c.xlsx", {}),
+    ]
+
+
+class TestLoadSources(unittest.TestCase):
+    def _load(self, **kwargs):
+        with self.assertLogs("wmlc_etl", level="DEBUG") as logs:
+            results = load_sources(_sources(), **kwargs)
+        return results, logs.output
+
+    def _check_results(self, results):
+        self.assertEqual(list(results), ["A", "B", "C"])
+        self.assertEqual(list(results["A"]["df"]["source"]), ["a.csv"] * 2)
+        self.assertEqual(len(results["B"]["df"]), 3)
+        for label in ("A", "B"):
+            self.assertIsNone(results[label]["error"])
+            self.assertIsNone(results[label]["traceback"])
+            self.assertGreaterEqual(results[label]["seconds"], 0)
+
+    def test_parallel_reads_in_workers_and_replays_their_logs(self):
+        results, logs = self._load(parallel=True, max_workers=2)
+        self._check_results(results)
+        pids = set(results["A"]["df"]["pid"]) | set(results["B"]["df"]["pid"])
+        self.assertNotIn(os.getpid(), pids)
+        self.assertIn("WARNING:wmlc_etl.readers.test_reader:reading a.csv", logs)
+        self.assertIn("WARNING:wmlc_etl.readers.test_reader:reading b.xlsx", logs)
+
+    def test_serial_reads_in_process_in_order(self):
+        results, logs = self._load(parallel=False)
+        self._check_results(results)
+        self.assertEqual(set(results["A"]["df"]["pid"]), {os.getpid()})
+        reads = [line for line in logs if ":reading " in line]
+        self.assertEqual(reads, ["WARNING:wmlc_etl.readers.test_reader:reading a.csv",
+                                 "WARNING:wmlc_etl.readers.test_reader:reading b.xlsx"])
+
+    def test_falls_back_to_serial_when_pool_unavailable(self):
+        with mock.patch.object(loader, "ProcessPoolExecutor",
+                               side_effect=OSError("process spawning disabled")):
+            results, logs = self._load(parallel=True)
+        self._check_results(results)
+        self.assertEqual(set(results["B"]["df"]["pid"]), {os.getpid()})
+        self.assertTrue(any("Process pool unavailable" in line for line in logs))
+
+    def test_errors_are_captured_per_source_with_traceback(self):
+        for parallel in (True, False):
+            with self.subTest(parallel=parallel):
+                results, logs = self._load(parallel=parallel)
+                broken = results["C"]
+                self.assertIsNone(broken["df"])
+                self.assertEqual(broken["error"], "ValueError: cannot parse c.xlsx")
+                self.assertTrue(broken["traceback"].startswith("Traceback"))
+                self.assertIn("read_broken", broken["traceback"])
+                self.assertTrue(any("C" in line and "FAILED" in line for line in logs))
+                self.assertIsNotNone(results["A"]["df"])
+
+
+if __name__ == "__main__":
+    unittest.main()
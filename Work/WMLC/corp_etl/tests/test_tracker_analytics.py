@@ -0,0 +1,67 @@
+"""Unit tests for the tracker matching engine in build_tracker_analytics."""
+
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+# Ensure imports work
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from corp_etl.build_tracker_analytics import (
+    normalize_borrower_key, combine_flag_columns, dedup_latest_per_quarter,
+    match_tracker_to_extract, _crosstab_matrix,
+)
+
+
+def _tracker():
+    df = pd.DataFrame({
+        "_BORROWER_KEY": [" Acme Trust", "ACME TRUST ", "Beta LLC", "Acme Trust"],
+        "_DATE": pd.to_datetime(["2025-01-10", "2025-03-01", "2025-02-01", "2025-05-01"]),
+        "FA-MSSB-D": ["Y", np.nan, " y", "N"],
+        "FA-MSSB-C": [np.nan, np.nan, "N", "Y"],
+        "Product Area": ["LAL", "LAL", "TL-CRE", "LAL"],
+        "Gross": [10.04, 20.0, 5.5, 1.0],
+    })
+    df["_QUARTER"] = df["_DATE"].dt.to_period("Q").astype(str)
+    df["_BORROWER_KEY_NORM"] = normalize_borrower_key(df["_BORROWER_KEY"])
+    return df
+
+
+class TestTrackerMatching(unittest.TestCase):
+    def test_combine_flag_columns(self):
+        combined = combine_flag_columns(_tracker(), ["FA-MSSB-D", "FA-MSSB-C"])
+        self.assertEqual(list(combined), ["Y", "N", "Y", "Y"])
+
+    def test_dedup_keeps_latest_per_borrower_quarter(self):
+        deduped = dedup_latest_per_quarter(_tracker())
+        self.assertEqual(len(deduped), 3)
+        acme_q1 = deduped[(deduped["_BORROWER_KEY_NORM"] == "ACME TRUST") & (deduped["_QUARTER"] == "2025Q1")]
+        self.assertEqual(acme_q1["_DATE"].iloc[0], pd.Timestamp("2025-03-01"))
+
+    def test_match_tracker_to_extract(self):
+        tagged = pd.DataFrame({
+            "BORROWER": ["acme trust", "Acme Trust", "Gamma"],
+            "CREDIT_LII": ["5", "90000000", "1"],
+            "WMLC_FLAGS": ["", "LAL-C >$100MM", ""],
+        })
+        matched = match_tracker_to_extract(dedup_latest_per_quarter(_tracker()), tagged)
+        acme = matched[matched["_BORROWER_KEY_NORM"] == "ACME TRUST"]
+        self.assertTrue(acme["EXTRACT_MATCH"].all())
+        self.assertEqual(set(acme["EXTRACT_WMLC_FLAGS"]), {"LAL-C >$100MM"})
+        self.assertFalse(matched.loc[matched["_BORROWER_KEY_NORM"] == "BETA LLC", "EXTRACT_MATCH"].any())
+
+    def test_crosstab_matrix(self):
+        df = _tracker()
+        counts = _crosstab_matrix(df, "Product Area", "_QUARTER", ["LAL", "PSL"], ["2025Q1", "2025Q2"])
+        self.assertEqual(counts, [[2, 1], [0, 0]])
+        sums = _crosstab_matrix(df, "Product Area", "_QUARTER", ["LAL"], ["2025Q1"], values="Gross")
+        self.assertEqual(sums, [[30.0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,11 +13,12 @@ import os
 import sys
 import time
 import subprocess
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from openpyxl import Workbook
 from openpyxl.styles import (
-    Font, PatternFill, Alignment, Border, Side, numbers
+    Font, PatternFill, Alignment, Border, Side, NamedStyle, numbers
 )
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.table import Table, TableStyleInfo
@@ -142,32 +143,155 @@ THIN = Side(style="thin", color="000000")
 THIN_BORDER = Border(left=THIN, right=THIN, top=THIN, bottom=THIN)
 DOUBLE_TOP = Border(left=THIN, right=THIN, top=Side(style="double", color="000000"), bottom=THIN)
 
+# Named styles — one style assignment per cell instead of four attribute sets
+STYLE_DATA = "wmlc_data"
+STYLE_DATA_ALT = "wmlc_data_alt"
+
+
+def register_named_styles(wb):
+    """Register the shared matrix-cell styles on the workbook (idempotent)."""
+    for name, fill in [(STYLE_DATA, WHITE_FILL), (STYLE_DATA_ALT, ICE_BLUE_FILL)]:
+        if name in wb.named_styles:
+            continue
+        wb.add_named_style(NamedStyle(
+            name=name, font=DATA_FONT, fill=fill, border=THIN_GRAY_BORDER,
+            alignment=Alignment(horizontal="right"),
+        ))
+
+
+def write_row(ws, row, start_col, values, style=None, number_format=None):
+    """Write one row of values starting at (row, start_col) with a named style."""
+    for ci, val in enumerate(values, start_col):
+        cell = ws.cell(row=row, column=ci, value=val)
+        if style is not None:
+            cell.style = style
+        if number_format is not None:
+            cell.number_format = number_format
+
+
+def append_rows(ws, rows):
+    """Stream whole rows (2-D array or list of lists) onto the end of a sheet.
+
+    Uses ws.append, so it works on normal and write-only worksheets alike.
+    """
+    for row in np.asarray(rows, dtype=object).tolist():
+        ws.append(row)
+
 
 # -- pivot computation -------------------------------------------------------
+_LADDER_FLOORS_ASC = np.array([floor for _, floor, _ in BUCKET_LADDER][::-1], dtype="float64")
+_LADDER_CEILS_ASC = np.array([ceil for _, _, ceil in BUCKET_LADDER][::-1], dtype="float64")
+_LADDER_LABELS = [label for label, _, _ in BUCKET_LADDER]
+_PIVOT_MEASURES = ("count", "sum", "share")
+
+
+def _ladder_row_index(credit_lii):
+    """Map each CREDIT_LII to its BUCKET_LADDER row (0 = top), -1 if in no row.
+
+    A value belongs to the row with the largest floor <= value, provided it
+    is also <= that row's ceiling — the same inclusive floor/ceil test the
+    per-cell masks used, found by binary search instead of 24 scans.
+    """
+    vals = np.asarray(credit_lii, dtype="float64")
+    pos = np.searchsorted(_LADDER_FLOORS_ASC, vals, side="right") - 1
+    safe = np.clip(pos, 0, None)
+    inside = (pos >= 0) & (vals <= _LADDER_CEILS_ASC[safe])
+    return np.where(inside, len(BUCKET_LADDER) - 1 - safe, -1)
+
+
+def _pivot_cells(df, extra_keys=()):
+    """One groupby over (ladder row, product column[, extra keys]) -> count and sum."""
+    lii = pd.to_numeric(df["CREDIT_LII"], errors="coerce").fillna(0).to_numpy()
+    rows = _ladder_row_index(lii)
+    cols = pd.Categorical(df["PRODUCT_BUCKET"], categories=PRODUCT_BUCKETS).codes
+    keep = (rows >= 0) & (cols >= 0)
+
+    cells = pd.DataFrame({"row": rows[keep], "col": cols[keep], "lii": lii[keep]})
+    for key, values in extra_keys:
+        cells[key] = np.asarray(values)[keep]
+    keys = ["row", "col"] + [key for key, _ in extra_keys]
+    return cells.groupby(keys, sort=False)["lii"].agg(["count", "sum"])
+
+
+def _to_matrix(cell_values):
+    """Reindex a (row, col) Series onto the fixed 24 x 13 ladder/product grid."""
+    full = pd.MultiIndex.from_product(
+        [range(len(BUCKET_LADDER)), range(len(PRODUCT_BUCKETS))], names=["row", "col"])
+    grid = cell_values.groupby(level=["row", "col"]).sum().reindex(full, fill_value=0)
+    return pd.DataFrame(grid.to_numpy().reshape(len(BUCKET_LADDER), len(PRODUCT_BUCKETS)),
+                        index=_LADDER_LABELS, columns=PRODUCT_BUCKETS)
+
+
+def _measure_frames(cells, measures):
+    """Build the requested measure matrices from grouped count/sum cells."""
+    frames = {}
+    sums = _to_matrix(cells["sum"])
+    for measure in measures:
+        if measure == "count":
+            frames["count"] = _to_matrix(cells["count"]).astype("int64")
+        elif measure == "sum":
+            frames["sum"] = sums.astype("float64")
+        elif measure == "share":
+            total = float(sums.to_numpy().sum())
+            frames["share"] = sums / total if total else sums * 0.0
+        else:
+            raise ValueError(f"Unknown pivot measure: {measure} (expected {_PIVOT_MEASURES})")
+    return frames
+
+
+def pivot_measures(df, measures=("count", "sum"), subset_mask=None):
+    """Compute several 24 x 13 pivot measures from a single groupby.
+
+    Args:
+        df: tagged DataFrame with CREDIT_LII and PRODUCT_BUCKET
+        measures: any of 'count', 'sum' (of CREDIT_LII), 'share' (of total sum)
+        subset_mask: optional boolean Series to pre-filter df
+
+    Returns:
+        dict measure -> DataFrame indexed by ladder label, columns PRODUCT_BUCKETS.
+    """
+    sub = df if subset_mask is None else df[subset_mask]
+    return _measure_frames(_pivot_cells(sub), measures)
+
+
 def compute_pivot(df, agg, subset_mask=None):
     """Return a 24x13 matrix (list of lists).
     agg: 'count' or 'sum' (of credit_lii).
     subset_mask: boolean Series to pre-filter df.
     """
-    sub = df if subset_mask is None else df[subset_mask]
-    matrix = []
-    for label, floor, ceil in BUCKET_LADDER:
-        row_mask = (sub["CREDIT_LII"] >= floor) & (sub["CREDIT_LII"] <= ceil)
-        row_data = []
-        for pb in PRODUCT_BUCKETS:
-            cell_mask = row_mask & (sub["PRODUCT_BUCKET"] == pb)
-            if agg == "count":
-                row_data.append(int(cell_mask.sum()))
-            else:
-                row_data.append(float(sub.loc[cell_mask, "CREDIT_LII"].sum()))
-        matrix.append(row_data)
-    return matrix
+    measure = "count" if agg == "count" else "sum"
+    return pivot_measures(df, (measure,), subset_mask)[measure].to_numpy().tolist()
+
+
+def compute_view_pivots(df, mask_new, mask_wmlc):
+    """All 8 dashboard views (count/sum x all/NEW/WMLC/NEW+WMLC) from one groupby.
+
+    Cells are grouped by (row, col, NEW, WMLC) once; each view is a sum over
+    the relevant NEW/WMLC slices of that result.
+    """
+    cells = _pivot_cells(df, extra_keys=(("new", mask_new.to_numpy(bool)),
+                                         ("wmlc", mask_wmlc.to_numpy(bool))))
+    new_level = cells.index.get_level_values("new")
+    wmlc_level = cells.index.get_level_values("wmlc")
+    subsets = {
+        (1, 2): np.ones(len(cells), dtype=bool),
+        (3, 4): new_level,
+        (5, 6): wmlc_level,
+        (7, 8): new_level & wmlc_level,
+    }
+    pivots = {}
+    for (count_view, sum_view), keep in subsets.items():
+        frames = _measure_frames(cells[np.asarray(keep, dtype=bool)], ("count", "sum"))
+        pivots[count_view] = frames["count"].to_numpy().tolist()
+        pivots[sum_view] = frames["sum"].to_numpy().tolist()
+    return pivots
 
 
 # -- Summary sheet builder ---------------------------------------------------
 def build_summary_sheet(wb, pivots):
     """Build a static Summary sheet with all 4 view matrices stacked."""
     ws = wb.create_sheet("Summary")
+    register_named_styles(wb)
 
     headers = ["Gross Amount", "Defined Range"] + PRODUCT_BUCKETS + ["Total"]
 
@@ -229,15 +353,9 @@ def build_summary_sheet(wb, pivots):
             cell_b.fill = ICE_BLUE_FILL if is_alt else WHITE_FILL
 
             # Cols C-O
-            row_total = 0
-            for ci, val in enumerate(matrix[ri]):
-                cell = ws.cell(row=current_row, column=ci + 3, value=val)
-                cell.number_format = num_fmt
-                cell.border = THIN_GRAY_BORDER
-                cell.alignment = Alignment(horizontal="right")
-                cell.font = DATA_FONT
-                cell.fill = ICE_BLUE_FILL if is_alt else WHITE_FILL
-                row_total += val
+            write_row(ws, current_row, 3, matrix[ri],
+                      style=STYLE_DATA_ALT if is_alt else STYLE_DATA, number_format=num_fmt)
+            row_total = sum(matrix[ri])
 
             # Col P -- total
             cell_p = ws.cell(row=current_row, column=16, value=row_total)
@@ -484,6 +602,36 @@ _CHART_W = 38
 _CHART_H = 14
 
 
+_BANDS = ["below", "approaching", "at_above"]
+
+
+def _threshold_bands(df):
+    """Classify every loan in a known product as below 80% / 80-99% / >= threshold."""
+    thresh = df["PRODUCT_BUCKET"].map(WMLC_THRESHOLDS_DOLLARS)
+    known = thresh.notna()
+    lii = df.loc[known, "CREDIT_LII"].to_numpy(dtype="float64")
+    t = thresh[known].to_numpy(dtype="float64")
+    band = np.select([lii < t * 0.8, lii < t], _BANDS[:2], default=_BANDS[2])
+    return pd.DataFrame({
+        "product": df.loc[known, "PRODUCT_BUCKET"].to_numpy(),
+        "band": pd.Categorical(band, categories=_BANDS),
+        "lii": lii,
+    })
+
+
+def _explode_flags(df):
+    """One row per (loan, flag) with the loan's CREDIT_LII, in extract order."""
+    flags = df["WMLC_FLAGS"]
+    flags = flags[flags.notna()].astype(str)
+    flags = flags[(flags != "") & (flags.str.lower() != "nan")]
+    exploded = pd.DataFrame({
+        "flag": flags.str.split("|"),
+        "lii": df.loc[flags.index, "CREDIT_LII"].astype(float),
+    }).explode("flag")
+    exploded["flag"] = exploded["flag"].str.strip()
+    return exploded[exploded["flag"] != ""]
+
+
 def build_chart_data_sheet(wb, df, pivots):
     """Build _chart_data with all pre-computed visualization data.
 
@@ -496,21 +644,14 @@ def build_chart_data_sheet(wb, df, pivots):
     ws = wb.create_sheet("_chart_data")
     credit_lii = df["CREDIT_LII"]
     wmlc_mask = df["WMLC_QUALIFIED"]
+    bands = _threshold_bands(df)
 
     # ── Rows 1-13: Stacked bar data ──────────────────────────────────────
-    for i, pb in enumerate(PRODUCT_BUCKETS):
-        thresh = WMLC_THRESHOLDS_DOLLARS.get(pb, 999_999_999_999)
-        mask = df["PRODUCT_BUCKET"] == pb
-        lii = credit_lii[mask]
-        below = float(lii[lii < thresh * 0.8].sum())
-        approaching = float(lii[(lii >= thresh * 0.8) & (lii < thresh)].sum())
-        at_above = float(lii[lii >= thresh].sum())
-
-        row = i + 1
-        ws.cell(row=row, column=1, value=pb)
-        ws.cell(row=row, column=2, value=below)
-        ws.cell(row=row, column=3, value=approaching)
-        ws.cell(row=row, column=4, value=at_above)
+    band_sums = bands.pivot_table(index="product", columns="band", values="lii",
+                                  aggfunc="sum", observed=False).reindex(PRODUCT_BUCKETS)
+    band_sums = band_sums.reindex(columns=_BANDS).fillna(0.0)
+    for i, (pb, vals) in enumerate(zip(PRODUCT_BUCKETS, band_sums.to_numpy().tolist())):
+        write_row(ws, i + 1, 1, [pb] + vals)
 
     # ── Rows 41-42: Donut split ──────────────────────────────────────────
     wmlc_sum = float(credit_lii[wmlc_mask].sum())
@@ -521,41 +662,17 @@ def build_chart_data_sheet(wb, df, pivots):
     ws.cell(row=42, column=2, value=non_wmlc_sum)
 
     # ── Rows 45-56: Flag breakdown by type ───────────────────────────────
-    flag_col = "WMLC_FLAGS"
-    flag_counts = {}
-    flag_sums = {}
-    for _, row in df.iterrows():
-        flags_str = row.get(flag_col, "")
-        if not flags_str or str(flags_str).lower() == "nan":
-            continue
-        lii_val = float(row.get("CREDIT_LII", 0))
-        for f in str(flags_str).split("|"):
-            f = f.strip()
-            if f:
-                flag_counts[f] = flag_counts.get(f, 0) + 1
-                flag_sums[f] = flag_sums.get(f, 0) + lii_val
-
-    sorted_flags = sorted(flag_counts.keys(), key=lambda x: flag_counts[x], reverse=True)
-    for i, flag_name in enumerate(sorted_flags[:12]):
-        row_num = 45 + i
-        ws.cell(row=row_num, column=1, value=flag_name)
-        ws.cell(row=row_num, column=2, value=flag_counts[flag_name])
-        ws.cell(row=row_num, column=3, value=flag_sums.get(flag_name, 0))
+    exploded = _explode_flags(df)
+    breakdown = exploded.groupby("flag", sort=False)["lii"].agg(["count", "sum"])
+    breakdown = breakdown.sort_values("count", ascending=False, kind="stable")
+    for i, (flag_name, count, total) in enumerate(breakdown.head(12).itertuples()):
+        write_row(ws, 45 + i, 1, [flag_name, int(count), float(total)])
 
     # ── Rows 58-70: Threshold proximity counts ───────────────────────────
-    for i, pb in enumerate(PRODUCT_BUCKETS):
-        thresh = WMLC_THRESHOLDS_DOLLARS.get(pb, 999_999_999_999)
-        mask = df["PRODUCT_BUCKET"] == pb
-        lii = credit_lii[mask]
-        n_below = int((lii < thresh * 0.8).sum())
-        n_approach = int(((lii >= thresh * 0.8) & (lii < thresh)).sum())
-        n_above = int((lii >= thresh).sum())
-
-        row_num = 58 + i
-        ws.cell(row=row_num, column=1, value=pb)
-        ws.cell(row=row_num, column=2, value=n_below)
-        ws.cell(row=row_num, column=3, value=n_approach)
-        ws.cell(row=row_num, column=4, value=n_above)
+    band_counts = pd.crosstab(bands["product"], bands["band"]).reindex(
+        index=PRODUCT_BUCKETS, columns=_BANDS).fillna(0).astype("int64")
+    for i, (pb, vals) in enumerate(zip(PRODUCT_BUCKETS, band_counts.to_numpy().tolist())):
+        write_row(ws, 58 + i, 1, [pb] + vals)
 
     ws.sheet_state = "hidden"
     return ws
@@ -681,26 +798,19 @@ def build_dashboard_visuals(ws_dash, wb, df):
     ws_dash.row_dimensions[53].height = 22
 
     # Pre-populate from proxy data — loans between 70% and 300% of threshold
-    credit_lii = df["CREDIT_LII"]
-    candidates = []
-    for _, row in df.iterrows():
-        pb = row.get("PRODUCT_BUCKET", "")
-        thresh = WMLC_THRESHOLDS_DOLLARS.get(pb)
-        if thresh is None or thresh == 0:
-            continue
-        lii = float(row.get("CREDIT_LII", 0))
-        pct = lii / thresh
-        if 0.7 <= pct <= 3.0:
-            candidates.append({
-                "borrower": row.get("BORROWER", ""),
-                "product": pb,
-                "lii": lii,
-                "thresh": thresh,
-                "pct": pct,
-            })
+    near = pd.DataFrame({
+        "borrower": df["BORROWER"],
+        "product": df["PRODUCT_BUCKET"],
+        "lii": df["CREDIT_LII"].astype(float),
+        "thresh": df["PRODUCT_BUCKET"].map(WMLC_THRESHOLDS_DOLLARS),
+    })
+    near = near[near["thresh"] > 0]
+    near["pct"] = near["lii"] / near["thresh"]
+    near = near[near["pct"].between(0.7, 3.0)]
     # Sort by distance from 100% (closest to boundary first)
-    candidates.sort(key=lambda x: abs(x["pct"] - 1.0))
-    candidates = candidates[:30]
+    order = np.argsort(np.abs(near["pct"].to_numpy() - 1.0), kind="stable")[:30]
+    near = near.iloc[order].astype({"thresh": "int64"})
+    candidates = near.to_dict("records")
 
     AMBER = PatternFill("solid", fgColor="D4A017")
     LIGHT_AMBER = PatternFill("solid", fgColor="FFF3CD")
@@ -767,26 +877,15 @@ def build_dashboard_visuals(ws_dash, wb, df):
 
     # Pre-populate heatmap from proxy data
     # Collect unique flags
-    flag_set = set()
-    for flags_str in df["WMLC_FLAGS"].dropna():
-        if flags_str and str(flags_str).lower() != "nan":
-            for f in str(flags_str).split("|"):
-                f = f.strip()
-                if f:
-                    flag_set.add(f)
-    flag_list = sorted(flag_set)[:16]
+    exploded = _explode_flags(df)
+    flag_list = sorted(exploded["flag"].unique())[:16]
     num_flags = len(flag_list)
-    flag_idx = {f: i for i, f in enumerate(flag_list)}
 
-    # Build co-occurrence matrix
-    overlap = [[0] * num_flags for _ in range(num_flags)]
-    for flags_str in df["WMLC_FLAGS"].dropna():
-        if not flags_str or str(flags_str).lower() == "nan":
-            continue
-        row_flags = [f.strip() for f in str(flags_str).split("|") if f.strip() in flag_idx]
-        for fi in row_flags:
-            for fj in row_flags:
-                overlap[flag_idx[fi]][flag_idx[fj]] += 1
+    # Build co-occurrence matrix: loan x flag counts, then X'X
+    exploded = exploded[exploded["flag"].isin(flag_list)]
+    indicator = pd.crosstab(exploded.index, exploded["flag"]).reindex(
+        columns=flag_list, fill_value=0).to_numpy(dtype="int64")
+    overlap = (indicator.T @ indicator).tolist()
 
     max_val = max((overlap[i][j] for i in range(num_flags) for j in range(num_flags)), default=1)
     if max_val == 0:
@@ -1158,22 +1257,13 @@ def main():
     # Masks
     mask_new = df["NEW_CAMP_YN"] == "Y"
     mask_wmlc = df["WMLC_QUALIFIED"]
-    mask_new_wmlc = mask_new & mask_wmlc
 
     # Compute 8 pivots
     print("Computing 8 view pivots ...")
-    pivots = {
-        1: compute_pivot(df, "count"),
-        2: compute_pivot(df, "sum"),
-        3: compute_pivot(df, "count", mask_new),
-        4: compute_pivot(df, "sum",   mask_new),
-        5: compute_pivot(df, "count", mask_wmlc),
-        6: compute_pivot(df, "sum",   mask_wmlc),
-        7: compute_pivot(df, "count", mask_new_wmlc),
-        8: compute_pivot(df, "sum",   mask_new_wmlc),
-    }
+    pivots = compute_view_pivots(df, mask_new, mask_wmlc)
 
     wb = Workbook()
+    register_named_styles(wb)
 
     # == "Loan Detail" sheet — BLANK landing zone for Power Query ===========
     # Power Query loads data here. No pre-populated data, no Table object.
@@ -1255,15 +1345,10 @@ def main():
         cell_b.fill = row_fill
 
         # Cols C-O -- data
-        row_total = 0
-        for ci, val in enumerate(initial_matrix[ri]):
-            cell = ws_dash.cell(row=row_num, column=ci + 3, value=val)
-            cell.number_format = '$#,##0;-$#,##0;"-"'
-            cell.font = DATA_FONT
-            cell.border = THIN_GRAY_BORDER
-            cell.alignment = Alignment(horizontal="right")
-            cell.fill = row_fill
-            row_total += val
+        write_row(ws_dash, row_num, 3, initial_matrix[ri],
+                  style=STYLE_DATA_ALT if is_alt else STYLE_DATA,
+                  number_format='$#,##0;-$#,##0;"-"')
+        row_total = sum(initial_matrix[ri])
 
         # Col P -- total
         cell_p = ws_dash.cell(row=row_num, column=16, value=row_total)
@@ -1341,10 +1426,7 @@ def main():
     print("Building 8 hidden view sheets ...")
     for view_num in range(1, 9):
         ws_v = wb.create_sheet(f"_view{view_num}")
-        matrix = pivots[view_num]
-        for ri, row_vals in enumerate(matrix):
-            for ci, val in enumerate(row_vals):
-                ws_v.cell(row=ri + 1, column=ci + 1, value=val)
+        append_rows(ws_v, pivots[view_num])
         ws_v.sheet_state = "hidden"
 
     # == loan_detail removed — "Loan Detail" sheet IS the data sheet now ======
@@ -6,11 +6,17 @@ Produces:
   proxy_data/LAL_Credit.xlsx        (80+ data rows, 3 skip rows)
   proxy_data/Loan_Reserve_Report.xlsx (100+ data rows, 6 skip rows)
   proxy_data/DAR_Tracker.xlsx       (60+ data rows, no skip rows)
+
+Stress-test mode (loan_extract only, streamed in chunks):
+  python scripts/generate_proxy_data.py --bulk-rows 5000000 --out proxy_data/big.csv
 """
 
 import os
+import sys
+import time
 import random
 import string
+import argparse
 import datetime
 import pandas as pd
 import numpy as np
@@ -247,27 +253,30 @@ def rand_credit_lii():
     return max(1.0, round(val, 2))
 
 
-def collateral_for_bucket(bucket: str) -> str:
+def collateral_pool(bucket: str) -> list[str]:
     if bucket == "TL Aircraft":
-        return random.choice(COLLATERAL_AIRCRAFT + COLLATERAL_GENERIC[:3])
+        return COLLATERAL_AIRCRAFT + COLLATERAL_GENERIC[:3]
     if bucket == "TL PHA":
-        return random.choice(COLLATERAL_PRIVATE + COLLATERAL_GENERIC[:3])
+        return COLLATERAL_PRIVATE + COLLATERAL_GENERIC[:3]
     if bucket == "TL Unsecured":
-        return random.choice(COLLATERAL_UNSECURED + COLLATERAL_GENERIC[:2])
+        return COLLATERAL_UNSECURED + COLLATERAL_GENERIC[:2]
     if bucket == "TL Other Secured":
-        return random.choice(COLLATERAL_OTHER + COLLATERAL_GENERIC[:2])
+        return COLLATERAL_OTHER + COLLATERAL_GENERIC[:2]
     if bucket == "TL Life Insurance":
-        return random.choice(["Life Insurance Policy", "Whole Life Insurance",
-                              "Universal Life Insurance Policy"])
+        return ["Life Insurance Policy", "Whole Life Insurance",
+                "Universal Life Insurance Policy"]
     if bucket == "TL Multicollateral":
-        pool = (COLLATERAL_GENERIC + COLLATERAL_HEDGE[:1] +
+        return (COLLATERAL_GENERIC + COLLATERAL_HEDGE[:1] +
                 COLLATERAL_PRIVATE[:1] + COLLATERAL_OTHER[:1])
-        return random.choice(pool)
     if bucket == "TL CRE":
-        return random.choice(["Commercial Real Estate", "Real Estate Holdings",
-                              "CRE Portfolio - Office/Retail",
-                              "CRE Multi-Tenant Property"])
-    return random.choice(COLLATERAL_GENERIC)
+        return ["Commercial Real Estate", "Real Estate Holdings",
+                "CRE Portfolio - Office/Retail",
+                "CRE Multi-Tenant Property"]
+    return COLLATERAL_GENERIC
+
+
+def collateral_for_bucket(bucket: str) -> str:
+    return random.choice(collateral_pool(bucket))
 
 
 # ---------------------------------------------------------------------------
@@ -326,6 +335,151 @@ def generate_bulk_rows(n: int) -> list[dict]:
     return rows
 
 
+# ---------------------------------------------------------------------------
+# Vectorized bulk generation — stress-test extracts (1M-10M rows)
+# ---------------------------------------------------------------------------
+# Same distributions as generate_bulk_rows, but every column is drawn in one
+# call from a numpy Generator so millions of rows take seconds, not hours.
+_LADDER_FLOORS_ASC = np.array([f for f, _, _ in reversed(BUCKET_LADDER)], dtype="float64")
+_LADDER_LABELS_ASC = np.array([lbl for _, lbl, _ in reversed(BUCKET_LADDER)], dtype=object)
+_LADDER_INTS_ASC = np.array([i for _, _, i in reversed(BUCKET_LADDER)], dtype="int64")
+
+
+def assign_bucket_array(credit_lii: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized assign_bucket: (labels, floors) for an array of exposures."""
+    idx = np.searchsorted(_LADDER_FLOORS_ASC, credit_lii, side="right") - 1
+    idx = np.clip(idx, 0, len(_LADDER_FLOORS_ASC) - 1)
+    return _LADDER_LABELS_ASC[idx], _LADDER_INTS_ASC[idx]
+
+
+def _rand_keys_12(rng, n: int) -> pd.Series:
+    return pd.Series(rng.integers(1, 1_000_000_000_000, size=n)).astype(str).str.zfill(12)
+
+
+def _acct_to_key_series(accts: pd.Series) -> pd.Series:
+    """Vectorized acct_to_key: 12-digit acct -> ###-######."""
+    padded = accts.str.lstrip("0").replace("", "0").str.zfill(9)
+    return padded.str.slice(0, 3) + "-" + padded.str.slice(3, 9)
+
+
+def _rand_dates(rng, n: int, start_year=2018, end_year=2025) -> np.ndarray:
+    start = np.datetime64(f"{start_year}-01-01")
+    days = (np.datetime64(f"{end_year}-12-31") - start).astype(int)
+    return start + rng.integers(0, days + 1, size=n).astype("timedelta64[D]")
+
+
+def _rand_names(rng, n: int) -> pd.Series:
+    first = pd.Series(np.asarray(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), n)])
+    last = pd.Series(np.asarray(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), n)])
+    return first + " " + last
+
+
+def _choose_by_mask(rng, size: int, flags: np.ndarray, choices: list[str]) -> np.ndarray:
+    """Pick from choices where flags is True, '' elsewhere."""
+    out = np.full(size, "", dtype=object)
+    out[flags] = np.asarray(choices, dtype=object)[rng.integers(0, len(choices), flags.sum())]
+    return out
+
+
+def generate_bulk_frame(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Column-wise equivalent of generate_bulk_rows(n), returned as a DataFrame."""
+    bucket_list = list(BUCKET_WEIGHTS.keys())
+    bucket_probs = np.array([BUCKET_WEIGHTS[b] for b in bucket_list])
+    bucket_probs = bucket_probs / bucket_probs.sum()
+
+    acct = _rand_keys_12(rng, n)
+    facility = _rand_keys_12(rng, n)
+    bucket = np.asarray(bucket_list, dtype=object)[rng.choice(len(bucket_list), size=n, p=bucket_probs)]
+    credit_lii = np.maximum(1.0, np.round(rng.lognormal(mean=16.5, sigma=1.5, size=n), 2))
+    bucket_label, bucket_floor = assign_bucket_array(credit_lii)
+    is_new = rng.random(n) < 0.40
+    is_non_pass = rng.random(n) < 0.05
+    is_sbl = pd.Series(bucket).str.contains("SBL").to_numpy()
+
+    collateral = np.empty(n, dtype=object)
+    for b in bucket_list:
+        mask = bucket == b
+        pool = np.asarray(collateral_pool(b), dtype=object)
+        collateral[mask] = pool[rng.integers(0, len(pool), mask.sum())]
+
+    new_reason = _choose_by_mask(rng, n, is_new, ["New", "Increase Facility"])
+    return pd.DataFrame({
+        "tl_facility_digits12": facility,
+        "facility_id": facility,
+        "account_number": acct,
+        "key_acct": _acct_to_key_series(acct),
+        "borrower": _rand_names(rng, n),
+        "name": _rand_names(rng, n),
+        "sub_product_norm": np.asarray(SUB_PRODUCTS, dtype=object)[rng.integers(0, len(SUB_PRODUCTS), n)],
+        "product_bucket": bucket,
+        "is_lal_nfp": (bucket == "LAL NFPs") & (rng.random(n) < 0.6),
+        "focus_list": np.where(is_non_pass, "Non-Pass", ""),
+        "txt_mstr_facil_collateral_desc": collateral,
+        "SBL_PERC": np.where(is_sbl, np.round(rng.uniform(0, 100, n), 2), 0.0),
+        "book_date": _rand_dates(rng, n),
+        "effective_date": _rand_dates(rng, n),
+        "origination_date": _rand_dates(rng, n, 2015, 2024),
+        "balance": np.round(credit_lii * rng.uniform(0.2, 0.95, n), 2),
+        "credit_limit": np.round(credit_lii * rng.uniform(1.0, 1.3, n), 2),
+        "amt_original_comt": np.round(credit_lii * rng.uniform(0.8, 1.2, n), 2),
+        "credit_lii": credit_lii,
+        "NEW_CAMP_YN": np.where(is_new, "Y", "N"),
+        "NEW_CAMP_REASON": new_reason,
+        "base_commit": np.round(credit_lii * rng.uniform(0.7, 1.0, n), 2),
+        "latest_commit": credit_lii,
+        "commit_delta": np.round(credit_lii * rng.uniform(-0.1, 0.3, n), 2),
+        "new_commitment_amount": np.where(is_new, credit_lii, 0.0),
+        "new_commitment_reason": _choose_by_mask(rng, n, is_new, ["New", "Increase Facility"]),
+        "credit_lii_commitment_bucket": bucket_label,
+        "credit_lii_commitment_floor": bucket_floor,
+    })
+
+
+def write_bulk_extract(path: str, n_rows: int, chunk_rows: int = 500_000,
+                       seed: int = 42, include_seeded: bool = True) -> int:
+    """Stream an n_rows loan_extract to CSV or Parquet in chunk_rows pieces.
+
+    Only one chunk is held in memory at a time. The format follows the file
+    extension (.parquet needs pyarrow). When include_seeded is set, the
+    flag-coverage rows from generate_seeded_rows are prepended so every WMLC
+    flag fires at least once.
+
+    Returns:
+        Number of rows written.
+    """
+    rng = np.random.default_rng(seed)
+    as_parquet = path.lower().endswith(".parquet")
+    writer = None
+    if as_parquet:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+    written = 0
+    seeded_df = pd.DataFrame(generate_seeded_rows()[0]) if include_seeded else None
+    try:
+        while written < n_rows:
+            chunk = generate_bulk_frame(min(chunk_rows, n_rows - written), rng)
+            if seeded_df is not None:
+                for col in ("book_date", "effective_date", "origination_date"):
+                    seeded_df[col] = pd.to_datetime(seeded_df[col])
+                chunk = pd.concat([seeded_df, chunk], ignore_index=True).head(n_rows)
+                seeded_df = None
+            if as_parquet:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(path, mode="w" if written == 0 else "a",
+                             header=written == 0, index=False)
+            written += len(chunk)
+            print(f"  {written:,} / {n_rows:,} rows")
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
 # ---------------------------------------------------------------------------
 # Seeded rows — 3+ per flag to guarantee coverage
 # ---------------------------------------------------------------------------
@@ -517,277 +671,308 @@ def generate_seeded_rows() -> list[dict]:
 
 
 # ---------------------------------------------------------------------------
-# Build main loan_extract
+# Proxy input set
 # ---------------------------------------------------------------------------
-print("Generating bulk rows ...")
-bulk = generate_bulk_rows(N_BULK)
-print("Generating seeded rows ...")
-seeded, flag4_rows, flag1_tl_rows, flag1_lal_credit_rows = generate_seeded_rows()
-
-all_rows = bulk + seeded
-df = pd.DataFrame(all_rows)
-
-# Ensure bucket consistency
-for idx, row in df.iterrows():
-    lbl, flr = assign_bucket(row["credit_lii"])
-    df.at[idx, "credit_lii_commitment_bucket"] = lbl
-    df.at[idx, "credit_lii_commitment_floor"] = flr
-
-print(f"Total loan_extract rows: {len(df)}")
-print(f"\nProduct bucket distribution:\n{df['product_bucket'].value_counts().to_string()}")
-print(f"\nCredit LII range: ${df['credit_lii'].min():,.0f} — ${df['credit_lii'].max():,.0f}")
-print(f"NEW_CAMP_YN='Y': {(df['NEW_CAMP_YN']=='Y').sum()} ({(df['NEW_CAMP_YN']=='Y').mean()*100:.1f}%)")
-print(f"Non-Pass: {(df['focus_list']=='Non-Pass').sum()}")
-print(f"is_lal_nfp=True: {df['is_lal_nfp'].sum()}")
-
-csv_path = os.path.join(OUT_DIR, "loan_extract.csv")
-df.to_csv(csv_path, index=False)
-print(f"\nWrote {csv_path}")
-
+def generate_proxy_set() -> None:
+    """Write the four linked proxy input files to ``OUT_DIR`` and print a summary."""
+    # -----------------------------------------------------------------------
+    # Build main loan_extract
+    # -----------------------------------------------------------------------
+    print("Generating bulk rows ...")
+    bulk = generate_bulk_rows(N_BULK)
+    print("Generating seeded rows ...")
+    seeded, flag4_rows, flag1_tl_rows, flag1_lal_credit_rows = generate_seeded_rows()
+
+    all_rows = bulk + seeded
+    df = pd.DataFrame(all_rows)
+
+    # Ensure bucket consistency
+    for idx, row in df.iterrows():
+        lbl, flr = assign_bucket(row["credit_lii"])
+        df.at[idx, "credit_lii_commitment_bucket"] = lbl
+        df.at[idx, "credit_lii_commitment_floor"] = flr
+
+    print(f"Total loan_extract rows: {len(df)}")
+    print(f"\nProduct bucket distribution:\n{df['product_bucket'].value_counts().to_string()}")
+    print(f"\nCredit LII range: ${df['credit_lii'].min():,.0f} — ${df['credit_lii'].max():,.0f}")
+    print(f"NEW_CAMP_YN='Y': {(df['NEW_CAMP_YN']=='Y').sum()} ({(df['NEW_CAMP_YN']=='Y').mean()*100:.1f}%)")
+    print(f"Non-Pass: {(df['focus_list']=='Non-Pass').sum()}")
+    print(f"is_lal_nfp=True: {df['is_lal_nfp'].sum()}")
+
+    csv_path = os.path.join(OUT_DIR, "loan_extract.csv")
+    df.to_csv(csv_path, index=False)
+    print(f"\nWrote {csv_path}")
+
+
+    # -----------------------------------------------------------------------
+    # LAL_Credit.xlsx — 80+ data rows, 3 skip rows
+    # -----------------------------------------------------------------------
+    print("\nGenerating LAL_Credit.xlsx ...")
+
+    # Gather LAL account numbers from loan_extract for linking
+    lal_accts = df[df["product_bucket"].isin(LAL_BUCKETS)]["account_number"].unique().tolist()
+    random.shuffle(lal_accts)
+
+    lal_rows = []
+
+    # Include seeded NTC-qualifying rows (Operating Company / Charity)
+    for r in flag1_lal_credit_rows:
+        lal_rows.append({
+            "Account Number": acct_to_key(r["account_number"]),
+            "Operating Company": "Yes",
+            "Charity/Non-Profit Organization": "No",
+            "Bank Level Limit/Guideline Exception": random.choice(["Yes", "No"]),
+            "Credit Report RAC Exception": "No",
+            "Firm Level Limit/Guideline Exception": "No",
+            "Significant Credit Standard Exception": "No",
+        })
 
-# ---------------------------------------------------------------------------
-# LAL_Credit.xlsx — 80+ data rows, 3 skip rows
-# ---------------------------------------------------------------------------
-print("\nGenerating LAL_Credit.xlsx ...")
-
-# Gather LAL account numbers from loan_extract for linking
-lal_accts = df[df["product_bucket"].isin(LAL_BUCKETS)]["account_number"].unique().tolist()
-random.shuffle(lal_accts)
-
-lal_rows = []
-
-# Include seeded NTC-qualifying rows (Operating Company / Charity)
-for r in flag1_lal_credit_rows:
-    lal_rows.append({
-        "Account Number": acct_to_key(r["account_number"]),
-        "Operating Company": "Yes",
-        "Charity/Non-Profit Organization": "No",
-        "Bank Level Limit/Guideline Exception": random.choice(["Yes", "No"]),
-        "Credit Report RAC Exception": "No",
-        "Firm Level Limit/Guideline Exception": "No",
-        "Significant Credit Standard Exception": "No",
-    })
+    # NFP accounts
+    nfp_accts = df[(df["product_bucket"] == "LAL NFPs") & (df["is_lal_nfp"] == True)][
+        "account_number"
+    ].unique().tolist()
+    for acct in nfp_accts[:5]:
+        lal_rows.append({
+            "Account Number": acct_to_key(acct),
+            "Operating Company": "No",
+            "Charity/Non-Profit Organization": "Yes",
+            "Bank Level Limit/Guideline Exception": "No",
+            "Credit Report RAC Exception": "No",
+            "Firm Level Limit/Guideline Exception": "No",
+            "Significant Credit Standard Exception": "No",
+        })
 
-# NFP accounts
-nfp_accts = df[(df["product_bucket"] == "LAL NFPs") & (df["is_lal_nfp"] == True)][
-    "account_number"
-].unique().tolist()
-for acct in nfp_accts[:5]:
-    lal_rows.append({
-        "Account Number": acct_to_key(acct),
-        "Operating Company": "No",
-        "Charity/Non-Profit Organization": "Yes",
-        "Bank Level Limit/Guideline Exception": "No",
-        "Credit Report RAC Exception": "No",
-        "Firm Level Limit/Guideline Exception": "No",
-        "Significant Credit Standard Exception": "No",
-    })
+    # Fill to 85+ with other LAL accounts (with some exceptions)
+    used = {r["Account Number"] for r in lal_rows}
+    for acct in lal_accts:
+        if len(lal_rows) >= 90:
+            break
+        key = acct_to_key(acct)
+        if key in used:
+            continue
+        used.add(key)
+        has_exc = random.random() < 0.15
+        lal_rows.append({
+            "Account Number": key,
+            "Operating Company": "No",
+            "Charity/Non-Profit Organization": "No",
+            "Bank Level Limit/Guideline Exception": "Yes" if has_exc else "No",
+            "Credit Report RAC Exception": "Yes" if (has_exc and random.random() < 0.5) else "No",
+            "Firm Level Limit/Guideline Exception": "Yes" if random.random() < 0.05 else "No",
+            "Significant Credit Standard Exception": "Yes" if random.random() < 0.05 else "No",
+        })
 
-# Fill to 85+ with other LAL accounts (with some exceptions)
-used = {r["Account Number"] for r in lal_rows}
-for acct in lal_accts:
-    if len(lal_rows) >= 90:
-        break
-    key = acct_to_key(acct)
-    if key in used:
-        continue
-    used.add(key)
-    has_exc = random.random() < 0.15
-    lal_rows.append({
-        "Account Number": key,
-        "Operating Company": "No",
-        "Charity/Non-Profit Organization": "No",
-        "Bank Level Limit/Guideline Exception": "Yes" if has_exc else "No",
-        "Credit Report RAC Exception": "Yes" if (has_exc and random.random() < 0.5) else "No",
-        "Firm Level Limit/Guideline Exception": "Yes" if random.random() < 0.05 else "No",
-        "Significant Credit Standard Exception": "Yes" if random.random() < 0.05 else "No",
-    })
+    lal_df = pd.DataFrame(lal_rows)
+    print(f"LAL_Credit data rows: {len(lal_df)}")
+
+    # Write with 3 skip rows
+    lal_path = os.path.join(OUT_DIR, "LAL_Credit.xlsx")
+    with pd.ExcelWriter(lal_path, engine="openpyxl") as writer:
+        # Write filler rows first
+        filler = pd.DataFrame([
+            ["LAL Credit Exception Report - Confidential"],
+            [""],
+            [f"Generated: {datetime.date.today().isoformat()}"],
+        ])
+        filler.to_excel(writer, sheet_name="Sheet1", index=False, header=False, startrow=0)
+        # Write data starting at row 3 (0-indexed), which is row 4 in Excel
+        lal_df.to_excel(writer, sheet_name="Sheet1", index=False, startrow=3)
+    print(f"Wrote {lal_path}")
+
+
+    # -----------------------------------------------------------------------
+    # Loan_Reserve_Report.xlsx — 100+ data rows, 6 skip rows
+    # -----------------------------------------------------------------------
+    print("\nGenerating Loan_Reserve_Report.xlsx ...")
+
+    tl_accts = df[df["product_bucket"].isin(TL_BUCKETS)]["account_number"].unique().tolist()
+    random.shuffle(tl_accts)
+
+    lrr_rows = []
+
+    # Seeded NTC-qualifying TL rows (Corp + entity type)
+    for r in flag1_tl_rows:
+        lrr_rows.append({
+            "Facility Account Number": r["account_number"],
+            "Purpose Code Description": "Corp General Purpose",
+            "Account Relationship Code Description": random.choice(NTC_ENTITY_TYPES),
+        })
 
-lal_df = pd.DataFrame(lal_rows)
-print(f"LAL_Credit data rows: {len(lal_df)}")
+    # Fill to 110+
+    used_lrr = {r["Facility Account Number"] for r in lrr_rows}
+    for acct in tl_accts:
+        if len(lrr_rows) >= 115:
+            break
+        if acct in used_lrr:
+            continue
+        used_lrr.add(acct)
+        is_corp = random.random() < 0.25
+        lrr_rows.append({
+            "Facility Account Number": acct,
+            "Purpose Code Description": "Corp General Purpose" if is_corp else random.choice([
+                "Personal Investment", "Real Estate Purchase", "Business Expansion",
+                "Working Capital", "Equipment Purchase",
+            ]),
+            "Account Relationship Code Description": random.choice(
+                NTC_ENTITY_TYPES if is_corp else [
+                    "Individual", "Joint Account", "Trust (Revocable)",
+                    "Trust (Irrevocable)", "Estate",
+                ]
+            ),
+        })
 
-# Write with 3 skip rows
-lal_path = os.path.join(OUT_DIR, "LAL_Credit.xlsx")
-with pd.ExcelWriter(lal_path, engine="openpyxl") as writer:
-    # Write filler rows first
-    filler = pd.DataFrame([
-        ["LAL Credit Exception Report - Confidential"],
-        [""],
-        [f"Generated: {datetime.date.today().isoformat()}"],
-    ])
-    filler.to_excel(writer, sheet_name="Sheet1", index=False, header=False, startrow=0)
-    # Write data starting at row 3 (0-indexed), which is row 4 in Excel
-    lal_df.to_excel(writer, sheet_name="Sheet1", index=False, startrow=3)
-print(f"Wrote {lal_path}")
+    lrr_df = pd.DataFrame(lrr_rows)
+    print(f"Loan_Reserve_Report data rows: {len(lrr_df)}")
+
+    lrr_path = os.path.join(OUT_DIR, "Loan_Reserve_Report.xlsx")
+    with pd.ExcelWriter(lrr_path, engine="openpyxl") as writer:
+        filler = pd.DataFrame([
+            ["Loan Reserve Report - Internal Use Only"],
+            ["Risk Management Division"],
+            [""],
+            [f"Report Date: {datetime.date.today().isoformat()}"],
+            [""],
+            ["--- End Header ---"],
+        ])
+        filler.to_excel(writer, sheet_name="Sheet1", index=False, header=False, startrow=0)
+        lrr_df.to_excel(writer, sheet_name="Sheet1", index=False, startrow=6)
+    print(f"Wrote {lrr_path}")
+
+
+    # -----------------------------------------------------------------------
+    # DAR_Tracker.xlsx — 60+ data rows, no skip rows
+    # -----------------------------------------------------------------------
+    print("\nGenerating DAR_Tracker.xlsx ...")
+
+    cre_facilities = df[df["product_bucket"] == "TL CRE"]["facility_id"].unique().tolist()
+    random.shuffle(cre_facilities)
+
+    dar_rows = []
+
+    # Seeded Office rows for Flag 4
+    for r in flag4_rows:
+        dar_rows.append({
+            "Facility ID": r["facility_id"],
+            "Property_Type": random.choice(["Office", "OFFICE"]),
+            "Property_Name": f"{random.choice(LAST_NAMES)} Tower",
+            "Address": f"{random.randint(100, 9999)} {random.choice(LAST_NAMES)} Ave, New York, NY",
+        })
 
+    # Fill with CRE facilities first, then synthetic ones to reach 65+
+    used_dar = {r["Facility ID"] for r in dar_rows}
+    for fac in cre_facilities:
+        if len(dar_rows) >= 75:
+            break
+        if fac in used_dar:
+            continue
+        used_dar.add(fac)
+        dar_rows.append({
+            "Facility ID": fac,
+            "Property_Type": random.choice(PROPERTY_TYPES),
+            "Property_Name": f"{random.choice(LAST_NAMES)} {random.choice(['Plaza', 'Center', 'Park', 'Building', 'Complex'])}",
+            "Address": f"{random.randint(100, 9999)} {random.choice(LAST_NAMES)} St, {random.choice(['New York, NY', 'Chicago, IL', 'Los Angeles, CA', 'Dallas, TX', 'Miami, FL'])}",
+        })
+    # If still under 65, add synthetic facility IDs (won't link but fill the file)
+    while len(dar_rows) < 65:
+        fac = rand_acct_12()
+        if fac in used_dar:
+            continue
+        used_dar.add(fac)
+        dar_rows.append({
+            "Facility ID": fac,
+            "Property_Type": random.choice(PROPERTY_TYPES),
+            "Property_Name": f"{random.choice(LAST_NAMES)} {random.choice(['Tower', 'Campus', 'Square', 'Mall', 'Depot'])}",
+            "Address": f"{random.randint(100, 9999)} {random.choice(LAST_NAMES)} Blvd, {random.choice(['Boston, MA', 'Houston, TX', 'Seattle, WA', 'Denver, CO', 'Atlanta, GA'])}",
+        })
 
-# ---------------------------------------------------------------------------
-# Loan_Reserve_Report.xlsx — 100+ data rows, 6 skip rows
-# ---------------------------------------------------------------------------
-print("\nGenerating Loan_Reserve_Report.xlsx ...")
+    dar_df = pd.DataFrame(dar_rows)
+    print(f"DAR_Tracker data rows: {len(dar_df)}")
 
-tl_accts = df[df["product_bucket"].isin(TL_BUCKETS)]["account_number"].unique().tolist()
-random.shuffle(tl_accts)
+    dar_path = os.path.join(OUT_DIR, "DAR_Tracker.xlsx")
+    dar_df.to_excel(dar_path, index=False)
+    print(f"Wrote {dar_path}")
 
-lrr_rows = []
 
-# Seeded NTC-qualifying TL rows (Corp + entity type)
-for r in flag1_tl_rows:
-    lrr_rows.append({
-        "Facility Account Number": r["account_number"],
-        "Purpose Code Description": "Corp General Purpose",
-        "Account Relationship Code Description": random.choice(NTC_ENTITY_TYPES),
-    })
+    # -----------------------------------------------------------------------
+    # Summary validation
+    # -----------------------------------------------------------------------
+    print("\n" + "=" * 70)
+    print("VALIDATION SUMMARY")
+    print("=" * 70)
 
-# Fill to 110+
-used_lrr = {r["Facility Account Number"] for r in lrr_rows}
-for acct in tl_accts:
-    if len(lrr_rows) >= 115:
-        break
-    if acct in used_lrr:
-        continue
-    used_lrr.add(acct)
-    is_corp = random.random() < 0.25
-    lrr_rows.append({
-        "Facility Account Number": acct,
-        "Purpose Code Description": "Corp General Purpose" if is_corp else random.choice([
-            "Personal Investment", "Real Estate Purchase", "Business Expansion",
-            "Working Capital", "Equipment Purchase",
-        ]),
-        "Account Relationship Code Description": random.choice(
-            NTC_ENTITY_TYPES if is_corp else [
-                "Individual", "Joint Account", "Trust (Revocable)",
-                "Trust (Irrevocable)", "Estate",
-            ]
-        ),
-    })
+    files = {
+        "loan_extract.csv": (csv_path, 500),
+        "LAL_Credit.xlsx": (lal_path, 80),
+        "Loan_Reserve_Report.xlsx": (lrr_path, 100),
+        "DAR_Tracker.xlsx": (dar_path, 60),
+    }
 
-lrr_df = pd.DataFrame(lrr_rows)
-print(f"Loan_Reserve_Report data rows: {len(lrr_df)}")
+    for name, (path, min_rows) in files.items():
+        exists = os.path.exists(path)
+        if name.endswith(".csv"):
+            count = len(pd.read_csv(path))
+        else:
+            count = "N/A (skip-row file)"
+        print(f"  {name}: exists={exists}, rows={count}, min={min_rows}")
 
-lrr_path = os.path.join(OUT_DIR, "Loan_Reserve_Report.xlsx")
-with pd.ExcelWriter(lrr_path, engine="openpyxl") as writer:
-    filler = pd.DataFrame([
-        ["Loan Reserve Report - Internal Use Only"],
-        ["Risk Management Division"],
-        [""],
-        [f"Report Date: {datetime.date.today().isoformat()}"],
-        [""],
-        ["--- End Header ---"],
-    ])
-    filler.to_excel(writer, sheet_name="Sheet1", index=False, header=False, startrow=0)
-    lrr_df.to_excel(writer, sheet_name="Sheet1", index=False, startrow=6)
-print(f"Wrote {lrr_path}")
+    print(f"\nAll 13 product_buckets present: {len(df['product_bucket'].unique()) == 13}")
+    print(f"  Unique buckets: {sorted(df['product_bucket'].unique())}")
 
+    print(f"\ncredit_lii range: ${df['credit_lii'].min():,.0f} to ${df['credit_lii'].max():,.0f}")
+    for threshold in [10_000_000, 35_000_000, 50_000_000, 75_000_000, 100_000_000, 300_000_000]:
+        count = (df["credit_lii"] > threshold).sum()
+        print(f"  credit_lii > ${threshold:,.0f}: {count} rows")
 
-# ---------------------------------------------------------------------------
-# DAR_Tracker.xlsx — 60+ data rows, no skip rows
-# ---------------------------------------------------------------------------
-print("\nGenerating DAR_Tracker.xlsx ...")
+    print(f"\nNEW_CAMP_YN='Y': {(df['NEW_CAMP_YN']=='Y').sum()} / {len(df)} = "
+          f"{(df['NEW_CAMP_YN']=='Y').mean()*100:.1f}%")
+    print(f"Non-Pass: {(df['focus_list']=='Non-Pass').sum()}")
+    print(f"Non-Pass + NEW_CAMP_YN='Y': "
+          f"{((df['focus_list']=='Non-Pass') & (df['NEW_CAMP_YN']=='Y')).sum()}")
 
-cre_facilities = df[df["product_bucket"] == "TL CRE"]["facility_id"].unique().tolist()
-random.shuffle(cre_facilities)
+    # Check linking
+    lal_credit_accts = set(lal_df["Account Number"].values)
+    lrr_accts = set(lrr_df["Facility Account Number"].values)
+    dar_facs = set(dar_df["Facility ID"].values)
 
-dar_rows = []
+    base_lal_keys = set(df[df["product_bucket"].isin(LAL_BUCKETS)]["key_acct"].values)
+    base_tl_accts = set(df[df["product_bucket"].isin(TL_BUCKETS)]["account_number"].values)
+    base_cre_facs = set(df[df["product_bucket"] == "TL CRE"]["facility_id"].values)
 
-# Seeded Office rows for Flag 4
-for r in flag4_rows:
-    dar_rows.append({
-        "Facility ID": r["facility_id"],
-        "Property_Type": random.choice(["Office", "OFFICE"]),
-        "Property_Name": f"{random.choice(LAST_NAMES)} Tower",
-        "Address": f"{random.randint(100, 9999)} {random.choice(LAST_NAMES)} Ave, New York, NY",
-    })
+    lal_overlap = len(lal_credit_accts & base_lal_keys)
+    lrr_overlap = len(lrr_accts & base_tl_accts)
+    dar_overlap = len(dar_facs & base_cre_facs)
 
-# Fill with CRE facilities first, then synthetic ones to reach 65+
-used_dar = {r["Facility ID"] for r in dar_rows}
-for fac in cre_facilities:
-    if len(dar_rows) >= 75:
-        break
-    if fac in used_dar:
-        continue
-    used_dar.add(fac)
-    dar_rows.append({
-        "Facility ID": fac,
-        "Property_Type": random.choice(PROPERTY_TYPES),
-        "Property_Name": f"{random.choice(LAST_NAMES)} {random.choice(['Plaza', 'Center', 'Park', 'Building', 'Complex'])}",
-        "Address": f"{random.randint(100, 9999)} {random.choice(LAST_NAMES)} St, {random.choice(['New York, NY', 'Chicago, IL', 'Los Angeles, CA', 'Dallas, TX', 'Miami, FL'])}",
-    })
-# If still under 65, add synthetic facility IDs (won't link but fill the file)
-while len(dar_rows) < 65:
-    fac = rand_acct_12()
-    if fac in used_dar:
-        continue
-    used_dar.add(fac)
-    dar_rows.append({
-        "Facility ID": fac,
-        "Property_Type": random.choice(PROPERTY_TYPES),
-        "Property_Name": f"{random.choice(LAST_NAMES)} {random.choice(['Tower', 'Campus', 'Square', 'Mall', 'Depot'])}",
-        "Address": f"{random.randint(100, 9999)} {random.choice(LAST_NAMES)} Blvd, {random.choice(['Boston, MA', 'Houston, TX', 'Seattle, WA', 'Denver, CO', 'Atlanta, GA'])}",
-    })
+    print(f"\nExternal file linkage:")
+    print(f"  LAL_Credit accounts matching loan_extract LAL key_accts: {lal_overlap}")
+    print(f"  Loan_Reserve_Report accounts matching loan_extract TL accts: {lrr_overlap}")
+    print(f"  DAR_Tracker facilities matching loan_extract TL CRE facilities: {dar_overlap}")
 
-dar_df = pd.DataFrame(dar_rows)
-print(f"DAR_Tracker data rows: {len(dar_df)}")
+    print(f"\nDAR_Tracker Office rows: {(dar_df['Property_Type'].str.lower() == 'office').sum()}")
 
-dar_path = os.path.join(OUT_DIR, "DAR_Tracker.xlsx")
-dar_df.to_excel(dar_path, index=False)
-print(f"Wrote {dar_path}")
+    print("\n=== DATA GENERATION COMPLETE ===")
 
 
 # ---------------------------------------------------------------------------
-# Summary validation
+# CLI — default: proxy set; --bulk-rows N: only a large stress-test loan_extract
 # ---------------------------------------------------------------------------
-print("\n" + "=" * 70)
-print("VALIDATION SUMMARY")
-print("=" * 70)
-
-files = {
-    "loan_extract.csv": (csv_path, 500),
-    "LAL_Credit.xlsx": (lal_path, 80),
-    "Loan_Reserve_Report.xlsx": (lrr_path, 100),
-    "DAR_Tracker.xlsx": (dar_path, 60),
-}
-
-for name, (path, min_rows) in files.items():
-    exists = os.path.exists(path)
-    if name.endswith(".csv"):
-        count = len(pd.read_csv(path))
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate WMLC proxy input files")
+    parser.add_argument("--bulk-rows", type=int, default=0,
+                        help="write an N-row stress-test loan_extract instead of the proxy set")
+    parser.add_argument("--out", default=os.path.join(OUT_DIR, "loan_extract_bulk.csv"),
+                        help="output path for --bulk-rows (.csv or .parquet)")
+    parser.add_argument("--chunk-rows", type=int, default=500_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    if args.bulk_rows:
+        print(f"Generating {args.bulk_rows:,}-row stress extract -> {args.out}")
+        start = time.perf_counter()
+        write_bulk_extract(args.out, args.bulk_rows, args.chunk_rows, args.seed)
+        print(f"Done in {time.perf_counter() - start:.1f}s")
     else:
-        count = "N/A (skip-row file)"
-    print(f"  {name}: exists={exists}, rows={count}, min={min_rows}")
-
-print(f"\nAll 13 product_buckets present: {len(df['product_bucket'].unique()) == 13}")
-print(f"  Unique buckets: {sorted(df['product_bucket'].unique())}")
-
-print(f"\ncredit_lii range: ${df['credit_lii'].min():,.0f} to ${df['credit_lii'].max():,.0f}")
-for threshold in [10_000_000, 35_000_000, 50_000_000, 75_000_000, 100_000_000, 300_000_000]:
-    count = (df["credit_lii"] > threshold).sum()
-    print(f"  credit_lii > ${threshold:,.0f}: {count} rows")
-
-print(f"\nNEW_CAMP_YN='Y': {(df['NEW_CAMP_YN']=='Y').sum()} / {len(df)} = "
-      f"{(df['NEW_CAMP_YN']=='Y').mean()*100:.1f}%")
-print(f"Non-Pass: {(df['focus_list']=='Non-Pass').sum()}")
-print(f"Non-Pass + NEW_CAMP_YN='Y': "
-      f"{((df['focus_list']=='Non-Pass') & (df['NEW_CAMP_YN']=='Y')).sum()}")
-
-# Check linking
-lal_credit_accts = set(lal_df["Account Number"].values)
-lrr_accts = set(lrr_df["Facility Account Number"].values)
-dar_facs = set(dar_df["Facility ID"].values)
-
-base_lal_keys = set(df[df["product_bucket"].isin(LAL_BUCKETS)]["key_acct"].values)
-base_tl_accts = set(df[df["product_bucket"].isin(TL_BUCKETS)]["account_number"].values)
-base_cre_facs = set(df[df["product_bucket"] == "TL CRE"]["facility_id"].values)
-
-lal_overlap = len(lal_credit_accts & base_lal_keys)
-lrr_overlap = len(lrr_accts & base_tl_accts)
-dar_overlap = len(dar_facs & base_cre_facs)
-
-print(f"\nExternal file linkage:")
-print(f"  LAL_Credit accounts matching loan_extract LAL key_accts: {lal_overlap}")
-print(f"  Loan_Reserve_Report accounts matching loan_extract TL accts: {lrr_overlap}")
-print(f"  DAR_Tracker facilities matching loan_extract TL CRE facilities: {dar_overlap}")
+        generate_proxy_set()
+    return 0
 
-print(f"\nDAR_Tracker Office rows: {(dar_df['Property_Type'].str.lower() == 'office').sum()}")
 
-print("\n=== DATA GENERATION COMPLETE ===")
+if __name__ == "__main__":
+    sys.exit(main())
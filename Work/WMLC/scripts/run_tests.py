@@ -2,12 +2,25 @@
 """WMLC Pipeline Test Suite — Sub-Agent 4.
 
 Runs all automated validation tests and writes output/test_report.md.
+
+Usage:
+    python scripts/run_tests.py [--workers N] [--serial] [--changed-only]
+
+Setup tests (the ETL run) go first, serially; the rest are spread across
+worker processes. --changed-only runs only tests whose target files changed
+since the last all-green run, per the hash manifest in output/.
 """
 
 import os
 import sys
+import glob
+import json
+import time
+import hashlib
+import argparse
 import subprocess
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -26,30 +39,128 @@ os.chdir(ROOT)
 # Test infrastructure
 # ---------------------------------------------------------------------------
 
+MANIFEST_PATH = "output/.test_manifest.json"
+SLOWEST_N = 5
+
+
 class TestResult:
-    def __init__(self, name: str, passed: bool, details: str = ""):
+    def __init__(self, name: str, passed: bool, details: str = "",
+                 seconds: float = 0.0, skipped: bool = False):
         self.name = name
         self.passed = passed
         self.details = details
+        self.seconds = seconds
+        self.skipped = skipped
+
 
+class TestCase:
+    def __init__(self, name: str, fn, targets: list[str], setup: bool):
+        self.name = name
+        self.fn = fn
+        self.targets = targets
+        self.setup = setup
 
-results: list[TestResult] = []
 
+tests: list[TestCase] = []
+_section_targets: list[str] = []
 
-def run_test(name: str):
-    """Decorator that captures pass/fail into *results*."""
+
+def section(targets: list[str]):
+    """Set the files (globs) that tests registered below exercise."""
+    global _section_targets
+    _section_targets = targets
+
+
+def run_test(name: str, setup: bool = False):
+    """Decorator that registers a test; setup tests run first, serially."""
     def decorator(fn):
-        try:
-            detail = fn()
-            results.append(TestResult(name, True, detail or ""))
-        except Exception as exc:
-            results.append(TestResult(name, False, str(exc)))
+        tests.append(TestCase(name, fn, _section_targets, setup))
+        return fn
     return decorator
 
 
+def _execute(index: int) -> tuple:
+    """Run tests[index]; returns (index, passed, details, seconds)."""
+    start = time.perf_counter()
+    try:
+        detail = tests[index].fn()
+        passed, detail = True, detail or ""
+    except Exception as exc:
+        passed, detail = False, str(exc)
+    return index, passed, detail, time.perf_counter() - start
+
+
+def build_manifest(patterns: list[str]) -> dict:
+    """{"targets": pattern -> matched paths, "files": path -> sha256}."""
+    manifest = {"targets": {}, "files": {}}
+    for pattern in patterns:
+        paths = sorted(p.replace(os.sep, "/") for p in glob.glob(pattern, recursive=True)
+                       if os.path.isfile(p))
+        manifest["targets"][pattern] = paths
+        for path in paths:
+            if path not in manifest["files"]:
+                with open(path, "rb") as f:
+                    manifest["files"][path] = hashlib.sha256(f.read()).hexdigest()
+    return manifest
+
+
+def _changed(case: TestCase, previous: dict, current: dict) -> bool:
+    """True if any file matched by the test's targets was added, removed or edited."""
+    for pattern in case.targets:
+        before = previous["targets"].get(pattern)
+        after = current["targets"][pattern]
+        if before != after:
+            return True
+        if any(previous["files"].get(p) != current["files"][p] for p in after):
+            return True
+    return not case.targets
+
+
+def run_all(workers: int = 1, changed_only: bool = False) -> list[TestResult]:
+    """Run the registered tests and return results in registration order."""
+    current = build_manifest(sorted({t for case in tests for t in case.targets}))
+    previous = None
+    if changed_only and os.path.exists(MANIFEST_PATH):
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            previous = json.load(f)
+
+    out: list = [None] * len(tests)
+    selected = []
+    for i, case in enumerate(tests):
+        if previous is not None and not _changed(case, previous, current):
+            out[i] = TestResult(case.name, True, "Skipped — targets unchanged since last green run",
+                                skipped=True)
+        else:
+            selected.append(i)
+
+    setup = [i for i in selected if tests[i].setup]
+    rest = [i for i in selected if not tests[i].setup]
+    outcomes = [_execute(i) for i in setup]
+    if workers > 1 and len(rest) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes += list(pool.map(_execute, rest))
+    else:
+        outcomes += [_execute(i) for i in rest]
+    for i, passed, detail, seconds in outcomes:
+        out[i] = TestResult(tests[i].name, passed, detail, seconds)
+
+    if all(r.passed for r in out):
+        # Record the green state for the next --changed-only run
+        os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+        with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=1, sort_keys=True)
+    return out
+
+
+def slowest(results: list[TestResult], n: int = SLOWEST_N) -> list[TestResult]:
+    ran = [r for r in results if not r.skipped]
+    return sorted(ran, key=lambda r: r.seconds, reverse=True)[:n]
+
+
 # ===================================================================
 # 1. DATA GEN VALIDATION
 # ===================================================================
+section(["scripts/generate_proxy_data.py", "proxy_data/*"])
 
 @run_test("Proxy data files exist")
 def _():
@@ -158,8 +269,10 @@ def _():
 # ===================================================================
 # 2. ETL VALIDATION
 # ===================================================================
+section(["corp_etl/**/*.py", "corp_etl/config.yaml", "proxy_data/*"])
 
-@run_test("ETL runs with exit code 0")
+
+@run_test("ETL runs with exit code 0", setup=True)
 def _():
     result = subprocess.run(
         [sys.executable, "corp_etl/main.py"],
@@ -255,6 +368,9 @@ def _():
 # ===================================================================
 # 3. EXCEL STRUCTURAL VALIDATION
 # ===================================================================
+section(["scripts/build_dashboard.py", "scripts/build_tracker_analytics.py",
+         "templates/**/*", "output/WMLC_Dashboard.xls*", "output/VBA_REFERENCE.txt",
+         "output/loan_extract_tagged.csv"])
 
 def _excel_path():
     for ext in (".xlsm", ".xlsx"):
@@ -507,6 +623,8 @@ def write_report(results: list[TestResult], path: str):
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     passed = sum(1 for r in results if r.passed)
     failed = len(results) - passed
+    skipped = sum(1 for r in results if r.skipped)
+    slow = {id(r) for r in slowest(results)}
 
     lines = [
         "# WMLC Pipeline Test Report",
@@ -514,24 +632,32 @@ def write_report(results: list[TestResult], path: str):
         "",
         "## Automated Test Results",
         "",
-        "| # | Test | Result | Details |",
-        "|---|------|--------|---------|",
+        "| # | Test | Result | Time (s) | Details |",
+        "|---|------|--------|----------|---------|",
     ]
 
     for i, r in enumerate(results, 1):
-        status = "PASS" if r.passed else "FAIL"
-        icon = "+" if r.passed else "X"
+        status = "SKIP" if r.skipped else "PASS" if r.passed else "FAIL"
+        icon = "-" if r.skipped else "+" if r.passed else "X"
         detail = r.details.replace("|", "/").replace("\n", " ")[:200]
-        lines.append(f"| {i} | {r.name} | {icon} {status} | {detail} |")
+        timing = "" if r.skipped else f"{r.seconds:.2f}" + (" (slow)" if id(r) in slow else "")
+        lines.append(f"| {i} | {r.name} | {icon} {status} | {timing} | {detail} |")
 
     lines += [
         "",
         "## Summary",
         "",
         f"**Passed: {passed} / {len(results)}**  ",
-        f"**Failed: {failed}**",
+        f"**Failed: {failed}**  ",
+        f"**Skipped (unchanged): {skipped}**  ",
+        f"**Total test time: {sum(r.seconds for r in results):.2f}s**",
+        "",
+        f"## Slowest {SLOWEST_N} Tests",
         "",
     ]
+    for r in slowest(results):
+        lines.append(f"- {r.seconds:.2f}s — {r.name}")
+    lines.append("")
 
     # Failed test detail
     if failed > 0:
@@ -604,21 +730,38 @@ def write_report(results: list[TestResult], path: str):
 # ===================================================================
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WMLC Pipeline Test Suite")
+    parser.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 1),
+                        help="worker processes for non-setup tests")
+    parser.add_argument("--serial", action="store_true", help="run every test in-process")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="skip tests whose targets are unchanged since the last green run")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("WMLC Pipeline Test Suite")
     print("=" * 60)
 
-    # Results were already collected by the decorators at module load time
+    wall_start = time.perf_counter()
+    results = run_all(workers=1 if args.serial else args.workers, changed_only=args.changed_only)
+    wall = time.perf_counter() - wall_start
+
     for i, r in enumerate(results, 1):
-        icon = "PASS" if r.passed else "FAIL"
-        print(f"  [{icon}] {i:>2}. {r.name}")
+        icon = "SKIP" if r.skipped else "PASS" if r.passed else "FAIL"
+        timing = "" if r.skipped else f" ({r.seconds:.2f}s)"
+        print(f"  [{icon}] {i:>2}. {r.name}{timing}")
         if not r.passed:
             print(f"         -> {r.details[:120]}")
 
     passed, failed = write_report(results, "output/test_report.md")
 
     print()
-    print(f"Results: {passed} passed, {failed} failed out of {len(results)} tests")
+    print("Slowest tests:")
+    for r in slowest(results):
+        print(f"  {r.seconds:6.2f}s  {r.name}")
+    print()
+    print(f"Results: {passed} passed, {failed} failed out of {len(results)} tests "
+          f"(wall {wall:.1f}s, test time {sum(r.seconds for r in results):.1f}s)")
     print("Report written to output/test_report.md")
 
     sys.exit(1 if failed else 0)
@@ -1,126 +1,283 @@
-"""Validate WMLC_Dashboard.xlsm structure and content."""
+"""Validate WMLC_Dashboard.xlsm structure and content.
+
+Usage:
+    python scripts/validate_xlsm.py [path] [--fast]
+
+By default the workbook is loaded with openpyxl. --fast reads the same facts
+straight from the ZIP container (workbook.xml, sheet/drawing relationships,
+sheet XML) with streaming XML parsing and never builds a cell object model,
+so it finishes in milliseconds and can run after every build.
+"""
 import openpyxl
 import zipfile
+import posixpath
 import os
 import re
 import sys
+import time
+import xml.etree.ElementTree as ET
 
-path = "output/WMLC_Dashboard.xlsm"
-errors = []
-
-# 1. File exists and is valid ZIP
-if not os.path.exists(path):
-    path_xlsx = "output/WMLC_Dashboard.xlsx"
-    if os.path.exists(path_xlsx):
-        print(f"NOTE: .xlsm not found, validating .xlsx instead: {path_xlsx}")
-        path = path_xlsx
-    else:
-        print(f"FAIL: Neither {path} nor {path_xlsx} exists")
-        sys.exit(1)
-
-if not zipfile.is_zipfile(path):
-    errors.append("Not a valid ZIP/XLSM file")
-
-# 2. VBA present (only for .xlsm)
-if path.endswith(".xlsm"):
-    with zipfile.ZipFile(path) as z:
-        if "xl/vbaProject.bin" not in z.namelist():
-            errors.append("No vbaProject.bin -- VBA macros missing")
+DEFAULT_PATH = "output/WMLC_Dashboard.xlsm"
 
-# 3. All required sheets
-wb = openpyxl.load_workbook(path, data_only=True)
-required_sheets = {
+REQUIRED_SHEETS = {
     "Dashboard", "Loan Detail", "_config", "_chart_data",
     "_view1", "_view2", "_view3", "_view4",
     "_view5", "_view6", "_view7", "_view8",
     "Summary", "POWER_QUERY_SETUP", "Tracker Analytics"
 }
-actual = set(wb.sheetnames)
-missing = required_sheets - actual
-if missing:
-    errors.append(f"Missing sheets: {missing}")
-
-# 4. Dashboard dimensions
-if "Dashboard" in actual:
-    ws = wb["Dashboard"]
-    if ws.max_row < 30:
-        errors.append(f"Dashboard too short: {ws.max_row} rows")
-    if ws.max_column < 16:
-        errors.append(f"Dashboard too narrow: {ws.max_column} cols")
-
-# 5. Charts on Dashboard
-dash_charts = 0
-if "Dashboard" in actual:
-    ws = wb["Dashboard"]
-    dash_charts = len(ws._charts)
-    if dash_charts < 1:
-        errors.append(f"Dashboard has {dash_charts} charts, expected at least 1")
-
-# 6. Tracker Analytics charts (count only — size checked via XML below)
-ta_charts = 0
-if "Tracker Analytics" in actual:
-    ws_ta = wb["Tracker Analytics"]
-    ta_charts = len(ws_ta._charts)
-    if ta_charts < 3:
-        errors.append(f"Tracker Analytics has {ta_charts} charts, expected at least 3")
-
-# 7. Chart dimensions — read from raw drawing XML (openpyxl doesn't round-trip these)
+# Named ranges the VBA modules read and write
+REQUIRED_NAMES = {"ViewState", "WMLCState", "DataSourcePath"}
+
+# sheet -> {cell: label}; each cell must hold a value
+REQUIRED_CELLS = {
+    "_config": {
+        "A1": "_config!A1 (ViewState)",
+        "A2": "_config!A2 (WMLCState)",
+    },
+    "_chart_data": {
+        "A1": "_chart_data Stacked bar (A1)",
+        "A41": "_chart_data Donut WMLC (A41)",
+        "A42": "_chart_data Donut Non-WMLC (A42)",
+        "A45": "_chart_data Flag breakdown (A45)",
+        "A58": "_chart_data Proximity (A58)",
+    },
+}
+
 MIN_WIDTH_CM = 30
 MIN_HEIGHT_CM = 10
 # Match both <xdr:ext cx="..." cy="..."/> and <ext cx="..." cy="..."/>
 # (COM-saved files use xdr: prefix, openpyxl-saved files omit it)
 EXT_PATTERN = re.compile(r'<(?:xdr:)?ext\s+cx="(\d+)"\s+cy="(\d+)"')
-chart_sizes = []
-with zipfile.ZipFile(path) as z:
-    for entry in sorted(z.namelist()):
-        if "drawings/drawing" in entry and entry.endswith(".xml"):
-            content = z.read(entry).decode("utf-8")
-            extents = EXT_PATTERN.findall(content)
-            for idx, (cx, cy) in enumerate(extents):
-                w_cm = int(cx) / 360000
-                h_cm = int(cy) / 360000
-                chart_label = f"{entry} chart {idx+1}"
-                chart_sizes.append((chart_label, w_cm, h_cm))
-                if w_cm < MIN_WIDTH_CM:
-                    errors.append(f"{chart_label} too narrow: {w_cm:.1f}cm (min {MIN_WIDTH_CM})")
-                if h_cm < MIN_HEIGHT_CM:
-                    errors.append(f"{chart_label} too short: {h_cm:.1f}cm (min {MIN_HEIGHT_CM})")
-
-# 8. _config defaults
-if "_config" in actual:
-    cfg = wb["_config"]
-    if cfg["A1"].value is None:
-        errors.append("_config!A1 (ViewState) is empty")
-    if cfg["A2"].value is None:
-        errors.append("_config!A2 (WMLCState) is empty")
-
-# 9. _chart_data completeness
-if "_chart_data" in actual:
-    wsc = wb["_chart_data"]
-    checks = {
-        "Stacked bar (A1)": wsc["A1"].value,
-        "Donut WMLC (A41)": wsc["A41"].value,
-        "Donut Non-WMLC (A42)": wsc["A42"].value,
-        "Flag breakdown (A45)": wsc["A45"].value,
-        "Proximity (A58)": wsc["A58"].value,
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+
+
+def _col_index(letters):
+    idx = 0
+    for ch in letters:
+        idx = idx * 26 + ord(ch) - 64
+    return idx
+
+
+# ── Fact gathering: openpyxl ─────────────────────────────────────────────────
+
+def read_facts_openpyxl(path):
+    """Workbook facts via a full openpyxl load."""
+    wb = openpyxl.load_workbook(path, data_only=True)
+    facts = {
+        "sheets": list(wb.sheetnames),
+        "defined_names": set(wb.defined_names.keys()),
+        "dimensions": {},
+        "charts": {},
+        "cells": {},
     }
-    for name, val in checks.items():
-        if val is None:
-            errors.append(f"_chart_data {name} is empty")
-
-wb.close()
-
-# Report
-if errors:
-    print(f"VALIDATION FAILED -- {len(errors)} errors:")
-    for e in errors:
-        print(f"  FAIL: {e}")
-    sys.exit(1)
-else:
-    print("ALL VALIDATION CHECKS PASSED")
-    print(f"  Sheets: {len(actual)}")
-    print(f"  Dashboard charts: {dash_charts}")
-    print(f"  Tracker Analytics charts: {ta_charts}")
+    for name in wb.sheetnames:
+        ws = wb[name]
+        facts["charts"][name] = len(ws._charts)
+        if name == "Dashboard":
+            facts["dimensions"][name] = (ws.max_row, ws.max_column)
+    for sheet, cells in REQUIRED_CELLS.items():
+        if sheet in wb.sheetnames:
+            facts["cells"][sheet] = {ref: wb[sheet][ref].value is not None for ref in cells}
+    wb.close()
+    return facts
+
+
+# ── Fact gathering: ZIP + streaming XML ──────────────────────────────────────
+
+def _rels(z, part):
+    """{rId: (type, absolute target)} for a part's relationships file."""
+    folder, name = posixpath.split(part)
+    rels_path = posixpath.join(folder, "_rels", name + ".rels")
+    if rels_path not in z.namelist():
+        return {}
+    out = {}
+    for _, el in ET.iterparse(z.open(rels_path)):
+        if el.tag == NS_PKG_REL + "Relationship":
+            target = el.get("Target")
+            if target.startswith("/"):
+                target = target.lstrip("/")
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            out[el.get("Id")] = (el.get("Type", ""), target)
+    return out
+
+
+def _scan_sheet(z, part, wanted_cells):
+    """Stream one sheet: (max_row, max_col) and which wanted cells hold a value.
+
+    Stops as soon as every wanted cell has been passed; the <dimension> element
+    (written at the top of the sheet) supplies the used range when present.
+    """
+    dims = None
+    found = {ref: False for ref in wanted_cells}
+    last_row_needed = max((int(CELL_REF.match(r).group(2)) for r in wanted_cells), default=0)
+    max_row = max_col = 0
+    for _, el in ET.iterparse(z.open(part)):
+        tag = el.tag
+        if tag == NS_MAIN + "dimension":
+            m = CELL_REF.findall(el.get("ref", ""))
+            if m:
+                dims = (int(m[-1][1]), _col_index(m[-1][0]))
+            if not wanted_cells:
+                break
+        elif tag == NS_MAIN + "c":
+            ref = el.get("r", "")
+            m = CELL_REF.match(ref)
+            if m:
+                row = int(m.group(2))
+                max_row = max(max_row, row)
+                max_col = max(max_col, _col_index(m.group(1)))
+                if ref in found:
+                    found[ref] = (el.find(NS_MAIN + "v") is not None
+                                  or el.find(f"{NS_MAIN}is/{NS_MAIN}t") is not None)
+                if dims and wanted_cells and row > last_row_needed:
+                    break
+            el.clear()
+        elif tag == NS_MAIN + "row":
+            el.clear()
+    return dims or (max(max_row, 1), max(max_col, 1)), found
+
+
+def read_facts_zip(path):
+    """Workbook facts from the OOXML package without building a cell model."""
+    facts = {"sheets": [], "defined_names": set(), "dimensions": {}, "charts": {}, "cells": {}}
+    with zipfile.ZipFile(path) as z:
+        sheet_rids = []
+        for _, el in ET.iterparse(z.open("xl/workbook.xml")):
+            if el.tag == NS_MAIN + "sheet":
+                facts["sheets"].append(el.get("name"))
+                sheet_rids.append((el.get("name"), el.get(NS_REL + "id")))
+            elif el.tag == NS_MAIN + "definedName":
+                facts["defined_names"].add(el.get("name"))
+        wb_rels = _rels(z, "xl/workbook.xml")
+
+        for name, rid in sheet_rids:
+            part = wb_rels.get(rid, ("", ""))[1]
+            if part not in z.namelist():
+                continue
+            charts = 0
+            for rel_type, target in _rels(z, part).values():
+                if rel_type.endswith("/drawing"):
+                    charts += sum(1 for t, _ in _rels(z, target).values() if t.endswith("/chart"))
+            facts["charts"][name] = charts
+            wanted = list(REQUIRED_CELLS.get(name, {}))
+            if name == "Dashboard" or wanted:
+                dims, found = _scan_sheet(z, part, wanted)
+                if name == "Dashboard":
+                    facts["dimensions"][name] = dims
+                if wanted:
+                    facts["cells"][name] = found
+    return facts
+
+
+# ── Checks (shared by both modes) ────────────────────────────────────────────
+
+def check_chart_sizes(path, errors):
+    """Chart extents from raw drawing XML (openpyxl doesn't round-trip these)."""
+    chart_sizes = []
+    with zipfile.ZipFile(path) as z:
+        for entry in sorted(z.namelist()):
+            if "drawings/drawing" in entry and entry.endswith(".xml"):
+                content = z.read(entry).decode("utf-8")
+                extents = EXT_PATTERN.findall(content)
+                for idx, (cx, cy) in enumerate(extents):
+                    w_cm = int(cx) / 360000
+                    h_cm = int(cy) / 360000
+                    chart_label = f"{entry} chart {idx+1}"
+                    chart_sizes.append((chart_label, w_cm, h_cm))
+                    if w_cm < MIN_WIDTH_CM:
+                        errors.append(f"{chart_label} too narrow: {w_cm:.1f}cm (min {MIN_WIDTH_CM})")
+                    if h_cm < MIN_HEIGHT_CM:
+                        errors.append(f"{chart_label} too short: {h_cm:.1f}cm (min {MIN_HEIGHT_CM})")
+    return chart_sizes
+
+
+def check_facts(facts, errors):
+    """Sheet, named-range, dimension, chart-count and required-cell checks."""
+    actual = set(facts["sheets"])
+    missing = REQUIRED_SHEETS - actual
+    if missing:
+        errors.append(f"Missing sheets: {missing}")
+
+    missing_names = REQUIRED_NAMES - facts["defined_names"]
+    if missing_names:
+        errors.append(f"Missing named ranges: {missing_names}")
+
+    if "Dashboard" in actual:
+        max_row, max_col = facts["dimensions"].get("Dashboard", (0, 0))
+        if max_row < 30:
+            errors.append(f"Dashboard too short: {max_row} rows")
+        if max_col < 16:
+            errors.append(f"Dashboard too narrow: {max_col} cols")
+        if facts["charts"].get("Dashboard", 0) < 1:
+            errors.append(f"Dashboard has {facts['charts'].get('Dashboard', 0)} charts, expected at least 1")
+
+    if "Tracker Analytics" in actual and facts["charts"].get("Tracker Analytics", 0) < 3:
+        errors.append(f"Tracker Analytics has {facts['charts']['Tracker Analytics']} charts, "
+                      f"expected at least 3")
+
+    for sheet, cells in REQUIRED_CELLS.items():
+        if sheet not in actual:
+            continue
+        for ref, label in cells.items():
+            if not facts["cells"].get(sheet, {}).get(ref, False):
+                errors.append(f"{label} is empty")
+
+
+def validate(path, fast=False):
+    """Run every check against path. Returns (errors, facts, chart_sizes)."""
+    errors = []
+    if not zipfile.is_zipfile(path):
+        return ["Not a valid ZIP/XLSM file"], None, []
+
+    if path.endswith(".xlsm"):
+        with zipfile.ZipFile(path) as z:
+            if "xl/vbaProject.bin" not in z.namelist():
+                errors.append("No vbaProject.bin -- VBA macros missing")
+
+    facts = read_facts_zip(path) if fast else read_facts_openpyxl(path)
+    check_facts(facts, errors)
+    chart_sizes = check_chart_sizes(path, errors)
+    return errors, facts, chart_sizes
+
+
+def main(argv):
+    fast = "--fast" in argv
+    args = [a for a in argv if not a.startswith("--")]
+    path = args[0] if args else DEFAULT_PATH
+
+    if not os.path.exists(path):
+        path_xlsx = os.path.splitext(path)[0] + ".xlsx"
+        if os.path.exists(path_xlsx):
+            print(f"NOTE: .xlsm not found, validating .xlsx instead: {path_xlsx}")
+            path = path_xlsx
+        else:
+            print(f"FAIL: Neither {path} nor {path_xlsx} exists")
+            return 1
+
+    start = time.perf_counter()
+    errors, facts, chart_sizes = validate(path, fast=fast)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    mode = "fast ZIP/XML" if fast else "openpyxl"
+
+    if errors:
+        print(f"VALIDATION FAILED -- {len(errors)} errors ({mode}, {elapsed_ms:.0f} ms):")
+        for e in errors:
+            print(f"  FAIL: {e}")
+        return 1
+
+    print(f"ALL VALIDATION CHECKS PASSED ({mode}, {elapsed_ms:.0f} ms)")
+    print(f"  Sheets: {len(facts['sheets'])}")
+    print(f"  Dashboard charts: {facts['charts'].get('Dashboard', 0)}")
+    print(f"  Tracker Analytics charts: {facts['charts'].get('Tracker Analytics', 0)}")
     for label, w, h in chart_sizes:
         print(f"  {label}: {w:.1f}x{h:.1f}cm")
-    sys.exit(0)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))